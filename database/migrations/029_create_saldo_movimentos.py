@@ -0,0 +1,62 @@
+"""
+Migration 029: Ledger de Movimentos de Saldos
+
+Cria:
+- Tabela saldo_movimentos - um movimento com sinal por IN/OUT de cada sócio,
+  associado ao Projeto/Despesa/Boletim que o originou
+
+Índices:
+- (socio, componente, data) - somas por intervalo de datas
+- (origem_tipo, origem_id) - sincronização quando a origem muda
+
+Depois de aplicar, popular com rebuild_ledger() (scripts/run_migration_029.py).
+
+Data: 2026-10-17
+"""
+
+from sqlalchemy import text
+
+
+def upgrade(engine):
+    """Aplica as mudanças da migration"""
+
+    with engine.connect() as conn:
+        print("\n🔧 Migration 029: Criar ledger saldo_movimentos")
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS saldo_movimentos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                socio VARCHAR(2) NOT NULL,
+                componente VARCHAR(30) NOT NULL,
+                origem_tipo VARCHAR(10) NOT NULL,
+                origem_id INTEGER NOT NULL,
+                data DATE,
+                valor NUMERIC(14, 6) NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_saldo_movimentos_socio_comp_data "
+            "ON saldo_movimentos(socio, componente, data)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_saldo_movimentos_origem "
+            "ON saldo_movimentos(origem_tipo, origem_id)"
+        ))
+
+        conn.commit()
+        print("✅ Tabela 'saldo_movimentos' criada com sucesso")
+
+
+def downgrade(engine):
+    """Reverte as mudanças da migration"""
+
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS saldo_movimentos"))
+        conn.commit()
+        print("✅ Migration 029 revertida")
+
+
+if __name__ == "__main__":
+    print("⚠️ Execute este script via scripts/run_migration_029.py")
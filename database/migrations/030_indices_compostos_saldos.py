@@ -0,0 +1,62 @@
+"""
+Migration 030: Índices compostos para saldos e relatórios
+
+Os cálculos de saldos e os relatórios filtram por combinações de colunas
+(tipo + owner + estado + período). Com índices de uma só coluna o SQLite
+escolhe um deles e filtra o resto linha a linha; sem índice em
+data_faturacao / data_pagamento os filtros por período percorrem a tabela.
+
+Índices (as últimas colunas tornam-nos "covering" para as somas de saldos):
+- projetos(tipo, owner, estado, data_faturacao, valor_sem_iva) - projetos pessoais
+- projetos(estado, data_faturacao, premio_bruno, premio_rafael) - prémios, faturação mensal
+- despesas(tipo, estado, data, valor_sem_iva) - despesas fixas / pessoais
+- despesas(estado, data_pagamento) - despesas pagas por período (financeiro mensal)
+- boletins(socio, estado, data_emissao, valor) - boletins por sócio
+
+Verificação: tests/testar_planos_queries.py (EXPLAIN QUERY PLAN).
+
+Data: 2026-10-17
+"""
+
+from sqlalchemy import text
+
+INDICES = (
+    ("idx_projetos_tipo_owner_estado_faturacao", "projetos",
+     "tipo, owner, estado, data_faturacao, valor_sem_iva"),
+    ("idx_projetos_estado_faturacao_premios", "projetos",
+     "estado, data_faturacao, premio_bruno, premio_rafael"),
+    ("idx_despesas_tipo_estado_data", "despesas",
+     "tipo, estado, data, valor_sem_iva"),
+    ("idx_despesas_estado_data_pagamento", "despesas",
+     "estado, data_pagamento"),
+    ("idx_boletins_socio_estado_emissao", "boletins",
+     "socio, estado, data_emissao, valor"),
+)
+
+
+def upgrade(engine):
+    """Aplica as mudanças da migration"""
+
+    with engine.connect() as conn:
+        print("\n🔧 Migration 030: Índices compostos para saldos e relatórios")
+
+        for nome, tabela, colunas in INDICES:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {nome} ON {tabela}({colunas})"))
+            print(f"  ✅ {nome}")
+
+        conn.commit()
+        print("✅ Índices criados com sucesso")
+
+
+def downgrade(engine):
+    """Reverte as mudanças da migration"""
+
+    with engine.connect() as conn:
+        for nome, _, _ in INDICES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {nome}"))
+        conn.commit()
+        print("✅ Migration 030 revertida")
+
+
+if __name__ == "__main__":
+    print("⚠️ Execute este script via scripts/run_migration_030.py")
@@ -0,0 +1,49 @@
+"""
+Migration 031: Tabela de sequências para números sequenciais
+
+Cria:
+- Tabela sequencias (nome, ultimo_valor) - um contador por entidade
+  (projetos #P, despesas #D, boletins #B, clientes #C, fornecedores #F,
+  freelancers #F, equipamento #E, despesa_templates #TD, orcamentos OR-)
+
+Os números passam a ser reservados com um UPDATE atómico em vez de
+"ler o último + 1" (seguro com vários clientes na mesma base de dados).
+
+Depois de aplicar, inicializar os contadores com SequenciasManager.sincronizar()
+(scripts/run_migration_031.py).
+
+Data: 2026-10-17
+"""
+
+from sqlalchemy import text
+
+
+def upgrade(engine):
+    """Aplica as mudanças da migration"""
+
+    with engine.connect() as conn:
+        print("\n🔧 Migration 031: Criar tabela sequencias")
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS sequencias (
+                nome VARCHAR(30) PRIMARY KEY,
+                ultimo_valor INTEGER NOT NULL DEFAULT 0,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+
+        conn.commit()
+        print("✅ Tabela 'sequencias' criada com sucesso")
+
+
+def downgrade(engine):
+    """Reverte as mudanças da migration"""
+
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS sequencias"))
+        conn.commit()
+        print("✅ Migration 031 revertida")
+
+
+if __name__ == "__main__":
+    print("⚠️ Execute este script via scripts/run_migration_031.py")
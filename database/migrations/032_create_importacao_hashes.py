@@ -0,0 +1,50 @@
+"""
+Migration 032: Hashes das linhas importadas do Excel
+
+Cria:
+- Tabela importacao_hashes (folha, chave, hash, excel, importado_em) - o
+  hash do conteúdo de cada linha (#C, #F, #P, #D) do último snapshot
+  importado, para que scripts/import_from_excel.py só processe as linhas
+  novas, alteradas ou removidas desde então.
+
+A tabela começa vazia: a primeira importação depois da migration processa
+todas as linhas e grava os hashes.
+
+Data: 2026-10-17
+"""
+
+from sqlalchemy import text
+
+
+def upgrade(engine):
+    """Aplica as mudanças da migration"""
+
+    with engine.connect() as conn:
+        print("\n🔧 Migration 032: Criar tabela importacao_hashes")
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS importacao_hashes (
+                folha VARCHAR(20) NOT NULL,
+                chave VARCHAR(30) NOT NULL,
+                hash VARCHAR(40) NOT NULL,
+                excel VARCHAR(255) NOT NULL,
+                importado_em DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (folha, chave)
+            )
+        """))
+
+        conn.commit()
+        print("✅ Tabela 'importacao_hashes' criada com sucesso")
+
+
+def downgrade(engine):
+    """Reverte as mudanças da migration"""
+
+    with engine.connect() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS importacao_hashes"))
+        conn.commit()
+        print("✅ Migration 032 revertida")
+
+
+if __name__ == "__main__":
+    print("⚠️ Execute este script via scripts/run_migration_032.py")
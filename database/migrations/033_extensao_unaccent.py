@@ -0,0 +1,44 @@
+"""
+Migration 033: Extensão unaccent (PostgreSQL)
+
+A pesquisa das listagens (logic/consulta_lista.py) ignora acentos: no SQLite
+com a função normalizar() registada em cada ligação, no PostgreSQL com
+unaccent(lower(...)). Esta migration instala a extensão unaccent; sem ela a
+pesquisa no PostgreSQL usa só lower() ("acao" não encontra "ação").
+
+No SQLite não faz nada.
+
+Data: 2026-10-17
+"""
+
+from sqlalchemy import text
+
+
+def upgrade(engine):
+    """Aplica as mudanças da migration"""
+
+    if engine.dialect.name != 'postgresql':
+        print("\nℹ️  Migration 033: só se aplica ao PostgreSQL (nada a fazer)")
+        return
+
+    with engine.connect() as conn:
+        print("\n🔧 Migration 033: Instalar extensão unaccent")
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+        conn.commit()
+        print("✅ Extensão 'unaccent' instalada com sucesso")
+
+
+def downgrade(engine):
+    """Reverte as mudanças da migration"""
+
+    if engine.dialect.name != 'postgresql':
+        return
+
+    with engine.connect() as conn:
+        conn.execute(text("DROP EXTENSION IF EXISTS unaccent"))
+        conn.commit()
+        print("✅ Migration 033 revertida")
+
+
+if __name__ == "__main__":
+    print("⚠️ Execute este script via scripts/run_migration_033.py")
@@ -14,10 +14,15 @@ from database.models.boletim import Boletim, Socio, EstadoBoletim
 from database.models.boletim_linha import BoletimLinha, TipoDeslocacao
 from database.models.valor_referencia_anual import ValorReferenciaAnual
 from database.models.equipamento import Equipamento
-from database.models.orcamento import Orcamento, OrcamentoSecao, OrcamentoItem, OrcamentoReparticao
+from database.models.orcamento import (
+    Orcamento, OrcamentoSecao, OrcamentoItem, OrcamentoReparticao, PropostaSecao, PropostaItem
+)
 from database.models.freelancer import Freelancer
 from database.models.freelancer_trabalho import FreelancerTrabalho, StatusTrabalho
 from database.models.fornecedor_compra import FornecedorCompra
+from database.models.saldo_movimento import SaldoMovimento
+from database.models.sequencia import Sequencia
+from database.models.importacao_hash import ImportacaoHash
 
 __all__ = [
     'Base',
@@ -43,8 +48,13 @@ __all__ = [
     'OrcamentoSecao',
     'OrcamentoItem',
     'OrcamentoReparticao',
+    'PropostaSecao',
+    'PropostaItem',
     'Freelancer',
     'FreelancerTrabalho',
     'StatusTrabalho',
     'FornecedorCompra',
+    'SaldoMovimento',
+    'Sequencia',
+    'ImportacaoHash',
 ]
@@ -3,9 +3,11 @@
 Modelo Boletim - Boletins de ajudas de custo emitidos aos sócios (Boletim Itinerário)
 """
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, Text, Index, Enum as SQLEnum
+from sqlalchemy import func, select
+from sqlalchemy.orm import relationship, column_property
 from database.models.base import Base
+from database.models.boletim_linha import BoletimLinha
 import enum
 
 
@@ -83,7 +85,23 @@ class Boletim(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relações
-    linhas = relationship("BoletimLinha", back_populates="boletim", cascade="all, delete-orphan", lazy="joined")
+    # Linhas carregadas só quando acedidas (ou com selectinload - perfil 'detalhe');
+    # as listagens usam num_linhas em vez de carregar as linhas
+    linhas = relationship("BoletimLinha", back_populates="boletim", cascade="all, delete-orphan", lazy="select")
+
+    # Número de linhas (subquery; deferred - carregar com undefer(Boletim.num_linhas))
+    num_linhas = column_property(
+        select(func.count(BoletimLinha.id))
+        .where(BoletimLinha.boletim_id == id)
+        .correlate_except(BoletimLinha)
+        .scalar_subquery(),
+        deferred=True
+    )
+
+    # Índices compostos para saldos e relatórios (migration 030)
+    __table_args__ = (
+        Index('idx_boletins_socio_estado_emissao', 'socio', 'estado', 'data_emissao', 'valor'),
+    )
 
     def __repr__(self):
         return f"<Boletim(id={self.id}, numero='{self.numero}', socio='{self.socio.value}', valor={self.valor}, estado='{self.estado.value}')>"
@@ -109,7 +127,7 @@ class Boletim(Base):
             'descricao': self.descricao,  # Compatibilidade
             'estado': self.estado.value if self.estado else None,
             'nota': self.nota,
-            'linhas_count': len(self.linhas) if self.linhas else 0,
+            'linhas_count': self.num_linhas or 0,  # undefer(Boletim.num_linhas) na query
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
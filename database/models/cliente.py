@@ -4,8 +4,10 @@ Modelo Cliente - Base de dados de clientes da Agora Media
 """
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import func, select
+from sqlalchemy.orm import relationship, column_property
 from database.models.base import Base
+from database.models.projeto import Projeto
 
 
 class Cliente(Base):
@@ -36,6 +38,15 @@ class Cliente(Base):
     projetos = relationship("Projeto", back_populates="cliente", cascade="all, delete-orphan")
     orcamentos = relationship("Orcamento", back_populates="cliente", cascade="all, delete-orphan")
 
+    # Número de projetos (subquery; deferred - carregar com undefer(Cliente.num_projetos))
+    num_projetos = column_property(
+        select(func.count(Projeto.id))
+        .where(Projeto.cliente_id == id)
+        .correlate_except(Projeto)
+        .scalar_subquery(),
+        deferred=True
+    )
+
     def __repr__(self):
         return f"<Cliente(id={self.id}, numero='{self.numero}', nome='{self.nome}')>"
 
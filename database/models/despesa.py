@@ -3,7 +3,7 @@
 Modelo Despesa - Despesas da empresa e despesas pessoais dos sócios
 """
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from database.models.base import Base
 import enum
@@ -79,6 +79,12 @@ class Despesa(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Índices compostos para saldos e relatórios (migration 030)
+    __table_args__ = (
+        Index('idx_despesas_tipo_estado_data', 'tipo', 'estado', 'data', 'valor_sem_iva'),
+        Index('idx_despesas_estado_data_pagamento', 'estado', 'data_pagamento'),
+    )
+
     def __repr__(self):
         return f"<Despesa(id={self.id}, numero='{self.numero}', tipo='{self.tipo.value}', valor={self.valor_sem_iva})>"
 
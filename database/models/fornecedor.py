@@ -4,8 +4,10 @@ Modelo Fornecedor - Base de dados de fornecedores/credores
 """
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import func, select
+from sqlalchemy.orm import relationship, column_property
 from database.models.base import Base
+from database.models.despesa import Despesa
 import enum
 
 
@@ -44,6 +46,15 @@ class Fornecedor(Base):
     # Relacionamentos
     despesas = relationship("Despesa", back_populates="credor", cascade="all, delete-orphan")
 
+    # Número de despesas (subquery; deferred - carregar com undefer(Fornecedor.num_despesas))
+    num_despesas = column_property(
+        select(func.count(Despesa.id))
+        .where(Despesa.credor_id == id)
+        .correlate_except(Despesa)
+        .scalar_subquery(),
+        deferred=True
+    )
+
     def __repr__(self):
         return f"<Fornecedor(id={self.id}, numero='{self.numero}', nome='{self.nome}')>"
 
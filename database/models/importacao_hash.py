@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo ImportacaoHash - Hash do conteúdo de cada linha importada do Excel
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+from database.models.base import Base
+
+
+class ImportacaoHash(Base):
+    """
+    Hash de cada linha do Excel no último snapshot importado
+
+    A chave é a folha + o número da coluna A (#C0001, #D000123, ...). Numa
+    nova importação só as linhas novas ou com hash diferente são
+    processadas; as que desapareceram do Excel são removidas daqui (os
+    registos na base de dados mantêm-se). Ver scripts/import_from_excel.py.
+    """
+    __tablename__ = 'importacao_hashes'
+
+    folha = Column(String(20), primary_key=True)  # Ex: 'CLIENTES', 'DESPESAS'
+    chave = Column(String(30), primary_key=True)  # Número da coluna A
+    hash = Column(String(40), nullable=False)     # SHA-1 dos valores da linha
+    excel = Column(String(255), nullable=False)   # Snapshot de onde veio a linha
+    importado_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ImportacaoHash(folha='{self.folha}', chave='{self.chave}')>"
@@ -37,6 +37,12 @@ class Orcamento(Base):
     # Status do orçamento
     status = Column(String(20), nullable=False, default='rascunho')  # 'rascunho', 'aprovado', 'rejeitado'
 
+    # Versão cliente (proposta)
+    tem_versao_cliente = Column(Boolean, nullable=False, default=False)
+    titulo_cliente = Column(String(200), nullable=True)
+    descricao_cliente = Column(Text, nullable=True)
+    notas_contratuais = Column(Text, nullable=True)
+
     # Link para projeto (quando convertido)
     projeto_id = Column(Integer, ForeignKey('projetos.id'), nullable=True)
 
@@ -45,9 +51,14 @@ class Orcamento(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
     # Relacionamentos
-    secoes = relationship("OrcamentoSecao", back_populates="orcamento", cascade="all, delete-orphan")
-    itens = relationship("OrcamentoItem", back_populates="orcamento", cascade="all, delete-orphan")
-    reparticoes = relationship("OrcamentoReparticao", back_populates="orcamento", cascade="all, delete-orphan")
+    secoes = relationship("OrcamentoSecao", back_populates="orcamento", cascade="all, delete-orphan",
+                          order_by="OrcamentoSecao.ordem")
+    itens = relationship("OrcamentoItem", back_populates="orcamento", cascade="all, delete-orphan",
+                         order_by="OrcamentoItem.ordem")
+    reparticoes = relationship("OrcamentoReparticao", back_populates="orcamento", cascade="all, delete-orphan",
+                               order_by="OrcamentoReparticao.ordem")
+    proposta_secoes = relationship("PropostaSecao", back_populates="orcamento", cascade="all, delete-orphan",
+                                   order_by="PropostaSecao.ordem")
     projeto = relationship("Projeto", back_populates="orcamentos")
 
     def __repr__(self):
@@ -78,7 +89,8 @@ class OrcamentoSecao(Base):
     # Relacionamentos
     orcamento = relationship("Orcamento", back_populates="secoes")
     parent = relationship("OrcamentoSecao", remote_side=[id], backref="subsecoes")
-    itens = relationship("OrcamentoItem", back_populates="secao", cascade="all, delete-orphan")
+    itens = relationship("OrcamentoItem", back_populates="secao", cascade="all, delete-orphan",
+                         order_by="OrcamentoItem.ordem")
 
     def __repr__(self):
         return f"<OrcamentoSecao(nome='{self.nome}', tipo='{self.tipo}')>"
@@ -209,7 +221,7 @@ class OrcamentoReparticao(Base):
             return (self.quantidade or 0) * (self.dias or 1) * (self.valor_unitario or 0)
         elif self.tipo == 'comissao':
             # Total = Base × (Percentagem / 100)
-            return (self.base_calculo or 0) * ((self.percentagem or 0) / 100)
+            return (self.base_calculo or 0) * (self.percentagem or 0) / 100
         elif self.tipo == 'despesa':
             # Replicado do item cliente - calcular baseado nos campos
             if self.kms is not None:
@@ -224,3 +236,48 @@ class OrcamentoReparticao(Base):
         return f"<OrcamentoReparticao(tipo='{self.tipo}', beneficiario='{self.beneficiario}', total={self.total})>"
 
 
+class PropostaSecao(Base):
+    """
+    Modelo para Secções da Proposta (versão cliente, independente dos items CLIENTE)
+    """
+    __tablename__ = 'proposta_secoes'
+
+    id = Column(Integer, primary_key=True)
+    orcamento_id = Column(Integer, ForeignKey('orcamentos.id'), nullable=False)
+
+    nome = Column(String(100), nullable=False)
+    ordem = Column(Integer, nullable=False, default=0)
+    subtotal = Column(Numeric(10, 2), nullable=True)
+
+    # Relacionamentos
+    orcamento = relationship("Orcamento", back_populates="proposta_secoes")
+    itens = relationship("PropostaItem", back_populates="secao", cascade="all, delete-orphan",
+                         order_by="PropostaItem.ordem")
+
+    def __repr__(self):
+        return f"<PropostaSecao(nome='{self.nome}')>"
+
+
+class PropostaItem(Base):
+    """
+    Modelo para Items da Proposta (versão cliente)
+    """
+    __tablename__ = 'proposta_itens'
+
+    id = Column(Integer, primary_key=True)
+    orcamento_id = Column(Integer, ForeignKey('orcamentos.id'), nullable=False)
+    secao_id = Column(Integer, ForeignKey('proposta_secoes.id'), nullable=False)
+
+    descricao = Column(Text, nullable=False)
+    quantidade = Column(Integer, nullable=False, default=1)
+    dias = Column(Integer, nullable=False, default=1)
+    preco_unitario = Column(Numeric(10, 2), nullable=False)
+    desconto = Column(Numeric(5, 4), nullable=False, default=0)  # 0-1 (ex: 0.1 = 10%)
+    total = Column(Numeric(10, 2), nullable=False)
+    ordem = Column(Integer, nullable=False, default=0)
+
+    # Relacionamentos
+    secao = relationship("PropostaSecao", back_populates="itens")
+
+    def __repr__(self):
+        return f"<PropostaItem(descricao='{self.descricao[:30]}...', total={self.total})>"
@@ -3,7 +3,7 @@
 Modelo Projeto - Projetos da Agora Media Production e projetos pessoais dos sócios
 """
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from database.models.base import Base
 import enum
@@ -70,6 +70,12 @@ class Projeto(Base):
     despesas = relationship("Despesa", back_populates="projeto")
     orcamentos = relationship("Orcamento", back_populates="projeto")
 
+    # Índices compostos para saldos e relatórios (migration 030)
+    __table_args__ = (
+        Index('idx_projetos_tipo_owner_estado_faturacao', 'tipo', 'owner', 'estado', 'data_faturacao', 'valor_sem_iva'),
+        Index('idx_projetos_estado_faturacao_premios', 'estado', 'data_faturacao', 'premio_bruno', 'premio_rafael'),
+    )
+
     def __repr__(self):
         return f"<Projeto(id={self.id}, numero='{self.numero}', tipo='{self.tipo.value}', valor={self.valor_sem_iva})>"
 
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo SaldoMovimento - Ledger de movimentos que afetam os saldos pessoais
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric, Index, Enum as SQLEnum
+from database.models.base import Base
+from database.models.boletim import Socio
+
+
+class SaldoMovimento(Base):
+    """
+    Ledger materializado dos saldos pessoais
+
+    Cada linha é um movimento com sinal (IN positivo, OUT negativo) de um
+    sócio, associado à entidade que o originou (Projeto, Despesa ou Boletim).
+    O ledger é mantido pelos managers (ProjetosManager, DespesasManager,
+    BoletinsManager, BoletimLinhasManager) sempre que a origem é criada,
+    alterada, muda de estado ou é apagada.
+
+    Componentes (ver logic/saldo_movimentos.py):
+    - projetos_pessoais, premios: INs (projetos PAGOS)
+    - pessoais_nao_faturados, premios_nao_faturados: INs projetados (FINALIZADOS)
+    - despesas_fixas (metade por sócio), despesas_pessoais: OUTs (PAGAS)
+    - boletins_pagos: OUT; boletins_pendentes: OUT projetado
+
+    Os saldos passam a ser somas por intervalo de datas sobre este ledger.
+    rebuild_ledger() reconstrói tudo a partir das tabelas base.
+    """
+    __tablename__ = 'saldo_movimentos'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    socio = Column(SQLEnum(Socio), nullable=False)
+    componente = Column(String(30), nullable=False)
+
+    # Origem do movimento
+    origem_tipo = Column(String(10), nullable=False)  # 'PROJETO', 'DESPESA' ou 'BOLETIM'
+    origem_id = Column(Integer, nullable=False)
+
+    # Data relevante para o saldo (data_faturacao / data / data_emissao)
+    data = Column(Date, nullable=True)
+
+    # Valor com sinal (6 casas: despesas fixas são divididas por 2)
+    valor = Column(Numeric(14, 6), nullable=False, default=0)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_saldo_movimentos_socio_comp_data', 'socio', 'componente', 'data'),
+        Index('idx_saldo_movimentos_origem', 'origem_tipo', 'origem_id'),
+    )
+
+    def __repr__(self):
+        return f"<SaldoMovimento(socio='{self.socio.value}', componente='{self.componente}', origem={self.origem_tipo}:{self.origem_id}, valor={self.valor})>"
+
+    def to_dict(self):
+        """Converte para dicionário"""
+        return {
+            'id': self.id,
+            'socio': self.socio.value if self.socio else None,
+            'componente': self.componente,
+            'origem_tipo': self.origem_tipo,
+            'origem_id': self.origem_id,
+            'data': self.data.isoformat() if self.data else None,
+            'valor': float(self.valor) if self.valor else 0,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo Sequencia - Contadores dos números sequenciais (#P, #D, #B, ...)
+"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from database.models.base import Base
+
+
+class Sequencia(Base):
+    """
+    Último número atribuído de cada entidade
+
+    Os números são reservados com um UPDATE atómico (ultimo_valor += n) em
+    vez de ler o último registo da tabela e somar 1, por isso dois clientes
+    ligados à mesma base de dados nunca recebem o mesmo número. Ver
+    logic/sequencias.py.
+    """
+    __tablename__ = 'sequencias'
+
+    nome = Column(String(30), primary_key=True)  # Ex: 'projetos', 'despesas'
+    ultimo_valor = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<Sequencia(nome='{self.nome}', ultimo_valor={self.ultimo_valor})>"
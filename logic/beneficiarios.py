@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Nomes dos beneficiários das repartições de orçamentos
+
+Os beneficiários são guardados como texto: 'BA', 'RR', 'AGORA',
+'FREELANCER_<id>' ou 'FORNECEDOR_<id>'. NomesBeneficiarios resolve todos os
+ids de uma vez, com uma query IN por tipo (freelancers e fornecedores):
+
+    nomes = NomesBeneficiarios(session).resolver(documento.totais_beneficiario)
+    nomes['FREELANCER_2']   # 'FREELANCER_2 - João Silva'
+
+Os nomes ficam em cache na sessão (session.info) até os freelancers ou
+fornecedores mudarem (ver logic/versao_dados.py), por isso voltar a mostrar
+os totais não faz queries.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.models import Freelancer, Fornecedor
+from logic.versao_dados import versao
+
+# Beneficiários fixos (sócios e empresa)
+NOMES_FIXOS = {
+    'BA': 'BA - Bruno',
+    'RR': 'RR - Rafael',
+    'AGORA': 'AGORA - Empresa',
+}
+
+# Prefixo do id -> modelo com o nome
+PREFIXOS = {
+    'FREELANCER_': Freelancer,
+    'FORNECEDOR_': Fornecedor,
+}
+
+# Tabelas de que os nomes dependem
+TABELAS_BENEFICIARIOS = ('freelancers', 'fornecedores')
+
+# Chave da cache em session.info
+_CHAVE_CACHE = 'nomes_beneficiarios'
+
+
+def interpretar_beneficiario(beneficiario_id: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Separa um id de beneficiário em prefixo e id numérico
+
+    Args:
+        beneficiario_id: ex: 'FREELANCER_2'
+
+    Returns:
+        ('FREELANCER_', 2), ou (None, None) para sócios/ids inválidos
+    """
+    for prefixo in PREFIXOS:
+        if beneficiario_id and beneficiario_id.startswith(prefixo):
+            try:
+                return prefixo, int(beneficiario_id[len(prefixo):])
+            except ValueError:
+                return None, None
+    return None, None
+
+
+class NomesBeneficiarios:
+    """
+    Resolve ids de beneficiário para nomes de exibição, em lote
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize resolver
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db_session = db_session
+
+    def _cache(self) -> Dict[Tuple[str, int], Optional[str]]:
+        """Nomes já lidos nesta sessão, descartados se os dados mudaram"""
+        chave = versao(*TABELAS_BENEFICIARIOS)
+        cache = self.db_session.info.get(_CHAVE_CACHE)
+        if not cache or cache['chave'] != chave:
+            cache = {'chave': chave, 'nomes': {}}
+            self.db_session.info[_CHAVE_CACHE] = cache
+        return cache['nomes']
+
+    def resolver(self, beneficiario_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve vários ids de beneficiário
+
+        Args:
+            beneficiario_ids: ex: ['BA', 'FREELANCER_2', 'FORNECEDOR_5']
+
+        Returns:
+            Dict {beneficiario_id: nome_display}, ex:
+            {'BA': 'BA - Bruno', 'FREELANCER_2': 'FREELANCER_2 - João Silva'}
+            Ids desconhecidos são mostrados tal como estão.
+        """
+        beneficiario_ids = [b for b in dict.fromkeys(beneficiario_ids) if b]
+        nomes = self._cache()
+
+        # Uma query IN por tipo, só com os ids que ainda não estão em cache
+        em_falta: Dict[str, set] = {}
+        for beneficiario_id in beneficiario_ids:
+            prefixo, numero = interpretar_beneficiario(beneficiario_id)
+            if prefixo and (prefixo, numero) not in nomes:
+                em_falta.setdefault(prefixo, set()).add(numero)
+
+        for prefixo, ids in em_falta.items():
+            modelo = PREFIXOS[prefixo]
+            encontrados = dict(self.db_session.execute(
+                select(modelo.id, modelo.nome).where(modelo.id.in_(ids))
+            ).all())
+            for numero in ids:
+                # Ids inexistentes também ficam em cache (None)
+                nomes[(prefixo, numero)] = encontrados.get(numero)
+
+        resultado = {}
+        for beneficiario_id in beneficiario_ids:
+            if beneficiario_id in NOMES_FIXOS:
+                resultado[beneficiario_id] = NOMES_FIXOS[beneficiario_id]
+                continue
+            prefixo, numero = interpretar_beneficiario(beneficiario_id)
+            nome = nomes.get((prefixo, numero)) if prefixo else None
+            resultado[beneficiario_id] = f"{beneficiario_id} - {nome}" if nome else beneficiario_id
+        return resultado
+
+    def nome(self, beneficiario_id: str) -> str:
+        """
+        Resolve um id de beneficiário
+
+        Args:
+            beneficiario_id: 'BA', 'RR', 'AGORA', 'FREELANCER_2', 'FORNECEDOR_5'
+
+        Returns:
+            Nome formatado: 'BA - Bruno', 'FREELANCER_2 - João Silva', etc
+        """
+        return self.resolver([beneficiario_id]).get(beneficiario_id, beneficiario_id)
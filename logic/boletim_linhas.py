@@ -9,6 +9,7 @@ from decimal import Decimal
 
 from database.models.boletim_linha import BoletimLinha, TipoDeslocacao
 from database.models.boletim import Boletim
+from logic.saldo_movimentos import SaldoMovimentosManager
 
 
 class BoletimLinhasManager:
@@ -24,6 +25,7 @@ class BoletimLinhasManager:
             db_session: SQLAlchemy database session
         """
         self.db_session = db_session
+        self.ledger = SaldoMovimentosManager(db_session)
 
     def listar_por_boletim(self, boletim_id: int) -> List[BoletimLinha]:
         """
@@ -301,6 +303,7 @@ class BoletimLinhasManager:
 
             boletim.updated_at = datetime.utcnow()
 
+            self.ledger.sincronizar_boletim(boletim)
             self.db_session.commit()
             return True
 
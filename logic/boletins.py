@@ -10,6 +10,11 @@ from decimal import Decimal
 
 from database.models import Boletim, Socio, EstadoBoletim, BoletimLinha
 from logic.saldos import SaldosCalculator
+from logic.saldo_movimentos import SaldoMovimentosManager, ORIGEM_BOLETIM
+from logic.sequencias import SequenciasManager
+from logic.consulta_lista import ConsultaLista
+from logic.perfis_carregamento import aplicar_perfil
+from logic.clonagem import ler, copiar, inserir
 
 
 class BoletinsManager:
@@ -26,77 +31,106 @@ class BoletinsManager:
         """
         self.db_session = db_session
         self.saldos_calculator = SaldosCalculator(db_session)
+        self.ledger = SaldoMovimentosManager(db_session)
 
-    def listar_todos(self) -> List[Boletim]:
+    def _query(self, perfil: str = 'lista'):
+        """Query de Boletim com o perfil de carregamento indicado"""
+        return aplicar_perfil(self.db_session.query(Boletim), Boletim, perfil)
+
+    def listar_todos(self, perfil: str = 'lista') -> List[Boletim]:
         """
         Lista todos os boletins ordenados por data (mais recentes primeiro)
 
+        Args:
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
+
         Returns:
             Lista de objetos Boletim
         """
-        return self.db_session.query(Boletim).order_by(desc(Boletim.data_emissao)).all()
+        return self._query(perfil).order_by(desc(Boletim.data_emissao)).all()
 
-    def listar_por_socio(self, socio: Socio) -> List[Boletim]:
+    def consulta_lista(self) -> ConsultaLista:
+        """
+        Query builder para a listagem de boletins (filtros/ordenação/paginação na BD)
+
+        Filtros:
+            - 'socio': [Socio, ...]
+            - 'estado': [EstadoBoletim, ...]
+
+        Returns:
+            ConsultaLista ordenada por data de emissão (mais recentes primeiro)
+        """
+        return ConsultaLista(
+            self._query('lista'),
+            chave=Boletim.id,
+            filtros={
+                'socio': lambda valores: Boletim.socio.in_(valores),
+                'estado': lambda valores: Boletim.estado.in_(valores),
+            },
+            ordenacoes={
+                'numero': [Boletim.numero],
+                'socio': [Boletim.socio],
+                'data_emissao': [Boletim.data_emissao],
+                'linhas': [Boletim.num_linhas],
+                'valor_fmt': [Boletim.valor],
+                'estado': [Boletim.estado],
+                'data_pagamento': [Boletim.data_pagamento],
+            },
+            pesquisa=[Boletim.numero, Boletim.descricao],
+            ordem_padrao=[desc(Boletim.data_emissao)]
+        )
+
+    def listar_por_socio(self, socio: Socio, perfil: str = 'lista') -> List[Boletim]:
         """
         Lista boletins por sócio
 
         Args:
             socio: Socio enum
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de boletins do sócio
         """
-        return self.db_session.query(Boletim).filter(
+        return self._query(perfil).filter(
             Boletim.socio == socio
         ).order_by(desc(Boletim.data_emissao)).all()
 
-    def listar_por_estado(self, estado: EstadoBoletim) -> List[Boletim]:
+    def listar_por_estado(self, estado: EstadoBoletim, perfil: str = 'lista') -> List[Boletim]:
         """
         Lista boletins por estado
 
         Args:
             estado: EstadoBoletim enum
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de boletins com o estado especificado
         """
-        return self.db_session.query(Boletim).filter(
+        return self._query(perfil).filter(
             Boletim.estado == estado
         ).order_by(desc(Boletim.data_emissao)).all()
 
-    def obter_por_id(self, boletim_id: int) -> Optional[Boletim]:
+    def obter_por_id(self, boletim_id: int, perfil: str = 'base') -> Optional[Boletim]:
         """
         Obtém um boletim por ID
 
         Args:
             boletim_id: ID do boletim
+            perfil: Perfil de carregamento ('detalhe' carrega também as linhas)
 
         Returns:
             Objeto Boletim ou None se não encontrado
         """
-        return self.db_session.query(Boletim).filter(Boletim.id == boletim_id).first()
+        return self._query(perfil).filter(Boletim.id == boletim_id).first()
 
     def gerar_proximo_numero(self) -> str:
         """
-        Gera próximo número de boletim
+        Gera próximo número de boletim (reservado na transação atual, ver logic/sequencias.py)
 
         Returns:
             Próximo número (ex: #B0001, #B0002, ...)
         """
-        ultimo_boletim = self.db_session.query(Boletim).order_by(
-            desc(Boletim.id)
-        ).first()
-
-        if ultimo_boletim:
-            try:
-                ultimo_num = int(ultimo_boletim.numero.replace('#B', ''))
-                novo_num = ultimo_num + 1
-            except:
-                novo_num = 1
-        else:
-            novo_num = 1
-
-        return f"#B{novo_num:04d}"
+        return SequenciasManager(self.db_session).proximo('boletins')
 
     def criar(
         self,
@@ -156,6 +190,8 @@ class BoletinsManager:
             )
 
             self.db_session.add(boletim)
+            self.db_session.flush()
+            self.ledger.sincronizar_boletim(boletim)
             self.db_session.commit()
             self.db_session.refresh(boletim)
 
@@ -225,6 +261,8 @@ class BoletinsManager:
             )
 
             self.db_session.add(boletim)
+            self.db_session.flush()
+            self.ledger.sincronizar_boletim(boletim)
             self.db_session.commit()
             self.db_session.refresh(boletim)
 
@@ -297,6 +335,7 @@ class BoletinsManager:
 
             boletim.updated_at = datetime.utcnow()
 
+            self.ledger.sincronizar_boletim(boletim)
             self.db_session.commit()
             return True, None
 
@@ -330,6 +369,7 @@ class BoletinsManager:
             boletim.estado = EstadoBoletim.PAGO
             boletim.data_pagamento = data_pagamento or date.today()
 
+            self.ledger.sincronizar_boletim(boletim)
             self.db_session.commit()
             return True, None
 
@@ -355,6 +395,7 @@ class BoletinsManager:
             boletim.estado = EstadoBoletim.PENDENTE
             boletim.data_pagamento = None
 
+            self.ledger.sincronizar_boletim(boletim)
             self.db_session.commit()
             return True, None
 
@@ -372,7 +413,6 @@ class BoletinsManager:
         - Gera novo número automático
         - Estado sempre PENDENTE
         - Descrição indica que é cópia (se houver descricao antiga)
-        - Retorna novo boletim AINDA NÃO GRAVADO (permite editar antes de gravar)
 
         Args:
             boletim_id: ID do boletim original a duplicar
@@ -380,76 +420,95 @@ class BoletinsManager:
         Returns:
             Tuple (sucesso, boletim_novo, mensagem_erro)
         """
-        try:
-            # Buscar original
-            original = self.obter_por_id(boletim_id)
-            if not original:
-                return False, None, f"Boletim #{boletim_id} não encontrado"
-
-            # Gerar novo número
-            novo_numero = self.gerar_proximo_numero()
-
-            # Copiar header
-            novo = Boletim(
-                numero=novo_numero,
-                socio=original.socio,
-                mes=original.mes,
-                ano=original.ano,
-                data_emissao=date.today(),  # Data de hoje por padrão
-                val_dia_nacional=original.val_dia_nacional,
-                val_dia_estrangeiro=original.val_dia_estrangeiro,
-                val_km=original.val_km,
-                total_ajudas_nacionais=Decimal('0'),  # Será recalculado
-                total_ajudas_estrangeiro=Decimal('0'),  # Será recalculado
-                total_kms=Decimal('0'),  # Será recalculado
-                valor_total=Decimal('0'),  # Será recalculado
-                valor=Decimal('0'),  # Compatibilidade
-                estado=EstadoBoletim.PENDENTE,  # Sempre PENDENTE
-                descricao=f"{original.descricao} (cópia)" if original.descricao else None,
-                nota=original.nota,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
+        sucesso, novos_ids, erro = self.duplicar_boletins([boletim_id])
+        if not sucesso:
+            return False, None, erro
+        return True, self.obter_por_id(novos_ids[0]), None
 
-            # Copiar todas as linhas
-            if hasattr(original, 'linhas') and original.linhas:
-                for idx, linha_original in enumerate(original.linhas, start=1):
-                    linha_nova = BoletimLinha(
-                        boletim=novo,
-                        ordem=idx,
-                        projeto_id=linha_original.projeto_id,
-                        servico=linha_original.servico,
-                        localidade=linha_original.localidade,
-                        data_inicio=linha_original.data_inicio,
-                        hora_inicio=linha_original.hora_inicio,
-                        data_fim=linha_original.data_fim,
-                        hora_fim=linha_original.hora_fim,
-                        tipo=linha_original.tipo,
-                        dias=linha_original.dias,
-                        kms=linha_original.kms,
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    # Adicionar linha ao boletim (será persistida quando gravar)
-                    if not hasattr(novo, 'linhas'):
-                        novo.linhas = []
-                    novo.linhas.append(linha_nova)
-
-            # Gravar boletim + linhas
-            self.db_session.add(novo)
-            self.db_session.commit()
-            self.db_session.refresh(novo)
+    def duplicar_boletins(
+        self,
+        boletim_ids: List[int],
+        periodos: Optional[List[Tuple[int, int]]] = None
+    ) -> Tuple[bool, List[int], Optional[str]]:
+        """
+        Duplica vários boletins (header + linhas) numa única transação
+
+        Os números #B são reservados num bloco e os headers e as linhas de
+        todas as cópias são inseridos com um INSERT por tabela (ver
+        logic/clonagem.py). As cópias ficam PENDENTE, com a data de hoje e os
+        totais do original (as linhas são as mesmas).
 
-            # Recalcular totais (se o boletim tem método para isso)
-            if hasattr(novo, 'recalcular_totais'):
-                novo.recalcular_totais()
-                self.db_session.commit()
+        Ex: duplicar os boletins de 2025 para 2026, mês a mês:
+            boletins = manager.listar_todos()
+            de_2025 = [b for b in boletins if b.ano == 2025]
+            manager.duplicar_boletins([b.id for b in de_2025], [(2026, b.mes) for b in de_2025])
 
-            return True, novo, None
+        Args:
+            boletim_ids: IDs dos boletins a duplicar (o mesmo ID pode aparecer
+                várias vezes, ex: um boletim para todos os meses)
+            periodos: (ano, mes) de cada cópia, pela mesma ordem (opcional,
+                default o período do original)
+
+        Returns:
+            Tuple (sucesso, ids_das_copias, mensagem_erro)
+        """
+        boletim_ids = list(boletim_ids)
+        if not boletim_ids:
+            return True, [], None
+        if periodos is not None:
+            if len(periodos) != len(boletim_ids):
+                return False, [], "Número de períodos diferente do número de boletins"
+            if any(mes < 1 or mes > 12 for _, mes in periodos):
+                return False, [], "Mês deve estar entre 1 e 12"
+
+        try:
+            originais = {
+                linha['id']: linha
+                for linha in ler(self.db_session, Boletim, Boletim.id.in_(set(boletim_ids)))
+            }
+            em_falta = [boletim_id for boletim_id in boletim_ids if boletim_id not in originais]
+            if em_falta:
+                return False, [], f"Boletim #{em_falta[0]} não encontrado"
+
+            # Headers (números #B num só bloco)
+            numeros = SequenciasManager(self.db_session).reservar_bloco('boletins', len(boletim_ids))
+            agora = datetime.utcnow()
+            headers = []
+            for i, (boletim_id, numero) in enumerate(zip(boletim_ids, numeros)):
+                original = originais[boletim_id]
+                ano, mes = periodos[i] if periodos else (original['ano'], original['mes'])
+                headers.append(copiar(
+                    original,
+                    numero=numero,
+                    ano=ano,
+                    mes=mes,
+                    data_emissao=date.today(),  # Data de hoje por padrão
+                    data_pagamento=None,
+                    estado=EstadoBoletim.PENDENTE,  # Sempre PENDENTE
+                    descricao=f"{original['descricao']} (cópia)" if original['descricao'] else None,
+                    created_at=agora,
+                    updated_at=agora
+                ))
+            novos_ids = inserir(self.db_session, Boletim, headers)
+
+            # Linhas de todas as cópias (boletim_id remapeado, ordem 1, 2, 3...)
+            linhas_por_boletim = {}
+            for linha in ler(self.db_session, BoletimLinha, BoletimLinha.boletim_id.in_(list(originais)),
+                             ordem=(BoletimLinha.boletim_id, BoletimLinha.ordem)):
+                linhas_por_boletim.setdefault(linha['boletim_id'], []).append(linha)
+            inserir(self.db_session, BoletimLinha, [
+                copiar(linha, boletim_id=novo_id, ordem=ordem, created_at=agora, updated_at=agora)
+                for boletim_id, novo_id in zip(boletim_ids, novos_ids)
+                for ordem, linha in enumerate(linhas_por_boletim.get(boletim_id, []), start=1)
+            ])
+
+            self.ledger.sincronizar_lote(ORIGEM_BOLETIM, novos_ids)
+            self.db_session.commit()
+            return True, novos_ids, None
 
         except Exception as e:
             self.db_session.rollback()
-            return False, None, f"Erro ao duplicar boletim: {str(e)}"
+            return False, [], f"Erro ao duplicar boletins: {str(e)}"
 
     def apagar(self, boletim_id: int) -> Tuple[bool, Optional[str]]:
         """
@@ -466,6 +525,7 @@ class BoletinsManager:
             if not boletim:
                 return False, "Boletim não encontrado"
 
+            self.ledger.remover_origem(ORIGEM_BOLETIM, boletim.id)
             self.db_session.delete(boletim)
             self.db_session.commit()
             return True, None
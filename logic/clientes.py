@@ -6,6 +6,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from database.models import Cliente
 from typing import List, Tuple, Optional
+from logic.perfis_carregamento import aplicar_perfil
+from logic.sequencias import SequenciasManager
 
 
 class ClientesManager:
@@ -22,17 +24,22 @@ class ClientesManager:
         """
         self.db = db_session
 
-    def listar_todos(self, order_by: str = 'numero') -> List[Cliente]:
+    def _query(self, perfil: str = 'lista'):
+        """Query de Cliente com o perfil de carregamento indicado"""
+        return aplicar_perfil(self.db.query(Cliente), Cliente, perfil)
+
+    def listar_todos(self, order_by: str = 'numero', perfil: str = 'lista') -> List[Cliente]:
         """
         List all clientes
 
         Args:
             order_by: Field to order by (numero, nome, pais)
+            perfil: Eager-loading profile (see logic/perfis_carregamento.py)
 
         Returns:
             List of Cliente objects
         """
-        query = self.db.query(Cliente)
+        query = self._query(perfil)
 
         if order_by == 'numero':
             query = query.order_by(desc(Cliente.numero))
@@ -67,18 +74,19 @@ class ClientesManager:
         """
         return self.db.query(Cliente).filter(Cliente.numero == numero).first()
 
-    def pesquisar(self, termo: str) -> List[Cliente]:
+    def pesquisar(self, termo: str, perfil: str = 'lista') -> List[Cliente]:
         """
         Search clientes by nome, nome_formal, NIF, or email
 
         Args:
             termo: Search term
+            perfil: Eager-loading profile (see logic/perfis_carregamento.py)
 
         Returns:
             List of matching Cliente objects
         """
         termo_like = f"%{termo}%"
-        return self.db.query(Cliente).filter(
+        return self._query(perfil).filter(
             (Cliente.nome.ilike(termo_like)) |
             (Cliente.nome_formal.ilike(termo_like)) |
             (Cliente.nif.ilike(termo_like)) |
@@ -87,22 +95,12 @@ class ClientesManager:
 
     def gerar_proximo_numero(self) -> str:
         """
-        Generate next cliente numero
+        Generate next cliente numero (reserved in the current transaction)
 
         Returns:
             Next numero (e.g., #C0001, #C0002, ...)
         """
-        ultimo = self.db.query(Cliente).order_by(desc(Cliente.numero)).first()
-
-        if not ultimo:
-            return "#C0001"
-
-        # Extract number from #C0001 format
-        try:
-            num = int(ultimo.numero.replace("#C", ""))
-            return f"#C{num + 1:04d}"
-        except:
-            return "#C0001"
+        return SequenciasManager(self.db).proximo('clientes')
 
     def criar(
         self,
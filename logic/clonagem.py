@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Cópia em bulk de registos com as suas linhas (orçamentos, boletins)
+
+Em vez de criar um objeto ORM por linha, as linhas originais são lidas só
+com as colunas (uma query por tabela, para todos os registos a copiar) e as
+cópias são inseridas com um INSERT (executemany) por tabela. Os ids novos são
+devolvidos pela ordem das linhas e as chaves estrangeiras das tabelas
+seguintes são remapeadas em memória:
+
+    itens = ler(session, OrcamentoItem, OrcamentoItem.orcamento_id.in_(ids))
+    novos_ids = inserir(session, OrcamentoItem, [
+        copiar(item, orcamento_id=mapa_orcamentos[item['orcamento_id']]) for item in itens
+    ])
+    mapa_itens = dict(zip((item['id'] for item in itens), novos_ids))
+
+O número de queries depende do número de tabelas, não do número de linhas.
+
+Os ids são atribuídos pela base de dados (INSERT ... RETURNING com
+sort_by_parameter_order, ex: PostgreSQL - as sequences ficam atualizadas). No
+SQLite esse INSERT passa a ser um por linha (não há forma de garantir a ordem
+dos ids de um INSERT com várias linhas), por isso os ids são atribuídos a
+seguir ao maior id da tabela, tal como faria o próprio SQLite.
+"""
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+
+def ler(db_session: Session, modelo, *criterios, ordem: Iterable = ()) -> List[Dict[str, Any]]:
+    """
+    Linhas de uma tabela como dicionários (sem passar pelo identity map)
+
+    Args:
+        db_session: SQLAlchemy database session
+        modelo: Classe do model (ex: OrcamentoItem)
+        *criterios: Filtros (ex: OrcamentoItem.orcamento_id.in_(ids))
+        ordem: Colunas de ordenação
+
+    Returns:
+        Lista de {coluna: valor}
+    """
+    query = select(modelo.__table__).where(*criterios).order_by(*ordem, modelo.id)
+    return [dict(linha) for linha in db_session.execute(query).mappings()]
+
+
+def copiar(linha: Dict[str, Any], **valores) -> Dict[str, Any]:
+    """
+    Cópia de uma linha sem o id, com valores substituídos
+
+    Args:
+        linha: Linha original (de ler())
+        **valores: Colunas a substituir (ex: chaves estrangeiras remapeadas)
+
+    Returns:
+        Dicionário pronto a inserir
+    """
+    copia = {coluna: valor for coluna, valor in linha.items() if coluna != 'id'}
+    copia.update(valores)
+    return copia
+
+
+def inserir(db_session: Session, modelo, linhas: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insere várias linhas num só INSERT e devolve os ids novos
+
+    Com RETURNING ordenado (ex: PostgreSQL) os ids vêm da sequence da tabela.
+    No SQLite (e noutras bases de dados sem RETURNING) são atribuídos a
+    seguir ao maior id da tabela: chamar dentro da transação da cópia - se
+    outra escrita usar os mesmos ids, o INSERT falha com IntegrityError e a
+    transação é revertida.
+
+    Args:
+        db_session: SQLAlchemy database session
+        modelo: Classe do model
+        linhas: Dicionários {coluna: valor}
+
+    Returns:
+        IDs das linhas inseridas, pela mesma ordem de linhas
+    """
+    if not linhas:
+        return []
+    tabela = modelo.__table__
+    # Core (não ORM): o bulk insert do ORM parte as linhas em vários INSERTs
+    # conforme as colunas a None
+    if _ids_pela_base_de_dados(db_session):
+        query = insert(tabela).returning(tabela.c.id, sort_by_parameter_order=True)
+        return list(db_session.execute(query, linhas).scalars())
+
+    ultimo_id = db_session.execute(select(func.max(modelo.id))).scalar() or 0
+    ids = list(range(ultimo_id + 1, ultimo_id + 1 + len(linhas)))
+    db_session.execute(insert(tabela), [dict(linha, id=novo_id) for linha, novo_id in zip(linhas, ids)])
+    return ids
+
+
+def _ids_pela_base_de_dados(db_session: Session) -> bool:
+    """True se a base de dados devolve os ids de um INSERT em bulk pela ordem das linhas"""
+    dialect = db_session.get_bind().dialect
+    return dialect.name != 'sqlite' and dialect.insert_executemany_returning_sort_by_parameter_order
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Query builder para ecrãs de listagem
+
+Os managers descrevem os filtros, colunas de pesquisa e ordenações da sua
+entidade (ex: ProjetosManager.consulta_lista()); o BaseScreen compila os
+chips de filtro, a pesquisa e a ordenação das colunas em WHERE / ORDER BY e
+carrega os dados por páginas (LIMIT/OFFSET), sem materializar a tabela toda.
+
+Exemplo:
+    consulta = manager.consulta_lista()
+    consulta.filtrar({'estado': [EstadoProjeto.PAGO]}).pesquisar("video")
+    consulta.ordenar('valor_sem_iva', 'desc')
+    projetos = consulta.pagina(200, offset=0)
+"""
+import logging
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import String, event, func, or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+
+from utils.texto import normalizar_pesquisa
+
+logger = logging.getLogger(__name__)
+
+# Engines com normalizar() registada no evento "checkout"
+_engines_registados = weakref.WeakSet()
+
+# Cache (por engine PostgreSQL) da existência da extensão unaccent
+_unaccent_disponivel = weakref.WeakKeyDictionary()
+
+
+def registar_funcoes_sql(engine: Engine) -> bool:
+    """
+    Regista a função SQL normalizar() (minúsculas, sem acentos) nas ligações SQLite
+
+    Permite que a pesquisa na BD ignore acentos como a pesquisa em memória
+    do BaseScreen. A função é criada uma vez por ligação, quando a ligação
+    sai do pool (evento "checkout"), pelo que existe em todas as ligações do
+    engine: as que já estavam no pool, as novas e as de sessões noutras
+    threads. Chamar ao criar o engine (main.py); ConsultaLista.pesquisar()
+    regista-a também se ainda não foi feito.
+
+    No PostgreSQL a pesquisa usa unaccent(lower(...)), da extensão unaccent
+    (migration 033); sem a extensão usa lower() e distingue letras com e sem
+    acento.
+
+    Args:
+        engine: Engine SQLAlchemy
+
+    Returns:
+        True se a pesquisa na BD ignora acentos
+    """
+    if engine.dialect.name == 'postgresql':
+        return _unaccent_instalado(engine)
+    if engine.dialect.name != 'sqlite':
+        return False
+    if engine not in _engines_registados:
+        event.listen(engine, "checkout", _criar_normalizar)
+        _engines_registados.add(engine)
+    return True
+
+
+def _criar_normalizar(dbapi_connection, connection_record, connection_proxy):
+    """Cria normalizar() numa ligação sqlite3 (uma vez por ligação)"""
+    if not connection_record.info.get('normalizar'):
+        dbapi_connection.create_function('normalizar', 1, normalizar_pesquisa, deterministic=True)
+        connection_record.info['normalizar'] = True
+
+
+def _unaccent_instalado(engine: Engine) -> bool:
+    """Verifica (uma vez por engine) se a extensão unaccent está instalada"""
+    if engine not in _unaccent_disponivel:
+        with engine.connect() as conn:
+            _unaccent_disponivel[engine] = conn.exec_driver_sql(
+                "SELECT 1 FROM pg_extension WHERE extname = 'unaccent'"
+            ).first() is not None
+        if not _unaccent_disponivel[engine]:
+            logger.warning("Extensão unaccent não instalada (migration 033): pesquisa distingue acentos")
+    return _unaccent_disponivel[engine]
+
+
+def _normalizacao_sql(query: Query) -> Callable:
+    """
+    Expressão SQL que põe uma coluna em minúsculas e sem acentos, como normalizar_pesquisa()
+
+    No SQLite garante normalizar() na ligação da query (e nas seguintes do
+    mesmo engine): a ligação da sessão atual já saiu do pool antes do registo
+    no engine e recebe a função diretamente.
+    """
+    connection = query.session.connection()
+    if connection.dialect.name == 'postgresql' and _unaccent_instalado(connection.engine):
+        return lambda coluna: func.unaccent(func.lower(coluna), type_=String)
+    if connection.dialect.name != 'sqlite':
+        return func.lower
+    if connection.engine not in _engines_registados:
+        registar_funcoes_sql(connection.engine)
+        connection.connection.driver_connection.create_function(
+            'normalizar', 1, normalizar_pesquisa, deterministic=True
+        )
+    return lambda coluna: func.normalizar(coluna, type_=String)
+
+
+class ConsultaLista:
+    """
+    Consulta de listagem com filtros, pesquisa, ordenação e paginação na BD
+    """
+
+    def __init__(
+        self,
+        query: Query,
+        chave,
+        filtros: Optional[Dict[str, Callable[[List[Any]], Any]]] = None,
+        ordenacoes: Optional[Dict[str, Sequence]] = None,
+        pesquisa: Sequence = (),
+        ordem_padrao: Sequence = ()
+    ):
+        """
+        Initialize query builder
+
+        Args:
+            query: Query base (com os joins necessários para filtros/ordenações)
+            chave: Coluna id da entidade (desempate na ordenação e ids_correspondentes)
+            filtros: {chave: função(valores) -> cláusula SQLAlchemy}
+            ordenacoes: {chave da coluna da tabela: [colunas SQL]}
+            pesquisa: Colunas de texto usadas na pesquisa
+            ordem_padrao: ORDER BY quando não há ordenação por coluna
+        """
+        self.query = query
+        self.chave = chave
+        self.filtros = filtros or {}
+        self.ordenacoes = ordenacoes or {}
+        self.colunas_pesquisa = list(pesquisa)
+        self.ordem_padrao = list(ordem_padrao)
+        self._ordem = None
+
+    def filtrar(self, filtros: Dict[str, List[Any]]) -> 'ConsultaLista':
+        """
+        Aplica filtros (valores da mesma chave em OR, chaves diferentes em AND)
+
+        Args:
+            filtros: {chave: [valor1, valor2, ...]}; listas vazias são ignoradas
+        """
+        for chave, valores in filtros.items():
+            if not valores:
+                continue
+            if chave not in self.filtros:
+                logger.warning(f"Filtro desconhecido ignorado: {chave}")
+                continue
+            clausula = self.filtros[chave](list(valores))
+            if clausula is not None:
+                self.query = self.query.filter(clausula)
+        return self
+
+    def pesquisar(self, texto: Optional[str]) -> 'ConsultaLista':
+        """
+        Pesquisa por texto: cada palavra (sem acentos) tem de aparecer numa das colunas
+
+        Args:
+            texto: Texto de pesquisa
+        """
+        termos = normalizar_pesquisa(texto).split()
+        if not termos or not self.colunas_pesquisa:
+            return self
+
+        normalizar = _normalizacao_sql(self.query)
+        colunas = [normalizar(coluna) for coluna in self.colunas_pesquisa]
+
+        for termo in termos:
+            self.query = self.query.filter(
+                or_(*[coluna.contains(termo, autoescape=True) for coluna in colunas])
+            )
+        return self
+
+    def ordenar(self, chave: Optional[str], direcao: Optional[str] = 'asc') -> 'ConsultaLista':
+        """
+        Ordena por uma coluna da tabela (chaves sem ordenação definida usam a ordem padrão)
+
+        Args:
+            chave: Chave da coluna (ex: 'valor_sem_iva') ou None
+            direcao: 'asc' ou 'desc'
+        """
+        colunas = self.ordenacoes.get(chave) if chave and direcao else None
+        if colunas is None:
+            self._ordem = None
+        else:
+            self._ordem = [coluna.desc() if direcao == 'desc' else coluna.asc() for coluna in colunas]
+        return self
+
+    def _query_ordenada(self) -> Query:
+        """Query com ORDER BY (id como desempate para páginas estáveis)"""
+        ordem = list(self._ordem) if self._ordem is not None else list(self.ordem_padrao)
+        ordem.append(self.chave.desc())
+        return self.query.order_by(*ordem)
+
+    def total(self) -> int:
+        """Número total de resultados (sem paginação)"""
+        return self.query.order_by(None).count()
+
+    def pagina(self, limite: int, offset: int = 0) -> List[Any]:
+        """
+        Devolve uma página de resultados
+
+        Args:
+            limite: Número máximo de resultados
+            offset: Resultados a saltar
+        """
+        return self._query_ordenada().limit(limite).offset(offset).all()
+
+    def todos(self) -> List[Any]:
+        """Devolve todos os resultados (ordenados)"""
+        return self._query_ordenada().all()
+
+    def ids_correspondentes(self, ids: Iterable[int]) -> Set[int]:
+        """
+        Dos ids indicados, devolve os que passam os filtros/pesquisa atuais
+
+        Args:
+            ids: Ids a verificar (ex: items acabados de alterar)
+        """
+        ids = list(ids)
+        if not ids:
+            return set()
+        linhas = self.query.order_by(None).with_entities(self.chave).filter(self.chave.in_(ids))
+        return {linha[0] for linha in linhas}
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Estatísticas do Dashboard
+
+Todos os contadores de projetos do dashboard saem de uma única query
+GROUP BY (tipo, owner, estado); os saldos vêm de
+SaldosCalculator.calcular_saldos_socios(). O resultado fica em cache até os
+projetos, despesas ou boletins mudarem (ver logic/versao_dados.py), por isso
+voltar ao dashboard vindo de outro ecrã não faz queries.
+"""
+from datetime import date
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database.models import Projeto, TipoProjeto, EstadoProjeto, Socio
+from logic.saldos import SaldosCalculator
+from logic.versao_dados import versao
+
+# Tabelas de que as estatísticas dependem
+TABELAS_DASHBOARD = ('projetos', 'despesas', 'boletins', 'boletim_linhas', 'saldo_movimentos')
+
+# Cache partilhado entre instâncias: {'chave': ..., 'dados': ...}
+_cache: Dict = {}
+
+
+class DashboardStatsService:
+    """
+    Calcula (e guarda em cache) os indicadores do dashboard
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize service
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db_session = db_session
+        self.calculator = SaldosCalculator(db_session)
+
+    def _chave_cache(self) -> tuple:
+        """Versão dos dados + BD + dia (os saldos dependem do ano/mês corrente)"""
+        return (
+            str(self.db_session.get_bind().url),
+            self.calculator.usar_ledger,
+            date.today(),
+            versao(*TABELAS_DASHBOARD),
+        )
+
+    def obter_estatisticas(self, forcar: bool = False) -> Dict:
+        """
+        Devolve os indicadores do dashboard (da cache se os dados não mudaram)
+
+        Args:
+            forcar: Ignorar a cache e recalcular
+
+        Returns:
+            Dict com:
+            - saldos: {Socio.BA: {...}, Socio.RR: {...}} (formato de calcular_saldos_socios)
+            - por_socio: {'BA': {'pessoais': n, 'empresa': n}, 'RR': {...}} (projetos pagos)
+            - projetos: {'total': n, 'recebidos': n, 'faturados': n, 'nao_faturados': n}
+        """
+        chave = self._chave_cache()
+        if not forcar and _cache.get('chave') == chave:
+            return _cache['dados']
+
+        dados = self._calcular()
+        _cache['chave'] = chave
+        _cache['dados'] = dados
+        return dados
+
+    def _calcular(self) -> Dict:
+        """Calcula os indicadores (1 query de contagens + queries dos saldos)"""
+        contagens = self.contar_projetos()
+
+        def contar(tipo: Optional[TipoProjeto] = None, owner: Optional[str] = None,
+                   estado: Optional[EstadoProjeto] = None) -> int:
+            return sum(
+                n for (t, o, e), n in contagens.items()
+                if (tipo is None or t == tipo)
+                and (owner is None or o == owner)
+                and (estado is None or e == estado)
+            )
+
+        pago = EstadoProjeto.PAGO
+        return {
+            'saldos': self.calculator.calcular_saldos_socios(),
+            'por_socio': {
+                socio: {
+                    'pessoais': contar(TipoProjeto.PESSOAL, socio, pago),
+                    'empresa': contar(TipoProjeto.EMPRESA, socio, pago),
+                }
+                for socio in (Socio.BA.value, Socio.RR.value)
+            },
+            'projetos': {
+                'total': contar(),
+                'recebidos': contar(estado=EstadoProjeto.PAGO),
+                'faturados': contar(estado=EstadoProjeto.FINALIZADO),
+                'nao_faturados': contar(estado=EstadoProjeto.ATIVO),
+            },
+        }
+
+    def contar_projetos(self) -> Dict[tuple, int]:
+        """
+        Conta os projetos por (tipo, owner, estado) numa única query
+
+        Returns:
+            Dict {(tipo, owner, estado): número de projetos}
+        """
+        linhas = self.db_session.query(
+            Projeto.tipo, Projeto.owner, Projeto.estado, func.count(Projeto.id)
+        ).group_by(Projeto.tipo, Projeto.owner, Projeto.estado).all()
+        return {(tipo, owner, estado): n for tipo, owner, estado, n in linhas}
+
+
+def invalidar_cache():
+    """Descarta as estatísticas em cache (ex: após alterações externas à BD)"""
+    _cache.clear()
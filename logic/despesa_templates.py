@@ -8,6 +8,7 @@ from sqlalchemy import desc
 from decimal import Decimal
 
 from database.models import DespesaTemplate, Fornecedor, Projeto, TipoDespesa
+from logic.sequencias import SequenciasManager
 
 
 class DespesaTemplatesManager:
@@ -61,24 +62,12 @@ class DespesaTemplatesManager:
 
     def gerar_proximo_numero(self) -> str:
         """
-        Gera próximo número de template
+        Gera próximo número de template (reservado na transação atual)
 
         Returns:
             Próximo número (ex: #TD000001, #TD000002, ...)
         """
-        ultimo = self.db_session.query(DespesaTemplate).order_by(
-            desc(DespesaTemplate.id)
-        ).first()
-
-        if not ultimo:
-            return "#TD000001"
-
-        # Extract number from #TD000001 format
-        try:
-            num = int(ultimo.numero.replace("#TD", ""))
-            return f"#TD{num + 1:06d}"
-        except:
-            return "#TD000001"
+        return SequenciasManager(self.db_session).proximo('despesa_templates')
 
     def criar(
         self,
@@ -3,13 +3,17 @@
 Lógica de gestão de Despesas (CRUD)
 """
 from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import desc, and_, select, insert, literal, union_all, true
 from datetime import date, datetime
 from decimal import Decimal
 from calendar import monthrange
 
 from database.models import Despesa, Fornecedor, Projeto, TipoDespesa, EstadoDespesa, DespesaTemplate
+from logic.saldo_movimentos import SaldoMovimentosManager, ORIGEM_DESPESA
+from logic.sequencias import SequenciasManager
+from logic.consulta_lista import ConsultaLista
+from logic.perfis_carregamento import aplicar_perfil
 
 
 class DespesasManager:
@@ -25,41 +29,82 @@ class DespesasManager:
             db_session: SQLAlchemy database session
         """
         self.db_session = db_session
+        self.ledger = SaldoMovimentosManager(db_session)
 
-    def listar_todas(self) -> List[Despesa]:
+    def _query(self, perfil: str = 'lista'):
+        """Query de Despesa com o perfil de carregamento indicado"""
+        return aplicar_perfil(self.db_session.query(Despesa), Despesa, perfil)
+
+    def listar_todas(self, perfil: str = 'lista') -> List[Despesa]:
         """
         Lista todas as despesas ordenadas por data (mais recentes primeiro)
 
+        Args:
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
+
         Returns:
             Lista de objetos Despesa
         """
-        return self.db_session.query(Despesa).order_by(desc(Despesa.data)).all()
+        return self._query(perfil).order_by(desc(Despesa.data)).all()
+
+    def consulta_lista(self) -> ConsultaLista:
+        """
+        Query builder para a listagem de despesas (filtros/ordenação/paginação na BD)
+
+        Filtros:
+            - 'tipo': [TipoDespesa, ...]
+            - 'estado': [EstadoDespesa, ...]
 
-    def listar_por_tipo(self, tipo: TipoDespesa) -> List[Despesa]:
+        Returns:
+            ConsultaLista ordenada por data (mais recentes primeiro)
+        """
+        return ConsultaLista(
+            self.db_session.query(Despesa)
+            .outerjoin(Fornecedor, Despesa.credor_id == Fornecedor.id)
+            .options(contains_eager(Despesa.credor)),
+            chave=Despesa.id,
+            filtros={
+                'tipo': lambda valores: Despesa.tipo.in_(valores),
+                'estado': lambda valores: Despesa.estado.in_(valores),
+            },
+            ordenacoes={
+                'numero': [Despesa.numero],
+                'data': [Despesa.data],
+                'credor_nome': [Fornecedor.nome],
+                'valor_com_iva_fmt': [Despesa.valor_com_iva],
+                'estado': [Despesa.estado],
+            },
+            pesquisa=[Despesa.numero, Despesa.descricao, Fornecedor.nome],
+            ordem_padrao=[desc(Despesa.data)]
+        )
+
+    def listar_por_tipo(self, tipo: TipoDespesa, perfil: str = 'lista') -> List[Despesa]:
         """
         Lista despesas por tipo
 
         Args:
             tipo: TipoDespesa enum
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de despesas do tipo especificado
         """
-        return self.db_session.query(Despesa).filter(
+        return self._query(perfil).filter(
             Despesa.tipo == tipo
         ).order_by(desc(Despesa.data)).all()
 
-    def listar_por_estado(self, estado: EstadoDespesa) -> List[Despesa]:
+    def listar_por_estado(self, estado: EstadoDespesa, perfil: str = 'lista') -> List[Despesa]:
         """
         Lista despesas por estado
 
         Args:
             estado: EstadoDespesa enum
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de despesas com o estado especificado
         """
-        return self.db_session.query(Despesa).filter(
+        return self._query(perfil).filter(
             Despesa.estado == estado
         ).order_by(desc(Despesa.data)).all()
 
@@ -110,18 +155,7 @@ class DespesasManager:
         """
         try:
             # Gerar número da despesa
-            ultima_despesa = self.db_session.query(Despesa).order_by(
-                desc(Despesa.id)
-            ).first()
-
-            if ultima_despesa:
-                # Extrair número (#D000001 -> 1)
-                ultimo_num = int(ultima_despesa.numero.replace('#D', ''))
-                novo_num = ultimo_num + 1
-            else:
-                novo_num = 1
-
-            numero = f"#D{novo_num:06d}"
+            numero = SequenciasManager(self.db_session).proximo('despesas')
 
             # Criar despesa
             despesa = Despesa(
@@ -140,6 +174,8 @@ class DespesasManager:
             )
 
             self.db_session.add(despesa)
+            self.db_session.flush()
+            self.ledger.sincronizar_despesa(despesa)
             self.db_session.commit()
             self.db_session.refresh(despesa)
 
@@ -199,6 +235,7 @@ class DespesasManager:
             if nota is not None:
                 despesa.nota = nota
 
+            self.ledger.sincronizar_despesa(despesa)
             self.db_session.commit()
             return True, None
 
@@ -221,6 +258,7 @@ class DespesasManager:
             if not despesa:
                 return False, "Despesa não encontrada"
 
+            self.ledger.remover_origem(ORIGEM_DESPESA, despesa.id)
             self.db_session.delete(despesa)
             self.db_session.commit()
             return True, None
@@ -247,7 +285,7 @@ class DespesasManager:
         """
         return self.db_session.query(Projeto).order_by(desc(Projeto.created_at)).all()
 
-    def filtrar_por_texto(self, search_text: str) -> List[Despesa]:
+    def filtrar_por_texto(self, search_text: str, perfil: str = 'lista') -> List[Despesa]:
         """
         Filtra despesas por texto de pesquisa (nome fornecedor ou descrição)
 
@@ -257,6 +295,7 @@ class DespesasManager:
 
         Args:
             search_text: Texto a pesquisar (mínimo 1 caracter)
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de despesas que correspondem à pesquisa
@@ -268,7 +307,7 @@ class DespesasManager:
         search_term = f"%{search_text.strip().lower()}%"
 
         # Query with JOIN to Fornecedor table
-        despesas = self.db_session.query(Despesa).outerjoin(
+        despesas = self._query(perfil).outerjoin(
             Fornecedor, Despesa.credor_id == Fornecedor.id
         ).filter(
             # Search in fornecedor.nome OR despesa.descricao (case-insensitive)
@@ -294,17 +333,7 @@ class DespesasManager:
                 return False, None, "Despesa não encontrada"
 
             # Gerar novo número
-            ultima_despesa = self.db_session.query(Despesa).order_by(
-                desc(Despesa.id)
-            ).first()
-
-            if ultima_despesa:
-                ultimo_num = int(ultima_despesa.numero.replace('#D', ''))
-                novo_num = ultimo_num + 1
-            else:
-                novo_num = 1
-
-            numero = f"#D{novo_num:06d}"
+            numero = SequenciasManager(self.db_session).proximo('despesas')
 
             # Criar cópia da despesa
             nova_despesa = Despesa(
@@ -323,6 +352,8 @@ class DespesasManager:
             )
 
             self.db_session.add(nova_despesa)
+            self.db_session.flush()
+            self.ledger.sincronizar_despesa(nova_despesa)
             self.db_session.commit()
             self.db_session.refresh(nova_despesa)
 
@@ -364,6 +395,7 @@ class DespesasManager:
                 # Se não for PAGO, limpar data_pagamento
                 despesa.data_pagamento = None
 
+            self.ledger.sincronizar_despesa(despesa)
             self.db_session.commit()
 
             return True, None
@@ -385,54 +417,108 @@ class DespesasManager:
         Returns:
             Tuple (quantidade_gerada, lista_de_erros)
         """
-        # Buscar todos os templates ativos
-        templates = self.db_session.query(DespesaTemplate).all()
-        geradas = 0
-        erros = []
-
-        for template in templates:
-            try:
-                # Verificar se já existe despesa gerada para este template neste mês
-                ja_existe = self.db_session.query(Despesa).filter(
-                    and_(
-                        Despesa.despesa_template_id == template.id,
-                        Despesa.data >= date(ano, mes, 1),
-                        Despesa.data < date(ano, mes + 1, 1) if mes < 12 else date(ano + 1, 1, 1)
-                    )
-                ).first()
-
-                if ja_existe:
-                    continue  # Já foi gerada para este mês
-
-                # Calcular a data correta (ajustar se o dia não existir no mês)
-                ultimo_dia_mes = monthrange(ano, mes)[1]
-                dia = min(template.dia_mes, ultimo_dia_mes)
-                data_despesa = date(ano, mes, dia)
-
-                # Criar a despesa baseada no template
-                sucesso, despesa, erro = self.criar(
-                    tipo=template.tipo,
-                    data=data_despesa,
-                    descricao=template.descricao,
-                    valor_sem_iva=template.valor_sem_iva,
-                    valor_com_iva=template.valor_com_iva,
-                    credor_id=template.credor_id,
-                    projeto_id=template.projeto_id,
-                    estado=EstadoDespesa.PENDENTE,
-                    data_pagamento=None,
-                    nota=f"Gerada automaticamente do template {template.numero}",
-                    despesa_template_id=template.id  # Rastrear o template
-                )
+        return self.gerar_despesas_recorrentes(date(ano, mes, 1), date(ano, mes, 1))
 
-                if sucesso:
-                    geradas += 1
-                else:
-                    erros.append(f"Erro ao gerar despesa do template {template.numero}: {erro}")
+    def gerar_despesas_recorrentes(
+        self,
+        data_inicio: date,
+        data_fim: date,
+        template_ids: Optional[List[int]] = None
+    ) -> Tuple[int, List[str]]:
+        """
+        Gera em bulk as despesas recorrentes em falta num intervalo de meses
 
-            except Exception as e:
-                erros.append(f"Erro ao processar template {template.numero}: {str(e)}")
+        Os pares (template, mês) em falta são obtidos numa única query (anti-join
+        templates × meses contra as despesas já geradas); os números #D são
+        alocados num bloco e todas as despesas são inseridas numa só transação.
 
-        return geradas, erros
+        Args:
+            data_inicio: Qualquer dia do primeiro mês
+            data_fim: Qualquer dia do último mês (inclusive)
+            template_ids: Limitar a estes templates (opcional, default todos)
+
+        Returns:
+            Tuple (quantidade_gerada, lista_de_erros)
+        """
+        meses = self._meses_entre(data_inicio, data_fim)
+        if not meses:
+            return 0, []
+
+        try:
+            # Tabela de meses: (ano, mes, primeiro dia, primeiro dia do mês seguinte)
+            tabela_meses = union_all(*[
+                select(
+                    literal(ano).label('ano'),
+                    literal(mes).label('mes'),
+                    literal(inicio).label('inicio'),
+                    literal(fim).label('fim')
+                )
+                for ano, mes, inicio, fim in meses
+            ]).subquery('meses')
+
+            # Anti-join: pares (template, mês) sem despesa gerada nesse mês
+            query = self.db_session.query(
+                DespesaTemplate, tabela_meses.c.ano, tabela_meses.c.mes
+            ).join(
+                tabela_meses, true()
+            ).outerjoin(
+                Despesa,
+                and_(
+                    Despesa.despesa_template_id == DespesaTemplate.id,
+                    Despesa.data >= tabela_meses.c.inicio,
+                    Despesa.data < tabela_meses.c.fim
+                )
+            ).filter(Despesa.id.is_(None))
+            if template_ids is not None:
+                query = query.filter(DespesaTemplate.id.in_(template_ids))
+            em_falta = query.order_by(tabela_meses.c.ano, tabela_meses.c.mes, DespesaTemplate.id).all()
+
+            if not em_falta:
+                return 0, []
+
+            # Bloco de números #D (uma única reserva)
+            numeros = SequenciasManager(self.db_session).reservar_bloco('despesas', len(em_falta))
+
+            despesas = []
+            for (template, ano, mes), numero in zip(em_falta, numeros):
+                # Ajustar o dia se não existir no mês (ex: 31 em fevereiro)
+                dia = min(template.dia_mes, monthrange(ano, mes)[1])
+                despesas.append({
+                    'numero': numero,
+                    'tipo': template.tipo,
+                    'data': date(ano, mes, dia),
+                    'credor_id': template.credor_id,
+                    'projeto_id': template.projeto_id,
+                    'descricao': template.descricao,
+                    'valor_sem_iva': template.valor_sem_iva,
+                    'valor_com_iva': template.valor_com_iva,
+                    'estado': EstadoDespesa.PENDENTE,
+                    'data_pagamento': None,
+                    'nota': f"Gerada automaticamente do template {template.numero}",
+                    'despesa_template_id': template.id  # Rastrear o template
+                })
+
+            # Um único INSERT executemany. As despesas geradas ficam PENDENTE,
+            # por isso não têm movimentos no ledger de saldos.
+            self.db_session.execute(insert(Despesa), despesas)
+            self.db_session.commit()
+
+            return len(despesas), []
+
+        except Exception as e:
+            self.db_session.rollback()
+            return 0, [f"Erro ao gerar despesas recorrentes: {str(e)}"]
+
+    @staticmethod
+    def _meses_entre(data_inicio: date, data_fim: date) -> List[Tuple[int, int, date, date]]:
+        """Meses de data_inicio a data_fim: [(ano, mes, primeiro dia, primeiro dia do mês seguinte)]"""
+        meses = []
+        ano, mes = data_inicio.year, data_inicio.month
+        while (ano, mes) <= (data_fim.year, data_fim.month):
+            seguinte = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+            meses.append((ano, mes, date(ano, mes, 1), date(seguinte[0], seguinte[1], 1)))
+            ano, mes = seguinte
+        return meses
 
     def verificar_e_gerar_recorrentes_pendentes(self) -> Tuple[int, List[str]]:
         """
@@ -5,6 +5,7 @@ Lógica de negócio para Equipamento
 from sqlalchemy.orm import Session
 from database.models.equipamento import Equipamento
 from typing import List, Optional, Tuple
+from logic.sequencias import SequenciasManager
 from datetime import date
 from decimal import Decimal
 
@@ -94,6 +95,9 @@ class EquipamentoManager:
                 **kwargs
             )
 
+            # Números atribuídos manualmente avançam a sequência
+            SequenciasManager(self.db).registar('equipamento', numero)
+
             self.db.add(equipamento)
             self.db.commit()
             self.db.refresh(equipamento)
@@ -161,22 +165,13 @@ class EquipamentoManager:
         """
         Gera próximo número de equipamento
 
+        O número fica reservado na transação atual: é confirmado pelo commit
+        de criar_equipamento() e libertado se a criação falhar.
+
         Returns:
             Próximo número disponível (ex: #E0028)
         """
-        # Obter último número
-        ultimo = self.db.query(Equipamento).order_by(Equipamento.numero.desc()).first()
-
-        if not ultimo:
-            return "#E0001"
-
-        # Extrair número e incrementar
-        try:
-            numero_atual = int(ultimo.numero.replace("#E", ""))
-            proximo = numero_atual + 1
-            return f"#E{proximo:04d}"
-        except:
-            return "#E0001"
+        return SequenciasManager(self.db).proximo('equipamento')
 
     def obter_tipos(self) -> List[str]:
         """Obtém lista de tipos de equipamento únicos"""
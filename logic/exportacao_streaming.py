@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação em streaming para relatórios grandes (Excel e PDF)
+
+- Excel: FolhaStreaming escreve as linhas à medida que chegam num workbook
+  openpyxl write-only. A formatação vem de estilos nomeados registados uma
+  vez por workbook (ESTILOS_EXCEL), em vez de Font/PatternFill por célula.
+- PDF: FlowablesStreaming alimenta o doc.build() do reportlab a partir de um
+  gerador. tabelas_pdf() parte as linhas em tabelas pequenas e
+  desenhar_cabecalho_tabela() repete o cabeçalho das colunas no topo das
+  páginas seguintes.
+
+A memória usada fica limitada a um lote de linhas (o resto do relatório
+está no ficheiro), e o tempo cresce de forma linear com o número de
+linhas: o reportlab nunca parte uma tabela gigante.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+
+# Linhas por tabela nos PDFs (cada tabela é partida no máximo uma vez)
+LINHAS_POR_TABELA_PDF = 40
+
+
+def _preenchimento(cor: str) -> PatternFill:
+    return PatternFill(start_color=cor, end_color=cor, fill_type="solid")
+
+
+# Estilos nomeados dos relatórios: nome → argumentos de NamedStyle
+ESTILOS_EXCEL: Dict[str, Dict[str, Any]] = {
+    'rel_titulo': {
+        'font': Font(size=18, bold=True, color="2196F3"),
+        'alignment': Alignment(horizontal='center', vertical='center'),
+    },
+    'rel_periodo': {'font': Font(size=11, color="666666"), 'alignment': Alignment(horizontal='center')},
+    'rel_gerado': {'font': Font(size=10, color="999999"), 'alignment': Alignment(horizontal='center')},
+    'rel_resumo': {
+        'font': Font(size=11, bold=True),
+        'fill': _preenchimento("E3F2FD"),
+        'alignment': Alignment(horizontal='center'),
+    },
+    'rel_socio': {
+        'font': Font(size=14, bold=True),
+        'fill': _preenchimento("E3F2FD"),
+        'alignment': Alignment(horizontal='center'),
+    },
+    'rel_saldo': {
+        'font': Font(size=16, bold=True, color="1976D2"),
+        'fill': _preenchimento("BBDEFB"),
+        'alignment': Alignment(horizontal='center', vertical='center'),
+    },
+    'rel_seccao': {
+        'font': Font(size=13, bold=True, color="1976D2"),
+        'fill': _preenchimento("E3F2FD"),
+        'alignment': Alignment(horizontal='center'),
+    },
+    'rel_ins': {'font': Font(bold=True, color="FFFFFF"), 'fill': _preenchimento("4CAF50")},
+    'rel_ins_total': {'font': Font(bold=True), 'fill': _preenchimento("E8F5E9")},
+    'rel_ins_total_valor': {
+        'font': Font(bold=True),
+        'fill': _preenchimento("E8F5E9"),
+        'alignment': Alignment(horizontal='right'),
+    },
+    'rel_outs': {'font': Font(bold=True, color="FFFFFF"), 'fill': _preenchimento("F44336")},
+    'rel_outs_total': {'font': Font(bold=True), 'fill': _preenchimento("FFEBEE")},
+    'rel_outs_total_valor': {
+        'font': Font(bold=True),
+        'fill': _preenchimento("FFEBEE"),
+        'alignment': Alignment(horizontal='right'),
+    },
+    'rel_detalhe': {
+        'font': Font(size=11, bold=True, color="FFFFFF"),
+        'fill': _preenchimento("424242"),
+        'alignment': Alignment(horizontal='left'),
+    },
+    'rel_colunas': {'font': Font(bold=True), 'fill': _preenchimento("BDBDBD")},
+    'rel_cabecalho_projetos': {
+        'font': Font(bold=True, color="FFFFFF"),
+        'fill': _preenchimento("9C27B0"),
+        'alignment': Alignment(horizontal='center'),
+    },
+    'rel_cabecalho_despesas': {
+        'font': Font(bold=True, color="FFFFFF"),
+        'fill': _preenchimento("F44336"),
+        'alignment': Alignment(horizontal='center'),
+    },
+    'rel_texto': {},
+    'rel_valor': {'alignment': Alignment(horizontal='right')},
+    'rel_texto_alt': {'fill': _preenchimento("F5F5F5")},
+    'rel_valor_alt': {'fill': _preenchimento("F5F5F5"), 'alignment': Alignment(horizontal='right')},
+}
+
+
+class FolhaStreaming:
+    """
+    Folha de um workbook openpyxl write-only, escrita linha a linha
+
+    As larguras das colunas têm de ser definidas antes da primeira linha
+    (limitação do modo write-only); as células fundidas e as alturas de
+    linha são registadas à medida que as linhas são escritas.
+    """
+
+    def __init__(self, workbook: Workbook, titulo: str, larguras: Dict[str, float]):
+        self.ws = workbook.create_sheet(titulo)
+        for coluna, largura in larguras.items():
+            self.ws.column_dimensions[coluna].width = largura
+        self.linha_atual = 0
+
+    def linha(self, valores: Sequence[Any], estilos: Sequence[Optional[str]] = (),
+              fundir: Optional[str] = None, altura: Optional[float] = None):
+        """
+        Escreve uma linha
+
+        Args:
+            valores: Valores das células (a partir da coluna A)
+            estilos: Estilo nomeado de cada célula (None = sem estilo)
+            fundir: Última coluna a fundir com a coluna A (ex: 'H')
+            altura: Altura da linha (opcional)
+        """
+        self.linha_atual += 1
+        if altura:
+            self.ws.row_dimensions[self.linha_atual].height = altura
+
+        celulas = []
+        for indice, valor in enumerate(valores):
+            celula = WriteOnlyCell(self.ws, value=valor)
+            estilo = estilos[indice] if indice < len(estilos) else None
+            if estilo:
+                celula.style = estilo
+            celulas.append(celula)
+        self.ws.append(celulas)
+
+        if fundir:
+            self.ws.merged_cells.add(f"A{self.linha_atual}:{fundir}{self.linha_atual}")
+
+    def vazia(self, n: int = 1):
+        """Escreve n linhas vazias"""
+        for _ in range(n):
+            self.linha_atual += 1
+            self.ws.append([])
+
+    def cabecalho_relatorio(self, report_data: Dict[str, Any], ultima_coluna: str):
+        """Título, período e data de geração (fundidos até ultima_coluna)"""
+        self.linha([report_data['titulo']], ['rel_titulo'], fundir=ultima_coluna)
+        if report_data['periodo']:
+            self.linha([report_data['periodo']], ['rel_periodo'], fundir=ultima_coluna)
+        self.linha([f"Gerado em: {report_data['data_geracao']}"], ['rel_gerado'], fundir=ultima_coluna)
+        self.vazia()
+
+    def tabela(self, linhas: Iterable[Sequence[Any]], estilos: Sequence[str], estilos_alt: Sequence[str]):
+        """Escreve as linhas de uma tabela, alternando o fundo nas linhas pares"""
+        for valores in linhas:
+            par = (self.linha_atual + 1) % 2 == 0
+            self.linha(valores, estilos_alt if par else estilos)
+
+
+def criar_workbook() -> Workbook:
+    """Workbook write-only com os estilos nomeados dos relatórios registados"""
+    workbook = Workbook(write_only=True)
+    for nome, atributos in ESTILOS_EXCEL.items():
+        # Sem fonte própria, manter a fonte por omissão do workbook
+        atributos = {'font': Font(name="Calibri", size=11), **atributos}
+        workbook.add_named_style(NamedStyle(name=nome, **atributos))
+    return workbook
+
+
+class FlowablesStreaming(list):
+    """
+    Lista de flowables alimentada por um gerador, para doc.build()
+
+    O reportlab consome a lista pela frente (len(), [0], del [0]); o próximo
+    flowable só é pedido ao gerador quando a lista fica vazia, por isso o
+    documento nunca está todo em memória.
+    """
+
+    def __init__(self, flowables: Iterable[Any]):
+        super().__init__()
+        self._gerador = iter(flowables)
+
+    def __len__(self):
+        if not super().__len__():
+            proximo = next(self._gerador, None)
+            if proximo is not None:
+                self.append(proximo)
+        return super().__len__()
+
+
+def tabelas_pdf(linhas: Iterable[List[Any]], col_widths: Sequence[float], estilo: List[tuple],
+                linhas_por_tabela: int = LINHAS_POR_TABELA_PDF) -> Iterator[Any]:
+    """
+    Parte as linhas de uma tabela em tabelas pequenas (sem cabeçalho)
+
+    Args:
+        linhas: Linhas da tabela (gerador)
+        col_widths: Larguras das colunas
+        estilo: Comandos de TableStyle aplicados a cada tabela
+        linhas_por_tabela: Linhas por tabela (par, para manter as cores alternadas)
+
+    Yields:
+        Table com até linhas_por_tabela linhas
+    """
+    from reportlab.platypus import Table, TableStyle
+
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= linhas_por_tabela:
+            tabela = Table(bloco, colWidths=col_widths)
+            tabela.setStyle(TableStyle(estilo))
+            yield tabela
+            bloco = []
+    if bloco:
+        tabela = Table(bloco, colWidths=col_widths)
+        tabela.setStyle(TableStyle(estilo))
+        yield tabela
+
+
+def desenhar_cabecalho_tabela(cabecalho: List[str], col_widths: Sequence[float], estilo: List[tuple]):
+    """
+    Callback onLaterPages que desenha o cabeçalho das colunas na margem superior
+
+    As tabelas de tabelas_pdf() não têm cabeçalho; a primeira página tem-no
+    na história do documento e as seguintes recebem-no daqui.
+    """
+    from reportlab.platypus import Table, TableStyle
+
+    def desenhar(canvas, doc):
+        tabela = Table([cabecalho], colWidths=col_widths)
+        tabela.setStyle(TableStyle(estilo))
+        largura, altura = tabela.wrapOn(canvas, doc.width, doc.topMargin)
+        x = doc.leftMargin + (doc.width - largura) / 2
+        y = doc.pagesize[1] - doc.topMargin
+        canvas.saveState()
+        tabela.drawOn(canvas, x, y)
+        canvas.restoreState()
+
+    return desenhar
@@ -7,6 +7,8 @@ from sqlalchemy import desc
 from database.models import Fornecedor, EstatutoFornecedor
 from typing import List, Tuple, Optional
 from datetime import datetime
+from logic.perfis_carregamento import aplicar_perfil
+from logic.sequencias import SequenciasManager
 
 
 class FornecedoresManager:
@@ -23,18 +25,23 @@ class FornecedoresManager:
         """
         self.db = db_session
 
-    def listar_todos(self, estatuto: Optional[EstatutoFornecedor] = None, order_by: str = 'numero') -> List[Fornecedor]:
+    def _query(self, perfil: str = 'lista'):
+        """Query de Fornecedor com o perfil de carregamento indicado"""
+        return aplicar_perfil(self.db.query(Fornecedor), Fornecedor, perfil)
+
+    def listar_todos(self, estatuto: Optional[EstatutoFornecedor] = None, order_by: str = 'numero', perfil: str = 'lista') -> List[Fornecedor]:
         """
         List all fornecedores
 
         Args:
             estatuto: Filter by estatuto (optional)
             order_by: Field to order by (numero, nome, estatuto, area)
+            perfil: Eager-loading profile (see logic/perfis_carregamento.py)
 
         Returns:
             List of Fornecedor objects
         """
-        query = self.db.query(Fornecedor)
+        query = self._query(perfil)
 
         # Filter by estatuto if provided
         if estatuto:
@@ -52,14 +59,17 @@ class FornecedoresManager:
 
         return query.all()
 
-    def listar_ativos(self) -> List[Fornecedor]:
+    def listar_ativos(self, perfil: str = 'lista') -> List[Fornecedor]:
         """
         List all fornecedores (fornecedores don't have active/inactive status)
 
+        Args:
+            perfil: Eager-loading profile (see logic/perfis_carregamento.py)
+
         Returns:
             List of all Fornecedor objects ordered by name
         """
-        return self.db.query(Fornecedor).order_by(Fornecedor.nome).all()
+        return self._query(perfil).order_by(Fornecedor.nome).all()
 
     def buscar_por_id(self, fornecedor_id: int) -> Optional[Fornecedor]:
         """
@@ -85,18 +95,19 @@ class FornecedoresManager:
         """
         return self.db.query(Fornecedor).filter(Fornecedor.numero == numero).first()
 
-    def pesquisar(self, termo: str) -> List[Fornecedor]:
+    def pesquisar(self, termo: str, perfil: str = 'lista') -> List[Fornecedor]:
         """
         Search fornecedores by nome, NIF, area, funcao, or email
 
         Args:
             termo: Search term
+            perfil: Eager-loading profile (see logic/perfis_carregamento.py)
 
         Returns:
             List of matching Fornecedor objects
         """
         termo_like = f"%{termo}%"
-        return self.db.query(Fornecedor).filter(
+        return self._query(perfil).filter(
             (Fornecedor.nome.ilike(termo_like)) |
             (Fornecedor.nif.ilike(termo_like)) |
             (Fornecedor.area.ilike(termo_like)) |
@@ -106,22 +117,12 @@ class FornecedoresManager:
 
     def gerar_proximo_numero(self) -> str:
         """
-        Generate next fornecedor numero
+        Generate next fornecedor numero (reserved in the current transaction)
 
         Returns:
             Next numero (e.g., #F0001, #F0002, ...)
         """
-        ultimo = self.db.query(Fornecedor).order_by(desc(Fornecedor.numero)).first()
-
-        if not ultimo:
-            return "#F0001"
-
-        # Extract number from #F0001 format
-        try:
-            num = int(ultimo.numero.replace("#F", ""))
-            return f"#F{num + 1:04d}"
-        except:
-            return "#F0001"
+        return SequenciasManager(self.db).proximo('fornecedores')
 
     def criar(
         self,
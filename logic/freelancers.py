@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from database.models import Freelancer
 from typing import List, Tuple, Optional
+from logic.sequencias import SequenciasManager
 
 
 class FreelancersManager:
@@ -104,24 +105,12 @@ class FreelancersManager:
 
     def gerar_proximo_numero(self) -> str:
         """
-        Generate next freelancer numero
+        Generate next freelancer numero (reserved in the current transaction)
 
         Returns:
             Next numero (e.g., #F0001, #F0002, ...)
         """
-        ultimo = self.db.query(Freelancer).order_by(desc(Freelancer.numero)).first()
-
-        if not ultimo:
-            return "#F0001"
-
-        # Extract number from #F0001 format
-        try:
-            numero_str = ultimo.numero.replace('#F', '')
-            numero_int = int(numero_str)
-            proximo = numero_int + 1
-            return f"#F{proximo:04d}"
-        except (ValueError, AttributeError):
-            return "#F0001"
+        return SequenciasManager(self.db).proximo('freelancers')
 
     def criar(self, nome: str, nif: str = None, email: str = None, telefone: str = None,
               iban: str = None, morada: str = None, especialidade: str = None,
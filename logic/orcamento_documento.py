@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+Modelo em memória de um orçamento, editado pelo formulário
+
+O formulário altera o DocumentoOrcamento em vez da base de dados: cada
+alteração recalcula o total da linha e aplica a diferença aos totais que
+dependem dela (TotaisOrcamento: subtotal da secção ou do grupo, TOTAL
+CLIENTE/EMPRESA, total do beneficiário), sem queries. As linhas alteradas
+ficam marcadas e gravar() escreve-as todas numa única transação, com um
+UPDATE em bulk por chave primária:
+
+    documento = DocumentoOrcamento(session, orcamento_id)
+    rep = documento.ajustar_percentagem(rep_id, Decimal('0.0001'))
+    ...atualizar apenas as labels de rep, do grupo e do beneficiário...
+    sucesso, erro = documento.gravar()   # ex: após um intervalo sem alterações
+
+Criar e eliminar linhas continua a ser feito pelos dialogs e pelo
+OrcamentoManager; depois disso o documento é recarregado (recarregar()).
+
+Se o orçamento já foi lido com OrcamentoManager.carregar_documento(), o
+documento pode ser criado a partir dele sem novas queries:
+
+    orcamento = manager.carregar_documento(orcamento_id)
+    documento = DocumentoOrcamento(session, orcamento_id, orcamento)
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from database.models.orcamento import Orcamento, OrcamentoSecao, OrcamentoItem, OrcamentoReparticao
+from logic.clonagem import ler
+from logic.orcamento_totais import TotaisOrcamento, arredondar
+
+PERCENTAGEM_MIN = Decimal('0')
+PERCENTAGEM_MAX = Decimal('100')
+CASAS_PERCENTAGEM = Decimal('0.0001')
+
+
+class LinhaDocumento:
+    """
+    Cópia em memória de uma linha do orçamento
+
+    Tem os mesmos atributos que a linha da base de dados (as colunas do
+    modelo), por isso pode ser passada aos métodos de renderização e aos
+    dialogs no lugar do objeto ORM.
+    """
+
+    modelo = None  # Classe ORM da linha
+
+    def __init__(self, valores: Dict[str, Any]):
+        for coluna in self.modelo.__table__.columns:
+            setattr(self, coluna.key, valores.get(coluna.key))
+        self.alterados: Set[str] = set()
+
+    @property
+    def suja(self) -> bool:
+        """Tem alterações ainda não gravadas"""
+        return bool(self.alterados)
+
+    def calcular_total(self) -> Decimal:
+        """Total da linha com as regras do modelo, arredondado ao cêntimo"""
+        return arredondar(self.modelo.calcular_total(self))
+
+    def atribuir(self, **campos) -> Decimal:
+        """
+        Altera campos da linha e recalcula o total
+
+        Args:
+            **campos: Colunas a alterar (ex: percentagem=Decimal('5.0001'))
+
+        Returns:
+            Diferença no total da linha (novo - anterior)
+        """
+        colunas = self.modelo.__table__.columns
+        for campo, valor in campos.items():
+            if campo not in colunas or campo in ('id', 'orcamento_id', 'total'):
+                raise ValueError(f"Campo não editável: {campo}")
+            if getattr(self, campo) != valor:
+                setattr(self, campo, valor)
+                self.alterados.add(campo)
+
+        total_anterior = self.total or Decimal('0')
+        self.total = self.calcular_total()
+        if self.total != total_anterior:
+            self.alterados.add('total')
+        return self.total - total_anterior
+
+
+class ItemDocumento(LinhaDocumento):
+    """Item do LADO CLIENTE"""
+
+    modelo = OrcamentoItem
+
+
+class ReparticaoDocumento(LinhaDocumento):
+    """Repartição do LADO EMPRESA"""
+
+    modelo = OrcamentoReparticao
+
+
+class SecaoDocumento:
+    """Secção do LADO CLIENTE com os seus items"""
+
+    def __init__(self, valores: Dict[str, Any]):
+        self.id = valores['id']
+        self.tipo = valores['tipo']
+        self.nome = valores['nome']
+        self.ordem = valores['ordem']
+        self.parent_id = valores['parent_id']
+        self.itens: List[ItemDocumento] = []
+
+
+class DocumentoOrcamento:
+    """
+    Secções, items e repartições de um orçamento, com totais mantidos em memória
+
+    Os totais (self.totais) são calculados uma vez ao carregar e depois
+    atualizados com a diferença de cada linha alterada.
+    """
+
+    def __init__(self, db_session: Session, orcamento_id: int, orcamento: Optional[Orcamento] = None):
+        self.db = db_session
+        self.orcamento_id = orcamento_id
+        self.recarregar(orcamento)
+
+    def recarregar(self, orcamento: Optional[Orcamento] = None):
+        """
+        Lê o orçamento da base de dados (descarta alterações não gravadas)
+
+        Args:
+            orcamento: Orçamento já carregado com OrcamentoManager.carregar_documento()
+                (as linhas são copiadas dele, sem queries); se None, lê da DB
+        """
+        if orcamento is not None:
+            secoes = [self._copiar(s) for s in orcamento.secoes]
+            itens = [self._copiar(i) for i in orcamento.itens]
+            reparticoes = [self._copiar(r) for r in orcamento.reparticoes]
+        else:
+            secoes = self._ler(OrcamentoSecao, OrcamentoSecao.ordem)
+            itens = self._ler(OrcamentoItem, OrcamentoItem.ordem)
+            reparticoes = self._ler(OrcamentoReparticao, OrcamentoReparticao.ordem)
+
+        self.secoes: Dict[int, SecaoDocumento] = {linha['id']: SecaoDocumento(linha) for linha in secoes}
+        self.itens: Dict[int, ItemDocumento] = {linha['id']: ItemDocumento(linha) for linha in itens}
+        self.reparticoes: Dict[int, ReparticaoDocumento] = {
+            linha['id']: ReparticaoDocumento(linha) for linha in reparticoes
+        }
+
+        for item in self.itens.values():
+            secao = self.secoes.get(item.secao_id)
+            if secao:
+                secao.itens.append(item)
+
+        self.totais = TotaisOrcamento.calcular(self.itens.values(), self.reparticoes.values())
+
+    def _ler(self, modelo, ordem) -> List[Dict[str, Any]]:
+        """Linhas de uma tabela do orçamento (sem passar pelo identity map)"""
+        return ler(self.db, modelo, modelo.orcamento_id == self.orcamento_id, ordem=[ordem])
+
+    @staticmethod
+    def _copiar(objeto) -> Dict[str, Any]:
+        """Valores das colunas de um objeto ORM já carregado"""
+        return {coluna.key: getattr(objeto, coluna.key) for coluna in objeto.__table__.columns}
+
+    # ==================== Consulta ====================
+
+    @property
+    def total_cliente(self) -> Decimal:
+        return self.totais.total_cliente
+
+    @property
+    def total_empresa(self) -> Decimal:
+        return self.totais.total_empresa
+
+    @property
+    def totais_beneficiario(self) -> Dict[str, Decimal]:
+        return self.totais.totais_beneficiario
+
+    def subtotal_secao(self, secao_id: int) -> Decimal:
+        return self.totais.subtotal_secao(secao_id)
+
+    def secao_por_tipo(self, tipo: str) -> Optional[SecaoDocumento]:
+        """Primeira secção do tipo indicado (ex: 'servicos')"""
+        return next((s for s in self.secoes.values() if s.tipo == tipo), None)
+
+    def reparticoes_por_tipo(self) -> Dict[str, List[ReparticaoDocumento]]:
+        """Repartições agrupadas por tipo, pela ordem de apresentação"""
+        grupos: Dict[str, List[ReparticaoDocumento]] = {}
+        for rep in self.reparticoes.values():
+            grupos.setdefault(rep.tipo, []).append(rep)
+        return grupos
+
+    def subtotal_grupo(self, tipo: str) -> Decimal:
+        return self.totais.subtotal_grupo(tipo)
+
+    def verificar_totais(self) -> List[str]:
+        """Diferenças entre os totais mantidos e um cálculo completo (vazia se coincidem)"""
+        return self.totais.verificar(self.itens.values(), self.reparticoes.values())
+
+    @property
+    def tem_alteracoes(self) -> bool:
+        """Há linhas alteradas ainda não gravadas"""
+        return any(l.suja for l in (*self.itens.values(), *self.reparticoes.values()))
+
+    # ==================== Edição ====================
+
+    def alterar_item(self, item_id: int, **campos) -> Optional[ItemDocumento]:
+        """
+        Altera um item CLIENTE em memória
+
+        Args:
+            item_id: ID do item
+            **campos: Colunas a alterar
+
+        Returns:
+            O item alterado, ou None se não existir
+        """
+        item = self.itens.get(item_id)
+        if not item:
+            return None
+
+        secao_anterior = self.secoes.get(item.secao_id)
+        self.totais.remover_item(item)
+        item.atribuir(**campos)
+        self.totais.adicionar_item(item)
+
+        secao = self.secoes.get(item.secao_id)
+        if secao is not secao_anterior:
+            if secao_anterior:
+                secao_anterior.itens.remove(item)
+            if secao:
+                secao.itens.append(item)
+        return item
+
+    def alterar_reparticao(self, reparticao_id: int, **campos) -> Optional[ReparticaoDocumento]:
+        """
+        Altera uma repartição EMPRESA em memória
+
+        Args:
+            reparticao_id: ID da repartição
+            **campos: Colunas a alterar
+
+        Returns:
+            A repartição alterada, ou None se não existir
+        """
+        rep = self.reparticoes.get(reparticao_id)
+        if not rep:
+            return None
+
+        self.totais.remover_reparticao(rep)
+        rep.atribuir(**campos)
+        self.totais.adicionar_reparticao(rep)
+        return rep
+
+    def definir_percentagem(self, reparticao_id: int, percentagem: Decimal) -> Optional[ReparticaoDocumento]:
+        """
+        Define a percentagem de uma comissão (limitada a 0-100, 4 casas decimais)
+
+        Returns:
+            A comissão alterada, ou None se não existir ou não for comissão
+        """
+        rep = self.reparticoes.get(reparticao_id)
+        if not rep or rep.tipo != 'comissao':
+            return None
+        percentagem = min(max(Decimal(percentagem), PERCENTAGEM_MIN), PERCENTAGEM_MAX)
+        return self.alterar_reparticao(reparticao_id, percentagem=percentagem.quantize(CASAS_PERCENTAGEM))
+
+    def ajustar_percentagem(self, reparticao_id: int, incremento: Decimal) -> Optional[ReparticaoDocumento]:
+        """
+        Soma incremento à percentagem de uma comissão (setas ▲▼)
+
+        Returns:
+            A comissão alterada, ou None se não existir ou não for comissão
+        """
+        rep = self.reparticoes.get(reparticao_id)
+        if not rep or rep.tipo != 'comissao':
+            return None
+        return self.definir_percentagem(reparticao_id, (rep.percentagem or Decimal('0')) + Decimal(incremento))
+
+    # ==================== Persistência ====================
+
+    def gravar(self) -> Tuple[bool, Optional[str]]:
+        """
+        Grava as linhas alteradas numa única transação
+
+        Cada tabela recebe um UPDATE em bulk por chave primária com as colunas
+        alteradas; se algum item CLIENTE mudou, o valor_total do orçamento é
+        atualizado na mesma transação.
+
+        Returns:
+            (sucesso, mensagem_erro)
+        """
+        sujas = [l for l in (*self.itens.values(), *self.reparticoes.values()) if l.suja]
+        if not sujas:
+            return True, None
+
+        try:
+            for modelo in (OrcamentoItem, OrcamentoReparticao):
+                linhas = [l for l in sujas if l.modelo is modelo]
+                if not linhas:
+                    continue
+                colunas = set().union(*(l.alterados for l in linhas))
+                self.db.execute(update(modelo), [
+                    {'id': l.id, **{coluna: getattr(l, coluna) for coluna in colunas}}
+                    for l in linhas
+                ])
+
+            if any(l.modelo is OrcamentoItem for l in sujas):
+                self.db.execute(
+                    update(Orcamento)
+                    .where(Orcamento.id == self.orcamento_id)
+                    .values(valor_total=self.total_cliente, updated_at=datetime.now())
+                )
+
+            self.db.commit()
+
+        except Exception as e:
+            self.db.rollback()
+            return False, str(e)
+
+        for linha in sujas:
+            linha.alterados.clear()
+        return True, None
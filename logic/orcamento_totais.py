@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Totais de um orçamento mantidos por diferenças
+
+TotaisOrcamento guarda os subtotais por secção (LADO CLIENTE), por grupo
+(tipo de repartição, LADO EMPRESA), os totais por beneficiário e o TOTAL
+CLIENTE/EMPRESA. Alterar uma linha custa O(1): retira-se a contribuição
+antiga e soma-se a nova, sem voltar a percorrer (nem a ler da DB) as
+restantes linhas:
+
+    totais = TotaisOrcamento.calcular(itens, reparticoes)
+    totais.remover_reparticao(rep)
+    rep.percentagem += Decimal('0.0001')
+    rep.total = arredondar(rep.calcular_total())
+    totais.adicionar_reparticao(rep)
+
+verificar() compara os totais mantidos com um cálculo completo a partir
+das linhas (usado nos testes e para detetar desvios).
+
+Os totais das linhas são arredondados ao cêntimo com arredondar(), tal
+como ficam gravados na DB (Numeric(10, 2)), para que a soma em memória
+coincida com a soma das linhas gravadas.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List
+
+CENTIMO = Decimal('0.01')
+
+
+def arredondar(valor: Any) -> Decimal:
+    """Arredonda um total ao cêntimo (como é gravado na DB)"""
+    return Decimal(valor or 0).quantize(CENTIMO)
+
+
+class TotaisOrcamento:
+    """
+    Subtotais e totais de um orçamento
+
+    Os dicionários só têm chaves com pelo menos uma linha: um beneficiário
+    ou grupo deixa de aparecer quando a sua última linha é removida.
+    """
+
+    def __init__(self):
+        self.total_cliente = Decimal('0')
+        self.total_empresa = Decimal('0')
+        self.subtotais_secao: Dict[int, Decimal] = {}
+        self.subtotais_grupo: Dict[str, Decimal] = {}
+        self.totais_beneficiario: Dict[str, Decimal] = {}
+        # Número de linhas por chave (para retirar chaves vazias)
+        self._linhas: Dict[tuple, int] = {}
+
+    @classmethod
+    def calcular(cls, itens: Iterable[Any], reparticoes: Iterable[Any]) -> 'TotaisOrcamento':
+        """
+        Cálculo completo a partir das linhas
+
+        Args:
+            itens: Items CLIENTE (com secao_id e total)
+            reparticoes: Repartições EMPRESA (com tipo, beneficiario e total)
+
+        Returns:
+            TotaisOrcamento com todas as linhas somadas
+        """
+        totais = cls()
+        for item in itens:
+            totais.adicionar_item(item)
+        for rep in reparticoes:
+            totais.adicionar_reparticao(rep)
+        return totais
+
+    def _somar(self, totais: Dict, chave: Any, valor: Decimal, sinal: int):
+        contagem = (id(totais), chave)
+        linhas = self._linhas.get(contagem, 0) + sinal
+        if linhas:
+            self._linhas[contagem] = linhas
+            totais[chave] = totais.get(chave, Decimal('0')) + sinal * valor
+        else:
+            self._linhas.pop(contagem, None)
+            totais.pop(chave, None)
+
+    # ==================== LADO CLIENTE ====================
+
+    def adicionar_item(self, item: Any, sinal: int = 1):
+        """Soma a contribuição de um item CLIENTE (sinal=-1 para a retirar)"""
+        total = item.total or Decimal('0')
+        self.total_cliente += sinal * total
+        self._somar(self.subtotais_secao, item.secao_id, total, sinal)
+
+    def remover_item(self, item: Any):
+        """Retira a contribuição de um item CLIENTE (com os valores atuais do item)"""
+        self.adicionar_item(item, -1)
+
+    # ==================== LADO EMPRESA ====================
+
+    def adicionar_reparticao(self, rep: Any, sinal: int = 1):
+        """Soma a contribuição de uma repartição EMPRESA (sinal=-1 para a retirar)"""
+        total = rep.total or Decimal('0')
+        self.total_empresa += sinal * total
+        self._somar(self.subtotais_grupo, rep.tipo, total, sinal)
+        if rep.beneficiario:
+            self._somar(self.totais_beneficiario, rep.beneficiario, total, sinal)
+
+    def remover_reparticao(self, rep: Any):
+        """Retira a contribuição de uma repartição EMPRESA (com os valores atuais)"""
+        self.adicionar_reparticao(rep, -1)
+
+    # ==================== Consulta ====================
+
+    def subtotal_secao(self, secao_id: int) -> Decimal:
+        return self.subtotais_secao.get(secao_id, Decimal('0'))
+
+    def subtotal_grupo(self, tipo: str) -> Decimal:
+        return self.subtotais_grupo.get(tipo, Decimal('0'))
+
+    @property
+    def diferenca(self) -> Decimal:
+        """TOTAL CLIENTE - TOTAL EMPRESA"""
+        return self.total_cliente - self.total_empresa
+
+    def como_dict(self) -> Dict[str, Any]:
+        """Todos os totais (para comparar ou mostrar)"""
+        return {
+            'total_cliente': self.total_cliente,
+            'total_empresa': self.total_empresa,
+            'subtotais_secao': dict(self.subtotais_secao),
+            'subtotais_grupo': dict(self.subtotais_grupo),
+            'totais_beneficiario': dict(self.totais_beneficiario),
+        }
+
+    def verificar(self, itens: Iterable[Any], reparticoes: Iterable[Any]) -> List[str]:
+        """
+        Compara os totais mantidos com um cálculo completo
+
+        Args:
+            itens: Items CLIENTE atuais
+            reparticoes: Repartições EMPRESA atuais
+
+        Returns:
+            Lista de diferenças (vazia se coincidem), ex:
+            ["totais_beneficiario['BA']: 120.00 != 125.00 (completo)"]
+        """
+        mantidos = self.como_dict()
+        completos = self.calcular(itens, reparticoes).como_dict()
+        diferencas = []
+        for nome, completo in completos.items():
+            mantido = mantidos[nome]
+            if not isinstance(completo, dict):
+                if mantido != completo:
+                    diferencas.append(f"{nome}: {mantido} != {completo} (completo)")
+                continue
+            for chave in sorted(set(mantido) | set(completo), key=str):
+                if mantido.get(chave) != completo.get(chave):
+                    diferencas.append(f"{nome}[{chave!r}]: {mantido.get(chave)} != {completo.get(chave)} (completo)")
+        return diferencas
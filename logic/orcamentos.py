@@ -3,8 +3,11 @@
 Lógica de negócio para Orçamentos
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from database.models.orcamento import Orcamento, OrcamentoSecao, OrcamentoItem, OrcamentoReparticao
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, or_
+from database.models.orcamento import (
+    Orcamento, OrcamentoSecao, OrcamentoItem, OrcamentoReparticao, PropostaSecao, PropostaItem
+)
 from database.models.cliente import Cliente
 from database.models.freelancer_trabalho import StatusTrabalho
 from database.models.projeto import TipoProjeto, EstadoProjeto
@@ -12,6 +15,11 @@ from typing import List, Optional, Tuple, Dict
 from datetime import date, datetime
 from decimal import Decimal
 
+from logic.clonagem import ler, copiar, inserir
+from logic.orcamento_totais import TotaisOrcamento, arredondar
+from logic.perfis_carregamento import aplicar_perfil
+from logic.sequencias import SequenciasManager
+
 
 class OrcamentoManager:
     """Gerencia operações de orçamentos"""
@@ -24,7 +32,8 @@ class OrcamentoManager:
         filtro_status: Optional[str] = None,
         filtro_cliente_id: Optional[int] = None,
         filtro_com_versao_cliente: Optional[bool] = None,
-        pesquisa: Optional[str] = None
+        pesquisa: Optional[str] = None,
+        perfil: str = 'lista'
     ) -> List[Orcamento]:
         """
         Lista orçamentos com filtros opcionais
@@ -34,11 +43,12 @@ class OrcamentoManager:
             filtro_cliente_id: Filtrar por cliente
             filtro_com_versao_cliente: Filtrar orçamentos com versão cliente (True/False/None)
             pesquisa: Termo de pesquisa (código, descrição)
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de orçamentos
         """
-        query = self.db.query(Orcamento)
+        query = aplicar_perfil(self.db.query(Orcamento), Orcamento, perfil)
 
         # Filtros
         if filtro_com_versao_cliente is not None:
@@ -64,6 +74,42 @@ class OrcamentoManager:
         """Obtém orçamento por ID com todas as relações"""
         return self.db.query(Orcamento).filter(Orcamento.id == orcamento_id).first()
 
+    def carregar_documento(self, orcamento_id: int) -> Optional[Orcamento]:
+        """
+        Carrega o orçamento completo num número fixo de queries
+
+        Cliente, secções, items (com equipamento), repartições (com
+        equipamento e fornecedor) e secções/items da proposta vêm com o
+        perfil 'documento' (uma query por relação, independentemente do
+        número de linhas). secao.itens e secao.subsecoes são preenchidos a
+        partir das linhas já carregadas, sem queries.
+
+        Args:
+            orcamento_id: ID do orçamento
+
+        Returns:
+            Orçamento com todas as relações carregadas, ou None se não existir
+        """
+        query = self.db.query(Orcamento).filter(Orcamento.id == orcamento_id)
+        orcamento = aplicar_perfil(query, Orcamento, 'documento')\
+            .populate_existing()\
+            .one_or_none()
+        if not orcamento:
+            return None
+
+        itens_por_secao: Dict[int, List[OrcamentoItem]] = {s.id: [] for s in orcamento.secoes}
+        subsecoes: Dict[int, List[OrcamentoSecao]] = {s.id: [] for s in orcamento.secoes}
+        for item in orcamento.itens:
+            itens_por_secao.setdefault(item.secao_id, []).append(item)
+        for secao in orcamento.secoes:
+            if secao.parent_id in subsecoes:
+                subsecoes[secao.parent_id].append(secao)
+        for secao in orcamento.secoes:
+            set_committed_value(secao, 'itens', itens_por_secao[secao.id])
+            set_committed_value(secao, 'subsecoes', subsecoes[secao.id])
+
+        return orcamento
+
     def obter_por_codigo(self, codigo: str) -> Optional[Orcamento]:
         """
         Obtém orçamento por código
@@ -148,35 +194,13 @@ class OrcamentoManager:
         Gera o próximo código de orçamento automaticamente
         Formato: OR-00001, OR-00002, OR-00003...
 
+        O código é só uma sugestão (editável no formulário), por isso não é
+        reservado: a sequência avança quando o orçamento é criado.
+
         Returns:
             Próximo código disponível
         """
-        # Obter último orçamento por código (ordenado alfabeticamente)
-        ultimo_orcamento = self.db.query(Orcamento)\
-            .filter(Orcamento.codigo.like('OR-%'))\
-            .order_by(Orcamento.codigo.desc())\
-            .first()
-
-        if not ultimo_orcamento:
-            # Primeiro orçamento
-            return "OR-00001"
-
-        # Extrair número do último código
-        try:
-            ultimo_codigo = ultimo_orcamento.codigo
-            # Formato esperado: OR-00001
-            if ultimo_codigo.startswith('OR-'):
-                numero_str = ultimo_codigo.split('-')[1]
-                numero = int(numero_str)
-                proximo_numero = numero + 1
-                # Formatar com 5 dígitos zero-padded
-                return f"OR-{proximo_numero:05d}"
-            else:
-                # Formato antigo, começar do 1
-                return "OR-00001"
-        except (ValueError, IndexError):
-            # Erro ao parsear, começar do 1
-            return "OR-00001"
+        return SequenciasManager(self.db).espreitar('orcamentos')
 
     def criar_orcamento(
         self,
@@ -211,6 +235,9 @@ class OrcamentoManager:
                 **kwargs
             )
 
+            # Códigos OR-XXXXX avançam a sequência
+            SequenciasManager(self.db).registar('orcamentos', codigo)
+
             self.db.add(orcamento)
             self.db.commit()
             self.db.refresh(orcamento)
@@ -415,7 +442,7 @@ class OrcamentoManager:
         """
         try:
             # Calcular total
-            total = (quantidade * dias * preco_unitario) * (1 - desconto)
+            total = arredondar((quantidade * dias * preco_unitario) * (1 - desconto))
 
             item = OrcamentoItem(
                 orcamento_id=orcamento_id,
@@ -431,12 +458,11 @@ class OrcamentoManager:
             )
 
             self.db.add(item)
+            # Somar o item ao total do orçamento (mesma transação)
+            self._somar_valor_total(orcamento_id, item.total)
             self.db.commit()
             self.db.refresh(item)
 
-            # Recalcular totais do orçamento
-            self.recalcular_totais(orcamento_id)
-
             return True, item, None
 
         except Exception as e:
@@ -459,20 +485,21 @@ class OrcamentoManager:
             if not item:
                 return False, None, "Item não encontrado"
 
+            total_anterior = item.total
+
             # Atualizar campos
             for key, value in kwargs.items():
                 if hasattr(item, key):
                     setattr(item, key, value)
 
             # Recalcular total
-            item.total = (item.quantidade * item.dias * item.preco_unitario) * (1 - item.desconto)
+            item.total = arredondar((item.quantidade * item.dias * item.preco_unitario) * (1 - item.desconto))
 
+            # Aplicar a diferença ao total do orçamento (mesma transação)
+            self._somar_valor_total(item.orcamento_id, item.total - total_anterior)
             self.db.commit()
             self.db.refresh(item)
 
-            # Recalcular totais do orçamento
-            self.recalcular_totais(item.orcamento_id)
-
             return True, item, None
 
         except Exception as e:
@@ -491,13 +518,13 @@ class OrcamentoManager:
             if not item:
                 return False, "Item não encontrado"
 
-            orcamento_id = item.orcamento_id
+            orcamento_id, total = item.orcamento_id, item.total
             self.db.delete(item)
+            self.db.flush()
+            # Retirar o item do total do orçamento (mesma transação)
+            self._somar_valor_total(orcamento_id, -total)
             self.db.commit()
 
-            # Recalcular totais do orçamento
-            self.recalcular_totais(orcamento_id)
-
             return True, None
 
         except Exception as e:
@@ -564,15 +591,14 @@ class OrcamentoManager:
                     setattr(item, key, value)
 
             # Calcular total usando método do modelo
-            item.total = item.calcular_total()
+            item.total = arredondar(item.calcular_total())
 
             self.db.add(item)
+            # Somar o item ao total do orçamento (mesma transação)
+            self._somar_valor_total(orcamento_id, item.total)
             self.db.commit()
             self.db.refresh(item)
 
-            # Recalcular totais do orçamento
-            self.recalcular_totais(orcamento_id)
-
             return True, item, None
 
         except Exception as e:
@@ -595,20 +621,21 @@ class OrcamentoManager:
             if not item:
                 return False, None, "Item não encontrado"
 
+            total_anterior = item.total
+
             # Atualizar campos fornecidos
             for key, value in kwargs.items():
                 if hasattr(item, key):
                     setattr(item, key, value)
 
             # Recalcular total usando método do modelo
-            item.total = item.calcular_total()
+            item.total = arredondar(item.calcular_total())
 
+            # Aplicar a diferença ao total do orçamento (mesma transação)
+            self._somar_valor_total(item.orcamento_id, item.total - total_anterior)
             self.db.commit()
             self.db.refresh(item)
 
-            # Recalcular totais do orçamento
-            self.recalcular_totais(item.orcamento_id)
-
             return True, item, None
 
         except Exception as e:
@@ -619,11 +646,14 @@ class OrcamentoManager:
 
     def recalcular_totais(self, orcamento_id: int) -> bool:
         """
-        Recalcula os totais do orçamento (Total Parcial 1, 2 e Total)
+        Recalcula o total do orçamento (valor_total) somando todos os items
+
+        Total = soma dos totais de todos os items CLIENTE
 
-        Total Parcial 1 = Soma de items de Serviços + Equipamento
-        Total Parcial 2 = Soma de items de Despesas
-        Total = Total Parcial 1 + Total Parcial 2
+        Adicionar, alterar ou eliminar um item aplica só a diferença
+        (_somar_valor_total); este cálculo completo fica para alterações em
+        massa (ex: eliminar uma secção) e para corrigir desvios detetados
+        por verificar_totais().
 
         Returns:
             True se sucesso, False caso contrário
@@ -633,17 +663,7 @@ class OrcamentoManager:
             if not orcamento:
                 return False
 
-            # Obter todas as secções
-            secoes = self.obter_secoes(orcamento_id)
-
-            # IDs de secções de serviços e equipamento (incluindo subsecções)
-            # Calcular total de todos os itens
-            valor_total = self.db.query(func.sum(OrcamentoItem.total))\
-                .filter(OrcamentoItem.orcamento_id == orcamento_id)\
-                .scalar() or Decimal('0')
-
-            # Atualizar orçamento
-            orcamento.valor_total = valor_total
+            orcamento.valor_total = self._somar_itens(orcamento_id)
             orcamento.updated_at = datetime.now()
 
             self.db.commit()
@@ -654,6 +674,60 @@ class OrcamentoManager:
             print(f"Erro ao recalcular totais: {e}")
             return False
 
+    def _somar_itens(self, orcamento_id: int) -> Decimal:
+        """Soma dos totais dos items (em Decimal, como ficam gravados)"""
+        totais = self.db.query(OrcamentoItem.total).filter(OrcamentoItem.orcamento_id == orcamento_id)
+        return sum((total for total, in totais), Decimal('0'))
+
+    def _somar_valor_total(self, orcamento_id: int, diferenca: Decimal):
+        """
+        Aplica a diferença de um item ao valor_total do orçamento (sem commit)
+
+        Se o valor_total ainda não foi calculado, faz o cálculo completo.
+        """
+        orcamento = self.db.get(Orcamento, orcamento_id)
+        if not orcamento:
+            return
+
+        if orcamento.valor_total is None:
+            orcamento.valor_total = self._somar_itens(orcamento_id)
+        else:
+            orcamento.valor_total += diferenca
+        orcamento.updated_at = datetime.now()
+
+    def calcular_totais(self, orcamento_id: int) -> TotaisOrcamento:
+        """
+        Cálculo completo dos totais de um orçamento (secções, grupos, beneficiários)
+
+        Args:
+            orcamento_id: ID do orçamento
+
+        Returns:
+            TotaisOrcamento com todos os items e repartições somados
+        """
+        itens = self.db.query(OrcamentoItem.secao_id, OrcamentoItem.total)\
+            .filter(OrcamentoItem.orcamento_id == orcamento_id)
+        reparticoes = self.db.query(
+            OrcamentoReparticao.tipo, OrcamentoReparticao.beneficiario, OrcamentoReparticao.total
+        ).filter(OrcamentoReparticao.orcamento_id == orcamento_id)
+        return TotaisOrcamento.calcular(itens, reparticoes)
+
+    def verificar_totais(self, orcamento_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        Verifica se o valor_total gravado coincide com a soma dos items
+
+        Returns:
+            (coincide, mensagem_com_a_diferenca)
+        """
+        orcamento = self.obter_orcamento(orcamento_id)
+        if not orcamento:
+            return False, "Orçamento não encontrado"
+
+        total = self._somar_itens(orcamento_id)
+        if orcamento.valor_total != total:
+            return False, f"valor_total €{orcamento.valor_total} != soma dos items €{total}"
+        return True, None
+
     # ==================== Repartição (Backend) ====================
 
     def adicionar_reparticao(
@@ -784,102 +858,167 @@ class OrcamentoManager:
         Returns:
             (sucesso, novo_orcamento, mensagem_erro)
         """
-        try:
-            orcamento_original = self.obter_orcamento(orcamento_id)
-            if not orcamento_original:
-                return False, None, "Orçamento não encontrado"
+        sucesso, novos_ids, erro = self.duplicar_orcamentos(
+            [orcamento_id], [novo_codigo] if novo_codigo else None
+        )
+        if not sucesso:
+            return False, None, erro
+        return True, self.obter_orcamento(novos_ids[0]), None
 
-            # Gerar código automaticamente se não fornecido
-            if not novo_codigo:
-                novo_codigo = self._gerar_codigo_duplicado(orcamento_original.codigo)
+    def duplicar_orcamentos(
+        self,
+        orcamento_ids: List[int],
+        novos_codigos: Optional[List[str]] = None
+    ) -> Tuple[bool, List[int], Optional[str]]:
+        """
+        Duplica vários orçamentos completos numa única transação
 
-            # Verificar se novo código já existe
-            existe = self.obter_por_codigo(novo_codigo)
-            if existe:
-                return False, None, f"Orçamento {novo_codigo} já existe"
-
-            # Criar novo orçamento com dados duplicados
-            from datetime import date
-            novo_orcamento = Orcamento(
-                codigo=novo_codigo,
-                owner=orcamento_original.owner,
-                cliente_id=orcamento_original.cliente_id,
-                data_criacao=date.today(),  # Data de hoje
-                data_evento=orcamento_original.data_evento,
-                local_evento=orcamento_original.local_evento,
-                valor_total=orcamento_original.valor_total,
-                status='rascunho'  # Sempre começa como rascunho
-            )
+        Copia o orçamento, as secções (com a hierarquia), os items CLIENTE, as
+        repartições EMPRESA (incluindo a ligação das despesas espelhadas ao
+        item CLIENTE) e a proposta, com um INSERT por tabela para todas as
+        cópias (ver logic/clonagem.py). As cópias começam como rascunho, com
+        a data de hoje e sem projeto associado.
+
+        Args:
+            orcamento_ids: IDs dos orçamentos a duplicar (o mesmo ID pode
+                aparecer várias vezes para obter várias cópias)
+            novos_codigos: Código de cada cópia, pela mesma ordem (gerados
+                automaticamente se None, ex: OR-00001 -> OR-00001-COPIA)
+
+        Returns:
+            (sucesso, ids_das_copias, mensagem_erro)
+        """
+        orcamento_ids = list(orcamento_ids)
+        if not orcamento_ids:
+            return True, [], None
+        if novos_codigos is not None and len(novos_codigos) != len(orcamento_ids):
+            return False, [], "Número de códigos diferente do número de orçamentos"
 
-            self.db.add(novo_orcamento)
-            self.db.flush()  # Para obter o ID
-
-            # Duplicar items (LADO CLIENTE)
-            for item in orcamento_original.itens:
-                novo_item = OrcamentoItem(
-                    orcamento_id=novo_orcamento.id,
-                    tipo=item.tipo,
-                    descricao=item.descricao,
-                    quantidade=item.quantidade,
-                    dias=item.dias,
-                    valor_unitario=item.valor_unitario,
-                    kms=item.kms,
-                    valor_por_km=item.valor_por_km,
-                    num_refeicoes=item.num_refeicoes,
-                    valor_por_refeicao=item.valor_por_refeicao,
-                    valor_fixo=item.valor_fixo,
-                    total=item.total
+        try:
+            originais = {
+                linha['id']: linha
+                for linha in ler(self.db, Orcamento, Orcamento.id.in_(set(orcamento_ids)))
+            }
+            if any(orcamento_id not in originais for orcamento_id in orcamento_ids):
+                return False, [], "Orçamento não encontrado"
+
+            # Códigos das cópias
+            if novos_codigos is None:
+                novos_codigos = self._gerar_codigos_duplicados(
+                    [originais[orcamento_id]['codigo'] for orcamento_id in orcamento_ids]
                 )
-                self.db.add(novo_item)
-
-            # Duplicar repartições (LADO EMPRESA)
-            for reparticao in orcamento_original.reparticoes:
-                nova_reparticao = OrcamentoReparticao(
-                    orcamento_id=novo_orcamento.id,
-                    tipo=reparticao.tipo,
-                    beneficiario=reparticao.beneficiario,
-                    descricao=reparticao.descricao,
-                    quantidade=reparticao.quantidade,
-                    dias=reparticao.dias,
-                    valor_unitario=reparticao.valor_unitario,
-                    percentagem=reparticao.percentagem,
-                    base_calculo=reparticao.base_calculo,
-                    kms=reparticao.kms,
-                    valor_por_km=reparticao.valor_por_km,
-                    num_refeicoes=reparticao.num_refeicoes,
-                    valor_por_refeicao=reparticao.valor_por_refeicao,
-                    valor_fixo=reparticao.valor_fixo,
-                    total=reparticao.total,
-                    is_espelhada=reparticao.is_espelhada,
-                    item_cliente_ref=reparticao.item_cliente_ref
+            else:
+                if len(set(novos_codigos)) != len(novos_codigos):
+                    return False, [], "Códigos repetidos"
+                existentes = self.db.query(Orcamento.codigo).filter(Orcamento.codigo.in_(novos_codigos)).all()
+                if existentes:
+                    return False, [], f"Orçamento {existentes[0].codigo} já existe"
+
+            # 1. Orçamentos
+            agora = datetime.now()
+            novos_ids = inserir(self.db, Orcamento, [
+                copiar(
+                    originais[orcamento_id],
+                    codigo=codigo,
+                    data_criacao=date.today(),
+                    status='rascunho',  # Sempre começa como rascunho
+                    projeto_id=None,
+                    created_at=agora,
+                    updated_at=agora
                 )
-                self.db.add(nova_reparticao)
+                for orcamento_id, codigo in zip(orcamento_ids, novos_codigos)
+            ])
+            # Cada cópia é identificada pelo índice k (o mesmo original pode ser copiado várias vezes)
+            copias = list(enumerate(zip(orcamento_ids, novos_ids)))
+
+            def filhos(modelo, ordem):
+                por_orcamento: Dict[int, List[Dict]] = {}
+                for linha in ler(self.db, modelo, modelo.orcamento_id.in_(list(originais)), ordem=ordem):
+                    por_orcamento.setdefault(linha['orcamento_id'], []).append(linha)
+                return [
+                    (k, novo_id, linha)
+                    for k, (orcamento_id, novo_id) in copias
+                    for linha in por_orcamento.get(orcamento_id, [])
+                ]
+
+            # 2. Secções, por níveis da hierarquia (o parent tem de existir antes)
+            mapa_secoes: Dict[Tuple[int, int], int] = {}
+            pendentes = filhos(OrcamentoSecao, (OrcamentoSecao.ordem,))
+            while pendentes:
+                nivel = [
+                    (k, novo_id, s) for k, novo_id, s in pendentes
+                    if s['parent_id'] is None or (k, s['parent_id']) in mapa_secoes
+                ]
+                if not nivel:
+                    raise ValueError("Secções com hierarquia inválida")
+                ids = inserir(self.db, OrcamentoSecao, [
+                    copiar(s, orcamento_id=novo_id, parent_id=mapa_secoes.get((k, s['parent_id'])))
+                    for k, novo_id, s in nivel
+                ])
+                mapa_secoes.update(zip(((k, s['id']) for k, _, s in nivel), ids))
+                pendentes = [(k, novo_id, s) for k, novo_id, s in pendentes if (k, s['id']) not in mapa_secoes]
+
+            # 3. Items CLIENTE
+            itens = filhos(OrcamentoItem, (OrcamentoItem.ordem,))
+            ids = inserir(self.db, OrcamentoItem, [
+                copiar(i, orcamento_id=novo_id, secao_id=mapa_secoes[(k, i['secao_id'])])
+                for k, novo_id, i in itens
+            ])
+            mapa_itens = dict(zip(((k, i['id']) for k, _, i in itens), ids))
+
+            # 4. Repartições EMPRESA (despesas espelhadas apontam para o item CLIENTE copiado)
+            inserir(self.db, OrcamentoReparticao, [
+                copiar(r, orcamento_id=novo_id, item_cliente_id=mapa_itens.get((k, r['item_cliente_id'])))
+                for k, novo_id, r in filhos(OrcamentoReparticao, (OrcamentoReparticao.ordem,))
+            ])
+
+            # 5. Proposta (versão cliente)
+            proposta_secoes = filhos(PropostaSecao, (PropostaSecao.ordem,))
+            ids = inserir(self.db, PropostaSecao, [
+                copiar(s, orcamento_id=novo_id) for _, novo_id, s in proposta_secoes
+            ])
+            mapa_proposta = dict(zip(((k, s['id']) for k, _, s in proposta_secoes), ids))
+            inserir(self.db, PropostaItem, [
+                copiar(i, orcamento_id=novo_id, secao_id=mapa_proposta[(k, i['secao_id'])])
+                for k, novo_id, i in filhos(PropostaItem, (PropostaItem.ordem,))
+            ])
+
+            # Códigos OR-XXXXX avançam a sequência
+            sequencias = SequenciasManager(self.db)
+            validos = [c for c in novos_codigos if sequencias.extrair('orcamentos', c) is not None]
+            if validos:
+                sequencias.registar('orcamentos', max(validos, key=lambda c: sequencias.extrair('orcamentos', c)))
 
             self.db.commit()
-            self.db.refresh(novo_orcamento)
-
-            return True, novo_orcamento, None
+            return True, novos_ids, None
 
         except Exception as e:
             self.db.rollback()
-            return False, None, str(e)
+            return False, [], str(e)
 
-    def _gerar_codigo_duplicado(self, codigo_original: str) -> str:
+    def _gerar_codigos_duplicados(self, codigos_originais: List[str]) -> List[str]:
         """
-        Gera código para orçamento duplicado
+        Gera códigos para orçamentos duplicados (uma query para todos)
 
         Ex: ORC-001 -> ORC-001-COPIA ou ORC-001-COPIA-2
         """
-        base = f"{codigo_original}-COPIA"
-        novo_codigo = base
-
-        # Verificar se já existe e incrementar
-        contador = 1
-        while self.obter_por_codigo(novo_codigo):
-            contador += 1
-            novo_codigo = f"{base}-{contador}"
+        bases = [f"{codigo}-COPIA" for codigo in codigos_originais]
+        usados = {
+            codigo for (codigo,) in self.db.query(Orcamento.codigo).filter(
+                or_(*[Orcamento.codigo.startswith(base, autoescape=True) for base in set(bases)])
+            )
+        }
 
-        return novo_codigo
+        novos = []
+        for base in bases:
+            novo_codigo = base
+            contador = 1
+            while novo_codigo in usados:
+                contador += 1
+                novo_codigo = f"{base}-{contador}"
+            usados.add(novo_codigo)
+            novos.append(novo_codigo)
+        return novos
 
     def mudar_status(
         self,
@@ -938,23 +1077,24 @@ class OrcamentoManager:
         """
         try:
             # 1. Validar que orçamento existe
-            orcamento = self.obter_orcamento(orcamento_id)
+            orcamento = self.carregar_documento(orcamento_id)
             if not orcamento:
                 return False, None, "Orçamento não encontrado"
 
             # 2. Validar que tem items CLIENTE (mínimo 1)
-            itens_cliente = self.obter_itens(orcamento_id)
+            itens_cliente = orcamento.itens
             if not itens_cliente or len(itens_cliente) == 0:
                 return False, None, "Orçamento deve ter pelo menos 1 item CLIENTE"
 
             # 3. Validar que tem items EMPRESA (mínimo 1)
-            itens_empresa = self.obter_reparticoes(orcamento_id)
+            itens_empresa = orcamento.reparticoes
             if not itens_empresa or len(itens_empresa) == 0:
                 return False, None, "Orçamento deve ter pelo menos 1 item EMPRESA"
 
             # 4. Validar TOTAL_CLIENTE == TOTAL_EMPRESA (tolerância 0.01€)
-            total_cliente = sum(item.total for item in itens_cliente)
-            total_empresa = sum(item.total for item in itens_empresa)
+            totais = TotaisOrcamento.calcular(itens_cliente, itens_empresa)
+            total_cliente = totais.total_cliente
+            total_empresa = totais.total_empresa
 
             diferenca = abs(total_cliente - total_empresa)
             tolerancia = Decimal('0.01')
@@ -1082,8 +1222,8 @@ class OrcamentoManager:
         # Import aqui para evitar circular imports
         from logic.projetos import ProjetosManager
 
-        # 1. Obter orçamento
-        orcamento = self.obter_orcamento(orcamento_id)
+        # 1. Obter orçamento (com repartições)
+        orcamento = self.carregar_documento(orcamento_id)
         if not orcamento:
             return False, None, "Orçamento não encontrado"
 
@@ -1104,9 +1244,7 @@ class OrcamentoManager:
             'fornecedores': Decimal('0')
         }
 
-        reparticoes = self.obter_reparticoes(orcamento_id)
-
-        for reparticao in reparticoes:
+        for reparticao in orcamento.reparticoes:
             beneficiario = reparticao.beneficiario
             if not beneficiario:
                 continue
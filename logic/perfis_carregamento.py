@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Perfis de carregamento (eager loading) por ecrã / relatório
+
+Os item_to_dict() dos ecrãs de listagem e os relatórios acedem a relações
+(projeto.cliente.nome, despesa.credor, cliente.num_projetos, ...). Sem
+eager loading cada acesso faz um SELECT por linha (N+1). Cada perfil declara
+as relações que o consumidor usa; os managers aplicam-no nos listar_*:
+
+    manager.listar_todos()                  # perfil 'lista' (ecrã de listagem)
+    manager.listar_todos(perfil='base')     # sem relações (só a tabela)
+
+Perfis:
+- 'base': nenhuma relação
+- 'lista': relações mostradas na tabela do ecrã de listagem
+- 'relatorio': relações usadas pelos relatórios / to_dict()
+- 'detalhe' (Boletim): cabeçalho + linhas, para formulários e duplicação
+- 'documento' (Orcamento): orçamento completo (secções, items, repartições,
+  equipamento e proposta), ver OrcamentoManager.carregar_documento()
+"""
+from typing import Tuple
+
+from sqlalchemy.orm import Query, joinedload, selectinload, undefer
+
+from database.models import (
+    Projeto, Despesa, Boletim, Cliente, Fornecedor, Orcamento,
+    OrcamentoItem, OrcamentoReparticao, PropostaSecao
+)
+
+# Relações many-to-one: joinedload (mesma query); one-to-many: selectinload
+# (uma query extra por relação, sem duplicar linhas nem estragar LIMIT)
+PERFIS = {
+    Projeto: {
+        'base': (),
+        'lista': (joinedload(Projeto.cliente),),
+        'relatorio': (joinedload(Projeto.cliente),),
+    },
+    Despesa: {
+        'base': (),
+        'lista': (joinedload(Despesa.credor),),
+        'relatorio': (
+            joinedload(Despesa.credor),
+            joinedload(Despesa.projeto),
+            joinedload(Despesa.despesa_template),
+        ),
+    },
+    Boletim: {
+        'base': (),
+        'lista': (undefer(Boletim.num_linhas),),
+        'relatorio': (),
+        'detalhe': (selectinload(Boletim.linhas),),
+    },
+    Cliente: {
+        'base': (),
+        'lista': (undefer(Cliente.num_projetos),),
+        'relatorio': (),
+    },
+    Fornecedor: {
+        'base': (),
+        'lista': (undefer(Fornecedor.num_despesas),),
+        'relatorio': (),
+    },
+    Orcamento: {
+        'base': (),
+        'lista': (joinedload(Orcamento.cliente),),
+        'relatorio': (joinedload(Orcamento.cliente),),
+        'documento': (
+            joinedload(Orcamento.cliente),
+            selectinload(Orcamento.secoes),
+            selectinload(Orcamento.itens).joinedload(OrcamentoItem.equipamento),
+            selectinload(Orcamento.reparticoes).options(
+                joinedload(OrcamentoReparticao.equipamento),
+                joinedload(OrcamentoReparticao.fornecedor),
+            ),
+            selectinload(Orcamento.proposta_secoes).selectinload(PropostaSecao.itens),
+        ),
+    },
+}
+
+
+def opcoes_carregamento(modelo, perfil: str) -> Tuple:
+    """
+    Devolve as loader options de um perfil
+
+    Args:
+        modelo: Classe do model (ex: Projeto)
+        perfil: Nome do perfil ('base', 'lista', 'relatorio')
+
+    Returns:
+        Tuple de loader options
+
+    Raises:
+        ValueError: Se o perfil não existir para o model
+    """
+    try:
+        return PERFIS[modelo][perfil]
+    except KeyError:
+        raise ValueError(f"Perfil de carregamento desconhecido para {modelo.__name__}: {perfil}")
+
+
+def aplicar_perfil(query: Query, modelo, perfil: str) -> Query:
+    """
+    Aplica um perfil de carregamento a uma query
+
+    Args:
+        query: Query sobre o model
+        modelo: Classe do model
+        perfil: Nome do perfil
+
+    Returns:
+        Query com as loader options do perfil
+    """
+    opcoes = opcoes_carregamento(modelo, perfil)
+    return query.options(*opcoes) if opcoes else query
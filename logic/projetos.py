@@ -3,13 +3,17 @@
 Lógica de gestão de Projetos (CRUD)
 """
 from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import desc, and_, or_
 from datetime import date
 from decimal import Decimal
 import logging
 
 from database.models import Projeto, Cliente, TipoProjeto, EstadoProjeto
+from logic.saldo_movimentos import SaldoMovimentosManager, ORIGEM_PROJETO
+from logic.sequencias import SequenciasManager
+from logic.consulta_lista import ConsultaLista
+from logic.perfis_carregamento import aplicar_perfil
 
 logger = logging.getLogger(__name__)
 
@@ -27,41 +31,94 @@ class ProjetosManager:
             db_session: SQLAlchemy database session
         """
         self.db_session = db_session
+        self.ledger = SaldoMovimentosManager(db_session)
 
-    def listar_todos(self) -> List[Projeto]:
+    def _query(self, perfil: str = 'lista'):
+        """Query de Projeto com o perfil de carregamento indicado"""
+        return aplicar_perfil(self.db_session.query(Projeto), Projeto, perfil)
+
+    def listar_todos(self, perfil: str = 'lista') -> List[Projeto]:
         """
         Lista todos os projetos ordenados por data (mais recentes primeiro)
 
+        Args:
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
+
         Returns:
             Lista de objetos Projeto
         """
-        return self.db_session.query(Projeto).order_by(desc(Projeto.created_at)).all()
+        return self._query(perfil).order_by(desc(Projeto.created_at)).all()
+
+    def consulta_lista(self) -> ConsultaLista:
+        """
+        Query builder para a listagem de projetos (filtros/ordenação/paginação na BD)
+
+        Filtros:
+            - 'tipo_owner': [(TipoProjeto.EMPRESA, 'BA'), ...]
+            - 'estado': [EstadoProjeto, ...]
+            - 'cliente_id': [id, ...]
+            - 'premio_socio': ['BA', 'RR'] (prémio > 0)
+            - 'owner_empresa': ['BA', 'RR'] (projetos EMPRESA do owner)
 
-    def listar_por_tipo(self, tipo: TipoProjeto) -> List[Projeto]:
+        Returns:
+            ConsultaLista ordenada por data de criação (mais recentes primeiro)
+        """
+        premios = {'BA': Projeto.premio_bruno > 0, 'RR': Projeto.premio_rafael > 0}
+
+        return ConsultaLista(
+            self.db_session.query(Projeto)
+            .outerjoin(Cliente, Projeto.cliente_id == Cliente.id)
+            .options(contains_eager(Projeto.cliente)),
+            chave=Projeto.id,
+            filtros={
+                'tipo_owner': lambda valores: or_(*[
+                    and_(Projeto.tipo == tipo, Projeto.owner == owner) for tipo, owner in valores
+                ]),
+                'estado': lambda valores: Projeto.estado.in_(valores),
+                'cliente_id': lambda valores: Projeto.cliente_id.in_(valores),
+                'premio_socio': lambda valores: or_(*[premios[socio] for socio in valores if socio in premios]),
+                'owner_empresa': lambda valores: and_(
+                    Projeto.owner.in_(valores), Projeto.tipo == TipoProjeto.EMPRESA
+                ),
+            },
+            ordenacoes={
+                'numero': [Projeto.numero],
+                'tipo': [Projeto.tipo, Projeto.owner],
+                'cliente_nome': [Cliente.nome],
+                'valor_sem_iva': [Projeto.valor_sem_iva],
+                'estado': [Projeto.estado],
+            },
+            pesquisa=[Projeto.numero, Projeto.descricao, Cliente.nome],
+            ordem_padrao=[desc(Projeto.created_at)]
+        )
+
+    def listar_por_tipo(self, tipo: TipoProjeto, perfil: str = 'lista') -> List[Projeto]:
         """
         Lista projetos por tipo
 
         Args:
             tipo: TipoProjeto enum
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de projetos do tipo especificado
         """
-        return self.db_session.query(Projeto).filter(
+        return self._query(perfil).filter(
             Projeto.tipo == tipo
         ).order_by(desc(Projeto.created_at)).all()
 
-    def listar_por_estado(self, estado: EstadoProjeto) -> List[Projeto]:
+    def listar_por_estado(self, estado: EstadoProjeto, perfil: str = 'lista') -> List[Projeto]:
         """
         Lista projetos por estado
 
         Args:
             estado: EstadoProjeto enum
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de projetos com o estado especificado
         """
-        return self.db_session.query(Projeto).filter(
+        return self._query(perfil).filter(
             Projeto.estado == estado
         ).order_by(desc(Projeto.created_at)).all()
 
@@ -115,18 +172,7 @@ class ProjetosManager:
         """
         try:
             # Gerar número do projeto
-            ultimo_projeto = self.db_session.query(Projeto).order_by(
-                desc(Projeto.id)
-            ).first()
-
-            if ultimo_projeto:
-                # Extrair número do último projeto (#P0001 -> 1)
-                ultimo_num = int(ultimo_projeto.numero.replace('#P', ''))
-                novo_num = ultimo_num + 1
-            else:
-                novo_num = 1
-
-            numero = f"#P{novo_num:04d}"
+            numero = SequenciasManager(self.db_session).proximo('projetos')
 
             # Criar projeto
             projeto = Projeto(
@@ -147,6 +193,8 @@ class ProjetosManager:
             )
 
             self.db_session.add(projeto)
+            self.db_session.flush()
+            self.ledger.sincronizar_projeto(projeto)
             self.db_session.commit()
             self.db_session.refresh(projeto)
 
@@ -216,6 +264,7 @@ class ProjetosManager:
             if nota is not None:
                 projeto.nota = nota
 
+            self.ledger.sincronizar_projeto(projeto)
             self.db_session.commit()
             return True, None
 
@@ -238,6 +287,7 @@ class ProjetosManager:
             if not projeto:
                 return False, "Projeto não encontrado"
 
+            self.ledger.remover_origem(ORIGEM_PROJETO, projeto.id)
             self.db_session.delete(projeto)
             self.db_session.commit()
             return True, None
@@ -246,7 +296,7 @@ class ProjetosManager:
             self.db_session.rollback()
             return False, str(e)
 
-    def filtrar_por_texto(self, search_text: str) -> List[Projeto]:
+    def filtrar_por_texto(self, search_text: str, perfil: str = 'lista') -> List[Projeto]:
         """
         Filtra projetos por texto de pesquisa (nome cliente ou descrição)
 
@@ -256,6 +306,7 @@ class ProjetosManager:
 
         Args:
             search_text: Texto a pesquisar (mínimo 1 caracter)
+            perfil: Perfil de carregamento das relações (ver logic/perfis_carregamento.py)
 
         Returns:
             Lista de projetos que correspondem à pesquisa
@@ -267,7 +318,7 @@ class ProjetosManager:
         search_term = f"%{search_text.strip().lower()}%"
 
         # Query with JOIN to Cliente table
-        projetos = self.db_session.query(Projeto).outerjoin(
+        projetos = self._query(perfil).outerjoin(
             Cliente, Projeto.cliente_id == Cliente.id
         ).filter(
             # Search in cliente.nome OR projeto.descricao (case-insensitive)
@@ -303,17 +354,7 @@ class ProjetosManager:
                 return False, None, "Projeto não encontrado"
 
             # Gerar novo número
-            ultimo_projeto = self.db_session.query(Projeto).order_by(
-                desc(Projeto.id)
-            ).first()
-
-            if ultimo_projeto:
-                ultimo_num = int(ultimo_projeto.numero.replace('#P', ''))
-                novo_num = ultimo_num + 1
-            else:
-                novo_num = 1
-
-            numero = f"#P{novo_num:04d}"
+            numero = SequenciasManager(self.db_session).proximo('projetos')
 
             # Criar cópia do projeto
             novo_projeto = Projeto(
@@ -334,6 +375,8 @@ class ProjetosManager:
             )
 
             self.db_session.add(novo_projeto)
+            self.db_session.flush()
+            self.ledger.sincronizar_projeto(novo_projeto)
             self.db_session.commit()
             self.db_session.refresh(novo_projeto)
 
@@ -377,6 +420,7 @@ class ProjetosManager:
                 # Se não for PAGO, limpar data_pagamento
                 projeto.data_pagamento = None
 
+            self.ledger.sincronizar_projeto(projeto)
             self.db_session.commit()
 
             logger.info(
@@ -414,6 +458,7 @@ class ProjetosManager:
             count = 0
             for projeto in projetos_a_finalizar:
                 projeto.estado = EstadoProjeto.FINALIZADO
+                self.ledger.sincronizar_projeto(projeto)
                 logger.info(
                     f"Projeto {projeto.numero} finalizado automaticamente "
                     f"(data_fim: {projeto.data_fim})"
@@ -6,8 +6,8 @@ import os
 from typing import Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
-from database.models.orcamento import Orcamento, PropostaSecao, PropostaItem
-from database.models.cliente import Cliente
+from database.models.orcamento import Orcamento
+from logic.orcamentos import OrcamentoManager
 
 
 class PropostaExporter:
@@ -32,10 +32,8 @@ class PropostaExporter:
             orcamento_id: ID do orçamento
             filename: Nome do arquivo de saída
         """
-        # Obter orçamento
-        orcamento = self.db.query(Orcamento).filter(
-            Orcamento.id == orcamento_id
-        ).first()
+        # Obter orçamento com secções e itens da proposta
+        orcamento = OrcamentoManager(self.db).carregar_documento(orcamento_id)
 
         if not orcamento:
             raise ValueError(f"Orçamento com ID {orcamento_id} não encontrado")
@@ -43,10 +41,7 @@ class PropostaExporter:
         if not orcamento.tem_versao_cliente:
             raise ValueError("Este orçamento não tem versão para cliente")
 
-        # Obter secções e itens da proposta
-        proposta_secoes = self.db.query(PropostaSecao).filter(
-            PropostaSecao.orcamento_id == orcamento_id
-        ).order_by(PropostaSecao.ordem).all()
+        proposta_secoes = orcamento.proposta_secoes
 
         if not proposta_secoes:
             raise ValueError("Nenhum item de proposta encontrado")
@@ -198,10 +193,8 @@ class PropostaExporter:
             elements.append(secao_title)
             elements.append(Spacer(1, 0.2*cm))
 
-            # Obter itens da secção
-            itens = self.db.query(PropostaItem).filter(
-                PropostaItem.secao_id == secao.id
-            ).order_by(PropostaItem.ordem).all()
+            # Itens da secção (já carregados)
+            itens = secao.itens
 
             if itens:
                 # Tabela de itens
@@ -1,8 +1,18 @@
 # -*- coding: utf-8 -*-
 """
 Lógica de geração de relatórios
+
+Os relatórios gerados ficam numa cache LRU partilhada entre instâncias,
+indexada pelo tipo de relatório, filtros (período, ids pré-filtrados...) e
+versão dos dados (ver logic/versao_dados.py): voltar a uma seleção anterior
+não faz queries, e qualquer gravação nas tabelas dos relatórios invalida as
+entradas. As gerações em streaming (exportação) não passam pela cache.
 """
-from typing import Optional, Dict, Any, List
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Iterator
 from sqlalchemy.orm import Session
 from sqlalchemy import func, extract, or_
 from datetime import date, datetime
@@ -16,6 +26,106 @@ from database.models import (
     Boletim, EstadoBoletim
 )
 from logic.saldos import SaldosCalculator
+from logic.perfis_carregamento import aplicar_perfil
+from logic.versao_dados import versao
+
+# Linhas lidas da DB por lote nas exportações em streaming
+LOTE_EXPORTACAO = 500
+
+# Tabelas de que os relatórios dependem
+TABELAS_RELATORIOS = (
+    'projetos', 'despesas', 'boletins', 'boletim_linhas', 'saldo_movimentos',
+    'clientes', 'fornecedores', 'despesa_templates'
+)
+
+# Limites da cache: número de relatórios e total de linhas (listas) guardadas
+CACHE_MAX_RELATORIOS = 16
+CACHE_MAX_LINHAS = 50000
+
+# Cache LRU partilhada entre instâncias (e entre threads): chave → (linhas, dados)
+_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+_cache_linhas = 0
+_cache_lock = threading.Lock()
+
+
+def _congelar(valor):
+    """Valor hashable para a chave da cache (listas de ids ficam ordenadas)"""
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return tuple(sorted(valor, key=repr))
+    return valor
+
+
+def _contar_linhas(valor) -> int:
+    """Número de linhas (itens de listas) num relatório, para limitar a cache"""
+    if isinstance(valor, dict):
+        return sum(_contar_linhas(v) for v in valor.values())
+    if isinstance(valor, list):
+        return len(valor) + sum(_contar_linhas(v) for v in valor if isinstance(v, (dict, list)))
+    return 0
+
+
+def _com_cache(metodo):
+    """
+    Guarda o resultado de um gerar_relatorio_* na cache LRU
+
+    A chave inclui todos os argumentos (com os valores por omissão), a BD,
+    o dia (períodos por omissão dependem de hoje) e a versão das tabelas
+    lida antes de gerar. O resultado devolvido é uma cópia do dicionário
+    com a data de geração atual; as listas são partilhadas com a cache e
+    não devem ser alteradas.
+    """
+    assinatura = inspect.signature(metodo)
+
+    @functools.wraps(metodo)
+    def gerar(self, *args, **kwargs):
+        global _cache_linhas
+
+        argumentos = assinatura.bind(self, *args, **kwargs)
+        argumentos.apply_defaults()
+        filtros = {nome: valor for nome, valor in argumentos.arguments.items() if nome != 'self'}
+        if filtros.get('streaming'):
+            return metodo(self, *args, **kwargs)
+
+        chave = (
+            metodo.__name__,
+            str(self.db_session.get_bind().url),
+            self.saldos_calculator.usar_ledger,
+            date.today(),
+            versao(*TABELAS_RELATORIOS),
+            tuple((nome, _congelar(valor)) for nome, valor in filtros.items()),
+        )
+
+        with _cache_lock:
+            entrada = _cache.get(chave)
+            if entrada is not None:
+                _cache.move_to_end(chave)
+        if entrada is None:
+            dados = metodo(self, *args, **kwargs)
+            linhas = _contar_linhas(dados)
+            if linhas <= CACHE_MAX_LINHAS:
+                with _cache_lock:
+                    if chave not in _cache:
+                        _cache[chave] = (linhas, dados)
+                        _cache_linhas += linhas
+                    while len(_cache) > CACHE_MAX_RELATORIOS or _cache_linhas > CACHE_MAX_LINHAS:
+                        _, (linhas_removidas, _) = _cache.popitem(last=False)
+                        _cache_linhas -= linhas_removidas
+        else:
+            dados = entrada[1]
+
+        resultado = dict(dados)
+        resultado['data_geracao'] = datetime.now().strftime('%d/%m/%Y %H:%M')
+        return resultado
+
+    return gerar
+
+
+def invalidar_cache():
+    """Descarta os relatórios em cache (ex: após alterações externas à BD)"""
+    global _cache_linhas
+    with _cache_lock:
+        _cache.clear()
+        _cache_linhas = 0
 
 
 class RelatoriosManager:
@@ -33,6 +143,11 @@ class RelatoriosManager:
         self.db_session = db_session
         self.saldos_calculator = SaldosCalculator(db_session)
 
+    def _query_relatorio(self, modelo):
+        """Query com o perfil de carregamento 'relatorio' (clientes/credores sem N+1)"""
+        return aplicar_perfil(self.db_session.query(modelo), modelo, 'relatorio')
+
+    @_com_cache
     def gerar_relatorio_saldos(
         self,
         socio: Optional[Socio] = None,
@@ -64,9 +179,10 @@ class RelatoriosManager:
             socios_data = [self._format_socio_data_detalhado("RR", saldo_rafael, detalhes_rafael, "#efd578")]
         else:
             # Ambos
-            saldo_bruno = self.saldos_calculator.calcular_saldo_bruno()
+            saldos = self.saldos_calculator.calcular_saldos_socios()
+            saldo_bruno = saldos[Socio.BA]
             detalhes_bruno = self._get_detalhes_saldo_bruno(filtro_tipo_projeto)
-            saldo_rafael = self.saldos_calculator.calcular_saldo_rafael()
+            saldo_rafael = saldos[Socio.RR]
             detalhes_rafael = self._get_detalhes_saldo_rafael(filtro_tipo_projeto)
             socios_data = [
                 self._format_socio_data_detalhado("BA", saldo_bruno, detalhes_bruno, "#4CAF50"),
@@ -86,6 +202,7 @@ class RelatoriosManager:
             'socios': socios_data
         }
 
+    @_com_cache
     def gerar_relatorio_financeiro_mensal(
         self,
         data_inicio: Optional[date] = None,
@@ -208,13 +325,16 @@ class RelatoriosManager:
         ]
         return meses[mes - 1]
 
+    @_com_cache
     def gerar_relatorio_projetos(
         self,
         tipo: Optional['TipoProjeto'] = None,
         estado: Optional['EstadoProjeto'] = None,
         data_inicio: Optional[date] = None,
         data_fim: Optional[date] = None,
-        projeto_ids: Optional[list] = None
+        projeto_ids: Optional[list] = None,
+        owner: Optional[str] = None,
+        streaming: bool = False
     ) -> Dict[str, Any]:
         """
         Gera relatório de projetos
@@ -225,88 +345,53 @@ class RelatoriosManager:
             data_inicio: Data de início do período (opcional)
             data_fim: Data de fim do período (opcional)
             projeto_ids: Lista de IDs de projetos específicos para filtrar (opcional)
+            owner: Filtrar por sócio responsável ('BA' ou 'RR', opcional)
+            streaming: Para exportação - estatísticas somadas a partir das colunas
+                e 'projetos' é um gerador (lido em lotes) em vez de uma lista
 
         Returns:
             Dicionário com dados do relatório
         """
-        from database.models import TipoProjeto, EstadoProjeto
-
-        # Base query
-        query = self.db_session.query(Projeto)
+        from database.models import TipoProjeto
 
-        # Apply filters
-        if projeto_ids:
-            # If specific project IDs provided, filter by those (overrides other filters)
-            query = query.filter(Projeto.id.in_(projeto_ids))
+        filtros = (tipo, estado, data_inicio, data_fim, projeto_ids, owner)
+        stats_por_tipo, stats_por_estado, totais = self._stats_projetos_vazias()
+
+        if streaming:
+            # Totais de uma query só com as colunas somadas, lida em lotes;
+            # as linhas completas só são lidas durante a exportação
+            valores = self._filtrar_projetos(
+                self.db_session.query(
+                    Projeto.tipo, Projeto.owner, Projeto.estado,
+                    Projeto.valor_sem_iva, Projeto.premio_bruno, Projeto.premio_rafael
+                ), *filtros
+            )
+            for tipo_proj, owner_proj, estado_proj, valor, premio_bruno, premio_rafael in valores.yield_per(LOTE_EXPORTACAO):
+                self._acumular_projeto(
+                    stats_por_tipo, stats_por_estado, totais, tipo_proj, owner_proj, estado_proj,
+                    valor, premio_bruno, premio_rafael
+                )
+            projetos_formatados = self._iterar_projetos(*filtros)
         else:
-            # Otherwise apply standard filters
-            if tipo:
-                query = query.filter(Projeto.tipo == tipo)
-            if estado:
-                query = query.filter(Projeto.estado == estado)
-            if data_inicio:
-                query = query.filter(Projeto.data_inicio >= data_inicio)
-            if data_fim:
-                query = query.filter(Projeto.data_inicio <= data_fim)
-
-        projetos = query.all()
-
-        # Calculate statistics
-        stats_por_tipo = {
-            TipoProjeto.EMPRESA: {'count': 0, 'valor': Decimal('0'), 'premios': Decimal('0')},
-            TipoProjeto.PESSOAL_BRUNO: {'count': 0, 'valor': Decimal('0'), 'premios': Decimal('0')},
-            TipoProjeto.PESSOAL_RAFAEL: {'count': 0, 'valor': Decimal('0'), 'premios': Decimal('0')}
-        }
-
-        stats_por_estado = {
-            EstadoProjeto.ATIVO: {'count': 0, 'valor': Decimal('0')},
-            EstadoProjeto.FINALIZADO: {'count': 0, 'valor': Decimal('0')},
-            EstadoProjeto.PAGO: {'count': 0, 'valor': Decimal('0')},
-            EstadoProjeto.ANULADO: {'count': 0, 'valor': Decimal('0')}
-        }
+            projetos = self._filtrar_projetos(self._query_relatorio(Projeto), *filtros).all()
+            projetos_formatados = []
 
-        total_valor = Decimal('0')
-        total_premios_bruno = Decimal('0')
-        total_premios_rafael = Decimal('0')
-
-        projetos_formatados = []
-
-        for projeto in projetos:
-            # Stats por tipo
-            stats_por_tipo[projeto.tipo]['count'] += 1
-            stats_por_tipo[projeto.tipo]['valor'] += projeto.valor_sem_iva
-            if projeto.tipo == TipoProjeto.EMPRESA:
-                stats_por_tipo[projeto.tipo]['premios'] += (projeto.premio_bruno + projeto.premio_rafael)
-
-            # Stats por estado
-            stats_por_estado[projeto.estado]['count'] += 1
-            stats_por_estado[projeto.estado]['valor'] += projeto.valor_sem_iva
+            for projeto in projetos:
+                self._acumular_projeto(
+                    stats_por_tipo, stats_por_estado, totais, projeto.tipo, projeto.owner, projeto.estado,
+                    projeto.valor_sem_iva, projeto.premio_bruno, projeto.premio_rafael
+                )
+                projetos_formatados.append(self._formatar_projeto(projeto))
 
-            # Totals
-            total_valor += projeto.valor_sem_iva
-            total_premios_bruno += projeto.premio_bruno
-            total_premios_rafael += projeto.premio_rafael
-
-            # Format project for table
-            projetos_formatados.append({
-                'numero': projeto.numero,
-                'tipo': self._get_tipo_label(projeto.tipo),
-                'cliente': projeto.cliente.nome if projeto.cliente else '-',
-                'descricao': projeto.descricao[:40] + '...' if len(projeto.descricao) > 40 else projeto.descricao,
-                'valor': float(projeto.valor_sem_iva),
-                'valor_fmt': self._format_currency(float(projeto.valor_sem_iva)),
-                'estado': self._get_estado_label(projeto.estado),
-                'premio_bruno': float(projeto.premio_bruno) if projeto.premio_bruno else 0,
-                'premio_bruno_fmt': self._format_currency(float(projeto.premio_bruno)) if projeto.premio_bruno else '-',
-                'premio_rafael': float(projeto.premio_rafael) if projeto.premio_rafael else 0,
-                'premio_rafael_fmt': self._format_currency(float(projeto.premio_rafael)) if projeto.premio_rafael else '-',
-            })
+        total_valor = totais['valor']
+        total_premios_bruno = totais['premio_bruno']
+        total_premios_rafael = totais['premio_rafael']
 
         # Format statistics
         stats_tipo_fmt = []
-        for tipo_proj, stats in stats_por_tipo.items():
+        for tipo_label, stats in stats_por_tipo.items():
             stats_tipo_fmt.append({
-                'tipo': self._get_tipo_label(tipo_proj),
+                'tipo': tipo_label,
                 'count': stats['count'],
                 'valor': float(stats['valor']),
                 'valor_fmt': self._format_currency(float(stats['valor'])),
@@ -336,11 +421,11 @@ class RelatoriosManager:
             'data_inicio': data_inicio,
             'data_fim': data_fim,
             'filtros': {
-                'tipo': self._get_tipo_label(tipo) if tipo else 'Todos',
+                'tipo': self._get_tipo_label(tipo, owner) if tipo else 'Todos',
                 'estado': self._get_estado_label(estado) if estado else 'Todos'
             },
             'mostrar_premios': mostrar_premios,
-            'total_projetos': len(projetos),
+            'total_projetos': totais['count'],
             'total_valor': float(total_valor),
             'total_valor_fmt': self._format_currency(float(total_valor)),
             'total_premios_bruno': float(total_premios_bruno),
@@ -352,13 +437,104 @@ class RelatoriosManager:
             'projetos': projetos_formatados
         }
 
+    def _filtrar_projetos(self, query, tipo=None, estado=None, data_inicio=None, data_fim=None,
+                          projeto_ids=None, owner=None):
+        """Aplica os filtros do relatório de projetos a uma query"""
+        if projeto_ids:
+            # If specific project IDs provided, filter by those (overrides other filters)
+            return query.filter(Projeto.id.in_(projeto_ids))
+
+        # Otherwise apply standard filters
+        if tipo:
+            query = query.filter(Projeto.tipo == tipo)
+        if owner:
+            query = query.filter(Projeto.owner == owner)
+        if estado:
+            query = query.filter(Projeto.estado == estado)
+        if data_inicio:
+            query = query.filter(Projeto.data_inicio >= data_inicio)
+        if data_fim:
+            query = query.filter(Projeto.data_inicio <= data_fim)
+        return query
+
+    def _stats_projetos_vazias(self):
+        """Estatísticas do relatório de projetos a zero: (por tipo, por estado, totais)"""
+        from database.models import TipoProjeto, EstadoProjeto
+
+        stats_por_tipo = {
+            self._get_tipo_label(TipoProjeto.EMPRESA): {'count': 0, 'valor': Decimal('0'), 'premios': Decimal('0')},
+            self._get_tipo_label(TipoProjeto.PESSOAL, 'BA'): {'count': 0, 'valor': Decimal('0'), 'premios': Decimal('0')},
+            self._get_tipo_label(TipoProjeto.PESSOAL, 'RR'): {'count': 0, 'valor': Decimal('0'), 'premios': Decimal('0')}
+        }
+
+        stats_por_estado = {
+            EstadoProjeto.ATIVO: {'count': 0, 'valor': Decimal('0')},
+            EstadoProjeto.FINALIZADO: {'count': 0, 'valor': Decimal('0')},
+            EstadoProjeto.PAGO: {'count': 0, 'valor': Decimal('0')},
+            EstadoProjeto.ANULADO: {'count': 0, 'valor': Decimal('0')}
+        }
+
+        totais = {'count': 0, 'valor': Decimal('0'), 'premio_bruno': Decimal('0'), 'premio_rafael': Decimal('0')}
+        return stats_por_tipo, stats_por_estado, totais
+
+    def _acumular_projeto(self, stats_por_tipo, stats_por_estado, totais, tipo, owner, estado,
+                          valor, premio_bruno, premio_rafael):
+        """Soma um projeto às estatísticas do relatório"""
+        from database.models import TipoProjeto
+
+        premio_bruno = premio_bruno or Decimal('0')
+        premio_rafael = premio_rafael or Decimal('0')
+
+        # Stats por tipo
+        stats_tipo = stats_por_tipo.setdefault(
+            self._get_tipo_label(tipo, owner), {'count': 0, 'valor': Decimal('0'), 'premios': Decimal('0')}
+        )
+        stats_tipo['count'] += 1
+        stats_tipo['valor'] += valor
+        if tipo == TipoProjeto.EMPRESA:
+            stats_tipo['premios'] += (premio_bruno + premio_rafael)
+
+        # Stats por estado
+        stats_por_estado[estado]['count'] += 1
+        stats_por_estado[estado]['valor'] += valor
+
+        # Totals
+        totais['count'] += 1
+        totais['valor'] += valor
+        totais['premio_bruno'] += premio_bruno
+        totais['premio_rafael'] += premio_rafael
+
+    def _formatar_projeto(self, projeto: Projeto) -> Dict[str, Any]:
+        """Linha da tabela do relatório de projetos"""
+        return {
+            'numero': projeto.numero,
+            'tipo': self._get_tipo_label(projeto.tipo, projeto.owner),
+            'cliente': projeto.cliente.nome if projeto.cliente else '-',
+            'descricao': projeto.descricao[:40] + '...' if len(projeto.descricao) > 40 else projeto.descricao,
+            'valor': float(projeto.valor_sem_iva),
+            'valor_fmt': self._format_currency(float(projeto.valor_sem_iva)),
+            'estado': self._get_estado_label(projeto.estado),
+            'premio_bruno': float(projeto.premio_bruno) if projeto.premio_bruno else 0,
+            'premio_bruno_fmt': self._format_currency(float(projeto.premio_bruno)) if projeto.premio_bruno else '-',
+            'premio_rafael': float(projeto.premio_rafael) if projeto.premio_rafael else 0,
+            'premio_rafael_fmt': self._format_currency(float(projeto.premio_rafael)) if projeto.premio_rafael else '-',
+        }
+
+    def _iterar_projetos(self, *filtros) -> Iterator[Dict[str, Any]]:
+        """Linhas do relatório de projetos lidas em lotes de LOTE_EXPORTACAO (streaming)"""
+        query = self._filtrar_projetos(self._query_relatorio(Projeto), *filtros)
+        for projeto in query.yield_per(LOTE_EXPORTACAO):
+            yield self._formatar_projeto(projeto)
+
+    @_com_cache
     def gerar_relatorio_despesas(
         self,
         tipo: Optional['TipoDespesa'] = None,
         estado: Optional['EstadoDespesa'] = None,
         data_inicio: Optional[date] = None,
         data_fim: Optional[date] = None,
-        despesa_ids: Optional[list] = None
+        despesa_ids: Optional[list] = None,
+        streaming: bool = False
     ) -> Dict[str, Any]:
         """
         Gera relatório de despesas
@@ -369,31 +545,15 @@ class RelatoriosManager:
             data_inicio: Data de início do período (opcional)
             data_fim: Data de fim do período (opcional)
             despesa_ids: Lista de IDs de despesas específicas para filtrar (opcional)
+            streaming: Para exportação - estatísticas somadas a partir das colunas
+                e 'despesas' é um gerador (lido em lotes) em vez de uma lista
 
         Returns:
             Dicionário com dados do relatório
         """
         from database.models import TipoDespesa, EstadoDespesa
 
-        # Base query
-        query = self.db_session.query(Despesa)
-
-        # Apply filters
-        if despesa_ids:
-            # If specific despesa IDs provided, filter by those (overrides other filters)
-            query = query.filter(Despesa.id.in_(despesa_ids))
-        else:
-            # Otherwise apply standard filters
-            if tipo:
-                query = query.filter(Despesa.tipo == tipo)
-            if estado:
-                query = query.filter(Despesa.estado == estado)
-            if data_inicio:
-                query = query.filter(Despesa.data >= data_inicio)
-            if data_fim:
-                query = query.filter(Despesa.data <= data_fim)
-
-        despesas = query.all()
+        filtros = (tipo, estado, data_inicio, data_fim, despesa_ids)
 
         # Calculate statistics
         stats_por_tipo = {
@@ -410,37 +570,46 @@ class RelatoriosManager:
             EstadoDespesa.PAGO: {'count': 0, 'valor': Decimal('0')}
         }
 
+        total_despesas = 0
         total_valor_sem_iva = Decimal('0')
         total_valor_com_iva = Decimal('0')
 
-        despesas_formatadas = []
+        if streaming:
+            # Totais de uma query só com as colunas somadas, lida em lotes;
+            # as linhas completas só são lidas durante a exportação
+            valores = self._filtrar_despesas(
+                self.db_session.query(Despesa.tipo, Despesa.estado, Despesa.valor_sem_iva, Despesa.valor_com_iva),
+                *filtros
+            )
+            for tipo_desp, estado_desp, valor_sem_iva, valor_com_iva in valores.yield_per(LOTE_EXPORTACAO):
+                stats_por_tipo[tipo_desp]['count'] += 1
+                stats_por_tipo[tipo_desp]['valor'] += valor_com_iva
+                stats_por_estado[estado_desp]['count'] += 1
+                stats_por_estado[estado_desp]['valor'] += valor_com_iva
+                total_despesas += 1
+                total_valor_sem_iva += valor_sem_iva
+                total_valor_com_iva += valor_com_iva
+            despesas_formatadas = self._iterar_despesas(*filtros)
+        else:
+            despesas = self._filtrar_despesas(self._query_relatorio(Despesa), *filtros).all()
+            total_despesas = len(despesas)
+            despesas_formatadas = []
+
+            for despesa in despesas:
+                # Stats por tipo
+                stats_por_tipo[despesa.tipo]['count'] += 1
+                stats_por_tipo[despesa.tipo]['valor'] += despesa.valor_com_iva
 
-        for despesa in despesas:
-            # Stats por tipo
-            stats_por_tipo[despesa.tipo]['count'] += 1
-            stats_por_tipo[despesa.tipo]['valor'] += despesa.valor_com_iva
+                # Stats por estado
+                stats_por_estado[despesa.estado]['count'] += 1
+                stats_por_estado[despesa.estado]['valor'] += despesa.valor_com_iva
 
-            # Stats por estado
-            stats_por_estado[despesa.estado]['count'] += 1
-            stats_por_estado[despesa.estado]['valor'] += despesa.valor_com_iva
+                # Totals
+                total_valor_sem_iva += despesa.valor_sem_iva
+                total_valor_com_iva += despesa.valor_com_iva
 
-            # Totals
-            total_valor_sem_iva += despesa.valor_sem_iva
-            total_valor_com_iva += despesa.valor_com_iva
-
-            # Format despesa for table
-            despesas_formatadas.append({
-                'numero': despesa.numero,
-                'tipo': self._get_tipo_despesa_label(despesa.tipo),
-                'credor': despesa.credor.nome if despesa.credor else '-',
-                'descricao': despesa.descricao[:40] + '...' if len(despesa.descricao) > 40 else despesa.descricao,
-                'data': despesa.data.strftime("%Y-%m-%d") if despesa.data else '-',
-                'valor_sem_iva': float(despesa.valor_sem_iva),
-                'valor_sem_iva_fmt': self._format_currency(float(despesa.valor_sem_iva)),
-                'valor_com_iva': float(despesa.valor_com_iva),
-                'valor_com_iva_fmt': self._format_currency(float(despesa.valor_com_iva)),
-                'estado': self._get_estado_despesa_label(despesa.estado),
-            })
+                # Format despesa for table
+                despesas_formatadas.append(self._formatar_despesa(despesa))
 
         # Format statistics
         stats_tipo_fmt = []
@@ -474,7 +643,7 @@ class RelatoriosManager:
                 'tipo': self._get_tipo_despesa_label(tipo) if tipo else 'Todos',
                 'estado': self._get_estado_despesa_label(estado) if estado else 'Todos'
             },
-            'total_despesas': len(despesas),
+            'total_despesas': total_despesas,
             'total_valor_sem_iva': float(total_valor_sem_iva),
             'total_valor_sem_iva_fmt': self._format_currency(float(total_valor_sem_iva)),
             'total_valor_com_iva': float(total_valor_com_iva),
@@ -484,6 +653,45 @@ class RelatoriosManager:
             'despesas': despesas_formatadas
         }
 
+    def _filtrar_despesas(self, query, tipo=None, estado=None, data_inicio=None, data_fim=None,
+                          despesa_ids=None):
+        """Aplica os filtros do relatório de despesas a uma query"""
+        if despesa_ids:
+            # If specific despesa IDs provided, filter by those (overrides other filters)
+            return query.filter(Despesa.id.in_(despesa_ids))
+
+        # Otherwise apply standard filters
+        if tipo:
+            query = query.filter(Despesa.tipo == tipo)
+        if estado:
+            query = query.filter(Despesa.estado == estado)
+        if data_inicio:
+            query = query.filter(Despesa.data >= data_inicio)
+        if data_fim:
+            query = query.filter(Despesa.data <= data_fim)
+        return query
+
+    def _formatar_despesa(self, despesa: Despesa) -> Dict[str, Any]:
+        """Linha da tabela do relatório de despesas"""
+        return {
+            'numero': despesa.numero,
+            'tipo': self._get_tipo_despesa_label(despesa.tipo),
+            'credor': despesa.credor.nome if despesa.credor else '-',
+            'descricao': despesa.descricao[:40] + '...' if len(despesa.descricao) > 40 else despesa.descricao,
+            'data': despesa.data.strftime("%Y-%m-%d") if despesa.data else '-',
+            'valor_sem_iva': float(despesa.valor_sem_iva),
+            'valor_sem_iva_fmt': self._format_currency(float(despesa.valor_sem_iva)),
+            'valor_com_iva': float(despesa.valor_com_iva),
+            'valor_com_iva_fmt': self._format_currency(float(despesa.valor_com_iva)),
+            'estado': self._get_estado_despesa_label(despesa.estado),
+        }
+
+    def _iterar_despesas(self, *filtros) -> Iterator[Dict[str, Any]]:
+        """Linhas do relatório de despesas lidas em lotes de LOTE_EXPORTACAO (streaming)"""
+        query = self._filtrar_despesas(self._query_relatorio(Despesa), *filtros)
+        for despesa in query.yield_per(LOTE_EXPORTACAO):
+            yield self._formatar_despesa(despesa)
+
     def _get_tipo_despesa_label(self, tipo: 'TipoDespesa') -> str:
         """Get tipo despesa label in Portuguese"""
         from database.models import TipoDespesa
@@ -506,6 +714,7 @@ class RelatoriosManager:
         }
         return mapping.get(estado, str(estado))
 
+    @_com_cache
     def gerar_relatorio_boletins(
         self,
         socio: Optional['Socio'] = None,
@@ -530,7 +739,7 @@ class RelatoriosManager:
         from database.models import Socio, EstadoBoletim, Boletim
 
         # Base query
-        query = self.db_session.query(Boletim)
+        query = self._query_relatorio(Boletim)
 
         # Apply filters
         if boletim_ids:
@@ -637,13 +846,13 @@ class RelatoriosManager:
         }
         return mapping.get(estado, str(estado))
 
-    def _get_tipo_label(self, tipo: 'TipoProjeto') -> str:
-        """Get tipo label in Portuguese"""
+    def _get_tipo_label(self, tipo: 'TipoProjeto', owner: Optional[str] = None) -> str:
+        """Get tipo label in Portuguese (projetos pessoais pelo owner: 'Pessoal BA' / 'Pessoal RR')"""
         from database.models import TipoProjeto
+        if tipo == TipoProjeto.PESSOAL:
+            return f"Pessoal {owner}" if owner else "Pessoal"
         mapping = {
             TipoProjeto.EMPRESA: "Empresa",
-            TipoProjeto.PESSOAL_BRUNO: "Pessoal BA",
-            TipoProjeto.PESSOAL_RAFAEL: "Pessoal RR"
         }
         return mapping.get(tipo, str(tipo))
 
@@ -668,8 +877,9 @@ class RelatoriosManager:
             projetos_pessoais = []  # Não mostrar BA se filtro é RR
         else:
             # "todos" ou "bruno" - mostrar projetos pessoais BA
-            projetos_pessoais = self.db_session.query(Projeto).filter(
-                Projeto.tipo == TipoProjeto.PESSOAL_BRUNO,
+            projetos_pessoais = self._query_relatorio(Projeto).filter(
+                Projeto.tipo == TipoProjeto.PESSOAL,
+                Projeto.owner == 'BA',
                 Projeto.estado == EstadoProjeto.PAGO
             ).all()
 
@@ -677,25 +887,26 @@ class RelatoriosManager:
         if filtro_tipo in ["bruno", "rafael"]:
             projetos_premios = []  # Não mostrar prémios se filtro é só pessoais
         else:
-            # "todos" ou "empresa" - mostrar prémios
-            projetos_premios = self.db_session.query(Projeto).filter(
+            # "todos" ou "empresa" - mostrar prémios (só de projetos pagos, como no saldo)
+            projetos_premios = self._query_relatorio(Projeto).filter(
+                Projeto.estado == EstadoProjeto.PAGO,
                 Projeto.premio_bruno > 0
             ).all()
 
         # Despesas fixas pagas
-        despesas_fixas = self.db_session.query(Despesa).filter(
+        despesas_fixas = self._query_relatorio(Despesa).filter(
             Despesa.tipo == TipoDespesa.FIXA_MENSAL,
             Despesa.estado == EstadoDespesa.PAGO
         ).all()
 
         # Boletins pagos
-        boletins = self.db_session.query(Boletim).filter(
+        boletins = self._query_relatorio(Boletim).filter(
             Boletim.socio == Socio.BA,
             Boletim.estado == EstadoBoletim.PAGO
         ).all()
 
         # Despesas pessoais pagas
-        despesas_pessoais = self.db_session.query(Despesa).filter(
+        despesas_pessoais = self._query_relatorio(Despesa).filter(
             Despesa.tipo == TipoDespesa.PESSOAL_BA,
             Despesa.estado == EstadoDespesa.PAGO
         ).all()
@@ -718,8 +929,9 @@ class RelatoriosManager:
             projetos_pessoais = []  # Não mostrar RR se filtro é BA
         else:
             # "todos" ou "rafael" - mostrar projetos pessoais RR
-            projetos_pessoais = self.db_session.query(Projeto).filter(
-                Projeto.tipo == TipoProjeto.PESSOAL_RAFAEL,
+            projetos_pessoais = self._query_relatorio(Projeto).filter(
+                Projeto.tipo == TipoProjeto.PESSOAL,
+                Projeto.owner == 'RR',
                 Projeto.estado == EstadoProjeto.PAGO
             ).all()
 
@@ -727,25 +939,26 @@ class RelatoriosManager:
         if filtro_tipo in ["bruno", "rafael"]:
             projetos_premios = []  # Não mostrar prémios se filtro é só pessoais
         else:
-            # "todos" ou "empresa" - mostrar prémios
-            projetos_premios = self.db_session.query(Projeto).filter(
+            # "todos" ou "empresa" - mostrar prémios (só de projetos pagos, como no saldo)
+            projetos_premios = self._query_relatorio(Projeto).filter(
+                Projeto.estado == EstadoProjeto.PAGO,
                 Projeto.premio_rafael > 0
             ).all()
 
         # Despesas fixas pagas
-        despesas_fixas = self.db_session.query(Despesa).filter(
+        despesas_fixas = self._query_relatorio(Despesa).filter(
             Despesa.tipo == TipoDespesa.FIXA_MENSAL,
             Despesa.estado == EstadoDespesa.PAGO
         ).all()
 
         # Boletins pagos
-        boletins = self.db_session.query(Boletim).filter(
+        boletins = self._query_relatorio(Boletim).filter(
             Boletim.socio == Socio.RR,
             Boletim.estado == EstadoBoletim.PAGO
         ).all()
 
         # Despesas pessoais pagas
-        despesas_pessoais = self.db_session.query(Despesa).filter(
+        despesas_pessoais = self._query_relatorio(Despesa).filter(
             Despesa.tipo == TipoDespesa.PESSOAL_RR,
             Despesa.estado == EstadoDespesa.PAGO
         ).all()
@@ -842,7 +1055,7 @@ class RelatoriosManager:
             'total_ins_valor': ins['total'],
             'outs': [
                 {'label': 'Despesas Fixas (50%)', 'valor': self._format_currency(outs['despesas_fixas'])},
-                {'label': 'Boletins Pagos', 'valor': self._format_currency(outs['boletins'])},
+                {'label': 'Boletins Pagos', 'valor': self._format_currency(outs['boletins_pagos'])},
                 {'label': 'Despesas Pessoais', 'valor': self._format_currency(outs['despesas_pessoais'])}
             ],
             'total_outs': self._format_currency(outs['total']),
@@ -874,7 +1087,7 @@ class RelatoriosManager:
             'total_ins_valor': ins['total'],
             'outs': [
                 {'label': 'Despesas Fixas (50%)', 'valor': self._format_currency(outs['despesas_fixas'])},
-                {'label': 'Boletins Pagos', 'valor': self._format_currency(outs['boletins'])},
+                {'label': 'Boletins Pagos', 'valor': self._format_currency(outs['boletins_pagos'])},
                 {'label': 'Despesas Pessoais', 'valor': self._format_currency(outs['despesas_pessoais'])}
             ],
             'total_outs': self._format_currency(outs['total']),
@@ -912,6 +1125,8 @@ class RelatoriosManager:
             self._exportar_pdf_financeiro(report_data, filename)
         elif tipo == 'projetos':
             self._exportar_pdf_projetos(report_data, filename)
+        elif tipo == 'despesas':
+            self._exportar_pdf_despesas(report_data, filename)
         else:
             raise ValueError(f"Tipo de relatório não suportado: {tipo}")
 
@@ -1355,267 +1570,68 @@ class RelatoriosManager:
             self._exportar_excel_financeiro(report_data, filename)
         elif tipo == 'projetos':
             self._exportar_excel_projetos(report_data, filename)
+        elif tipo == 'despesas':
+            self._exportar_excel_despesas(report_data, filename)
         else:
             raise ValueError(f"Tipo de relatório não suportado: {tipo}")
 
     def _exportar_excel_saldos(self, report_data: Dict[str, Any], filename: str):
         """Export Saldos report to Excel"""
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from openpyxl.utils import get_column_letter
-
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Saldos Pessoais"
-
-        # Set column widths
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 18
-
-        row = 1
-
-        # Title
-        ws.merge_cells(f'A{row}:B{row}')
-        cell = ws[f'A{row}']
-        cell.value = report_data['titulo']
-        cell.font = Font(size=18, bold=True, color="2196F3")
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        row += 1
+        from logic.exportacao_streaming import criar_workbook, FolhaStreaming
+
+        # Listas detalhadas: (chave, título, colunas, campos)
+        seccoes_detalhe = [
+            ('projetos_pessoais_list', "💼 Projetos Pessoais", ['Nº', 'Cliente', 'Valor', 'Data'],
+             ['numero', 'cliente', 'valor_fmt', 'data']),
+            ('premios_list', "🏆 Prémios", ['Nº', 'Cliente', 'Prémio', 'Tipo'],
+             ['numero', 'cliente', 'premio_fmt', 'tipo']),
+            ('despesas_fixas_list', "🏢 Despesas Fixas - 50%", ['Nº', 'Fornecedor', 'Valor 50%', 'Data'],
+             ['numero', 'fornecedor', 'valor_50_fmt', 'data']),
+            ('boletins_list', "📄 Boletins Pagos", ['Nº', 'Descrição', 'Valor', 'Data Pag.'],
+             ['numero', 'descricao', 'valor_fmt', 'data_pagamento']),
+            ('despesas_pessoais_list', "💳 Despesas Pessoais", ['Nº', 'Fornecedor', 'Valor', 'Data'],
+             ['numero', 'fornecedor', 'valor_fmt', 'data']),
+        ]
 
-        # Period
-        if report_data['periodo']:
-            ws.merge_cells(f'A{row}:B{row}')
-            cell = ws[f'A{row}']
-            cell.value = report_data['periodo']
-            cell.font = Font(size=11, color="666666")
-            cell.alignment = Alignment(horizontal='center')
-            row += 1
-
-        # Generation date
-        ws.merge_cells(f'A{row}:B{row}')
-        cell = ws[f'A{row}']
-        cell.value = f"Gerado em: {report_data['data_geracao']}"
-        cell.font = Font(size=10, color="999999")
-        cell.alignment = Alignment(horizontal='center')
-        row += 2
+        wb = criar_workbook()
+        folha = FolhaStreaming(wb, "Saldos Pessoais", {'A': 12, 'B': 35, 'C': 15, 'D': 15})
+        folha.cabecalho_relatorio(report_data, 'B')
 
         # For each socio
         for socio_data in report_data['socios']:
-            # Socio name
-            ws.merge_cells(f'A{row}:B{row}')
-            cell = ws[f'A{row}']
-            cell.value = socio_data['nome']
-            cell.font = Font(size=14, bold=True)
-            cell.alignment = Alignment(horizontal='center')
-            cell.fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-            row += 1
-
-            # Saldo
-            ws.merge_cells(f'A{row}:B{row}')
-            cell = ws[f'A{row}']
-            cell.value = f"SALDO ATUAL: {socio_data['saldo']}"
-            cell.font = Font(size=16, bold=True, color="1976D2")
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.fill = PatternFill(start_color="BBDEFB", end_color="BBDEFB", fill_type="solid")
-            ws.row_dimensions[row].height = 30
-            row += 2
-
-            # INs header
-            ws[f'A{row}'].value = "RECEITAS (INs)"
-            ws[f'A{row}'].font = Font(bold=True, color="FFFFFF")
-            ws[f'A{row}'].fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-            ws[f'B{row}'].fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-            row += 1
+            folha.linha([socio_data['nome']], ['rel_socio'], fundir='B')
+            folha.linha([f"SALDO ATUAL: {socio_data['saldo']}"], ['rel_saldo'], fundir='B', altura=30)
+            folha.vazia()
 
-            # INs items
+            # INs
+            folha.linha(["RECEITAS (INs)", None], ['rel_ins', 'rel_ins'])
             for item in socio_data['ins']:
-                ws[f'A{row}'].value = item['label']
-                ws[f'B{row}'].value = item['valor']
-                ws[f'B{row}'].alignment = Alignment(horizontal='right')
-                row += 1
-
-            # INs total
-            ws[f'A{row}'].value = "TOTAL INs"
-            ws[f'A{row}'].font = Font(bold=True)
-            ws[f'B{row}'].value = socio_data['total_ins']
-            ws[f'B{row}'].font = Font(bold=True)
-            ws[f'B{row}'].alignment = Alignment(horizontal='right')
-            ws[f'A{row}'].fill = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
-            ws[f'B{row}'].fill = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
-            row += 2
-
-            # OUTs header
-            ws[f'A{row}'].value = "DESPESAS (OUTs)"
-            ws[f'A{row}'].font = Font(bold=True, color="FFFFFF")
-            ws[f'A{row}'].fill = PatternFill(start_color="F44336", end_color="F44336", fill_type="solid")
-            ws[f'B{row}'].fill = PatternFill(start_color="F44336", end_color="F44336", fill_type="solid")
-            row += 1
+                folha.linha([item['label'], item['valor']], [None, 'rel_valor'])
+            folha.linha(["TOTAL INs", socio_data['total_ins']], ['rel_ins_total', 'rel_ins_total_valor'])
+            folha.vazia()
 
-            # OUTs items
+            # OUTs
+            folha.linha(["DESPESAS (OUTs)", None], ['rel_outs', 'rel_outs'])
             for item in socio_data['outs']:
-                ws[f'A{row}'].value = item['label']
-                ws[f'B{row}'].value = item['valor']
-                ws[f'B{row}'].alignment = Alignment(horizontal='right')
-                row += 1
-
-            # OUTs total
-            ws[f'A{row}'].value = "TOTAL OUTs"
-            ws[f'A{row}'].font = Font(bold=True)
-            ws[f'B{row}'].value = socio_data['total_outs']
-            ws[f'B{row}'].font = Font(bold=True)
-            ws[f'B{row}'].alignment = Alignment(horizontal='right')
-            ws[f'A{row}'].fill = PatternFill(start_color="FFEBEE", end_color="FFEBEE", fill_type="solid")
-            ws[f'B{row}'].fill = PatternFill(start_color="FFEBEE", end_color="FFEBEE", fill_type="solid")
-            row += 2
+                folha.linha([item['label'], item['valor']], [None, 'rel_valor'])
+            folha.linha(["TOTAL OUTs", socio_data['total_outs']], ['rel_outs_total', 'rel_outs_total_valor'])
+            folha.vazia()
 
             # Detailed Lists
-            # First, adjust column widths for details
-            ws.column_dimensions['A'].width = 12
-            ws.column_dimensions['B'].width = 35
-            ws.column_dimensions['C'].width = 15
-            ws.column_dimensions['D'].width = 15
-
-            # Detailed section title
-            ws.merge_cells(f'A{row}:D{row}')
-            cell = ws[f'A{row}']
-            cell.value = f"Detalhes - {socio_data['nome']}"
-            cell.font = Font(size=13, bold=True, color="1976D2")
-            cell.alignment = Alignment(horizontal='center')
-            cell.fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-            row += 2
-
-            # Helper to create detail headers
-            def create_detail_header(row_num, title, cols='A:D'):
-                ws.merge_cells(f'{cols[0]}{row_num}:{cols[-1]}{row_num}')
-                cell = ws[f'{cols[0]}{row_num}']
-                cell.value = title
-                cell.font = Font(size=11, bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="424242", end_color="424242", fill_type="solid")
-                cell.alignment = Alignment(horizontal='left')
-                return row_num + 1
-
-            # Projetos Pessoais
-            if socio_data.get('projetos_pessoais_list'):
-                row = create_detail_header(row, f"💼 Projetos Pessoais ({len(socio_data['projetos_pessoais_list'])} items)")
-
-                # Column headers
-                ws[f'A{row}'].value = 'Nº'
-                ws[f'B{row}'].value = 'Cliente'
-                ws[f'C{row}'].value = 'Valor'
-                ws[f'D{row}'].value = 'Data'
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].font = Font(bold=True)
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="BDBDBD", end_color="BDBDBD", fill_type="solid")
-                row += 1
-
-                # Data rows
-                for proj in socio_data['projetos_pessoais_list']:
-                    ws[f'A{row}'].value = proj['numero']
-                    ws[f'B{row}'].value = proj['cliente']
-                    ws[f'C{row}'].value = proj['valor_fmt']
-                    ws[f'C{row}'].alignment = Alignment(horizontal='right')
-                    ws[f'D{row}'].value = proj['data']
-                    row += 1
-                row += 1
+            folha.linha([f"Detalhes - {socio_data['nome']}"], ['rel_seccao'], fundir='D')
+            folha.vazia()
 
-            # Prémios
-            if socio_data.get('premios_list'):
-                row = create_detail_header(row, f"🏆 Prémios ({len(socio_data['premios_list'])} items)")
-
-                # Column headers
-                ws[f'A{row}'].value = 'Nº'
-                ws[f'B{row}'].value = 'Cliente'
-                ws[f'C{row}'].value = 'Prémio'
-                ws[f'D{row}'].value = 'Tipo'
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].font = Font(bold=True)
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="BDBDBD", end_color="BDBDBD", fill_type="solid")
-                row += 1
-
-                # Data rows
-                for premio in socio_data['premios_list']:
-                    ws[f'A{row}'].value = premio['numero']
-                    ws[f'B{row}'].value = premio['cliente']
-                    ws[f'C{row}'].value = premio['premio_fmt']
-                    ws[f'C{row}'].alignment = Alignment(horizontal='right')
-                    ws[f'D{row}'].value = premio['tipo']
-                    row += 1
-                row += 1
-
-            # Despesas Fixas
-            if socio_data.get('despesas_fixas_list'):
-                row = create_detail_header(row, f"🏢 Despesas Fixas - 50% ({len(socio_data['despesas_fixas_list'])} items)")
-
-                # Column headers
-                ws[f'A{row}'].value = 'Nº'
-                ws[f'B{row}'].value = 'Fornecedor'
-                ws[f'C{row}'].value = 'Valor 50%'
-                ws[f'D{row}'].value = 'Data'
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].font = Font(bold=True)
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="BDBDBD", end_color="BDBDBD", fill_type="solid")
-                row += 1
-
-                # Data rows
-                for desp in socio_data['despesas_fixas_list']:
-                    ws[f'A{row}'].value = desp['numero']
-                    ws[f'B{row}'].value = desp['fornecedor']
-                    ws[f'C{row}'].value = desp['valor_50_fmt']
-                    ws[f'C{row}'].alignment = Alignment(horizontal='right')
-                    ws[f'D{row}'].value = desp['data']
-                    row += 1
-                row += 1
-
-            # Boletins
-            if socio_data.get('boletins_list'):
-                row = create_detail_header(row, f"📄 Boletins Pagos ({len(socio_data['boletins_list'])} items)")
-
-                # Column headers
-                ws[f'A{row}'].value = 'Nº'
-                ws[f'B{row}'].value = 'Descrição'
-                ws[f'C{row}'].value = 'Valor'
-                ws[f'D{row}'].value = 'Data Pag.'
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].font = Font(bold=True)
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="BDBDBD", end_color="BDBDBD", fill_type="solid")
-                row += 1
-
-                # Data rows
-                for bol in socio_data['boletins_list']:
-                    ws[f'A{row}'].value = bol['numero']
-                    ws[f'B{row}'].value = bol['descricao']
-                    ws[f'C{row}'].value = bol['valor_fmt']
-                    ws[f'C{row}'].alignment = Alignment(horizontal='right')
-                    ws[f'D{row}'].value = bol['data_pagamento']
-                    row += 1
-                row += 1
+            for chave, titulo, colunas, campos in seccoes_detalhe:
+                itens = socio_data.get(chave)
+                if not itens:
+                    continue
+                folha.linha([f"{titulo} ({len(itens)} items)"], ['rel_detalhe'], fundir='D')
+                folha.linha(colunas, ['rel_colunas'] * len(colunas))
+                for item in itens:
+                    folha.linha([item[campo] for campo in campos], [None, None, 'rel_valor', None])
+                folha.vazia()
 
-            # Despesas Pessoais
-            if socio_data.get('despesas_pessoais_list'):
-                row = create_detail_header(row, f"💳 Despesas Pessoais ({len(socio_data['despesas_pessoais_list'])} items)")
-
-                # Column headers
-                ws[f'A{row}'].value = 'Nº'
-                ws[f'B{row}'].value = 'Fornecedor'
-                ws[f'C{row}'].value = 'Valor'
-                ws[f'D{row}'].value = 'Data'
-                for col in ['A', 'B', 'C', 'D']:
-                    ws[f'{col}{row}'].font = Font(bold=True)
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="BDBDBD", end_color="BDBDBD", fill_type="solid")
-                row += 1
-
-                # Data rows
-                for desp in socio_data['despesas_pessoais_list']:
-                    ws[f'A{row}'].value = desp['numero']
-                    ws[f'B{row}'].value = desp['fornecedor']
-                    ws[f'C{row}'].value = desp['valor_fmt']
-                    ws[f'C{row}'].alignment = Alignment(horizontal='right')
-                    ws[f'D{row}'].value = desp['data']
-                    row += 1
-                row += 1
-
-            row += 2
+            folha.vazia(2)
 
         # Save
         wb.save(filename)
@@ -1712,22 +1728,36 @@ class RelatoriosManager:
 
         wb.save(filename)
 
-    def _exportar_pdf_projetos(self, report_data: Dict[str, Any], filename: str):
-        """Export Projetos report to PDF"""
+    def _exportar_pdf_listagem(self, report_data: Dict[str, Any], filename: str, resumo: List[str],
+                               cabecalho: List[str], linhas: Iterator[List[Any]], col_widths: List[float],
+                               cor_cabecalho: str):
+        """
+        Exporta um relatório de listagem (projetos, despesas) para PDF em streaming
+
+        A história do documento é um gerador: as linhas são lidas e partidas em
+        tabelas pequenas à medida que o reportlab as paginar, e o cabeçalho das
+        colunas é redesenhado no topo de cada página seguinte.
+
+        Args:
+            report_data: Dados do relatório
+            filename: Nome do arquivo
+            resumo: Células da tabela de resumo
+            cabecalho: Cabeçalho das colunas
+            linhas: Linhas da tabela (gerador)
+            col_widths: Larguras das colunas
+            cor_cabecalho: Cor de fundo do cabeçalho das colunas
+        """
         from reportlab.lib.pagesizes import A4, landscape
         from reportlab.lib import colors
         from reportlab.lib.units import cm
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.enums import TA_CENTER
+        from logic.exportacao_streaming import FlowablesStreaming, tabelas_pdf, desenhar_cabecalho_tabela
 
         doc = SimpleDocTemplate(filename, pagesize=landscape(A4))
-        elements = []
         styles = getSampleStyleSheet()
 
-        # Add header with logo (landscape width)
-        elements.extend(self._criar_header_pdf(styles))
-
         # Styles
         title_style = ParagraphStyle(
             'CustomTitle',
@@ -1747,39 +1777,75 @@ class RelatoriosManager:
             spaceAfter=20
         )
 
-        # Title and metadata
-        elements.append(Paragraph(report_data['titulo'], title_style))
-        if report_data['periodo']:
-            elements.append(Paragraph(report_data['periodo'], subtitle_style))
-        elements.append(Paragraph(f"Gerado em: {report_data['data_geracao']}", subtitle_style))
-        elements.append(Spacer(1, 0.3*cm))
+        estilo_cabecalho = [
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor(cor_cabecalho)),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]
+
+        estilo_linhas = [
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
+        ]
+
+        def historia():
+            # Add header with logo (landscape width)
+            yield from self._criar_header_pdf(styles)
 
-        # Summary stats
-        summary_data = [[
+            # Title and metadata
+            yield Paragraph(report_data['titulo'], title_style)
+            if report_data['periodo']:
+                yield Paragraph(report_data['periodo'], subtitle_style)
+            yield Paragraph(f"Gerado em: {report_data['data_geracao']}", subtitle_style)
+            yield Spacer(1, 0.3*cm)
+
+            # Summary stats
+            summary_table = Table([resumo], colWidths=[5*cm] * len(resumo))
+            summary_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#E3F2FD')),
+                ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#1976D2')),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 10),
+            ]))
+            yield summary_table
+            yield Spacer(1, 0.5*cm)
+
+            # Column header (first page); later pages get it from onLaterPages
+            tabela_cabecalho = Table([cabecalho], colWidths=col_widths)
+            tabela_cabecalho.setStyle(TableStyle(estilo_cabecalho))
+            yield tabela_cabecalho
+
+            # All rows, in small tables
+            yield from tabelas_pdf(linhas, col_widths, estilo_linhas)
+
+        doc.build(
+            FlowablesStreaming(historia()),
+            onLaterPages=desenhar_cabecalho_tabela(cabecalho, col_widths, estilo_cabecalho)
+        )
+
+    def _exportar_pdf_projetos(self, report_data: Dict[str, Any], filename: str):
+        """Export Projetos report to PDF"""
+        from reportlab.lib.units import cm
+
+        resumo = [
             f"Total: {report_data['total_projetos']} projetos",
             f"Valor Total: {report_data['total_valor_fmt']}",
             f"Prémios BA: {report_data['total_premios_bruno_fmt']}",
             f"Prémios RR: {report_data['total_premios_rafael_fmt']}"
-        ]]
-
-        summary_table = Table(summary_data, colWidths=[5*cm, 5*cm, 5*cm, 5*cm])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#E3F2FD')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#1976D2')),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-        ]))
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.5*cm))
-
-        # Projects table - show ALL projects
-        table_data = [['Nº', 'Tipo', 'Cliente', 'Valor', 'Prémio B', 'Prémio R', 'Estado']]
+        ]
 
-        for proj in report_data['projetos']:  # Show all projects
-            table_data.append([
+        linhas = (
+            [
                 proj['numero'],
                 proj['tipo'],
                 proj['cliente'][:15],
@@ -1787,112 +1853,126 @@ class RelatoriosManager:
                 proj.get('premio_bruno_fmt', '€0,00'),
                 proj.get('premio_rafael_fmt', '€0,00'),
                 proj['estado']
-            ])
+            ]
+            for proj in report_data['projetos']
+        )
 
-        table = Table(table_data, colWidths=[2*cm, 2.5*cm, 4.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm])
+        self._exportar_pdf_listagem(
+            report_data, filename, resumo,
+            ['Nº', 'Tipo', 'Cliente', 'Valor', 'Prémio B', 'Prémio R', 'Estado'], linhas,
+            [2*cm, 2.5*cm, 4.5*cm, 2.5*cm, 2.5*cm, 2.5*cm, 2.5*cm], '#9C27B0'
+        )
 
-        table.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#9C27B0')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            # Data rows
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F5F5F5')]),
-        ]))
-        elements.append(table)
+    def _exportar_pdf_despesas(self, report_data: Dict[str, Any], filename: str):
+        """Export Despesas report to PDF"""
+        from reportlab.lib.units import cm
 
-        doc.build(elements)
+        resumo = [
+            f"Total: {report_data['total_despesas']} despesas",
+            f"Sem IVA: {report_data['total_valor_sem_iva_fmt']}",
+            f"Com IVA: {report_data['total_valor_com_iva_fmt']}"
+        ]
+
+        linhas = (
+            [
+                desp['numero'],
+                desp['tipo'],
+                desp['credor'][:25],
+                desp['descricao'][:30],
+                desp['data'],
+                desp['valor_sem_iva_fmt'],
+                desp['valor_com_iva_fmt'],
+                desp['estado']
+            ]
+            for desp in report_data['despesas']
+        )
+
+        self._exportar_pdf_listagem(
+            report_data, filename, resumo,
+            ['Nº', 'Tipo', 'Credor', 'Descrição', 'Data', 'Sem IVA', 'Com IVA', 'Estado'], linhas,
+            [2.2*cm, 2.5*cm, 5*cm, 6*cm, 2.2*cm, 2.5*cm, 2.5*cm, 2*cm], '#F44336'
+        )
 
     def _exportar_excel_projetos(self, report_data: Dict[str, Any], filename: str):
         """Export Projetos report to Excel"""
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill
+        from logic.exportacao_streaming import criar_workbook, FolhaStreaming
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Projetos"
+        wb = criar_workbook()
+        folha = FolhaStreaming(wb, "Projetos", {
+            'A': 12, 'B': 18, 'C': 25, 'D': 40, 'E': 15, 'F': 15, 'G': 15, 'H': 18
+        })
+        folha.cabecalho_relatorio(report_data, 'H')
 
-        # Column widths
-        ws.column_dimensions['A'].width = 12
-        ws.column_dimensions['B'].width = 18
-        ws.column_dimensions['C'].width = 25
-        ws.column_dimensions['D'].width = 40
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 15
-        ws.column_dimensions['G'].width = 15
-        ws.column_dimensions['H'].width = 18
+        # Summary
+        folha.linha(
+            [f"Total: {report_data['total_projetos']} projetos | Valor: {report_data['total_valor_fmt']} | Prémios: BA {report_data['total_premios_bruno_fmt']} | RR {report_data['total_premios_rafael_fmt']}"],
+            ['rel_resumo'], fundir='H'
+        )
+        folha.vazia()
 
-        row = 1
+        # Header
+        headers = ['Nº', 'Tipo', 'Cliente', 'Descrição', 'Valor', 'Prémio BA', 'Prémio RR', 'Estado']
+        folha.linha(headers, ['rel_cabecalho_projetos'] * len(headers))
 
-        # Title
-        ws.merge_cells(f'A{row}:H{row}')
-        cell = ws[f'A{row}']
-        cell.value = report_data['titulo']
-        cell.font = Font(size=18, bold=True, color="2196F3")
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        row += 1
+        # Data rows
+        folha.tabela(
+            (
+                [
+                    proj['numero'],
+                    proj['tipo'],
+                    proj['cliente'],
+                    proj['descricao'],
+                    proj['valor_fmt'],
+                    proj.get('premio_bruno_fmt', '€0,00'),
+                    proj.get('premio_rafael_fmt', '€0,00'),
+                    proj['estado']
+                ]
+                for proj in report_data['projetos']
+            ),
+            [None, None, None, None, 'rel_valor', 'rel_valor', 'rel_valor', None],
+            ['rel_texto_alt'] * 4 + ['rel_valor_alt'] * 3 + ['rel_texto_alt']
+        )
 
-        # Period
-        if report_data['periodo']:
-            ws.merge_cells(f'A{row}:H{row}')
-            cell = ws[f'A{row}']
-            cell.value = report_data['periodo']
-            cell.font = Font(size=11, color="666666")
-            cell.alignment = Alignment(horizontal='center')
-            row += 1
+        wb.save(filename)
 
-        # Generation date
-        ws.merge_cells(f'A{row}:H{row}')
-        cell = ws[f'A{row}']
-        cell.value = f"Gerado em: {report_data['data_geracao']}"
-        cell.font = Font(size=10, color="999999")
-        cell.alignment = Alignment(horizontal='center')
-        row += 2
+    def _exportar_excel_despesas(self, report_data: Dict[str, Any], filename: str):
+        """Export Despesas report to Excel"""
+        from logic.exportacao_streaming import criar_workbook, FolhaStreaming
+
+        wb = criar_workbook()
+        folha = FolhaStreaming(wb, "Despesas", {
+            'A': 12, 'B': 15, 'C': 30, 'D': 40, 'E': 12, 'F': 15, 'G': 15, 'H': 12
+        })
+        folha.cabecalho_relatorio(report_data, 'H')
 
         # Summary
-        ws.merge_cells(f'A{row}:H{row}')
-        cell = ws[f'A{row}']
-        cell.value = f"Total: {report_data['total_projetos']} projetos | Valor: {report_data['total_valor_fmt']} | Prémios: BA {report_data['total_premios_bruno_fmt']} | RR {report_data['total_premios_rafael_fmt']}"
-        cell.font = Font(size=11, bold=True)
-        cell.fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-        cell.alignment = Alignment(horizontal='center')
-        row += 2
+        folha.linha(
+            [f"Total: {report_data['total_despesas']} despesas | Sem IVA: {report_data['total_valor_sem_iva_fmt']} | Com IVA: {report_data['total_valor_com_iva_fmt']}"],
+            ['rel_resumo'], fundir='H'
+        )
+        folha.vazia()
 
         # Header
-        headers = ['Nº', 'Tipo', 'Cliente', 'Descrição', 'Valor', 'Prémio BA', 'Prémio RR', 'Estado']
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col_idx)
-            cell.value = header
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color="9C27B0", end_color="9C27B0", fill_type="solid")
-            cell.alignment = Alignment(horizontal='center')
-        row += 1
+        headers = ['Nº', 'Tipo', 'Credor', 'Descrição', 'Data', 'Valor s/ IVA', 'Valor c/ IVA', 'Estado']
+        folha.linha(headers, ['rel_cabecalho_despesas'] * len(headers))
 
         # Data rows
-        for proj in report_data['projetos']:
-            ws[f'A{row}'].value = proj['numero']
-            ws[f'B{row}'].value = proj['tipo']
-            ws[f'C{row}'].value = proj['cliente']
-            ws[f'D{row}'].value = proj['descricao']
-            ws[f'E{row}'].value = proj['valor_fmt']
-            ws[f'E{row}'].alignment = Alignment(horizontal='right')
-            ws[f'F{row}'].value = proj.get('premio_bruno_fmt', '€0,00')
-            ws[f'F{row}'].alignment = Alignment(horizontal='right')
-            ws[f'G{row}'].value = proj.get('premio_rafael_fmt', '€0,00')
-            ws[f'G{row}'].alignment = Alignment(horizontal='right')
-            ws[f'H{row}'].value = proj['estado']
-
-            # Alternate row colors
-            if row % 2 == 0:
-                for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
-                    ws[f'{col}{row}'].fill = PatternFill(start_color="F5F5F5", end_color="F5F5F5", fill_type="solid")
-
-            row += 1
+        folha.tabela(
+            (
+                [
+                    desp['numero'],
+                    desp['tipo'],
+                    desp['credor'],
+                    desp['descricao'],
+                    desp['data'],
+                    desp['valor_sem_iva_fmt'],
+                    desp['valor_com_iva_fmt'],
+                    desp['estado']
+                ]
+                for desp in report_data['despesas']
+            ),
+            [None, None, None, None, None, 'rel_valor', 'rel_valor', None],
+            ['rel_texto_alt'] * 5 + ['rel_valor_alt'] * 2 + ['rel_texto_alt']
+        )
 
         wb.save(filename)
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""
+Ledger de movimentos de saldos (tabela saldo_movimentos)
+
+Cada Projeto/Despesa/Boletim que afeta os saldos pessoais gera uma ou mais
+linhas com sinal (IN positivo, OUT negativo) por sócio. Os managers chamam
+sincronizar_*() antes de cada commit, pelo que os saldos podem ser obtidos
+com somas por intervalo de datas sobre o ledger (ver SaldosCalculator com
+usar_ledger=True) em vez de re-agregar as tabelas base.
+
+As regras de cada componente são as mesmas de SaldosCalculator._calcular_saldo:
+- projetos_pessoais / pessoais_nao_faturados: projetos PESSOAL PAGOS / FINALIZADOS do owner
+- premios / premios_nao_faturados: prémios > 0 de projetos PAGOS / FINALIZADOS
+- despesas_fixas: despesas FIXA_MENSAL PAGAS, metade para cada sócio
+- despesas_pessoais: despesas PESSOAL_BA / PESSOAL_RR PAGAS
+- boletins_pagos / boletins_pendentes: boletins do sócio por estado
+
+O 'valor' de um boletim importado pode ficar gravado com mais de 2 casas
+decimais (dias x valor/dia, ex: 0.25 x 72.65 = 18.1625), que o ORM arredonda
+ao cêntimo ao ler. Os movimentos de boletins são por isso gerados em SQL a
+partir da linha gravada (INSERT ... SELECT), com o valor tal como está na
+tabela: as somas do ledger dão o mesmo que as de SaldosCalculator sobre as
+tabelas base.
+"""
+import logging
+import weakref
+from decimal import Decimal
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import inspect, delete, insert, select, case, literal
+
+from database.models import (
+    Projeto, TipoProjeto, EstadoProjeto,
+    Despesa, TipoDespesa, EstadoDespesa,
+    Boletim, Socio, EstadoBoletim,
+    SaldoMovimento
+)
+
+logger = logging.getLogger(__name__)
+
+# Componentes do ledger e respetivo sinal (IN = +1, OUT = -1)
+COMPONENTES = {
+    'projetos_pessoais': 1,
+    'premios': 1,
+    'pessoais_nao_faturados': 1,
+    'premios_nao_faturados': 1,
+    'despesas_fixas': -1,
+    'despesas_pessoais': -1,
+    'boletins_pagos': -1,
+    'boletins_pendentes': -1,
+}
+
+ORIGEM_PROJETO = 'PROJETO'
+ORIGEM_DESPESA = 'DESPESA'
+ORIGEM_BOLETIM = 'BOLETIM'
+
+
+# Cache (por engine) da existência da tabela saldo_movimentos
+_ledger_disponivel = weakref.WeakKeyDictionary()
+
+
+class SaldoMovimentosManager:
+    """
+    Gestor do ledger de saldos - sincronização e reconstrução
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize manager
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db_session = db_session
+
+    def ledger_disponivel(self) -> bool:
+        """
+        Verifica se a tabela saldo_movimentos existe (migration 029)
+
+        Enquanto a migration não for aplicada, a sincronização é ignorada
+        e os saldos continuam a ser calculados a partir das tabelas base.
+        """
+        engine = self.db_session.get_bind().engine
+        if engine not in _ledger_disponivel:
+            _ledger_disponivel[engine] = inspect(engine).has_table(SaldoMovimento.__tablename__)
+        return _ledger_disponivel[engine]
+
+    # ========== Sincronização (chamada pelos managers antes do commit) ==========
+
+    def sincronizar_projeto(self, projeto: Projeto):
+        """Substitui os movimentos de um projeto (requer projeto.id - fazer flush antes)"""
+        if self.ledger_disponivel():
+            self._substituir(ORIGEM_PROJETO, projeto.id, self._movimentos_projeto(projeto))
+
+    def sincronizar_despesa(self, despesa: Despesa):
+        """Substitui os movimentos de uma despesa (requer despesa.id - fazer flush antes)"""
+        if self.ledger_disponivel():
+            self._substituir(ORIGEM_DESPESA, despesa.id, self._movimentos_despesa(despesa))
+
+    def sincronizar_boletim(self, boletim: Boletim):
+        """Substitui os movimentos de um boletim (requer boletim.id - fazer flush antes)"""
+        if self.ledger_disponivel():
+            self._substituir_boletins([boletim.id])
+
+    def sincronizar_lote(self, origem_tipo: str, ids, lote: int = 500) -> int:
+        """
+        Substitui os movimentos de vários registos da mesma origem (imports em bulk)
+
+        Args:
+            origem_tipo: ORIGEM_PROJETO, ORIGEM_DESPESA ou ORIGEM_BOLETIM
+            ids: IDs dos registos inseridos/alterados
+            lote: Nº de registos por query
+
+        Returns:
+            Nº de movimentos gerados
+        """
+        if not self.ledger_disponivel():
+            return 0
+
+        ids = sorted(ids)
+        total = 0
+        if origem_tipo == ORIGEM_BOLETIM:
+            for i in range(0, len(ids), lote):
+                total += self._substituir_boletins(ids[i:i + lote])
+            return total
+
+        modelo, gerar = {
+            ORIGEM_PROJETO: (Projeto, self._movimentos_projeto),
+            ORIGEM_DESPESA: (Despesa, self._movimentos_despesa),
+        }[origem_tipo]
+
+        for i in range(0, len(ids), lote):
+            bloco = ids[i:i + lote]
+            movimentos = [
+                movimento
+                for registo in self.db_session.query(modelo).filter(modelo.id.in_(bloco))
+                for movimento in gerar(registo)
+            ]
+            self.db_session.execute(
+                delete(SaldoMovimento).where(
+                    SaldoMovimento.origem_tipo == origem_tipo,
+                    SaldoMovimento.origem_id.in_(bloco)
+                )
+            )
+            if movimentos:
+                self.db_session.execute(insert(SaldoMovimento), movimentos)
+            total += len(movimentos)
+        return total
+
+    def remover_origem(self, origem_tipo: str, origem_id: int):
+        """Remove os movimentos de uma origem apagada"""
+        if self.ledger_disponivel():
+            self._substituir(origem_tipo, origem_id, [])
+
+    def _substituir(self, origem_tipo: str, origem_id: int, movimentos: List[Dict]):
+        """Apaga os movimentos atuais da origem e insere os novos (sem commit)"""
+        self.db_session.execute(
+            delete(SaldoMovimento).where(
+                SaldoMovimento.origem_tipo == origem_tipo,
+                SaldoMovimento.origem_id == origem_id
+            )
+        )
+        if movimentos:
+            self.db_session.execute(insert(SaldoMovimento), movimentos)
+
+    def _substituir_boletins(self, ids: Optional[List[int]] = None) -> int:
+        """
+        Substitui os movimentos de boletins (sem commit)
+
+        Os movimentos são gerados a partir das linhas gravadas (INSERT ...
+        SELECT), com o valor gravado: os boletins têm de estar gravados (flush).
+
+        Args:
+            ids: IDs dos boletins (None = todos, após apagar o ledger)
+
+        Returns:
+            Nº de movimentos gerados
+        """
+        criterios = []
+        if ids is not None:
+            criterios.append(Boletim.id.in_(ids))
+            self.db_session.execute(
+                delete(SaldoMovimento).where(
+                    SaldoMovimento.origem_tipo == ORIGEM_BOLETIM,
+                    SaldoMovimento.origem_id.in_(ids)
+                )
+            )
+        componente = case(
+            (Boletim.estado == EstadoBoletim.PAGO, 'boletins_pagos'),
+            else_='boletins_pendentes'
+        )
+        movimentos = select(
+            Boletim.socio,
+            componente,
+            literal(ORIGEM_BOLETIM),
+            Boletim.id,
+            Boletim.data_emissao,
+            COMPONENTES['boletins_pagos'] * Boletim.valor
+        ).where(*criterios, Boletim.valor.isnot(None), Boletim.valor != 0)
+        resultado = self.db_session.execute(
+            insert(SaldoMovimento).from_select(
+                ['socio', 'componente', 'origem_tipo', 'origem_id', 'data', 'valor'],
+                movimentos
+            )
+        )
+        return resultado.rowcount
+
+    # ========== Regras de geração de movimentos ==========
+
+    @staticmethod
+    def _movimento(
+        socio: Socio,
+        componente: str,
+        origem_tipo: str,
+        origem_id: int,
+        data: Optional[date],
+        valor: Decimal
+    ) -> Dict:
+        """Cria o dict de um movimento com o sinal do componente"""
+        return {
+            'socio': socio,
+            'componente': componente,
+            'origem_tipo': origem_tipo,
+            'origem_id': origem_id,
+            'data': data,
+            'valor': COMPONENTES[componente] * Decimal(str(valor)),
+        }
+
+    def _movimentos_projeto(self, projeto: Projeto) -> List[Dict]:
+        """Movimentos de um projeto (apenas PAGOS e FINALIZADOS contam)"""
+        if projeto.estado == EstadoProjeto.PAGO:
+            comp_pessoal, comp_premio = 'projetos_pessoais', 'premios'
+        elif projeto.estado == EstadoProjeto.FINALIZADO:
+            comp_pessoal, comp_premio = 'pessoais_nao_faturados', 'premios_nao_faturados'
+        else:
+            return []
+
+        movimentos = []
+        if (projeto.tipo == TipoProjeto.PESSOAL and projeto.owner in ('BA', 'RR')
+                and projeto.valor_sem_iva):
+            movimentos.append(self._movimento(
+                Socio(projeto.owner), comp_pessoal, ORIGEM_PROJETO,
+                projeto.id, projeto.data_faturacao, projeto.valor_sem_iva
+            ))
+
+        # Prémios contam para qualquer tipo de projeto
+        for socio, premio in ((Socio.BA, projeto.premio_bruno), (Socio.RR, projeto.premio_rafael)):
+            if premio and premio > 0:
+                movimentos.append(self._movimento(
+                    socio, comp_premio, ORIGEM_PROJETO,
+                    projeto.id, projeto.data_faturacao, premio
+                ))
+
+        return movimentos
+
+    def _movimentos_despesa(self, despesa: Despesa) -> List[Dict]:
+        """Movimentos de uma despesa (apenas PAGAS contam)"""
+        if despesa.estado != EstadoDespesa.PAGO or not despesa.valor_sem_iva:
+            return []
+
+        if despesa.tipo == TipoDespesa.FIXA_MENSAL:
+            metade = Decimal(str(despesa.valor_sem_iva)) / Decimal("2")
+            return [
+                self._movimento(socio, 'despesas_fixas', ORIGEM_DESPESA, despesa.id, despesa.data, metade)
+                for socio in (Socio.BA, Socio.RR)
+            ]
+        if despesa.tipo == TipoDespesa.PESSOAL_BA:
+            return [self._movimento(Socio.BA, 'despesas_pessoais', ORIGEM_DESPESA,
+                                    despesa.id, despesa.data, despesa.valor_sem_iva)]
+        if despesa.tipo == TipoDespesa.PESSOAL_RR:
+            return [self._movimento(Socio.RR, 'despesas_pessoais', ORIGEM_DESPESA,
+                                    despesa.id, despesa.data, despesa.valor_sem_iva)]
+        return []
+
+    # ========== Reconstrução e verificação ==========
+
+    def rebuild_ledger(self, verificar: bool = True) -> Tuple[bool, Dict, Optional[str]]:
+        """
+        Reconstrói o ledger completo a partir das tabelas base
+
+        Args:
+            verificar: Se deve comparar o saldo do ledger com _calcular_saldo
+
+        Returns:
+            Tuple (sucesso, relatorio, mensagem_erro)
+            relatorio = {'movimentos': 512, 'diferencas': [...]}
+        """
+        if not self.ledger_disponivel():
+            return False, {}, "Tabela saldo_movimentos não existe (aplicar migration 029)"
+
+        try:
+            movimentos = []
+
+            projetos = self.db_session.query(Projeto).filter(
+                Projeto.estado.in_([EstadoProjeto.PAGO, EstadoProjeto.FINALIZADO])
+            )
+            for projeto in projetos:
+                movimentos.extend(self._movimentos_projeto(projeto))
+
+            despesas = self.db_session.query(Despesa).filter(
+                Despesa.estado == EstadoDespesa.PAGO,
+                Despesa.tipo.in_([TipoDespesa.FIXA_MENSAL, TipoDespesa.PESSOAL_BA, TipoDespesa.PESSOAL_RR])
+            )
+            for despesa in despesas:
+                movimentos.extend(self._movimentos_despesa(despesa))
+
+            self.db_session.execute(delete(SaldoMovimento))
+            if movimentos:
+                self.db_session.execute(insert(SaldoMovimento), movimentos)
+            total = len(movimentos) + self._substituir_boletins()
+            self.db_session.commit()
+
+        except Exception as e:
+            self.db_session.rollback()
+            logger.error(f"Erro ao reconstruir ledger de saldos: {e}")
+            return False, {}, str(e)
+
+        relatorio = {'movimentos': total, 'diferencas': []}
+        if verificar:
+            relatorio['diferencas'] = self.verificar_consistencia()
+
+        logger.info(
+            f"Ledger de saldos reconstruído: {total} movimentos, "
+            f"{len(relatorio['diferencas'])} diferença(s)"
+        )
+        return True, relatorio, None
+
+    def verificar_consistencia(self, tolerancia: float = 0.0) -> List[Dict]:
+        """
+        Compara o saldo calculado pelo ledger com _calcular_saldo (tabelas base)
+
+        Args:
+            tolerancia: Diferença máxima aceite por valor (euros). Por omissão
+                nenhuma: os dois caminhos somam os mesmos valores gravados
+                e têm de coincidir exatamente.
+
+        Returns:
+            Lista de diferenças (vazia se consistente):
+            [{'socio': 'BA', 'campo': 'outs.boletins_pagos', 'tabelas': 10.0, 'ledger': 12.0}]
+        """
+        from logic.saldos import SaldosCalculator
+
+        calculo_base = SaldosCalculator(self.db_session, usar_ledger=False)
+        saldos_ledger = SaldosCalculator(self.db_session, usar_ledger=True).calcular_saldos_socios()
+
+        diferencas = []
+        for socio in (Socio.BA, Socio.RR):
+            esperado = calculo_base._calcular_saldo(socio)
+            obtido = saldos_ledger[socio]
+
+            campos = [('saldo_total', esperado['saldo_total'], obtido['saldo_total']),
+                      ('sugestao_boletim', esperado['sugestao_boletim'], obtido['sugestao_boletim'])]
+            for grupo in ('ins', 'outs'):
+                for chave, valor in esperado[grupo].items():
+                    campos.append((f"{grupo}.{chave}", valor, obtido[grupo][chave]))
+
+            for campo, valor_tabelas, valor_ledger in campos:
+                if round(abs(valor_tabelas - valor_ledger), 6) > tolerancia:
+                    diferencas.append({
+                        'socio': socio.value,
+                        'campo': campo,
+                        'tabelas': valor_tabelas,
+                        'ledger': valor_ledger
+                    })
+
+        return diferencas
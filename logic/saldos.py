@@ -17,17 +17,22 @@ OUTs (Saídas - empresa PAGA ao sócio):
 
 Saldo = INs - OUTs
 """
+import os
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from datetime import date, datetime
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy import func, and_, or_, case, select, true, union_all, literal, null, type_coerce, Numeric, Float
+from datetime import date, datetime, timedelta
+from bisect import bisect_left
+from calendar import monthrange
 
 from database.models import (
     Projeto, TipoProjeto, EstadoProjeto,
     Despesa, TipoDespesa, EstadoDespesa,
-    Boletim, Socio, EstadoBoletim
+    Boletim, Socio, EstadoBoletim,
+    SaldoMovimento
 )
+from logic.saldo_movimentos import SaldoMovimentosManager, COMPONENTES
 
 
 class SaldosCalculator:
@@ -39,14 +44,34 @@ class SaldosCalculator:
     INVESTIMENTO_INICIAL_BRUNO = Decimal("5200.00")
     INVESTIMENTO_INICIAL_RAFAEL = Decimal("5200.00")
 
-    def __init__(self, db_session: Session):
+    # Granularidades suportadas pelo histórico de saldos
+    GRANULARIDADES = ('semana', 'mes', 'ano')
+
+    # Componentes do saldo acumulados no histórico
+    COMPONENTES_HISTORICO = (
+        'projetos_pessoais', 'premios',
+        'despesas_fixas', 'boletins_pagos', 'despesas_pessoais'
+    )
+
+    def __init__(self, db_session: Session, usar_ledger: Optional[bool] = None):
         """
         Initialize calculator
 
         Args:
             db_session: SQLAlchemy database session
+            usar_ledger: Calcular a partir do ledger saldo_movimentos em vez das
+                tabelas base (None = variável de ambiente SALDOS_USAR_LEDGER).
+                Ignorado enquanto a tabela não existir.
         """
         self.db_session = db_session
+        if usar_ledger is None:
+            usar_ledger = os.getenv('SALDOS_USAR_LEDGER', 'False').lower() in ('1', 'true', 'yes')
+        self.usar_ledger = usar_ledger
+        self.ledger = SaldoMovimentosManager(db_session)
+
+    def _ledger_ativo(self) -> bool:
+        """Indica se os cálculos devem usar o ledger saldo_movimentos"""
+        return self.usar_ledger and self.ledger.ledger_disponivel()
 
     def calcular_saldo_bruno(
         self,
@@ -65,6 +90,11 @@ class SaldosCalculator:
         Returns:
             Dict com breakdown completo do saldo
         """
+        if self._ledger_ativo():
+            return self.calcular_saldos_socios(
+                incluir_investimento, data_inicio, data_fim
+            )[Socio.BA]
+
         return self._calcular_saldo(
             Socio.BA,
             incluir_investimento,
@@ -89,6 +119,11 @@ class SaldosCalculator:
         Returns:
             Dict com breakdown completo do saldo
         """
+        if self._ledger_ativo():
+            return self.calcular_saldos_socios(
+                incluir_investimento, data_inicio, data_fim
+            )[Socio.RR]
+
         return self._calcular_saldo(
             Socio.RR,
             incluir_investimento,
@@ -96,6 +131,174 @@ class SaldosCalculator:
             data_fim
         )
 
+    def calcular_saldos_socios(
+        self,
+        incluir_investimento: bool = False,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> Dict[Socio, Dict]:
+        """
+        Calcula os saldos de ambos os sócios em modo agrupado
+
+        Resultado idêntico a calcular_saldo_bruno() + calcular_saldo_rafael(),
+        mas todos os INs/OUTs dos dois sócios são obtidos numa única query
+        de somas condicionais (CASE) sobre projetos, despesas e boletins,
+        mais uma query para os meses com boletim emitido no ano corrente.
+        São 2 round trips em vez de ~20 (importante com Postgres remoto).
+
+        Args:
+            incluir_investimento: Se deve incluir o investimento inicial nos INs
+            data_inicio: Data de início para filtrar (opcional)
+            data_fim: Data de fim para filtrar (opcional)
+
+        Returns:
+            Dict {Socio.BA: {...}, Socio.RR: {...}} com o mesmo formato
+            devolvido por _calcular_saldo
+        """
+        if self._ledger_ativo():
+            return self._calcular_saldos_ledger(incluir_investimento, data_inicio, data_fim)
+
+        def soma(coluna, *condicoes):
+            return func.coalesce(func.sum(case((and_(*condicoes), coluna), else_=0)), 0)
+
+        pago = Projeto.estado == EstadoProjeto.PAGO
+        finalizado = Projeto.estado == EstadoProjeto.FINALIZADO
+        pessoal = Projeto.tipo == TipoProjeto.PESSOAL
+
+        # === PROJETOS (filtrados por data_faturacao) ===
+        agregados_projetos = select(
+            soma(Projeto.valor_sem_iva, pessoal, Projeto.owner == 'BA', pago).label('pessoais_ba'),
+            soma(Projeto.valor_sem_iva, pessoal, Projeto.owner == 'RR', pago).label('pessoais_rr'),
+            soma(Projeto.premio_bruno, Projeto.premio_bruno > 0, pago).label('premios_ba'),
+            soma(Projeto.premio_rafael, Projeto.premio_rafael > 0, pago).label('premios_rr'),
+            soma(Projeto.premio_bruno, Projeto.premio_bruno > 0, finalizado).label('premios_nf_ba'),
+            soma(Projeto.premio_rafael, Projeto.premio_rafael > 0, finalizado).label('premios_nf_rr'),
+            soma(Projeto.valor_sem_iva, pessoal, Projeto.owner == 'BA', finalizado).label('pessoais_nf_ba'),
+            soma(Projeto.valor_sem_iva, pessoal, Projeto.owner == 'RR', finalizado).label('pessoais_nf_rr'),
+        ).where(
+            # Só projetos pagos/finalizados entram nas somas (permite usar os índices por estado)
+            Projeto.estado.in_([EstadoProjeto.PAGO, EstadoProjeto.FINALIZADO]),
+            *self._filtros_periodo(Projeto.data_faturacao, data_inicio, data_fim)
+        ).subquery()
+
+        # === DESPESAS (filtradas por data) ===
+        despesa_paga = Despesa.estado == EstadoDespesa.PAGO
+        agregados_despesas = select(
+            soma(Despesa.valor_sem_iva, Despesa.tipo == TipoDespesa.FIXA_MENSAL, despesa_paga).label('fixas'),
+            soma(Despesa.valor_sem_iva, Despesa.tipo == TipoDespesa.PESSOAL_BA, despesa_paga).label('desp_pessoais_ba'),
+            soma(Despesa.valor_sem_iva, Despesa.tipo == TipoDespesa.PESSOAL_RR, despesa_paga).label('desp_pessoais_rr'),
+        ).where(
+            Despesa.tipo.in_([TipoDespesa.FIXA_MENSAL, TipoDespesa.PESSOAL_BA, TipoDespesa.PESSOAL_RR]),
+            despesa_paga,
+            *self._filtros_periodo(Despesa.data, data_inicio, data_fim)
+        ).subquery()
+
+        # === BOLETINS (filtrados por data_emissao) ===
+        agregados_boletins = select(
+            soma(Boletim.valor, Boletim.socio == Socio.BA, Boletim.estado == EstadoBoletim.PENDENTE).label('bol_pendentes_ba'),
+            soma(Boletim.valor, Boletim.socio == Socio.RR, Boletim.estado == EstadoBoletim.PENDENTE).label('bol_pendentes_rr'),
+            soma(Boletim.valor, Boletim.socio == Socio.BA, Boletim.estado == EstadoBoletim.PAGO).label('bol_pagos_ba'),
+            soma(Boletim.valor, Boletim.socio == Socio.RR, Boletim.estado == EstadoBoletim.PAGO).label('bol_pagos_rr'),
+        ).where(
+            *self._filtros_periodo(Boletim.data_emissao, data_inicio, data_fim)
+        ).subquery()
+
+        # Round trip 1: três agregados de uma linha, combinados numa só linha
+        valores = self.db_session.execute(
+            select(agregados_projetos, agregados_despesas, agregados_boletins).select_from(
+                agregados_projetos
+                .join(agregados_despesas, true())
+                .join(agregados_boletins, true())
+            )
+        ).one()._mapping
+
+        # Round trip 2: meses com boletim emitido no ano corrente
+        meses_com_boletim = self._meses_com_boletim()
+
+        resultado = {}
+        for socio, sufixo in ((Socio.BA, 'ba'), (Socio.RR, 'rr')):
+            resultado[socio] = self._montar_saldo(
+                socio,
+                incluir_investimento=incluir_investimento,
+                projetos_pessoais=self._decimal(valores[f'pessoais_{sufixo}']),
+                premios=self._decimal(valores[f'premios_{sufixo}']),
+                premios_nao_faturados=self._decimal(valores[f'premios_nf_{sufixo}']),
+                pessoais_nao_faturados=self._decimal(valores[f'pessoais_nf_{sufixo}']),
+                despesas_fixas_total=self._decimal(valores['fixas']),
+                boletins_pendentes=self._decimal(valores[f'bol_pendentes_{sufixo}']),
+                boletins_pagos=self._decimal(valores[f'bol_pagos_{sufixo}']),
+                despesas_pessoais=self._decimal(valores[f'desp_pessoais_{sufixo}']),
+                meses_com_boletim=meses_com_boletim[socio]
+            )
+
+        return resultado
+
+    def _calcular_saldos_ledger(
+        self,
+        incluir_investimento: bool = False,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> Dict[Socio, Dict]:
+        """
+        Calcula os saldos de ambos os sócios a partir do ledger saldo_movimentos
+
+        Uma soma por (sócio, componente) sobre o índice
+        (socio, componente, data), mais os meses com boletim emitido.
+
+        Returns:
+            Dict {Socio.BA: {...}, Socio.RR: {...}} (formato de _calcular_saldo)
+        """
+        somas = {socio: dict.fromkeys(COMPONENTES, Decimal("0")) for socio in (Socio.BA, Socio.RR)}
+
+        # SUM() tal como o driver o devolve (sem passar por Decimal com escala):
+        # _arredondar_soma faz o mesmo '%.2f' que _calcular_saldo, sem arredondar
+        # duas vezes os valores gravados com mais de 2 casas (boletins importados)
+        linhas = self.db_session.execute(
+            select(
+                SaldoMovimento.socio,
+                SaldoMovimento.componente,
+                type_coerce(func.sum(SaldoMovimento.valor), Float())
+            ).where(
+                *self._filtros_periodo(SaldoMovimento.data, data_inicio, data_fim)
+            ).group_by(SaldoMovimento.socio, SaldoMovimento.componente)
+        ).all()
+
+        for socio, componente, valor in linhas:
+            # Ledger guarda valores com sinal; o breakdown usa valores absolutos
+            somas[socio][componente] += COMPONENTES[componente] * self._decimal(valor)
+
+        meses_com_boletim = self._meses_com_boletim()
+
+        resultado = {}
+        for socio, valores in somas.items():
+            resultado[socio] = self._montar_saldo(
+                socio,
+                incluir_investimento=incluir_investimento,
+                projetos_pessoais=self._arredondar_soma(valores['projetos_pessoais']),
+                premios=self._arredondar_soma(valores['premios']),
+                premios_nao_faturados=self._arredondar_soma(valores['premios_nao_faturados']),
+                pessoais_nao_faturados=self._arredondar_soma(valores['pessoais_nao_faturados']),
+                # Ledger guarda metade por sócio; _montar_saldo divide o total por 2
+                despesas_fixas_total=self._arredondar_soma(valores['despesas_fixas'] * 2),
+                boletins_pendentes=self._arredondar_soma(valores['boletins_pendentes']),
+                boletins_pagos=self._arredondar_soma(valores['boletins_pagos']),
+                despesas_pessoais=self._arredondar_soma(valores['despesas_pessoais']),
+                meses_com_boletim=meses_com_boletim[socio]
+            )
+
+        return resultado
+
+    def _meses_com_boletim(self) -> Dict[Socio, Set[int]]:
+        """Meses do ano corrente com boletim emitido (qualquer estado), por sócio"""
+        meses_com_boletim = {Socio.BA: set(), Socio.RR: set()}
+        for socio_boletim, mes in self.db_session.execute(
+            select(Boletim.socio, Boletim.mes).where(
+                Boletim.ano == date.today().year
+            ).distinct()
+        ):
+            meses_com_boletim[socio_boletim].add(mes)
+        return meses_com_boletim
+
     def _calcular_saldo(
         self,
         socio: Socio,
@@ -186,16 +389,6 @@ class SaldosCalculator:
 
         premios = query_premios.scalar() or Decimal("0.00")
 
-        # 3. Investimento inicial (se solicitado)
-        investimento = Decimal("0.00")
-        if incluir_investimento:
-            investimento = (
-                self.INVESTIMENTO_INICIAL_BRUNO if socio == Socio.BA
-                else self.INVESTIMENTO_INICIAL_RAFAEL
-            )
-
-        total_ins = projetos_pessoais + premios + investimento
-
         # === CALCULAR OUTs (Saídas) ===
 
         # 1. Despesas fixas mensais (divididas por 2)
@@ -217,7 +410,6 @@ class SaldosCalculator:
             )
 
         despesas_fixas_total = query_despesas_fixas.scalar() or Decimal("0.00")
-        despesas_fixas = despesas_fixas_total / Decimal("2.00")  # Divide por 2
 
         # 2. Boletins PENDENTES (emitidos mas não pagos)
         query_boletins_pendentes = self.db_session.query(
@@ -256,7 +448,6 @@ class SaldosCalculator:
             )
 
         boletins_pagos = query_boletins_pagos.scalar() or Decimal("0.00")
-        boletins_total = boletins_pendentes + boletins_pagos
 
         # 3. Despesas pessoais excecionais
         # ✅ CORREÇÃO: Usar valor_sem_iva (coluna P do Excel)
@@ -278,13 +469,6 @@ class SaldosCalculator:
 
         despesas_pessoais = query_despesas_pessoais.scalar() or Decimal("0.00")
 
-        # IMPORTANTE: Apenas boletins PAGOS entram no cálculo do saldo!
-        # Pendentes são apenas para visualização
-        total_outs = despesas_fixas + boletins_pagos + despesas_pessoais
-
-        # === CALCULAR SALDO FINAL ===
-        saldo_total = total_ins - total_outs
-
         # === PRÉMIOS NÃO FATURADOS (Projetos FINALIZADOS) ===
         # Não contam no saldo atual, mas permitem calcular saldo projetado
         if socio == Socio.BA:
@@ -334,6 +518,78 @@ class SaldosCalculator:
 
         pessoais_nao_faturados = query_pessoais_nao_faturados.scalar() or Decimal("0.00")
 
+        # Meses que já têm boletim emitido no ano corrente (qualquer estado)
+        meses_com_boletim = set(
+            b.mes for b in self.db_session.query(Boletim.mes).filter(
+                Boletim.socio == socio,
+                Boletim.ano == date.today().year
+            ).all()
+        )
+
+        return self._montar_saldo(
+            socio,
+            incluir_investimento=incluir_investimento,
+            projetos_pessoais=projetos_pessoais,
+            premios=premios,
+            premios_nao_faturados=premios_nao_faturados,
+            pessoais_nao_faturados=pessoais_nao_faturados,
+            despesas_fixas_total=despesas_fixas_total,
+            boletins_pendentes=boletins_pendentes,
+            boletins_pagos=boletins_pagos,
+            despesas_pessoais=despesas_pessoais,
+            meses_com_boletim=meses_com_boletim
+        )
+
+    def _montar_saldo(
+        self,
+        socio: Socio,
+        incluir_investimento: bool,
+        projetos_pessoais: Decimal,
+        premios: Decimal,
+        premios_nao_faturados: Decimal,
+        pessoais_nao_faturados: Decimal,
+        despesas_fixas_total: Decimal,
+        boletins_pendentes: Decimal,
+        boletins_pagos: Decimal,
+        despesas_pessoais: Decimal,
+        meses_com_boletim: Set[int]
+    ) -> Dict:
+        """
+        Monta o breakdown do saldo a partir dos valores agregados
+
+        Partilhado pelo cálculo individual (_calcular_saldo) e pelo
+        cálculo agrupado (calcular_saldos_socios).
+
+        Args:
+            socio: Sócio (BA ou RR)
+            incluir_investimento: Se deve incluir o investimento inicial
+            (outros): Somas já obtidas da base de dados
+            meses_com_boletim: Meses do ano corrente com boletim emitido
+
+        Returns:
+            Dict com breakdown completo (ver _calcular_saldo)
+        """
+        # === INs ===
+        investimento = Decimal("0.00")
+        if incluir_investimento:
+            investimento = (
+                self.INVESTIMENTO_INICIAL_BRUNO if socio == Socio.BA
+                else self.INVESTIMENTO_INICIAL_RAFAEL
+            )
+
+        total_ins = projetos_pessoais + premios + investimento
+
+        # === OUTs ===
+        despesas_fixas = despesas_fixas_total / Decimal("2.00")  # Divide por 2
+        boletins_total = boletins_pendentes + boletins_pagos
+
+        # IMPORTANTE: Apenas boletins PAGOS entram no cálculo do saldo!
+        # Pendentes são apenas para visualização
+        total_outs = despesas_fixas + boletins_pagos + despesas_pessoais
+
+        # === CALCULAR SALDO FINAL ===
+        saldo_total = total_ins - total_outs
+
         # Saldo projetado (se houver prémios ou pessoais não faturados)
         saldo_projetado = None
         total_nao_faturados = premios_nao_faturados + pessoais_nao_faturados
@@ -342,17 +598,7 @@ class SaldosCalculator:
 
         # === CALCULAR SUGESTÃO DE BOLETIM ===
         # Distribui o saldo projetado pelos meses restantes sem boletim emitido
-        hoje = date.today()
-        mes_atual = hoje.month
-        ano_atual = hoje.year
-
-        # Meses que já têm boletim emitido (qualquer estado)
-        meses_com_boletim = set(
-            b.mes for b in self.db_session.query(Boletim.mes).filter(
-                Boletim.socio == socio,
-                Boletim.ano == ano_atual
-            ).all()
-        )
+        mes_atual = date.today().month
 
         # Meses restantes sem boletim (do mês atual até dezembro)
         meses_restantes = [m for m in range(mes_atual, 13) if m not in meses_com_boletim]
@@ -392,6 +638,40 @@ class SaldosCalculator:
             'sugestao_boletim': sugestao_boletim
         }
 
+    @staticmethod
+    def _filtros_periodo(
+        coluna,
+        data_inicio: Optional[date],
+        data_fim: Optional[date]
+    ) -> List:
+        """Constrói os filtros de período (inclusivos) para uma coluna de data"""
+        filtros = []
+        if data_inicio:
+            filtros.append(coluna >= data_inicio)
+        if data_fim:
+            filtros.append(coluna <= data_fim)
+        return filtros
+
+    @staticmethod
+    def _arredondar_soma(valor: Decimal) -> Decimal:
+        """
+        Arredonda uma soma exata ao cêntimo
+
+        Mesmo arredondamento que o SQLAlchemy aplica ao SUM() de uma coluna
+        Numeric(10, 2) ('%.2f' sobre o float devolvido pelo driver), para que
+        somas feitas em Python coincidam com as de _calcular_saldo.
+        """
+        return Decimal("%.2f" % float(valor))
+
+    @staticmethod
+    def _decimal(valor) -> Decimal:
+        """Normaliza o resultado de um agregado SQL para Decimal"""
+        if valor is None:
+            return Decimal("0.00")
+        if isinstance(valor, Decimal):
+            return valor
+        return Decimal(str(valor))
+
     def obter_historico_mensal(
         self,
         socio: Socio,
@@ -419,32 +699,295 @@ class SaldosCalculator:
             'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
         ]
 
-        historico = []
-        for mes in range(1, 13):
-            # Calcular até o fim do mês
-            data_fim = date(ano, mes, 1)
-            # Último dia do mês
-            if mes == 12:
-                data_fim = date(ano, 12, 31)
-            else:
-                data_fim = date(ano, mes + 1, 1)
-                # Voltar 1 dia para ficar no último dia do mês anterior
-                from datetime import timedelta
-                data_fim = data_fim - timedelta(days=1)
+        resultado = self.obter_historico_saldos(
+            socio,
+            data_inicio=date(ano, 1, 1),
+            data_fim=date(ano, 12, 31),
+            granularidade='mes',
+            incluir_investimento=incluir_investimento
+        )
 
-            saldo_data = self._calcular_saldo(
-                socio,
-                incluir_investimento=incluir_investimento,
-                data_fim=data_fim
+        return [
+            {
+                'mes': periodo['inicio'].month,
+                'mes_nome': meses[periodo['inicio'].month - 1],
+                'saldo': periodo['saldo']
+            }
+            for periodo in resultado['periodos']
+        ]
+
+    def obter_historico_saldos(
+        self,
+        socio: Socio,
+        data_inicio: date,
+        data_fim: date,
+        granularidade: str = 'mes',
+        incluir_investimento: bool = False
+    ) -> Dict:
+        """
+        Obtém o histórico de saldos de um sócio para um intervalo arbitrário
+
+        Todas as linhas que contribuem para o saldo (projetos pessoais e
+        prémios pagos, despesas fixas/pessoais pagas, boletins pagos) são
+        somadas por dia numa única query (UNION ALL + GROUP BY). Os dias são
+        depois distribuídos pelos períodos e acumulados em Python (somas de
+        prefixo), em vez de recalcular o saldo completo para cada período.
+
+        O saldo de cada período é equivalente a _calcular_saldo() com
+        data_fim = último dia do período (sem data_inicio).
+
+        Args:
+            socio: Sócio (BA ou RR)
+            data_inicio: Primeiro dia do intervalo
+            data_fim: Último dia do intervalo (inclusivo)
+            granularidade: 'semana' (segunda a domingo), 'mes' ou 'ano'
+            incluir_investimento: Se deve incluir investimento inicial
+
+        Returns:
+            Dict com saldo inicial, períodos e saldo final:
+            {
+                'socio': 'BA',
+                'granularidade': 'mes',
+                'saldo_inicial': 1000.00,  # saldo no dia anterior a data_inicio
+                'periodos': [
+                    {
+                        'inicio': date(2025, 1, 1),
+                        'fim': date(2025, 1, 31),
+                        'ins': {'projetos_pessoais': ..., 'premios': ..., 'total': ...},
+                        'outs': {'despesas_fixas': ..., 'boletins_pagos': ...,
+                                 'despesas_pessoais': ..., 'total': ...},
+                        'delta': 234.56,   # ins - outs do período
+                        'saldo': 1234.56   # saldo acumulado no fim do período
+                    },
+                    ...
+                ],
+                'saldo_final': 1234.56
+            }
+        """
+        if granularidade not in self.GRANULARIDADES:
+            raise ValueError(
+                f"Granularidade inválida: {granularidade} "
+                f"(opções: {', '.join(self.GRANULARIDADES)})"
+            )
+        if data_fim < data_inicio:
+            raise ValueError("data_fim deve ser igual ou posterior a data_inicio")
+
+        periodos = self._gerar_periodos(data_inicio, data_fim, granularidade)
+
+        investimento = Decimal("0.00")
+        if incluir_investimento:
+            investimento = (
+                self.INVESTIMENTO_INICIAL_BRUNO if socio == Socio.BA
+                else self.INVESTIMENTO_INICIAL_RAFAEL
             )
 
-            historico.append({
-                'mes': mes,
-                'mes_nome': meses[mes - 1],
-                'saldo': saldo_data['saldo_total']
+        # Somas exatas por período; dias anteriores ao intervalo vêm com dia NULL
+        anteriores = dict.fromkeys(self.COMPONENTES_HISTORICO, Decimal("0"))
+        somas_por_periodo = [
+            dict.fromkeys(self.COMPONENTES_HISTORICO, Decimal("0"))
+            for _ in periodos
+        ]
+        fins = [fim for _, fim in periodos]
+
+        for dia, componente, valor in self._somas_diarias(socio, data_inicio, data_fim):
+            destino = anteriores if dia is None else somas_por_periodo[bisect_left(fins, dia)]
+            destino[componente] += self._decimal(valor)
+
+        # Acumular (somas de prefixo). Cada componente acumulado é arredondado
+        # ao cêntimo, tal como o SUM() de _calcular_saldo, para que o saldo de
+        # cada período coincida exatamente com o cálculo completo.
+        acumulado = dict(anteriores)
+        anterior = self._componentes_arredondados(acumulado)
+        saldo_inicial = self._saldo_componentes(anterior) + investimento
+
+        resultado_periodos = []
+        saldo = saldo_inicial
+        for (inicio, fim), somas in zip(periodos, somas_por_periodo):
+            for componente, valor in somas.items():
+                acumulado[componente] += valor
+            atual = self._componentes_arredondados(acumulado)
+
+            delta = {c: atual[c] - anterior[c] for c in self.COMPONENTES_HISTORICO}
+            total_ins = delta['projetos_pessoais'] + delta['premios']
+            total_outs = delta['despesas_fixas'] + delta['boletins_pagos'] + delta['despesas_pessoais']
+            saldo = self._saldo_componentes(atual) + investimento
+            anterior = atual
+
+            resultado_periodos.append({
+                'inicio': inicio,
+                'fim': fim,
+                'ins': {
+                    'projetos_pessoais': float(delta['projetos_pessoais']),
+                    'premios': float(delta['premios']),
+                    'total': float(total_ins)
+                },
+                'outs': {
+                    'despesas_fixas': float(delta['despesas_fixas']),
+                    'boletins_pagos': float(delta['boletins_pagos']),
+                    'despesas_pessoais': float(delta['despesas_pessoais']),
+                    'total': float(total_outs)
+                },
+                'delta': float(total_ins - total_outs),
+                'saldo': float(saldo)
             })
 
-        return historico
+        return {
+            'socio': socio.value,
+            'granularidade': granularidade,
+            'data_inicio': data_inicio,
+            'data_fim': data_fim,
+            'saldo_inicial': float(saldo_inicial),
+            'periodos': resultado_periodos,
+            'saldo_final': float(saldo)
+        }
+
+    @staticmethod
+    def _componentes_arredondados(acumulado: Dict[str, Decimal]) -> Dict[str, Decimal]:
+        """Arredonda os componentes acumulados ao cêntimo (despesas fixas ÷ 2)"""
+        componentes = {
+            componente: SaldosCalculator._arredondar_soma(valor)
+            for componente, valor in acumulado.items()
+        }
+        componentes['despesas_fixas'] = componentes['despesas_fixas'] / Decimal("2.00")
+        return componentes
+
+    @staticmethod
+    def _saldo_componentes(componentes: Dict[str, Decimal]) -> Decimal:
+        """Saldo (INs - OUTs) a partir dos componentes acumulados"""
+        return (
+            componentes['projetos_pessoais'] + componentes['premios']
+            - componentes['despesas_fixas'] - componentes['boletins_pagos']
+            - componentes['despesas_pessoais']
+        )
+
+    def _somas_diarias(self, socio: Socio, data_inicio: date, data_fim: date) -> List[Tuple]:
+        """
+        Soma por dia e componente todas as linhas que afetam o saldo até data_fim
+
+        Uma única query (UNION ALL). Linhas anteriores a data_inicio são
+        agrupadas com dia = NULL (contribuem apenas para o saldo inicial).
+
+        Returns:
+            Lista de tuplos (dia, componente, soma)
+        """
+        if self._ledger_ativo():
+            return self._somas_diarias_ledger(socio, data_inicio, data_fim)
+
+        owner = 'BA' if socio == Socio.BA else 'RR'
+        tipo_despesa = TipoDespesa.PESSOAL_BA if socio == Socio.BA else TipoDespesa.PESSOAL_RR
+        coluna_premio = Projeto.premio_bruno if socio == Socio.BA else Projeto.premio_rafael
+
+        linhas = union_all(
+            select(
+                Projeto.data_faturacao.label('dia'),
+                literal('projetos_pessoais').label('componente'),
+                Projeto.valor_sem_iva.label('valor')
+            ).where(
+                Projeto.tipo == TipoProjeto.PESSOAL,
+                Projeto.owner == owner,
+                Projeto.estado == EstadoProjeto.PAGO,
+                Projeto.data_faturacao <= data_fim
+            ),
+            select(
+                Projeto.data_faturacao,
+                literal('premios'),
+                coluna_premio
+            ).where(
+                coluna_premio > 0,
+                Projeto.estado == EstadoProjeto.PAGO,
+                Projeto.data_faturacao <= data_fim
+            ),
+            select(
+                Despesa.data,
+                literal('despesas_fixas'),
+                Despesa.valor_sem_iva
+            ).where(
+                Despesa.tipo == TipoDespesa.FIXA_MENSAL,
+                Despesa.estado == EstadoDespesa.PAGO,
+                Despesa.data <= data_fim
+            ),
+            select(
+                Despesa.data,
+                literal('despesas_pessoais'),
+                Despesa.valor_sem_iva
+            ).where(
+                Despesa.tipo == tipo_despesa,
+                Despesa.estado == EstadoDespesa.PAGO,
+                Despesa.data <= data_fim
+            ),
+            select(
+                Boletim.data_emissao,
+                literal('boletins_pagos'),
+                Boletim.valor
+            ).where(
+                Boletim.socio == socio,
+                Boletim.estado == EstadoBoletim.PAGO,
+                Boletim.data_emissao <= data_fim
+            ),
+        ).subquery()
+
+        dia = case((linhas.c.dia >= data_inicio, linhas.c.dia), else_=null())
+
+        # Numeric sem escala: somas sem arredondamento ao cêntimo (arredonda-se
+        # apenas o acumulado, ver obter_historico_saldos)
+        soma = type_coerce(func.sum(linhas.c.valor), Numeric(asdecimal=True))
+
+        return self.db_session.execute(
+            select(dia, linhas.c.componente, soma)
+            .group_by(dia, linhas.c.componente)
+        ).all()
+
+    def _somas_diarias_ledger(self, socio: Socio, data_inicio: date, data_fim: date) -> List[Tuple]:
+        """
+        Equivalente a _somas_diarias, lido do ledger saldo_movimentos
+
+        Devolve valores absolutos e despesas fixas pelo total (antes da divisão
+        por 2), tal como as tabelas base.
+        """
+        dia = case((SaldoMovimento.data >= data_inicio, SaldoMovimento.data), else_=null())
+        soma = type_coerce(func.sum(SaldoMovimento.valor), Numeric(asdecimal=True))
+
+        linhas = self.db_session.execute(
+            select(dia, SaldoMovimento.componente, soma).where(
+                SaldoMovimento.socio == socio,
+                SaldoMovimento.componente.in_(self.COMPONENTES_HISTORICO),
+                SaldoMovimento.data <= data_fim
+            ).group_by(dia, SaldoMovimento.componente)
+        ).all()
+
+        resultado = []
+        for dia_linha, componente, valor in linhas:
+            valor = COMPONENTES[componente] * self._decimal(valor)
+            if componente == 'despesas_fixas':
+                valor = valor * 2
+            resultado.append((dia_linha, componente, valor))
+        return resultado
+
+    @staticmethod
+    def _gerar_periodos(data_inicio: date, data_fim: date, granularidade: str) -> List[Tuple[date, date]]:
+        """
+        Divide [data_inicio, data_fim] em períodos consecutivos
+
+        O primeiro e o último período são cortados pelos limites do intervalo.
+
+        Returns:
+            Lista de tuplos (inicio, fim), ambos inclusivos
+        """
+        periodos = []
+        inicio = data_inicio
+        while inicio <= data_fim:
+            if granularidade == 'semana':
+                fim = inicio + timedelta(days=6 - inicio.weekday())
+            elif granularidade == 'mes':
+                fim = date(inicio.year, inicio.month, monthrange(inicio.year, inicio.month)[1])
+            else:
+                fim = date(inicio.year, 12, 31)
+
+            fim = min(fim, data_fim)
+            periodos.append((inicio, fim))
+            inicio = fim + timedelta(days=1)
+
+        return periodos
 
     def obter_breakdown_detalhado(self, socio: Socio) -> Dict:
         """
@@ -491,8 +1034,8 @@ class SaldosCalculator:
             Despesa.estado == EstadoDespesa.PAGO
         ).all()
 
-        # Boletins (apenas PAGOS)
-        boletins = self.db_session.query(Boletim).filter(
+        # Boletins (apenas PAGOS; num_linhas para o to_dict, na mesma query)
+        boletins = self.db_session.query(Boletim).options(undefer(Boletim.num_linhas)).filter(
             Boletim.socio == socio,
             Boletim.estado == EstadoBoletim.PAGO
         ).all()
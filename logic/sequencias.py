@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Números sequenciais das entidades (tabela sequencias)
+
+Cada entidade tem um contador (ultimo_valor) incrementado com um UPDATE
+atómico, em vez de "ler o último registo, extrair o número e somar 1":
+- Uma única query por reserva (UPDATE ... RETURNING), independente do
+  tamanho da tabela
+- Dois clientes ligados à mesma base de dados (PostgreSQL) nunca recebem
+  o mesmo número: o UPDATE bloqueia a linha do contador até ao commit
+- Blocos de números para operações em bulk (reservar_bloco)
+
+A reserva é feita na transação do manager que cria o registo: se este
+fizer rollback, o número volta a ficar disponível.
+
+Enquanto a migration 031 não for aplicada, os números continuam a ser
+calculados a partir do maior número existente na tabela da entidade.
+"""
+import logging
+import re
+import weakref
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select, update, insert
+from sqlalchemy.exc import IntegrityError
+
+from database.models import (
+    Projeto, Despesa, Boletim, Cliente, Fornecedor, Freelancer,
+    Equipamento, DespesaTemplate, Orcamento, Sequencia
+)
+
+logger = logging.getLogger(__name__)
+
+# Sequências: nome -> (coluna com o número, prefixo, dígitos)
+# Fornecedores e freelancers usam ambos o prefixo #F, com contadores separados.
+SEQUENCIAS: Dict[str, Tuple] = {
+    'projetos': (Projeto.numero, '#P', 4),
+    'despesas': (Despesa.numero, '#D', 6),
+    'boletins': (Boletim.numero, '#B', 4),
+    'clientes': (Cliente.numero, '#C', 4),
+    'fornecedores': (Fornecedor.numero, '#F', 4),
+    'freelancers': (Freelancer.numero, '#F', 4),
+    'equipamento': (Equipamento.numero, '#E', 4),
+    'despesa_templates': (DespesaTemplate.numero, '#TD', 6),
+    'orcamentos': (Orcamento.codigo, 'OR-', 5),
+}
+
+# Cache (por engine) da existência da tabela sequencias
+_sequencias_disponiveis = weakref.WeakKeyDictionary()
+
+
+class SequenciasManager:
+    """
+    Gestor dos números sequenciais - reserva atómica de números e blocos
+    """
+
+    def __init__(self, db_session: Session):
+        """
+        Initialize manager
+
+        Args:
+            db_session: SQLAlchemy database session
+        """
+        self.db_session = db_session
+
+    def disponivel(self) -> bool:
+        """Verifica se a tabela sequencias existe (migration 031)"""
+        engine = self.db_session.get_bind().engine
+        if engine not in _sequencias_disponiveis:
+            _sequencias_disponiveis[engine] = inspect(engine).has_table(Sequencia.__tablename__)
+        return _sequencias_disponiveis[engine]
+
+    # ========== Reserva ==========
+
+    def reservar(self, nome: str, quantidade: int = 1) -> int:
+        """
+        Reserva um bloco de números consecutivos
+
+        Args:
+            nome: Nome da sequência (ver SEQUENCIAS)
+            quantidade: Quantos números reservar
+
+        Returns:
+            Primeiro número do bloco (ex: 81 para #P0081)
+        """
+        if quantidade < 1:
+            raise ValueError("quantidade tem de ser >= 1")
+
+        if not self.disponivel():
+            return self._maximo_existente(nome) + 1
+
+        ultimo = self._incrementar(nome, quantidade)
+        if ultimo is None:
+            # Primeira utilização da sequência: inicializar a partir dos dados existentes
+            self._semear(nome)
+            ultimo = self._incrementar(nome, quantidade)
+
+        return ultimo - quantidade + 1
+
+    def proximo(self, nome: str) -> str:
+        """
+        Reserva e formata o próximo número
+
+        Args:
+            nome: Nome da sequência (ver SEQUENCIAS)
+
+        Returns:
+            Número formatado (ex: #P0081)
+        """
+        return self.formatar(nome, self.reservar(nome))
+
+    def reservar_bloco(self, nome: str, quantidade: int) -> List[str]:
+        """
+        Reserva e formata um bloco de números (operações em bulk)
+
+        Args:
+            nome: Nome da sequência (ver SEQUENCIAS)
+            quantidade: Quantos números reservar
+
+        Returns:
+            Lista de números formatados, por ordem
+        """
+        if quantidade < 1:
+            return []
+        primeiro = self.reservar(nome, quantidade)
+        return [self.formatar(nome, valor) for valor in range(primeiro, primeiro + quantidade)]
+
+    def espreitar(self, nome: str) -> str:
+        """
+        Próximo número sem o reservar (pré-visualização em formulários)
+
+        Args:
+            nome: Nome da sequência (ver SEQUENCIAS)
+
+        Returns:
+            Número formatado que seria atribuído agora
+        """
+        if not self.disponivel():
+            return self.formatar(nome, self._maximo_existente(nome) + 1)
+
+        ultimo = self.db_session.execute(
+            select(Sequencia.ultimo_valor).where(Sequencia.nome == nome)
+        ).scalar()
+        if ultimo is None:
+            ultimo = self._maximo_existente(nome)
+        return self.formatar(nome, ultimo + 1)
+
+    def registar(self, nome: str, numero: str):
+        """
+        Regista um número atribuído manualmente (ex: código de orçamento
+        editado no formulário), avançando o contador se necessário
+
+        Args:
+            nome: Nome da sequência (ver SEQUENCIAS)
+            numero: Número formatado (ignorado se não tiver o formato da sequência)
+        """
+        valor = self.extrair(nome, numero)
+        if valor is None or not self.disponivel():
+            return
+
+        resultado = self.db_session.execute(
+            update(Sequencia)
+            .where(Sequencia.nome == nome, Sequencia.ultimo_valor < valor)
+            .values(ultimo_valor=valor, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount == 0 and self._valor_atual(nome) is None:
+            self._semear(nome)
+
+    # ========== Inicialização ==========
+
+    def sincronizar(self, nomes: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Alinha os contadores com os números existentes (após migration ou
+        importações que gravam números explícitos). Nunca recua um contador.
+
+        Args:
+            nomes: Sequências a sincronizar (default: todas)
+
+        Returns:
+            Dict {nome: ultimo_valor}
+        """
+        valores = {}
+        for nome in (nomes or SEQUENCIAS):
+            maximo = self._maximo_existente(nome)
+            if self.disponivel():
+                atual = self._valor_atual(nome)
+                if atual is None:
+                    self._semear(nome)
+                    atual = self._valor_atual(nome)
+                elif atual < maximo:
+                    self.db_session.execute(
+                        update(Sequencia)
+                        .where(Sequencia.nome == nome)
+                        .values(ultimo_valor=maximo, updated_at=datetime.utcnow())
+                        .execution_options(synchronize_session=False)
+                    )
+                    atual = maximo
+                valores[nome] = atual
+            else:
+                valores[nome] = maximo
+        return valores
+
+    # ========== Formatação ==========
+
+    @staticmethod
+    def formatar(nome: str, valor: int) -> str:
+        """Formata um valor com o prefixo da sequência (ex: 81 -> #P0081)"""
+        _, prefixo, digitos = SEQUENCIAS[nome]
+        return f"{prefixo}{valor:0{digitos}d}"
+
+    @staticmethod
+    def extrair(nome: str, numero: Optional[str]) -> Optional[int]:
+        """Extrai o valor de um número formatado (ex: #P0081 -> 81), None se não tiver o formato"""
+        _, prefixo, _ = SEQUENCIAS[nome]
+        if not numero or not numero.startswith(prefixo):
+            return None
+        sufixo = numero[len(prefixo):]
+        return int(sufixo) if re.fullmatch(r'\d+', sufixo) else None
+
+    # ========== Internos ==========
+
+    def _incrementar(self, nome: str, quantidade: int) -> Optional[int]:
+        """UPDATE atómico do contador; devolve o novo ultimo_valor (None se a sequência não existir)"""
+        stmt = (
+            update(Sequencia)
+            .where(Sequencia.nome == nome)
+            .values(ultimo_valor=Sequencia.ultimo_valor + quantidade, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+
+        if self.db_session.get_bind().dialect.update_returning:
+            return self.db_session.execute(stmt.returning(Sequencia.ultimo_valor)).scalar()
+
+        # Sem RETURNING: a linha fica bloqueada pelo UPDATE até ao fim da transação
+        if self.db_session.execute(stmt).rowcount == 0:
+            return None
+        return self._valor_atual(nome)
+
+    def _valor_atual(self, nome: str) -> Optional[int]:
+        return self.db_session.execute(
+            select(Sequencia.ultimo_valor).where(Sequencia.nome == nome)
+        ).scalar()
+
+    def _semear(self, nome: str):
+        """Cria o contador com o maior número existente (ignora se outro cliente já o criou)"""
+        maximo = self._maximo_existente(nome)
+        try:
+            with self.db_session.begin_nested():
+                self.db_session.execute(
+                    insert(Sequencia).values(nome=nome, ultimo_valor=maximo, updated_at=datetime.utcnow())
+                )
+            logger.info(f"Sequência '{nome}' inicializada em {maximo}")
+        except IntegrityError:
+            pass
+
+    def _maximo_existente(self, nome: str) -> int:
+        """Maior número já atribuído na tabela da entidade (0 se vazia)"""
+        coluna, prefixo, _ = SEQUENCIAS[nome]
+        numeros = self.db_session.execute(
+            select(coluna).where(coluna.like(f"{prefixo}%"))
+        ).scalars()
+        return max((valor for valor in (self.extrair(nome, n) for n in numeros) if valor is not None), default=0)
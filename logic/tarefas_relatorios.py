@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Geração e exportação de relatórios em segundo plano
+
+As tarefas correm numa thread de trabalho, cada uma com a sua própria
+sessão de DB, para não bloquear a thread do Tk. A thread só publica
+eventos (início, progresso, fim); a UI consulta o executor com after() e
+processar_eventos() chama os callbacks já na thread de quem consulta:
+
+    executor = ExecutorRelatorios(sessionmaker(bind=engine))
+    executor.submeter("PDF: saldos.pdf", exportar_relatorio, nome, argumentos,
+                      'pdf', filename, ao_erro=mostrar_erro)
+
+    def verificar():
+        if executor.processar_eventos():
+            self.after(100, verificar)
+
+As tarefas correm uma de cada vez, pela ordem em que foram submetidas.
+Cancelar é cooperativo: uma tarefa em fila é descartada e a que está a
+correr pára no próximo ponto de verificação (reportar() / acompanhar()).
+"""
+import itertools
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from logic.relatorios import RelatoriosManager
+
+# Relatórios de listagem exportados em streaming: método → (chave das linhas, chave do total)
+LISTAGENS: Dict[str, Tuple[str, str]] = {
+    'gerar_relatorio_projetos': ('projetos', 'total_projetos'),
+    'gerar_relatorio_despesas': ('despesas', 'total_despesas'),
+}
+
+
+class TarefaCancelada(Exception):
+    """A tarefa foi cancelada enquanto corria"""
+
+
+class TarefaRelatorio:
+    """
+    Uma tarefa submetida ao ExecutorRelatorios
+
+    A função da tarefa recebe (manager, tarefa, *args, **kwargs), em que
+    manager é um RelatoriosManager com a sessão da thread de trabalho, e
+    usa a tarefa para reportar o progresso e verificar o cancelamento.
+    """
+
+    PENDENTE = 'pendente'
+    A_CORRER = 'a_correr'
+    CONCLUIDA = 'concluida'
+    CANCELADA = 'cancelada'
+    ERRO = 'erro'
+
+    def __init__(self, id: int, descricao: str, funcao: Callable, args: tuple, kwargs: dict,
+                 ao_concluir: Optional[Callable] = None, ao_erro: Optional[Callable] = None,
+                 ao_progresso: Optional[Callable] = None):
+        self.id = id
+        self.descricao = descricao
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.ao_concluir = ao_concluir
+        self.ao_erro = ao_erro
+        self.ao_progresso = ao_progresso
+
+        self.estado = self.PENDENTE
+        self.progresso = 0.0
+        self.mensagem = ''
+        self.resultado = None
+        self.erro: Optional[Exception] = None
+
+        self._cancelada = threading.Event()
+        self._executor: Optional['ExecutorRelatorios'] = None
+
+    @property
+    def cancelada(self) -> bool:
+        """Foi pedido o cancelamento"""
+        return self._cancelada.is_set()
+
+    @property
+    def terminada(self) -> bool:
+        return self.estado in (self.CONCLUIDA, self.CANCELADA, self.ERRO)
+
+    def cancelar(self):
+        """Pede o cancelamento (a tarefa pára no próximo ponto de verificação)"""
+        self._cancelada.set()
+
+    def verificar_cancelamento(self):
+        """Levanta TarefaCancelada se foi pedido o cancelamento"""
+        if self._cancelada.is_set():
+            raise TarefaCancelada()
+
+    def reportar(self, progresso: float, mensagem: Optional[str] = None):
+        """
+        Atualiza o progresso (e verifica o cancelamento)
+
+        Args:
+            progresso: Fração concluída (0 a 1)
+            mensagem: Texto a mostrar (opcional; mantém o anterior)
+        """
+        self.verificar_cancelamento()
+        self.progresso = max(0.0, min(1.0, progresso))
+        if mensagem is not None:
+            self.mensagem = mensagem
+        if self._executor:
+            self._executor._publicar(self, 'progresso')
+
+    def acompanhar(self, itens: Iterable[Any], total: int, mensagem: str = "Linhas",
+                   passo: int = 100) -> Iterator[Any]:
+        """
+        Itera os itens reportando o progresso a cada passo itens
+
+        Args:
+            itens: Itens a percorrer (ex: linhas de um relatório em streaming)
+            total: Número total de itens
+            mensagem: Prefixo da mensagem de progresso
+            passo: Itens entre cada atualização
+
+        Yields:
+            Os itens; levanta TarefaCancelada se a tarefa for cancelada
+        """
+        for indice, item in enumerate(itens, 1):
+            if indice % passo == 0:
+                self.reportar(indice / total if total else 0, f"{mensagem}: {indice}/{total}")
+            yield item
+        self.verificar_cancelamento()
+
+
+class ExecutorRelatorios:
+    """
+    Fila de tarefas de relatórios executadas numa thread de trabalho
+
+    submeter(), processar_eventos() e cancelar_todas() são chamados pela
+    thread da UI; a thread de trabalho arranca com a primeira tarefa.
+    """
+
+    def __init__(self, fabrica_sessao: Callable):
+        """
+        Args:
+            fabrica_sessao: Cria uma sessão nova (ex: sessionmaker(bind=engine));
+                cada tarefa usa e fecha a sua
+        """
+        self.fabrica_sessao = fabrica_sessao
+        self._fila: queue.Queue = queue.Queue()
+        self._eventos: queue.Queue = queue.Queue()
+        self._tarefas: List[TarefaRelatorio] = []
+        self._ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def tarefas(self) -> List[TarefaRelatorio]:
+        """Tarefas ainda não entregues por processar_eventos(), por ordem de submissão"""
+        return list(self._tarefas)
+
+    @property
+    def tarefa_atual(self) -> Optional[TarefaRelatorio]:
+        """Tarefa a correr (se houver)"""
+        return next((t for t in self._tarefas if t.estado == TarefaRelatorio.A_CORRER), None)
+
+    def submeter(self, descricao: str, funcao: Callable, *args,
+                 ao_concluir: Optional[Callable[[Any], None]] = None,
+                 ao_erro: Optional[Callable[[Exception], None]] = None,
+                 ao_progresso: Optional[Callable[[TarefaRelatorio], None]] = None,
+                 **kwargs) -> TarefaRelatorio:
+        """
+        Põe uma tarefa na fila
+
+        Args:
+            descricao: Texto para mostrar na UI
+            funcao: Função (manager, tarefa, *args, **kwargs) executada na thread de trabalho
+            ao_concluir: Callback com o resultado (thread da UI)
+            ao_erro: Callback com a exceção (thread da UI)
+            ao_progresso: Callback com a tarefa quando começa ou reporta progresso (thread da UI)
+
+        Returns:
+            A tarefa (para consultar o estado ou cancelar)
+        """
+        tarefa = TarefaRelatorio(next(self._ids), descricao, funcao, args, kwargs,
+                                 ao_concluir, ao_erro, ao_progresso)
+        tarefa._executor = self
+        self._tarefas.append(tarefa)
+        self._fila.put(tarefa)
+
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._trabalhar, name="relatorios", daemon=True)
+            self._thread.start()
+        return tarefa
+
+    def cancelar_todas(self):
+        """Cancela as tarefas em fila e a que está a correr"""
+        for tarefa in self._tarefas:
+            tarefa.cancelar()
+
+    def fechar(self):
+        """Cancela tudo e termina a thread de trabalho"""
+        self.cancelar_todas()
+        self._fila.put(None)
+
+    def processar_eventos(self) -> bool:
+        """
+        Entrega os eventos publicados pela thread de trabalho
+
+        Os callbacks correm na thread de quem chama. Vários avanços de
+        progresso da mesma tarefa resultam numa única chamada de ao_progresso.
+
+        Returns:
+            True se ainda há tarefas em fila ou a correr
+        """
+        com_progresso: Dict[int, TarefaRelatorio] = {}
+        terminadas: List[TarefaRelatorio] = []
+        while True:
+            try:
+                tarefa, tipo = self._eventos.get_nowait()
+            except queue.Empty:
+                break
+            if tipo == 'fim':
+                com_progresso.pop(tarefa.id, None)
+                terminadas.append(tarefa)
+            else:
+                com_progresso[tarefa.id] = tarefa
+
+        for tarefa in com_progresso.values():
+            if tarefa.ao_progresso:
+                tarefa.ao_progresso(tarefa)
+
+        for tarefa in terminadas:
+            self._tarefas.remove(tarefa)
+            # Cancelada depois de terminar, mas antes de ser entregue
+            if tarefa.cancelada and tarefa.estado == TarefaRelatorio.CONCLUIDA:
+                tarefa.estado = TarefaRelatorio.CANCELADA
+            if tarefa.estado == TarefaRelatorio.CONCLUIDA and tarefa.ao_concluir:
+                tarefa.ao_concluir(tarefa.resultado)
+            elif tarefa.estado == TarefaRelatorio.ERRO and tarefa.ao_erro:
+                tarefa.ao_erro(tarefa.erro)
+
+        return bool(self._tarefas)
+
+    def _publicar(self, tarefa: TarefaRelatorio, tipo: str):
+        self._eventos.put((tarefa, tipo))
+
+    def _trabalhar(self):
+        while True:
+            tarefa = self._fila.get()
+            if tarefa is None:
+                return
+            self._executar(tarefa)
+
+    def _executar(self, tarefa: TarefaRelatorio):
+        if tarefa.cancelada:
+            tarefa.estado = TarefaRelatorio.CANCELADA
+            self._publicar(tarefa, 'fim')
+            return
+
+        tarefa.estado = TarefaRelatorio.A_CORRER
+        self._publicar(tarefa, 'inicio')
+        session = self.fabrica_sessao()
+        try:
+            resultado = tarefa.funcao(RelatoriosManager(session), tarefa, *tarefa.args, **tarefa.kwargs)
+            # Cancelada no fim: o resultado já não é pedido
+            tarefa.verificar_cancelamento()
+            tarefa.resultado = resultado
+            tarefa.estado = TarefaRelatorio.CONCLUIDA
+        except TarefaCancelada:
+            tarefa.estado = TarefaRelatorio.CANCELADA
+        except Exception as e:
+            tarefa.erro = e
+            tarefa.estado = TarefaRelatorio.ERRO
+        finally:
+            session.close()
+        self._publicar(tarefa, 'fim')
+
+
+def gerar_relatorio(manager: RelatoriosManager, tarefa: TarefaRelatorio, nome: str,
+                    argumentos: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Tarefa: gera um relatório para o preview
+
+    Args:
+        nome: Método do manager (ex: 'gerar_relatorio_saldos')
+        argumentos: Argumentos do método
+
+    Returns:
+        Dados do relatório
+    """
+    tarefa.reportar(0, "A gerar relatório...")
+    return getattr(manager, nome)(**argumentos)
+
+
+def exportar_relatorio(manager: RelatoriosManager, tarefa: TarefaRelatorio, nome: str,
+                       argumentos: Dict[str, Any], formato: str, filename: str) -> str:
+    """
+    Tarefa: gera um relatório e exporta-o para PDF ou Excel
+
+    As listagens (projetos, despesas) são geradas em streaming e o progresso
+    acompanha as linhas escritas no ficheiro. Se a tarefa for cancelada o
+    ficheiro incompleto é apagado.
+
+    Args:
+        nome: Método do manager (ex: 'gerar_relatorio_despesas')
+        argumentos: Argumentos do método
+        formato: 'pdf' ou 'excel'
+        filename: Ficheiro de destino
+
+    Returns:
+        O ficheiro exportado
+    """
+    tarefa.reportar(0, "A ler dados...")
+    if nome in LISTAGENS:
+        chave, chave_total = LISTAGENS[nome]
+        dados = getattr(manager, nome)(**argumentos, streaming=True)
+        dados[chave] = tarefa.acompanhar(dados[chave], dados[chave_total])
+    else:
+        dados = getattr(manager, nome)(**argumentos)
+
+    tarefa.reportar(0, "A escrever ficheiro...")
+    exportar = manager.exportar_pdf if formato == 'pdf' else manager.exportar_excel
+    try:
+        exportar(dados, filename)
+        tarefa.verificar_cancelamento()
+    except TarefaCancelada:
+        if os.path.exists(filename):
+            os.remove(filename)
+        raise
+
+    tarefa.reportar(1, "Concluído")
+    return filename
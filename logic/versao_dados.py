@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Versão dos dados por tabela (invalidação de caches)
+
+Cada tabela tem um contador que é incrementado sempre que uma sessão grava
+alterações nessa tabela (objetos novos/alterados/apagados no flush, ou
+INSERT/UPDATE/DELETE executados diretamente com session.execute()),
+novamente no commit e novamente se essas alterações forem desfeitas por
+rollback. O incremento no commit é necessário porque outra sessão (ex: o
+worker dos relatórios) pode calcular entre o flush e o commit: lê ainda os
+dados antigos e guardá-los-ia com a versão nova.
+
+Os caches guardam a versão das tabelas de que dependem e recalculam apenas
+quando ela muda:
+
+    chave = versao('projetos', 'despesas')
+    if chave != cache_chave:
+        ...recalcular...
+
+Só vê as alterações feitas por este processo; alterações externas (scripts,
+outra instância da aplicação) não invalidam os caches.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_lock = threading.Lock()
+_versoes: Dict[str, int] = defaultdict(int)
+
+
+def versao(*tabelas: str) -> Tuple[int, ...]:
+    """
+    Devolve a versão atual das tabelas indicadas
+
+    Args:
+        *tabelas: Nomes das tabelas (ex: 'projetos', 'despesas')
+
+    Returns:
+        Tuple com a versão de cada tabela (comparável entre chamadas)
+    """
+    with _lock:
+        return tuple(_versoes[tabela] for tabela in tabelas)
+
+
+def marcar_alterada(*tabelas: str):
+    """
+    Incrementa a versão das tabelas indicadas
+
+    Args:
+        *tabelas: Nomes das tabelas alteradas
+    """
+    with _lock:
+        for tabela in tabelas:
+            _versoes[tabela] += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _apos_flush(session, flush_context):
+    tabelas = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if hasattr(obj, '__table__')
+    }
+    if tabelas:
+        _registar_pendentes(session, tabelas)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apos_execute(orm_execute_state):
+    statement = orm_execute_state.statement
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        tabela = getattr(statement, 'table', None)
+        nome = getattr(tabela, 'name', None)
+        if nome:
+            _registar_pendentes(orm_execute_state.session, {nome})
+
+
+def _registar_pendentes(session, tabelas):
+    """Marca as tabelas como alteradas e lembra-as até ao commit/rollback"""
+    session.info.setdefault('versao_dados_pendentes', set()).update(tabelas)
+    marcar_alterada(*tabelas)
+
+
+@event.listens_for(Session, "after_commit")
+def _apos_commit(session):
+    # Os resultados calculados por outras sessões antes do commit leram os
+    # dados antigos: invalidá-los outra vez agora que as alterações são visíveis
+    tabelas = session.info.pop('versao_dados_pendentes', None)
+    if tabelas:
+        marcar_alterada(*tabelas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _apos_rollback(session, previous_transaction):
+    # Um cache pode ter lido as alterações entretanto desfeitas
+    tabelas = session.info.pop('versao_dados_pendentes', None)
+    if tabelas:
+        marcar_alterada(*tabelas)
@@ -13,6 +13,8 @@ from sqlalchemy.orm import sessionmaker
 from ui.screens.login import LoginScreen
 from logic.auth import AuthManager
 from utils.session import SessionManager
+from utils.instrumentacao_sql import ativar_se_configurado, obter_instrumentacao
+from logic.consulta_lista import registar_funcoes_sql
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -50,6 +52,8 @@ class App(ctk.CTk):
 
         try:
             self.engine = create_engine(database_url)
+            ativar_se_configurado(self.engine)
+            registar_funcoes_sql(self.engine)
             Session = sessionmaker(bind=self.engine)
             self.db_session = Session()
             self.auth_manager = AuthManager(self.db_session)
@@ -164,6 +168,15 @@ class App(ctk.CTk):
 
     def on_closing(self):
         """Handle application closing"""
+        # Gravar diagnóstico SQL (se a instrumentação estiver ativa)
+        instrumentacao = obter_instrumentacao()
+        caminho_json = os.getenv("SQL_INSTRUMENTACAO_JSON")
+        if instrumentacao and caminho_json:
+            try:
+                instrumentacao.exportar_json(caminho_json)
+            except Exception as e:
+                print(f"Erro ao gravar diagnóstico SQL: {e}")
+
         # Close database connection
         if self.db_session:
             self.db_session.close()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da listagem de boletins (5000 boletins × 10 linhas)
+
+Cria uma base de dados SQLite temporária e compara:
+- Antes: Boletim.linhas com lazy="joined" (JOIN a boletim_linhas em cada listagem)
+- Listagem atual: só cabeçalhos + num_linhas (perfil 'lista')
+- Primeira página do ecrã (consulta_lista, 200 linhas)
+- Relatório de boletins (cabeçalhos, perfil 'relatorio')
+- Detalhe: linhas de 50 boletins em batch (perfil 'detalhe', selectinload)
+
+Uso:
+    python scripts/benchmark_boletins_lista.py [num_boletins] [linhas_por_boletim]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker, joinedload
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.models import Base, Boletim, BoletimLinha, Socio, EstadoBoletim, TipoDeslocacao
+from logic.boletins import BoletinsManager
+from logic.relatorios import RelatoriosManager
+from ui.screens.boletins import BoletinsScreen
+
+
+def popular(engine, num_boletins: int, linhas_por_boletim: int):
+    """Insere boletins e linhas com INSERTs em bulk"""
+    agora = datetime.utcnow()
+    inicio = date(2020, 1, 1)
+    boletins = [
+        {
+            'id': i,
+            'numero': f"#B{i:05d}",
+            'socio': Socio.BA if i % 2 else Socio.RR,
+            'mes': (i % 12) + 1,
+            'ano': 2020 + (i % 6),
+            'data_emissao': inicio + timedelta(days=i % 2000),
+            'total_ajudas_nacionais': Decimal('0'),
+            'total_ajudas_estrangeiro': Decimal('0'),
+            'total_kms': Decimal('0'),
+            'valor_total': Decimal('100.00'),
+            'valor': Decimal('100.00'),
+            'descricao': f"Boletim {i}",
+            'estado': EstadoBoletim.PAGO if i % 3 else EstadoBoletim.PENDENTE,
+            'created_at': agora,
+            'updated_at': agora,
+        }
+        for i in range(1, num_boletins + 1)
+    ]
+    linhas = [
+        {
+            'boletim_id': b,
+            'ordem': ordem,
+            'servico': f"Serviço {b}.{ordem}",
+            'localidade': "Lisboa",
+            'tipo': TipoDeslocacao.NACIONAL,
+            'dias': Decimal('1.0'),
+            'kms': 100,
+            'created_at': agora,
+            'updated_at': agora,
+        }
+        for b in range(1, num_boletins + 1)
+        for ordem in range(1, linhas_por_boletim + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Boletim), boletins)
+        conn.execute(insert(BoletimLinha), linhas)
+
+
+def medir(nome: str, session, funcao, query_count, repeticoes: int = 3):
+    """Executa funcao() com a sessão limpa e mostra o melhor tempo e nº de queries"""
+    melhor = None
+    for _ in range(repeticoes):
+        session.expunge_all()
+        query_count[0] = 0
+        inicio = time.perf_counter()
+        resultado = funcao()
+        duracao = time.perf_counter() - inicio
+        melhor = duracao if melhor is None else min(melhor, duracao)
+    print(f"  {nome:<48} {melhor * 1000:>9.1f} ms  {query_count[0]:>3} queries  ({resultado} linhas)")
+
+
+def main():
+    num_boletins = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    linhas_por_boletim = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print("=" * 80)
+    print(f"⏱️  BENCHMARK LISTAGEM DE BOLETINS ({num_boletins} boletins × {linhas_por_boletim} linhas)")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        engine = create_engine(f"sqlite:///{os.path.join(pasta, 'benchmark.db')}")
+        Base.metadata.create_all(engine)
+        popular(engine, num_boletins, linhas_por_boletim)
+
+        query_count = [0]
+
+        def contar_query(conn, cursor, statement, parameters, context, executemany):
+            query_count[0] += 1
+
+        event.listen(engine, "before_cursor_execute", contar_query)
+
+        session = sessionmaker(bind=engine)()
+        manager = BoletinsManager(session)
+        relatorios = RelatoriosManager(session)
+        screen = BoletinsScreen.__new__(BoletinsScreen)
+
+        def renderizar(items):
+            return len([screen.item_to_dict(item) for item in items])
+
+        def antes():
+            # Comportamento anterior: lazy="joined" + len(item.linhas) no ecrã
+            boletins = session.query(Boletim).options(joinedload(Boletim.linhas)).all()
+            return len([len(b.linhas) for b in boletins])
+
+        def detalhe():
+            ids = [b.id for b in manager.listar_todos(perfil='base')[:50]]
+            boletins = manager._query('detalhe').filter(Boletim.id.in_(ids)).all()
+            return sum(len(b.linhas) for b in boletins)
+
+        medir("Antes (JOIN boletim_linhas)", session, antes, query_count)
+        medir("listar_todos() + item_to_dict", session, lambda: renderizar(manager.listar_todos()), query_count)
+        medir("consulta_lista().pagina(200) + item_to_dict", session,
+              lambda: renderizar(manager.consulta_lista().pagina(200)), query_count)
+        medir("gerar_relatorio_boletins()", session,
+              lambda: relatorios.gerar_relatorio_boletins()['total_boletins'], query_count)
+        medir("Detalhe: linhas de 50 boletins (selectinload)", session, detalhe, query_count)
+
+        session.close()
+        engine.dispose()
+
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
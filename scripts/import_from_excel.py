@@ -7,27 +7,61 @@ MODO INCREMENTAL (padrão):
 - Verifica se registo já existe (por número: #C001, #P001, etc.)
 - Se existe → SKIP (não atualiza, preserva alterações locais)
 - Se não existe → INSERT (cria novo)
-- Exceção PROJETOS: Se existe mas prémios mudaram → UPDATE prémios
+- Exceção PROJETOS: Se existe mas owner/prémios mudaram → UPDATE
+- Exceção DESPESAS: Se existe mas estado mudou → UPDATE estado
+
+PIPELINE (duas fases):
+1. LEITURA - as folhas são lidas linha a linha (openpyxl, modo read-only, sem
+   DataFrames) e normalizadas em registos simples (dicts com str/Decimal/date/enums),
+   sem tocar na base de dados. Com --workers N > 1 as folhas são repartidas por
+   um pool de N processos.
+2. ESCRITA - sequencial, pela ordem das dependências
+   (clientes → fornecedores → projetos → despesas → prémios → boletins):
+   - Os números/nomes já existentes são carregados uma vez para dicts/sets
+     (em vez de uma query por linha)
+   - Os registos novos são inseridos em lotes (INSERT executemany de --lote linhas)
+     e as alterações com UPDATEs em bulk por id
+   - Tudo numa única transação (commit no fim, rollback total em caso de erro)
+   - O ledger de saldos é sincronizado no fim, só para os registos alterados
+No fim é impresso o tempo de cada fase (leitura por folha, escrita por entidade,
+ledger e commit).
+
+DELTA (reimportação de snapshots):
+- Cada linha lida tem um hash (SHA-1 dos valores); os hashes do último
+  snapshot importado ficam na tabela importacao_hashes (migration 032)
+- Só as linhas novas ou alteradas desde esse snapshot passam à fase de
+  escrita; as removidas do Excel saem da tabela de hashes (os registos na
+  DB mantêm-se, como no resto do modo incremental)
+- O delta é impresso por folha e aplicado na mesma transação da escrita
+- Prémios são sempre recalculados (somam várias linhas da folha DESPESAS)
+- --completo ignora os hashes e processa todas as linhas (e regrava-os)
 
 FLAGS:
 --dry-run          Preview sem gravar nada
 --clear-all        Limpar DB antes de importar (cuidado!)
 --excel PATH       Caminho para ficheiro Excel (default: excel/CONTABILIDADE_FINAL_20251124.xlsx)
+--lote N           Registos por INSERT em bulk (default: 500)
+--workers N        Processos para a leitura das folhas (default: 1, sem pool)
+--completo         Processar todas as linhas, ignorando os hashes do último snapshot
 
 LÓGICA DE MATCHING:
 - CLIENTES: Número (#C001, #C002, ...)
 - FORNECEDORES: Número (#F001, #F002, ...)
 - PROJETOS: Número (#P001, #P002, ...)
 - DESPESAS: Número (#D001, #D002, ...)
-- BOLETINS: Número (#D... extraído de DESPESAS)
+- BOLETINS: Sócio + data de emissão + valor (linhas #D de deslocações/per diem)
 """
 import sys
 import os
+import math
+import time
 import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date
 from decimal import Decimal
-import pandas as pd
-from sqlalchemy import create_engine
+from openpyxl import load_workbook
+from sqlalchemy import create_engine, select, insert, update, delete, inspect
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
@@ -42,85 +76,110 @@ from database.models import (
     Cliente, Fornecedor, Projeto, Despesa, Boletim,
     TipoProjeto, EstadoProjeto,
     TipoDespesa, EstadoDespesa,
-    EstatutoFornecedor, Socio, EstadoBoletim
+    EstatutoFornecedor, Socio, EstadoBoletim,
+    ImportacaoHash, SaldoMovimento
 )
 
 # Import managers
-from logic.clientes import ClientesManager
-from logic.fornecedores import FornecedoresManager
-from logic.projetos import ProjetosManager
-from logic.despesas import DespesasManager
-from logic.boletins import BoletinsManager
-
-
-class ExcelImporter:
-    """Importador incremental do Excel"""
-
-    def __init__(self, session, excel_path, dry_run=False):
-        self.excel_path = excel_path
-        self.xl = None
-        self.session = session
-        self.dry_run = dry_run
-
-        # Managers
-        self.clientes_manager = ClientesManager(session)
-        self.fornecedores_manager = FornecedoresManager(session)
-        self.projetos_manager = ProjetosManager(session)
-        self.despesas_manager = DespesasManager(session)
-        self.boletins_manager = BoletinsManager(session)
-
-        # Mapeamentos (nome → ID)
-        self.clientes_map = {}
-        self.fornecedores_map = {}
-        self.projetos_map = {}
+from logic.saldo_movimentos import SaldoMovimentosManager, ORIGEM_PROJETO, ORIGEM_DESPESA, ORIGEM_BOLETIM
+from logic.sequencias import SequenciasManager
+
+# Registos por INSERT em bulk
+LOTE = 500
+
+# Tipos (coluna G da folha DESPESAS) que são boletins e não despesas
+TIPOS_BOLETIM = ('deslocação, pessoal', 'per diem pt, pessoal', 'per diem fora, pessoal')
+
+# Folhas lidas: nome → (prefixo da coluna A, método do LeitorExcel)
+FOLHAS = {
+    'CLIENTES': ('#C', 'ler_clientes'),
+    'FORNECEDORES': ('#F', 'ler_fornecedores'),
+    'PROJETOS': ('#P', 'ler_projetos'),
+    'DESPESAS': ('#D', 'ler_despesas'),
+}
+
+# Folha de cada lista de registos (filtro do delta pelo número da coluna A)
+REGISTOS_POR_FOLHA = {
+    'clientes': ('CLIENTES', 'numero'),
+    'fornecedores': ('FORNECEDORES', 'numero'),
+    'projetos': ('PROJETOS', 'numero'),
+    'despesas': ('DESPESAS', 'numero'),
+    'boletins': ('DESPESAS', 'excel'),
+}
+
+# Ordem de distribuição pelos workers (maiores primeiro)
+FOLHAS_POR_TAMANHO = ('DESPESAS', 'PROJETOS', 'FORNECEDORES', 'CLIENTES')
+
+
+class LeitorExcel:
+    """
+    Leitura e normalização das folhas do Excel em registos simples
+
+    Não acede à base de dados: o resultado só contém tipos que podem ser
+    enviados entre processos (str, Decimal, date, enums), para que cada
+    folha possa ser lida num worker e gravada depois pelo ExcelImporter.
+    """
+
+    def __init__(self, hoje):
+        self.hoje = hoje
+        self.linhas = 0
+        self.hashes = {}
+
+    def ler(self, workbook, folha):
+        """
+        Lê uma folha do workbook
 
-        # Estatísticas melhoradas
-        self.stats = {
-            'clientes': {'total': 0, 'new': 0, 'skip': 0, 'error': 0},
-            'fornecedores': {'total': 0, 'new': 0, 'skip': 0, 'error': 0},
-            'projetos': {'total': 0, 'new': 0, 'skip': 0, 'updated': 0, 'error': 0},
-            'despesas': {'total': 0, 'new': 0, 'skip': 0, 'updated': 0, 'error': 0},
-            'boletins': {'total': 0, 'new': 0, 'skip': 0, 'error': 0},
-            'premios': {'bruno': Decimal('0'), 'rafael': Decimal('0')},
+        Returns:
+            dict: {'folha', 'linhas', 'duracao', 'registos', 'hashes' (numero → SHA-1 da linha)}
+        """
+        prefixo, metodo = FOLHAS[folha]
+        inicio = time.perf_counter()
+        registos = getattr(self, metodo)(self._linhas(workbook[folha], prefixo))
+        return {
+            'folha': folha,
+            'linhas': self.linhas,
+            'duracao': time.perf_counter() - inicio,
+            'registos': registos,
+            'hashes': self.hashes,
         }
 
-        # Armazenar prémios para adicionar aos projetos depois
-        self.premios_por_projeto = {}
-
-        # Data de hoje para marcar fixas como PAGO
-        self.hoje = date.today()
-
-    # ========== MÉTODOS DE VERIFICAÇÃO DE EXISTÊNCIA ==========
-
-    def _exists_cliente(self, numero):
-        """Verifica se cliente já existe pelo número"""
-        return self.session.query(Cliente).filter(Cliente.numero == numero).first()
-
-    def _exists_fornecedor(self, numero):
-        """Verifica se fornecedor já existe pelo número"""
-        return self.session.query(Fornecedor).filter(Fornecedor.numero == numero).first()
-
-    def _exists_projeto(self, numero):
-        """Verifica se projeto já existe pelo número"""
-        return self.session.query(Projeto).filter(Projeto.numero == numero).first()
+    def _linhas(self, worksheet, prefixo):
+        """
+        Linhas de uma folha cujo número (coluna A) começa pelo prefixo (#C, #P, ...)
 
-    def _exists_despesa(self, numero):
-        """Verifica se despesa já existe pelo número"""
-        return self.session.query(Despesa).filter(Despesa.numero == numero).first()
+        Os números inteiros guardados como float (NIF 245127682.0) são
+        convertidos para int, como fazia o pandas. O hash de cada linha fica
+        em self.hashes (números repetidos acumulam o hash das várias linhas).
+        """
+        self.linhas = 0
+        self.hashes = {}
+        for row in worksheet.iter_rows(values_only=True):
+            if row and row[0] is not None and str(row[0]).startswith(prefixo):
+                self.linhas += 1
+                row = tuple(
+                    int(valor) if isinstance(valor, float) and valor.is_integer() else valor
+                    for valor in row
+                )
+                chave = str(row[0]).strip()
+                conteudo = self.hashes.get(chave, '') + repr(row)
+                self.hashes[chave] = hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+                yield row
 
-    def _exists_boletim(self, socio, data_emissao, valor):
-        """Verifica se boletim já existe (não tem número único)"""
-        return self.session.query(Boletim).filter(
-            Boletim.socio == socio,
-            Boletim.data_emissao == data_emissao,
-            Boletim.valor == valor
-        ).first()
+    @staticmethod
+    def _col(row, indice):
+        """Valor da coluna (None se a linha for mais curta)"""
+        return row[indice] if indice < len(row) else None
 
     # ========== MÉTODOS AUXILIARES (parsing) ==========
 
+    @staticmethod
+    def _vazio(value):
+        """Célula vazia (None ou NaN)"""
+        return value is None or (isinstance(value, float) and math.isnan(value))
+
     def parse_date(self, value):
         """Converte valor para date"""
-        if pd.isna(value):
+        if self._vazio(value):
             return None
         if isinstance(value, datetime):
             return value.date()
@@ -138,13 +197,13 @@ class ExcelImporter:
 
     def safe_str(self, value):
         """Converte para string segura"""
-        if pd.isna(value):
+        if self._vazio(value):
             return None
         return str(value).strip() if str(value).strip() else None
 
     def safe_decimal(self, value):
         """Converte para Decimal seguro"""
-        if pd.isna(value):
+        if self._vazio(value):
             return None
         try:
             return Decimal(str(value))
@@ -153,16 +212,26 @@ class ExcelImporter:
 
     def safe_int(self, value):
         """Converte para int seguro"""
-        if pd.isna(value):
+        if self._vazio(value):
             return None
         try:
             return int(float(value))
         except:
             return None
 
+    def parse_data_partes(self, ano, mes, dia):
+        """Data a partir das colunas ano/mês/dia (None se incompleta ou inválida)"""
+        ano, mes, dia = self.safe_int(ano), self.safe_int(mes), self.safe_int(dia)
+        if ano and mes and dia:
+            try:
+                return date(ano, mes, dia)
+            except:
+                return None
+        return None
+
     def mapear_estatuto_fornecedor(self, estatuto_str):
         """Mapeia estatuto do Excel para enum"""
-        if pd.isna(estatuto_str):
+        if self._vazio(estatuto_str):
             return EstatutoFornecedor.FREELANCER
 
         estatuto = str(estatuto_str).upper().strip()
@@ -186,13 +255,13 @@ class ExcelImporter:
         tipo = TipoProjeto.EMPRESA
         owner = 'BA'
 
-        if not pd.isna(estado_str):
+        if not self._vazio(estado_str):
             estado = str(estado_str).lower()
             if 'pessoal' in estado:
                 tipo = TipoProjeto.PESSOAL
 
         # Owner da coluna P
-        if not pd.isna(owner_str):
+        if not self._vazio(owner_str):
             owner_lower = str(owner_str).lower()
             if 'rafael' in owner_lower or 'rr' in owner_lower:
                 owner = 'RR'
@@ -212,350 +281,149 @@ class ExcelImporter:
         else:
             return EstadoProjeto.ATIVO
 
-    # ========== IMPORTAÇÃO DE CLIENTES ==========
-
-    def importar_clientes(self):
-        """Importa clientes (modo incremental)"""
-        print("\n" + "=" * 80)
-        print("📋 IMPORTANDO CLIENTES (modo incremental)")
-        print("=" * 80)
-
-        df = pd.read_excel(self.xl, sheet_name='CLIENTES', header=1)
-        df_dados = df[df.iloc[:, 0].astype(str).str.startswith('#C', na=False)]
-
-        print(f"Total de clientes no Excel: {len(df_dados)}")
-        print()
-
-        for idx, row in df_dados.iterrows():
-            numero = self.safe_str(row.iloc[0])
-            nome = self.safe_str(row.iloc[1])
+    # ========== FOLHAS ==========
 
+    def ler_clientes(self, linhas):
+        """Folha CLIENTES → {'clientes': [registo]} (mesma normalização de ClientesManager.criar)"""
+        clientes = []
+        for row in linhas:
+            nome = self.safe_str(self._col(row, 1))
             if not nome:
                 continue
 
-            self.stats['clientes']['total'] += 1
-
-            # ✅ VERIFICAR SE JÁ EXISTE
-            existing = self._exists_cliente(numero)
-            if existing:
-                self.stats['clientes']['skip'] += 1
-                self.clientes_map[nome] = existing.id
-                print(f"  ⏭️  {numero}: {nome} (já existe)")
-                continue
-
-            # DRY RUN: Não gravar
-            if self.dry_run:
-                self.stats['clientes']['new'] += 1
-                print(f"  🔍 {numero}: {nome} (seria criado)")
-                continue
-
-            # CRIAR NOVO
-            nif = self.safe_str(row.iloc[2])
-            morada = self.safe_str(row.iloc[3])
-            pais = self.safe_str(row.iloc[4])
-            angariacao = self.safe_str(row.iloc[5])
-            nota = self.safe_str(row.iloc[7]) if len(row) > 7 else None
-
-            try:
-                success, cliente, msg = self.clientes_manager.criar(
-                    nome=nome,
-                    nif=nif,
-                    morada=morada,
-                    pais=pais,
-                    angariacao=angariacao,
-                    nota=nota
-                )
-
-                if success:
-                    # Manter número do Excel
-                    cliente.numero = numero
-                    self.session.add(cliente)
-                    self.session.commit()
-
-                    self.stats['clientes']['new'] += 1
-                    self.clientes_map[nome] = cliente.id
-                    print(f"  ✅ {numero}: {nome} (criado)")
-                else:
-                    self.stats['clientes']['error'] += 1
-                    print(f"  ❌ {numero}: {nome} - {msg}")
-
-            except Exception as e:
-                self.session.rollback()
-                self.stats['clientes']['error'] += 1
-                print(f"  ❌ {numero}: {nome} - Erro: {e}")
-
-        self._print_stats('clientes')
-
-    # ========== IMPORTAÇÃO DE FORNECEDORES ==========
-
-    def importar_fornecedores(self):
-        """Importa fornecedores (modo incremental)"""
-        print("\n" + "=" * 80)
-        print("📋 IMPORTANDO FORNECEDORES (modo incremental)")
-        print("=" * 80)
-
-        df = pd.read_excel(self.xl, sheet_name='FORNECEDORES', header=1)
-        df_dados = df[df.iloc[:, 0].astype(str).str.startswith('#F', na=False)]
-
-        print(f"Total de fornecedores no Excel: {len(df_dados)}")
-        print()
-
-        for idx, row in df_dados.iterrows():
-            numero = self.safe_str(row.iloc[0])
-            nome = self.safe_str(row.iloc[1])
-
+            clientes.append({
+                'numero': self.safe_str(row[0]),
+                'nome': nome,
+                'nome_formal': nome,
+                'nif': self.safe_str(self._col(row, 2)),
+                'morada': self.safe_str(self._col(row, 3)),
+                'pais': self.safe_str(self._col(row, 4)) or "Portugal",
+                'angariacao': self.safe_str(self._col(row, 5)),
+                'nota': self.safe_str(self._col(row, 7)),
+            })
+        return {'clientes': clientes}
+
+    def ler_fornecedores(self, linhas):
+        """Folha FORNECEDORES → {'fornecedores': [registo]}"""
+        fornecedores = []
+        for row in linhas:
+            nome = self.safe_str(self._col(row, 1))
             if not nome:
                 continue
 
-            self.stats['fornecedores']['total'] += 1
-
-            # ✅ VERIFICAR SE JÁ EXISTE
-            existing = self._exists_fornecedor(numero)
-            if existing:
-                self.stats['fornecedores']['skip'] += 1
-                self.fornecedores_map[nome] = existing.id
-                print(f"  ⏭️  {numero}: {nome} (já existe)")
-                continue
-
-            # DRY RUN: Não gravar
-            if self.dry_run:
-                self.stats['fornecedores']['new'] += 1
-                print(f"  🔍 {numero}: {nome} (seria criado)")
-                continue
-
-            # CRIAR NOVO
-            estatuto_str = self.safe_str(row.iloc[2])
-            estatuto = self.mapear_estatuto_fornecedor(estatuto_str)
-            area = self.safe_str(row.iloc[3])
-            funcao = self.safe_str(row.iloc[4])
-            classificacao_str = self.safe_str(row.iloc[5])
-
+            classificacao_str = self.safe_str(self._col(row, 5))
             classificacao = None
             if classificacao_str:
-                classificacao = classificacao_str.count('*')
-                if classificacao > 5:
-                    classificacao = 5
-
-            validade_seguro = self.parse_date(row.iloc[6]) if len(row) > 6 else None
-            nif = self.safe_str(row.iloc[7]) if len(row) > 7 else None
-            iban = self.safe_str(row.iloc[8]) if len(row) > 8 else None
-            morada = self.safe_str(row.iloc[9]) if len(row) > 9 else None
-            pais = self.safe_str(row.iloc[10]) if len(row) > 10 else None
-            contacto = self.safe_str(row.iloc[11]) if len(row) > 11 else None
-            email = self.safe_str(row.iloc[12]) if len(row) > 12 else None
-            nota = self.safe_str(row.iloc[13]) if len(row) > 13 else None
-
-            try:
-                success, fornecedor, msg = self.fornecedores_manager.criar(
-                    nome=nome,
-                    estatuto=estatuto,
-                    area=area,
-                    funcao=funcao,
-                    classificacao=classificacao,
-                    nif=nif,
-                    iban=iban,
-                    morada=morada,
-                    pais=pais,
-                    contacto=contacto,
-                    email=email,
-                    validade_seguro_trabalho=validade_seguro,
-                    nota=nota
-                )
-
-                if success:
-                    # Manter número do Excel
-                    fornecedor.numero = numero
-                    self.session.add(fornecedor)
-                    self.session.commit()
-
-                    self.stats['fornecedores']['new'] += 1
-                    self.fornecedores_map[nome] = fornecedor.id
-                    print(f"  ✅ {numero}: {nome} (criado)")
-                else:
-                    self.stats['fornecedores']['error'] += 1
-                    print(f"  ❌ {numero}: {nome} - {msg}")
-
-            except Exception as e:
-                self.session.rollback()
-                self.stats['fornecedores']['error'] += 1
-                print(f"  ❌ {numero}: {nome} - Erro: {e}")
-
-        self._print_stats('fornecedores')
-
-    # ========== IMPORTAÇÃO DE PROJETOS ==========
-
-    def importar_projetos(self):
-        """Importa projetos (modo incremental + update prémios)"""
-        print("\n" + "=" * 80)
-        print("📋 IMPORTANDO PROJETOS (modo incremental + update prémios)")
-        print("=" * 80)
-
-        df = pd.read_excel(self.xl, sheet_name='PROJETOS', header=2)
-        df_dados = df[df.iloc[:, 0].astype(str).str.startswith('#P', na=False)]
-
-        print(f"Total de projetos no Excel: {len(df_dados)}")
-        print()
-
-        for idx, row in df_dados.iterrows():
-            numero = self.safe_str(row.iloc[0])
-            cliente_nome = self.safe_str(row.iloc[1])
-            descricao = self.safe_str(row.iloc[4])
-
+                classificacao = min(classificacao_str.count('*'), 5)
+
+            fornecedores.append({
+                'numero': self.safe_str(row[0]),
+                'nome': nome,
+                'estatuto': self.mapear_estatuto_fornecedor(self.safe_str(self._col(row, 2))),
+                'area': self.safe_str(self._col(row, 3)),
+                'funcao': self.safe_str(self._col(row, 4)),
+                'classificacao': classificacao,
+                'validade_seguro_trabalho': self.parse_date(self._col(row, 6)),
+                'nif': self.safe_str(self._col(row, 7)),
+                'iban': self.safe_str(self._col(row, 8)),
+                'morada': self.safe_str(self._col(row, 9)),
+                'pais': self.safe_str(self._col(row, 10)) or 'Portugal',
+                'contacto': self.safe_str(self._col(row, 11)),
+                'email': self.safe_str(self._col(row, 12)),
+                'nota': self.safe_str(self._col(row, 13)),
+            })
+        return {'fornecedores': fornecedores}
+
+    def ler_projetos(self, linhas):
+        """Folha PROJETOS → {'projetos': [registo]} (cliente por nome, resolvido na escrita)"""
+        projetos = []
+        for row in linhas:
+            descricao = self.safe_str(self._col(row, 4))
             if not descricao:
                 continue
 
-            self.stats['projetos']['total'] += 1
-
-            # Parse dados do Excel
-            data_inicio = self.parse_date(row.iloc[2])
-            data_fim = self.parse_date(row.iloc[3])
-            valor_sem_iva = self.safe_decimal(row.iloc[5])
-            data_faturacao = self.parse_date(row.iloc[6])
-            data_vencimento = self.parse_date(row.iloc[7])
-            data_recebimento = self.parse_date(row.iloc[8])
+            data_faturacao = self.parse_date(self._col(row, 6))
+            data_vencimento = self.parse_date(self._col(row, 7))
+            data_recebimento = self.parse_date(self._col(row, 8))
 
-            estado_str = self.safe_str(row.iloc[14]) if len(row) > 14 else None
-            owner_str = self.safe_str(row.iloc[15]) if len(row) > 15 else None
-            nota = self.safe_str(row.iloc[16]) if len(row) > 16 else None
-
-            tipo, owner = self.mapear_tipo_projeto(estado_str, owner_str)
+            tipo, owner = self.mapear_tipo_projeto(
+                self.safe_str(self._col(row, 14)), self.safe_str(self._col(row, 15))
+            )
             estado = self.mapear_estado_projeto(data_recebimento, data_faturacao, data_vencimento)
 
             if estado == EstadoProjeto.PAGO and data_recebimento and not data_faturacao:
                 data_faturacao = data_recebimento
 
-            cliente_id = None
-            if cliente_nome and cliente_nome in self.clientes_map:
-                cliente_id = self.clientes_map[cliente_nome]
-            elif cliente_nome:
-                cliente = self.session.query(Cliente).filter(Cliente.nome == cliente_nome).first()
-                if cliente:
-                    cliente_id = cliente.id
-                    self.clientes_map[cliente_nome] = cliente.id
-
-            # Prémios (do Excel, inicialmente 0)
-            premio_bruno = Decimal('0')
-            premio_rafael = Decimal('0')
-
-            # ✅ VERIFICAR SE JÁ EXISTE
-            existing = self._exists_projeto(numero)
-            if existing:
-                # Projeto existe → atualizar owner se diferente
-                print(f"  [DEBUG] {numero}: existing.owner={existing.owner}, excel.owner={owner}, dry_run={self.dry_run}")
-                if existing.owner != owner:
-                    if not self.dry_run:
-                        print(f"  [DEBUG] Atualizando {numero}: {existing.owner} → {owner}")
-                        existing.owner = owner
-                        self.session.commit()
-                        # Confirmar que gravou
-                        self.session.refresh(existing)
-                        print(f"  [DEBUG] Após commit: {existing.owner}")
-                        print(f"  🔄 {numero}: {descricao[:40]} (owner atualizado para {owner})")
-                    else:
-                        print(f"  🔍 {numero}: {descricao[:40]} (owner seria atualizado para {owner})")
-                    self.stats['projetos']['updated'] += 1
-                else:
-                    print(f"  ⏭️  {numero}: {descricao[:40]} (já existe)")
-                    self.stats['projetos']['skip'] += 1
-
-                self.projetos_map[numero] = existing.id
-                continue
-
-            # DRY RUN: Não gravar
-            if self.dry_run:
-                self.stats['projetos']['new'] += 1
-                tipo_icon = "🏢" if tipo == TipoProjeto.EMPRESA else "👤"
-                print(f"  🔍 {numero}: {tipo_icon}{owner} {descricao[:40]} (seria criado)")
-                continue
-
-            # CRIAR NOVO
-            try:
-                success, projeto, msg = self.projetos_manager.criar(
-                    tipo=tipo,
-                    owner=owner,
-                    cliente_id=cliente_id,
-                    descricao=descricao,
-                    valor_sem_iva=valor_sem_iva,
-                    data_inicio=data_inicio,
-                    data_fim=data_fim,
-                    data_faturacao=data_faturacao,
-                    data_vencimento=data_vencimento,
-                    premio_bruno=premio_bruno,
-                    premio_rafael=premio_rafael,
-                    estado=estado,
-                    nota=nota
-                )
+            projetos.append({
+                'numero': self.safe_str(row[0]),
+                'tipo': tipo,
+                'owner': owner,
+                'cliente_nome': self.safe_str(self._col(row, 1)),
+                'descricao': descricao,
+                'valor_sem_iva': self.safe_decimal(self._col(row, 5)),
+                'data_inicio': self.parse_date(self._col(row, 2)),
+                'data_fim': self.parse_date(self._col(row, 3)),
+                'data_faturacao': data_faturacao,
+                'data_vencimento': data_vencimento,
+                'estado': estado,
+                'premio_bruno': Decimal('0.00'),
+                'premio_rafael': Decimal('0.00'),
+                'nota': self.safe_str(self._col(row, 16)),
+            })
+        return {'projetos': projetos}
+
+    def ler_despesas(self, linhas):
+        """
+        Folha DESPESAS → despesas, prémios por projeto e boletins
 
-                if success:
-                    # Manter número do Excel
-                    projeto.numero = numero
-                    self.session.add(projeto)
-                    self.session.commit()
+        A folha é lida uma única vez: as linhas de prémios são somadas por
+        projeto e as de boletins (deslocações / per diem pessoais, exceto
+        outubro 2025) normalizadas à parte.
 
-                    self.stats['projetos']['new'] += 1
-                    self.projetos_map[numero] = projeto.id
-                    tipo_icon = "🏢" if tipo == TipoProjeto.EMPRESA else "👤"
-                    estado_icon = "✅" if estado == EstadoProjeto.PAGO else ("📄" if estado == EstadoProjeto.FINALIZADO else "⏳")
-                    print(f"  {estado_icon} {numero}: {tipo_icon}{owner} {descricao[:40]} (criado)")
+        Returns:
+            dict: {'despesas': [registo], 'premios': {projeto_numero: {'bruno', 'rafael'}},
+                   'boletins': [registo], 'boletins_outubro': int}
+        """
+        despesas = []
+        premios = {}
+        boletins = []
+        boletins_outubro = 0
+
+        for row in linhas:
+            numero = self.safe_str(row[0])
+            credor_nome = self.safe_str(self._col(row, 4))
+            tipo_str = self.safe_str(self._col(row, 6))
+            descricao = self.safe_str(self._col(row, 7))
+
+            # Boletins (deslocações / per diem pessoais), exceto outubro 2025
+            boletim = any(x in str(self._col(row, 6)).lower() for x in TIPOS_BOLETIM)
+            if boletim:
+                if 'OUT2025' in str(self._col(row, 7)).upper():
+                    boletins_outubro += 1
                 else:
-                    self.stats['projetos']['error'] += 1
-                    print(f"  ❌ {numero}: {descricao[:40]} - {msg}")
-
-            except Exception as e:
-                self.session.rollback()
-                self.stats['projetos']['error'] += 1
-                print(f"  ❌ {numero}: {descricao[:40]} - Erro: {e}")
-
-        self._print_stats('projetos')
-
-    # ========== IMPORTAÇÃO DE DESPESAS ==========
-
-    def importar_despesas(self):
-        """Importa despesas (modo incremental, sem prémios e boletins)"""
-        print("\n" + "=" * 80)
-        print("📋 IMPORTANDO DESPESAS (modo incremental)")
-        print("=" * 80)
-
-        df = pd.read_excel(self.xl, sheet_name='DESPESAS', header=5)
-        df_dados = df[df.iloc[:, 0].astype(str).str.startswith('#D', na=False)]
-
-        print(f"Total de registos DESPESAS no Excel: {len(df_dados)}")
-        print("(Prémios e Boletins serão processados separadamente)")
-        print()
-
-        for idx, row in df_dados.iterrows():
-            numero = self.safe_str(row.iloc[0])
-            credor_nome = self.safe_str(row.iloc[4])
-            tipo_str = self.safe_str(row.iloc[6])
-            descricao = self.safe_str(row.iloc[7])
+                    boletins.append(self._ler_boletim(row, numero, credor_nome, descricao))
 
             if not descricao:
                 continue
 
-            # SKIP Prémios (processados em processar_premios)
+            # Prémios (aplicados aos projetos em processar_premios)
             if tipo_str and ('prém' in str(tipo_str).lower() or 'premio' in str(tipo_str).lower()):
-                projeto_numero = self.safe_str(row.iloc[5])
-                valor = self.safe_decimal(row.iloc[15])
+                projeto_numero = self.safe_str(self._col(row, 5))
+                valor = self.safe_decimal(self._col(row, 15))
 
                 if projeto_numero and valor:
-                    if projeto_numero not in self.premios_por_projeto:
-                        self.premios_por_projeto[projeto_numero] = {'bruno': Decimal('0'), 'rafael': Decimal('0')}
-
+                    premio = premios.setdefault(projeto_numero, {'bruno': Decimal('0'), 'rafael': Decimal('0')})
                     if 'bruno' in str(credor_nome).lower():
-                        self.premios_por_projeto[projeto_numero]['bruno'] += valor
-                        self.stats['premios']['bruno'] += valor
+                        premio['bruno'] += valor
                     elif 'rafael' in str(credor_nome).lower():
-                        self.premios_por_projeto[projeto_numero]['rafael'] += valor
-                        self.stats['premios']['rafael'] += valor
+                        premio['rafael'] += valor
 
                 continue
 
-            # SKIP Boletins (processados em importar_boletins)
-            if tipo_str and any(x in str(tipo_str).lower() for x in ['deslocação, pessoal', 'per diem pt, pessoal', 'per diem fora, pessoal']):
+            # Boletins já recolhidos acima
+            if tipo_str and boletim:
                 continue
 
-            self.stats['despesas']['total'] += 1
-
             # PROCESSAR DADOS DA LINHA (para criar OU atualizar)
             #
             # LÓGICA CORRETA:
@@ -565,29 +433,17 @@ class ExcelImporter:
             #
 
             # Ler DATA DE VENCIMENTO da coluna T (índice 19) - FONTE DA VERDADE
-            data_vencimento = None
-            if len(row) > 19:
-                data_vencimento = self.parse_date(row.iloc[19])
+            data_vencimento = self.parse_date(self._col(row, 19))
 
             # Se coluna T vazia, tentar usar colunas B/C/D para campo 'data' (informativo)
-            data_despesa = data_vencimento  # Preferir coluna T
-            if not data_despesa:
-                ano = self.safe_int(row.iloc[1])
-                mes = self.safe_int(row.iloc[2])
-                dia = self.safe_int(row.iloc[3])
-
-                if ano and mes and dia:
-                    try:
-                        data_despesa = date(ano, mes, dia)
-                    except:
-                        data_despesa = None
-
-            projeto_numero = self.safe_str(row.iloc[5])
-            periodicidade = self.safe_str(row.iloc[8])
-            valor_sem_iva = self.safe_decimal(row.iloc[15])
-            valor_com_iva = self.safe_decimal(row.iloc[16]) if len(row) > 16 else None
-            nota = self.safe_str(row.iloc[22]) if len(row) > 22 else None
-            out_col = self.safe_str(row.iloc[20]) if len(row) > 20 else None
+            data_despesa = data_vencimento or self.parse_data_partes(
+                self._col(row, 1), self._col(row, 2), self._col(row, 3)
+            )
+
+            periodicidade = self.safe_str(self._col(row, 8))
+            valor_sem_iva = self.safe_decimal(self._col(row, 15))
+            valor_com_iva = self.safe_decimal(self._col(row, 16))
+            out_col = self.safe_str(self._col(row, 20))
 
             # Determinar tipo
             tipo = None
@@ -618,7 +474,7 @@ class ExcelImporter:
             #
             # NOTAS IMPORTANTES:
             # 1. Coluna V (ATIVO) NÃO é usada para determinar estado PAGO/PENDENTE
-            # 2. Despesas do tipo PRÉMIO ou COMISSÃO são filtradas antes (linhas 507-522)
+            # 2. Despesas do tipo PRÉMIO ou COMISSÃO são filtradas antes
             #    e processadas separadamente em processar_premios()
             # 3. Prémios são pagos através de boletins, não como despesas diretas
             #
@@ -631,168 +487,636 @@ class ExcelImporter:
                 estado = EstadoDespesa.PENDENTE
                 data_pagamento = None
 
-            # Credor ID
-            credor_id = None
-            if credor_nome:
-                if credor_nome in self.fornecedores_map:
-                    credor_id = self.fornecedores_map[credor_nome]
-                else:
-                    credor = self.session.query(Fornecedor).filter(Fornecedor.nome == credor_nome).first()
-                    if credor:
-                        credor_id = credor.id
-                        self.fornecedores_map[credor_nome] = credor.id
-
-            # Projeto ID
-            projeto_id = None
-            if projeto_numero:
-                if projeto_numero in self.projetos_map:
-                    projeto_id = self.projetos_map[projeto_numero]
-                else:
-                    projeto = self.session.query(Projeto).filter(Projeto.numero == projeto_numero).first()
-                    if projeto:
-                        projeto_id = projeto.id
-                        self.projetos_map[projeto_numero] = projeto.id
+            despesas.append({
+                'numero': numero,
+                'tipo': tipo,
+                'data': data_despesa,  # Pode vir de T ou B/C/D (None → erro na escrita)
+                'credor_nome': credor_nome,
+                'projeto_numero': self.safe_str(self._col(row, 5)),
+                'descricao': descricao,
+                'valor_sem_iva': valor_sem_iva if valor_sem_iva is not None else Decimal('0'),
+                'valor_com_iva': valor_com_iva if valor_com_iva is not None else Decimal('0'),
+                'estado': estado,
+                'data_pagamento': data_pagamento,
+                'nota': self.safe_str(self._col(row, 22)),
+            })
+
+        return {
+            'despesas': despesas,
+            'premios': premios,
+            'boletins': boletins,
+            'boletins_outubro': boletins_outubro,
+        }
 
-            # ✅ VERIFICAR SE JÁ EXISTE (após processar dados)
-            existing = self._exists_despesa(numero)
-            if existing:
-                # Verificar se estado mudou no Excel
-                if existing.estado != estado:
-                    # Estado mudou → ATUALIZAR
+    def _ler_boletim(self, row, numero, credor_nome, descricao):
+        """Linha de boletim da folha DESPESAS → registo (sócio None se não identificado)"""
+        socio = None
+        if 'bruno' in str(credor_nome).lower():
+            socio = Socio.BA
+        elif 'rafael' in str(credor_nome).lower():
+            socio = Socio.RR
+
+        data_vencimento = self.parse_date(self._col(row, 19))
+        data_emissao = self.parse_data_partes(
+            self._col(row, 1), self._col(row, 2), self._col(row, 3)
+        ) or data_vencimento
+
+        return {
+            'excel': numero,
+            'credor_nome': credor_nome,
+            'socio': socio,
+            'data_emissao': data_emissao,
+            'data_vencimento': data_vencimento,
+            'valor': self.safe_decimal(self._col(row, 15)),
+            'descricao': descricao,
+        }
+
+
+def ler_folhas(excel_path, folhas, hoje):
+    """
+    Lê um grupo de folhas (ponto de entrada dos workers do pool)
+
+    O workbook é aberto uma vez por grupo: em modo read-only o openpyxl
+    percorre todas as abas ao abrir, pelo que esse custo domina a leitura.
+
+    Returns:
+        tuple: (abertura_segundos, {folha: resultado de LeitorExcel.ler})
+    """
+    inicio = time.perf_counter()
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    abertura = time.perf_counter() - inicio
+    try:
+        leitor = LeitorExcel(hoje)
+        return abertura, {folha: leitor.ler(workbook, folha) for folha in folhas}
+    finally:
+        workbook.close()
+
+
+class ExcelImporter:
+    """Importador incremental do Excel (leitura opcionalmente paralela, escrita em bulk)"""
+
+    def __init__(self, session, excel_path, dry_run=False, lote=LOTE, workers=1, completo=False):
+        self.excel_path = excel_path
+        self.session = session
+        self.dry_run = dry_run
+        self.lote = lote
+        self.workers = max(1, workers)
+        self.completo = completo
+
+        # Delta por folha ({'novas', 'alteradas', 'removidas', 'inalteradas'}), None = importação completa
+        self.delta = None
+
+        self.ledger = SaldoMovimentosManager(session)
+        self.sequencias = SequenciasManager(session)
+
+        # Mapeamentos (nome/número → ID), carregados em _carregar_existentes()
+        self.clientes_map = {}
+        self.fornecedores_map = {}
+        self.projetos_map = {}
+
+        # Registos existentes (chave → dados usados na comparação)
+        self.clientes_existentes = {}      # numero → id
+        self.fornecedores_existentes = {}  # numero → id
+        self.projetos_existentes = {}      # numero → {'id', 'owner', 'premio_bruno', 'premio_rafael'}
+        self.despesas_existentes = {}      # numero → {'id', 'estado'}
+        self.boletins_existentes = {}      # (socio, data_emissao) → [valor, ...]
+
+        # IDs alterados por origem (sincronização do ledger no fim)
+        self.alterados = {ORIGEM_PROJETO: set(), ORIGEM_DESPESA: set(), ORIGEM_BOLETIM: set()}
+
+        # Estatísticas melhoradas
+        self.stats = {
+            'clientes': {'total': 0, 'new': 0, 'skip': 0, 'error': 0},
+            'fornecedores': {'total': 0, 'new': 0, 'skip': 0, 'error': 0},
+            'projetos': {'total': 0, 'new': 0, 'skip': 0, 'updated': 0, 'error': 0},
+            'despesas': {'total': 0, 'new': 0, 'skip': 0, 'updated': 0, 'error': 0},
+            'boletins': {'total': 0, 'new': 0, 'skip': 0, 'error': 0},
+            'premios': {'bruno': Decimal('0'), 'rafael': Decimal('0')},
+        }
+
+        # Tempos por fase (segundos)
+        self.tempos = {'abertura': 0.0, 'leitura': 0.0, 'folhas': {}, 'escrita': {}}
+
+        # Data de hoje para marcar fixas como PAGO
+        self.hoje = date.today()
+
+    # ========== FASE 1: LEITURA ==========
+
+    def _ler_excel(self):
+        """
+        Lê e normaliza todas as folhas (sem acesso à DB)
+
+        Com workers > 1 as folhas são repartidas por um ProcessPoolExecutor;
+        cada worker abre o workbook uma vez para o seu grupo de folhas (a
+        abertura repete-se em cada processo, só compensa com vários CPUs).
+
+        Returns:
+            dict: {folha: {'folha', 'linhas', 'duracao', 'registos'}}
+        """
+        inicio = time.perf_counter()
+        workers = self._workers_efetivos()
+
+        if workers == 1:
+            self.tempos['abertura'], leituras = ler_folhas(self.excel_path, tuple(FOLHAS), self.hoje)
+        else:
+            grupos = [FOLHAS_POR_TAMANHO[i::workers] for i in range(workers)]
+            leituras = {}
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for abertura, resultado in pool.map(ler_folhas, [self.excel_path] * workers, grupos,
+                                                    [self.hoje] * workers):
+                    self.tempos['abertura'] = max(self.tempos['abertura'], abertura)
+                    leituras.update(resultado)
+
+        self.tempos['leitura'] = time.perf_counter() - inicio
+        for folha, leitura in leituras.items():
+            self.tempos['folhas'][folha] = (leitura['linhas'], leitura['duracao'])
+        return leituras
+
+    def _workers_efetivos(self):
+        """Processos de leitura: no máximo um por folha e um por CPU"""
+        return max(1, min(self.workers, len(FOLHAS), os.cpu_count() or 1))
+
+    # ========== DELTA (hashes por linha) ==========
+
+    def _hashes_disponiveis(self):
+        """Tabela importacao_hashes existe (migration 032)"""
+        return inspect(self.session.get_bind()).has_table(ImportacaoHash.__tablename__)
+
+    def _aplicar_delta(self, leituras):
+        """
+        Compara os hashes lidos com os do último snapshot e filtra os registos
+
+        Só os registos de linhas novas ou alteradas seguem para a escrita. Os
+        prémios não são filtrados: somam várias linhas da folha DESPESAS e o
+        processar_premios() só grava os projetos cujo total mudou.
+
+        Returns:
+            bool: True se há alguma linha nova, alterada ou removida
+        """
+        guardados = {folha: {} for folha in FOLHAS}
+        for folha, chave, hash_ in self.session.execute(
+            select(ImportacaoHash.folha, ImportacaoHash.chave, ImportacaoHash.hash)
+        ):
+            guardados.setdefault(folha, {})[chave] = hash_
+
+        self.delta = {}
+        for folha, leitura in leituras.items():
+            atuais = leitura['hashes']
+            anteriores = guardados[folha]
+            novas = atuais.keys() - anteriores.keys()
+            alteradas = {chave for chave in atuais.keys() & anteriores.keys() if atuais[chave] != anteriores[chave]}
+            self.delta[folha] = {
+                'novas': novas,
+                'alteradas': alteradas,
+                'removidas': anteriores.keys() - atuais.keys(),
+                'inalteradas': len(atuais) - len(novas) - len(alteradas),
+            }
+
+        for tipo, (folha, campo) in REGISTOS_POR_FOLHA.items():
+            processar = self.delta[folha]['novas'] | self.delta[folha]['alteradas']
+            registos = leituras[folha]['registos']
+            registos[tipo] = [registo for registo in registos[tipo] if registo[campo] in processar]
+
+        return any(
+            delta['novas'] or delta['alteradas'] or delta['removidas']
+            for delta in self.delta.values()
+        )
+
+    def _print_delta(self):
+        """Imprime o delta por folha em relação ao último snapshot importado"""
+        ultimo = self.session.execute(
+            select(ImportacaoHash.excel).order_by(ImportacaoHash.importado_em.desc()).limit(1)
+        ).scalar()
+
+        print(f"\n📐 DELTA desde o último snapshot importado ({os.path.basename(ultimo) if ultimo else 'nenhum'}):")
+        for folha, delta in self.delta.items():
+            print(f"   {folha:<14} ➕ {len(delta['novas']):>5} novas  "
+                  f"✏️  {len(delta['alteradas']):>5} alteradas  "
+                  f"➖ {len(delta['removidas']):>5} removidas  "
+                  f"= {delta['inalteradas']:>5} inalteradas")
+            if delta['removidas']:
+                removidas = sorted(delta['removidas'])
+                mais = f" (+{len(removidas) - 10})" if len(removidas) > 10 else ""
+                print(f"      Removidas do Excel (mantidas na DB): {', '.join(removidas[:10])}{mais}")
+
+    def _gravar_hashes(self, leituras):
+        """Grava os hashes do snapshot importado (na transação da importação)"""
+        excel = os.path.basename(self.excel_path)
+        agora = datetime.utcnow()
+
+        for folha, leitura in leituras.items():
+            hashes = leitura['hashes']
+            if self.delta is None:
+                # Importação completa: substituir todos os hashes da folha
+                self.session.execute(delete(ImportacaoHash).where(ImportacaoHash.folha == folha))
+                novas, alteradas = hashes.keys(), ()
+            else:
+                delta = self.delta[folha]
+                novas, alteradas = delta['novas'], delta['alteradas']
+                removidas = list(delta['removidas'])
+                for inicio in range(0, len(removidas), self.lote):
+                    self.session.execute(delete(ImportacaoHash).where(
+                        ImportacaoHash.folha == folha,
+                        ImportacaoHash.chave.in_(removidas[inicio:inicio + self.lote])
+                    ))
+
+            registos = [
+                {'folha': folha, 'chave': chave, 'hash': hashes[chave], 'excel': excel, 'importado_em': agora}
+                for chave in novas
+            ]
+            if registos:
+                self.session.execute(insert(ImportacaoHash), registos)
+            registos = [
+                {'folha': folha, 'chave': chave, 'hash': hashes[chave], 'excel': excel, 'importado_em': agora}
+                for chave in alteradas
+            ]
+            if registos:
+                self.session.execute(update(ImportacaoHash), registos)
+
+    # ========== REGISTOS EXISTENTES ==========
+
+    def _carregar_existentes(self):
+        """Carrega números/nomes existentes (uma query por tabela)"""
+        for numero, nome, id_ in self.session.execute(select(Cliente.numero, Cliente.nome, Cliente.id)):
+            self.clientes_existentes[numero] = id_
+            self.clientes_map[nome] = id_
+
+        for numero, nome, id_ in self.session.execute(select(Fornecedor.numero, Fornecedor.nome, Fornecedor.id)):
+            self.fornecedores_existentes[numero] = id_
+            self.fornecedores_map[nome] = id_
+
+        for numero, id_, owner, premio_bruno, premio_rafael in self.session.execute(
+            select(Projeto.numero, Projeto.id, Projeto.owner, Projeto.premio_bruno, Projeto.premio_rafael)
+        ):
+            self.projetos_existentes[numero] = {
+                'id': id_, 'owner': owner, 'premio_bruno': premio_bruno, 'premio_rafael': premio_rafael
+            }
+            self.projetos_map[numero] = id_
+
+        for numero, id_, estado in self.session.execute(select(Despesa.numero, Despesa.id, Despesa.estado)):
+            self.despesas_existentes[numero] = {'id': id_, 'estado': estado}
+
+        for socio, data_emissao, valor in self.session.execute(
+            select(Boletim.socio, Boletim.data_emissao, Boletim.valor)
+        ):
+            self.boletins_existentes.setdefault((socio, data_emissao), []).append(valor)
+
+    def _boletim_existe(self, socio, data_emissao, valor):
+        """
+        Boletim com o mesmo sócio, data e valor (não tem número único)
+
+        O valor é comparado ao meio cêntimo: valores do Excel com 3+ casas
+        decimais (399.575) voltam da coluna Numeric(10, 2) arredondados.
+        """
+        return any(
+            existente is not None and abs(Decimal(existente) - valor) <= Decimal('0.005')
+            for existente in self.boletins_existentes.get((socio, data_emissao), ())
+        )
+
+    def _inserir(self, modelo, registos):
+        """INSERT executemany de um lote; devolve {numero: id}"""
+        if not registos:
+            return {}
+        resultado = self.session.execute(insert(modelo).returning(modelo.numero, modelo.id), registos)
+        return dict(resultado.tuples().all())
+
+    # ========== FASE 2: ESCRITA ==========
+
+    # ========== IMPORTAÇÃO DE CLIENTES ==========
+
+    def importar_clientes(self, leitura):
+        """Importa clientes (modo incremental)"""
+        print("\n" + "=" * 80)
+        print("📋 IMPORTANDO CLIENTES (modo incremental)")
+        print("=" * 80)
+
+        inicio = time.perf_counter()
+        lote = []
+
+        registos = leitura['registos']['clientes']
+        for registo in registos:
+            numero = registo['numero']
+            nome = registo['nome']
+
+            self.stats['clientes']['total'] += 1
+
+            # ✅ VERIFICAR SE JÁ EXISTE
+            if numero in self.clientes_existentes:
+                self.stats['clientes']['skip'] += 1
+                if self.clientes_existentes[numero]:
+                    self.clientes_map[nome] = self.clientes_existentes[numero]
+                continue
+
+            self.clientes_existentes[numero] = None
+            self.stats['clientes']['new'] += 1
+
+            # DRY RUN: Não gravar
+            if self.dry_run:
+                print(f"  🔍 {numero}: {nome} (seria criado)")
+                continue
+
+            # CRIAR NOVO
+            lote.append(registo)
+            if len(lote) >= self.lote:
+                self._gravar_clientes(lote)
+                lote = []
+
+        self._gravar_clientes(lote)
+        self._print_stats('clientes', len(registos), inicio)
+
+    def _gravar_clientes(self, lote):
+        """Insere um lote de clientes"""
+        ids = self._inserir(Cliente, lote)
+        for registo in lote:
+            self.clientes_existentes[registo['numero']] = ids[registo['numero']]
+            self.clientes_map[registo['nome']] = ids[registo['numero']]
+            print(f"  ✅ {registo['numero']}: {registo['nome']} (criado)")
+
+    # ========== IMPORTAÇÃO DE FORNECEDORES ==========
+
+    def importar_fornecedores(self, leitura):
+        """Importa fornecedores (modo incremental)"""
+        print("\n" + "=" * 80)
+        print("📋 IMPORTANDO FORNECEDORES (modo incremental)")
+        print("=" * 80)
+
+        inicio = time.perf_counter()
+        lote = []
+
+        registos = leitura['registos']['fornecedores']
+        for registo in registos:
+            numero = registo['numero']
+            nome = registo['nome']
+
+            self.stats['fornecedores']['total'] += 1
+
+            # ✅ VERIFICAR SE JÁ EXISTE
+            if numero in self.fornecedores_existentes:
+                self.stats['fornecedores']['skip'] += 1
+                if self.fornecedores_existentes[numero]:
+                    self.fornecedores_map[nome] = self.fornecedores_existentes[numero]
+                continue
+
+            # Mesma validação de FornecedoresManager.criar
+            if registo['classificacao'] is not None and registo['classificacao'] < 1:
+                self.stats['fornecedores']['error'] += 1
+                print(f"  ❌ {numero}: {nome} - Classificação deve ser entre 1 e 5")
+                continue
+
+            self.fornecedores_existentes[numero] = None
+            self.stats['fornecedores']['new'] += 1
+
+            # DRY RUN: Não gravar
+            if self.dry_run:
+                print(f"  🔍 {numero}: {nome} (seria criado)")
+                continue
+
+            # CRIAR NOVO
+            lote.append(registo)
+            if len(lote) >= self.lote:
+                self._gravar_fornecedores(lote)
+                lote = []
+
+        self._gravar_fornecedores(lote)
+        self._print_stats('fornecedores', len(registos), inicio)
+
+    def _gravar_fornecedores(self, lote):
+        """Insere um lote de fornecedores"""
+        ids = self._inserir(Fornecedor, lote)
+        for registo in lote:
+            self.fornecedores_existentes[registo['numero']] = ids[registo['numero']]
+            self.fornecedores_map[registo['nome']] = ids[registo['numero']]
+            print(f"  ✅ {registo['numero']}: {registo['nome']} (criado)")
+
+    # ========== IMPORTAÇÃO DE PROJETOS ==========
+
+    def importar_projetos(self, leitura):
+        """Importa projetos (modo incremental + update owner)"""
+        print("\n" + "=" * 80)
+        print("📋 IMPORTANDO PROJETOS (modo incremental + update prémios)")
+        print("=" * 80)
+
+        inicio = time.perf_counter()
+        lote = []
+        atualizacoes = []
+
+        registos = leitura['registos']['projetos']
+        for registo in registos:
+            numero = registo['numero']
+            descricao = registo['descricao']
+            owner = registo['owner']
+
+            self.stats['projetos']['total'] += 1
+
+            # ✅ VERIFICAR SE JÁ EXISTE
+            existente = self.projetos_existentes.get(numero)
+            if numero in self.projetos_existentes:
+                if existente and existente['owner'] != owner:
+                    # Projeto existe → atualizar owner se diferente
                     if self.dry_run:
-                        old_estado = existing.estado.value
-                        new_estado = estado.value
-                        print(f"  🔄 {numero}: {descricao[:40]} (estado: {old_estado} → {new_estado})")
-                        self.stats['despesas']['updated'] += 1
+                        print(f"  🔍 {numero}: {descricao[:40]} (owner seria atualizado para {owner})")
                     else:
-                        try:
-                            existing.estado = estado
-                            existing.data_pagamento = data_pagamento
-                            self.session.commit()
-
-                            old_estado = existing.estado.value if hasattr(existing.estado, 'value') else existing.estado
-                            new_estado = estado.value
-                            print(f"  🔄 {numero}: {descricao[:40]} (estado atualizado: {new_estado})")
-                            self.stats['despesas']['updated'] += 1
-                        except Exception as e:
-                            print(f"  ❌ {numero}: Erro ao atualizar - {e}")
-                            self.stats['despesas']['error'] += 1
+                        atualizacoes.append({'id': existente['id'], 'owner': owner})
+                        self.alterados[ORIGEM_PROJETO].add(existente['id'])
+                        print(f"  🔄 {numero}: {descricao[:40]} (owner atualizado para {owner})")
+                    existente['owner'] = owner
+                    self.stats['projetos']['updated'] += 1
                 else:
-                    # Estado igual → SKIP
-                    self.stats['despesas']['skip'] += 1
-                    # print(f"  ⏭️  {numero}: {descricao[:40]} (já existe)")
+                    self.stats['projetos']['skip'] += 1
                 continue
 
+            self.projetos_existentes[numero] = None
+            self.stats['projetos']['new'] += 1
+            tipo_icon = "🏢" if registo['tipo'] == TipoProjeto.EMPRESA else "👤"
+
             # DRY RUN: Não gravar
             if self.dry_run:
-                self.stats['despesas']['new'] += 1
-                print(f"  🔍 {numero}: {descricao[:40]} (seria criado)")
+                print(f"  🔍 {numero}: {tipo_icon}{owner} {descricao[:40]} (seria criado)")
                 continue
 
-            # CRIAR NOVA DESPESA
-            try:
-                success, despesa, msg = self.despesas_manager.criar(
-                    tipo=tipo,
-                    data=data_despesa,  # Usar data_despesa (pode vir de T ou B/C/D)
-                    credor_id=credor_id,
-                    projeto_id=projeto_id,
-                    descricao=descricao,
-                    valor_sem_iva=valor_sem_iva,
-                    valor_com_iva=valor_com_iva,
-                    estado=estado,
-                    data_pagamento=data_pagamento,
-                    nota=nota
-                )
+            # CRIAR NOVO
+            registo = dict(registo)
+            cliente_nome = registo.pop('cliente_nome')
+            registo['cliente_id'] = self.clientes_map.get(cliente_nome) if cliente_nome else None
+            if registo['valor_sem_iva'] is None:
+                registo['valor_sem_iva'] = Decimal('0')
+            lote.append(registo)
+            if len(lote) >= self.lote:
+                self._gravar_projetos(lote)
+                lote = []
+
+        self._gravar_projetos(lote)
+        if atualizacoes:
+            self.session.execute(update(Projeto), atualizacoes)
+
+        self._print_stats('projetos', len(registos), inicio)
+
+    def _gravar_projetos(self, lote):
+        """Insere um lote de projetos"""
+        ids = self._inserir(Projeto, lote)
+        for registo in lote:
+            numero = registo['numero']
+            self.projetos_existentes[numero] = {
+                'id': ids[numero], 'owner': registo['owner'],
+                'premio_bruno': registo['premio_bruno'], 'premio_rafael': registo['premio_rafael']
+            }
+            self.projetos_map[numero] = ids[numero]
+            self.alterados[ORIGEM_PROJETO].add(ids[numero])
+
+            tipo_icon = "🏢" if registo['tipo'] == TipoProjeto.EMPRESA else "👤"
+            estado_icon = "✅" if registo['estado'] == EstadoProjeto.PAGO else (
+                "📄" if registo['estado'] == EstadoProjeto.FINALIZADO else "⏳")
+            print(f"  {estado_icon} {numero}: {tipo_icon}{registo['owner']} {registo['descricao'][:40]} (criado)")
 
-                if success:
-                    # Manter número do Excel
-                    despesa.numero = numero
-                    self.session.add(despesa)
-                    self.session.commit()
+    # ========== IMPORTAÇÃO DE DESPESAS ==========
+
+    def importar_despesas(self, leitura):
+        """Importa despesas (modo incremental; prémios e boletins vêm na mesma leitura)"""
+        print("\n" + "=" * 80)
+        print("📋 IMPORTANDO DESPESAS (modo incremental)")
+        print("=" * 80)
+        print("(Prémios e Boletins serão processados separadamente)")
+        print()
+
+        inicio = time.perf_counter()
+        lote = []
+        atualizacoes = []
+
+        registos = leitura['registos']['despesas']
+        for registo in registos:
+            numero = registo['numero']
+            descricao = registo['descricao']
+            estado = registo['estado']
+
+            self.stats['despesas']['total'] += 1
 
-                    self.stats['despesas']['new'] += 1
-                    tipo_icon = "🔧" if tipo == TipoDespesa.FIXA_MENSAL else "💸"
-                    print(f"  ✅ {numero}: {tipo_icon} {descricao[:40]} (criado)")
+            # ✅ VERIFICAR SE JÁ EXISTE (após processar dados)
+            existente = self.despesas_existentes.get(numero)
+            if numero in self.despesas_existentes:
+                if existente and existente['estado'] != estado:
+                    # Estado mudou no Excel → ATUALIZAR
+                    if self.dry_run:
+                        print(f"  🔄 {numero}: {descricao[:40]} (estado: {existente['estado'].value} → {estado.value})")
+                    else:
+                        atualizacoes.append({
+                            'id': existente['id'], 'estado': estado, 'data_pagamento': registo['data_pagamento']
+                        })
+                        self.alterados[ORIGEM_DESPESA].add(existente['id'])
+                        print(f"  🔄 {numero}: {descricao[:40]} (estado atualizado: {estado.value})")
+                    existente['estado'] = estado
+                    self.stats['despesas']['updated'] += 1
                 else:
-                    self.stats['despesas']['error'] += 1
-                    print(f"  ❌ {numero}: {descricao[:40]} - {msg}")
+                    # Estado igual → SKIP
+                    self.stats['despesas']['skip'] += 1
+                continue
 
-            except Exception as e:
-                self.session.rollback()
+            # Data obrigatória (NOT NULL, sem default - DespesasManager.criar falharia)
+            if not registo['data']:
                 self.stats['despesas']['error'] += 1
-                print(f"  ❌ {numero}: {descricao[:40]} - Erro: {e}")
+                print(f"  ❌ {numero}: {descricao[:40]} - Data em falta")
+                continue
 
-        self._print_stats('despesas')
+            self.despesas_existentes[numero] = None
+            self.stats['despesas']['new'] += 1
+
+            # DRY RUN: Não gravar
+            if self.dry_run:
+                print(f"  🔍 {numero}: {descricao[:40]} (seria criado)")
+                continue
+
+            # CRIAR NOVA DESPESA
+            registo = dict(registo)
+            credor_nome = registo.pop('credor_nome')
+            projeto_numero = registo.pop('projeto_numero')
+            registo['credor_id'] = self.fornecedores_map.get(credor_nome) if credor_nome else None
+            registo['projeto_id'] = self.projetos_map.get(projeto_numero) if projeto_numero else None
+            lote.append(registo)
+            if len(lote) >= self.lote:
+                self._gravar_despesas(lote)
+                lote = []
+
+        self._gravar_despesas(lote)
+        if atualizacoes:
+            self.session.execute(update(Despesa), atualizacoes)
+
+        self._print_stats('despesas', len(registos), inicio)
+
+    def _gravar_despesas(self, lote):
+        """Insere um lote de despesas"""
+        ids = self._inserir(Despesa, lote)
+        for registo in lote:
+            numero = registo['numero']
+            self.despesas_existentes[numero] = {'id': ids[numero], 'estado': registo['estado']}
+            self.alterados[ORIGEM_DESPESA].add(ids[numero])
+
+            tipo_icon = "🔧" if registo['tipo'] == TipoDespesa.FIXA_MENSAL else "💸"
+            print(f"  ✅ {numero}: {tipo_icon} {registo['descricao'][:40]} (criado)")
 
     # ========== PROCESSAR PRÉMIOS ==========
 
-    def processar_premios(self):
-        """Adiciona/atualiza prémios nos projetos"""
+    def processar_premios(self, leitura):
+        """Adiciona/atualiza prémios nos projetos (UPDATE em bulk)"""
         print("\n" + "=" * 80)
         print("🏆 PROCESSANDO PRÉMIOS")
         print("=" * 80)
 
-        if not self.premios_por_projeto:
+        premios_por_projeto = leitura['registos']['premios']
+        for premios in premios_por_projeto.values():
+            self.stats['premios']['bruno'] += premios['bruno']
+            self.stats['premios']['rafael'] += premios['rafael']
+
+        if not premios_por_projeto:
             print("Nenhum prémio encontrado no Excel.")
             return
 
-        print(f"Total de projetos com prémios no Excel: {len(self.premios_por_projeto)}")
+        print(f"Total de projetos com prémios no Excel: {len(premios_por_projeto)}")
         print()
 
-        for projeto_numero, premios in self.premios_por_projeto.items():
-            # Buscar projeto (pode já existir ou ter sido criado agora)
-            projeto = None
-            if projeto_numero in self.projetos_map:
-                # Map guarda ID, preciso buscar o objeto
-                projeto_id = self.projetos_map[projeto_numero]
-                projeto = self.session.query(Projeto).filter(Projeto.id == projeto_id).first()
-            else:
-                projeto = self._exists_projeto(projeto_numero)
-
+        atualizacoes = []
+        for projeto_numero, premios in premios_por_projeto.items():
+            # Projeto existente ou criado nesta importação
+            projeto = self.projetos_existentes.get(projeto_numero)
             if not projeto:
                 print(f"  ⚠️  {projeto_numero}: Projeto não encontrado")
                 continue
 
             # Verificar se prémios mudaram
             premios_mudaram = False
-            if premios['bruno'] > 0 and projeto.premio_bruno != premios['bruno']:
+            if premios['bruno'] > 0 and projeto['premio_bruno'] != premios['bruno']:
                 premios_mudaram = True
-            if premios['rafael'] > 0 and projeto.premio_rafael != premios['rafael']:
+            if premios['rafael'] > 0 and projeto['premio_rafael'] != premios['rafael']:
                 premios_mudaram = True
 
             if not premios_mudaram:
                 print(f"  ⏭️  {projeto_numero}: Prémios inalterados")
                 continue
 
+            bruno_str = f"Bruno: €{float(premios['bruno']):,.2f}" if premios['bruno'] > 0 else ""
+            rafael_str = f"Rafael: €{float(premios['rafael']):,.2f}" if premios['rafael'] > 0 else ""
+            premios_str = " | ".join(filter(None, [bruno_str, rafael_str]))
+
             # DRY RUN: Não gravar
             if self.dry_run:
-                bruno_str = f"Bruno: €{float(premios['bruno']):,.2f}" if premios['bruno'] > 0 else ""
-                rafael_str = f"Rafael: €{float(premios['rafael']):,.2f}" if premios['rafael'] > 0 else ""
-                premios_str = " | ".join(filter(None, [bruno_str, rafael_str]))
                 print(f"  🔍 {projeto_numero}: {premios_str} (seria atualizado)")
                 continue
 
             # ATUALIZAR PRÉMIOS
-            try:
-                if premios['bruno'] > 0:
-                    projeto.premio_bruno = premios['bruno']
-                if premios['rafael'] > 0:
-                    projeto.premio_rafael = premios['rafael']
-
-                self.session.add(projeto)
-                self.session.commit()
-
-                self.stats['projetos']['updated'] += 1
-
-                bruno_str = f"Bruno: €{float(premios['bruno']):,.2f}" if premios['bruno'] > 0 else ""
-                rafael_str = f"Rafael: €{float(premios['rafael']):,.2f}" if premios['rafael'] > 0 else ""
-                premios_str = " | ".join(filter(None, [bruno_str, rafael_str]))
-
-                print(f"  🔄 {projeto_numero}: {premios_str} (atualizado)")
-
-            except Exception as e:
-                self.session.rollback()
-                print(f"  ❌ {projeto_numero}: Erro ao atualizar - {e}")
+            if premios['bruno'] > 0:
+                projeto['premio_bruno'] = premios['bruno']
+            if premios['rafael'] > 0:
+                projeto['premio_rafael'] = premios['rafael']
+
+            atualizacoes.append({
+                'id': projeto['id'],
+                'premio_bruno': projeto['premio_bruno'],
+                'premio_rafael': projeto['premio_rafael'],
+            })
+            self.alterados[ORIGEM_PROJETO].add(projeto['id'])
+            self.stats['projetos']['updated'] += 1
+            print(f"  🔄 {projeto_numero}: {premios_str} (atualizado)")
+
+        if atualizacoes:
+            self.session.execute(update(Projeto), atualizacoes)
 
         print(f"\n💰 Total prémios no Excel:")
         print(f"   Bruno: €{float(self.stats['premios']['bruno']):,.2f}")
@@ -800,128 +1124,110 @@ class ExcelImporter:
 
     # ========== IMPORTAÇÃO DE BOLETINS ==========
 
-    def importar_boletins(self):
-        """Importa boletins (modo incremental)"""
+    def importar_boletins(self, leitura):
+        """Importa boletins (modo incremental, linhas recolhidas na leitura da folha DESPESAS)"""
         print("\n" + "=" * 80)
         print("📄 IMPORTANDO BOLETINS (modo incremental)")
         print("=" * 80)
 
-        df = pd.read_excel(self.xl, sheet_name='DESPESAS', header=5)
-        df_dados = df[df.iloc[:, 0].astype(str).str.startswith('#D', na=False)]
-
-        # Filtrar boletins
-        boletins_mask = df_dados.iloc[:, 6].astype(str).str.lower().str.contains('deslocação, pessoal|per diem pt, pessoal|per diem fora, pessoal', na=False)
-        boletins_df = df_dados[boletins_mask]
-
-        print(f"Total de boletins no Excel (com outubro): {len(boletins_df)}")
-
-        # Excluir outubro 2025
-        boletins_df = boletins_df[~boletins_df.iloc[:, 7].astype(str).str.contains('OUT2025', case=False, na=False)]
-
-        print(f"Total de boletins no Excel (sem outubro): {len(boletins_df)}")
+        boletins = leitura['registos']['boletins']
+        print(f"Total de boletins no Excel (com outubro): {len(boletins) + leitura['registos']['boletins_outubro']}")
+        print(f"Total de boletins no Excel (sem outubro): {len(boletins)}")
         print()
 
-        for idx, row in boletins_df.iterrows():
-            numero = self.safe_str(row.iloc[0])
-            credor_nome = self.safe_str(row.iloc[4])
-            descricao = self.safe_str(row.iloc[7])
+        inicio = time.perf_counter()
+        lote = []
+
+        for registo in boletins:
+            numero = registo['excel']
+            socio = registo['socio']
+            data_emissao = registo['data_emissao']
+            data_vencimento = registo['data_vencimento']
+            valor = registo['valor']
 
-            if not credor_nome:
+            if not registo['credor_nome']:
                 continue
 
             self.stats['boletins']['total'] += 1
 
-            # Determinar sócio
-            socio = None
-            if 'bruno' in str(credor_nome).lower():
-                socio = Socio.BA
-            elif 'rafael' in str(credor_nome).lower():
-                socio = Socio.RR
-            else:
-                print(f"  ⚠️  {numero}: Não foi possível determinar sócio de '{credor_nome}'")
+            if socio is None:
+                print(f"  ⚠️  {numero}: Não foi possível determinar sócio de '{registo['credor_nome']}'")
                 continue
 
-            # Datas
-            ano = self.safe_int(row.iloc[1])
-            mes = self.safe_int(row.iloc[2])
-            dia = self.safe_int(row.iloc[3])
-
-            data_emissao = None
-            if ano and mes and dia:
-                try:
-                    data_emissao = date(ano, mes, dia)
-                except:
-                    pass
-
-            if not data_emissao and len(row) > 19:
-                data_emissao = self.parse_date(row.iloc[19])
-
-            data_vencimento = None
-            if len(row) > 19:
-                data_vencimento = self.parse_date(row.iloc[19])
-
-            valor = self.safe_decimal(row.iloc[15])
-
             if not valor:
                 print(f"  ⚠️  {numero}: Sem valor")
                 continue
 
+            socio_icon = "👤B" if socio == Socio.BA else "👤R"
+
             # ✅ VERIFICAR SE JÁ EXISTE (por socio + data + valor)
-            existing = self._exists_boletim(socio, data_emissao, valor)
-            if existing:
+            if self._boletim_existe(socio, data_emissao, valor):
                 self.stats['boletins']['skip'] += 1
-                socio_icon = "👤B" if socio == Socio.BA else "👤R"
-                print(f"  ⏭️  {numero}: {socio_icon} €{float(valor):,.2f} (já existe)")
                 continue
 
+            # Mesma restrição da tabela (NOT NULL) que BoletinsManager.emitir encontraria
+            if not data_emissao:
+                self.stats['boletins']['error'] += 1
+                print(f"  ❌ {numero}: Data de emissão em falta")
+                continue
+
+            self.boletins_existentes.setdefault((socio, data_emissao), []).append(valor)
+            self.stats['boletins']['new'] += 1
+
             # DRY RUN: Não gravar
             if self.dry_run:
-                self.stats['boletins']['new'] += 1
-                socio_icon = "👤B" if socio == Socio.BA else "👤R"
                 print(f"  🔍 {numero}: {socio_icon} €{float(valor):,.2f} (seria criado)")
                 continue
 
-            # CRIAR NOVO
-            try:
-                success, boletim, msg = self.boletins_manager.emitir(
-                    socio=socio,
-                    data_emissao=data_emissao,
-                    valor=valor,
-                    descricao=descricao
-                )
-
-                if success:
-                    # Se vencido, marcar como PAGO
-                    if data_vencimento and data_vencimento <= self.hoje:
-                        self.boletins_manager.marcar_como_pago(boletim.id, data_vencimento)
-                        estado_icon = "💰"
-                    else:
-                        estado_icon = "⏳"
-
-                    self.stats['boletins']['new'] += 1
-                    socio_icon = "👤B" if socio == Socio.BA else "👤R"
-                    print(f"  ✅ {numero}: {socio_icon} {estado_icon} €{float(valor):,.2f} (criado)")
-                else:
-                    self.stats['boletins']['error'] += 1
-                    print(f"  ❌ {numero}: {msg}")
+            # CRIAR NOVO (emitido; PAGO se já vencido)
+            pago = bool(data_vencimento and data_vencimento <= self.hoje)
+            lote.append({
+                'socio': socio,
+                'data_emissao': data_emissao,
+                'valor': valor,
+                'valor_total': valor,  # Compatibilidade
+                'descricao': registo['descricao'],
+                'estado': EstadoBoletim.PAGO if pago else EstadoBoletim.PENDENTE,
+                'data_pagamento': data_vencimento if pago else None,
+                'nota': None,
+                'excel': numero,
+            })
+            if len(lote) >= self.lote:
+                self._gravar_boletins(lote)
+                lote = []
+
+        self._gravar_boletins(lote)
+        self._print_stats('boletins', len(boletins), inicio)
+
+    def _gravar_boletins(self, lote):
+        """Insere um lote de boletins (números #B reservados em bloco)"""
+        if not lote:
+            return
+        numeros = self.sequencias.reservar_bloco('boletins', len(lote))
+        for registo, numero in zip(lote, numeros):
+            registo['numero'] = numero
 
-            except Exception as e:
-                self.session.rollback()
-                self.stats['boletins']['error'] += 1
-                print(f"  ❌ {numero}: Erro - {e}")
+        excel = [registo.pop('excel') for registo in lote]
+        ids = self._inserir(Boletim, lote)
+        for registo, numero_excel in zip(lote, excel):
+            self.alterados[ORIGEM_BOLETIM].add(ids[registo['numero']])
 
-        self._print_stats('boletins')
+            socio_icon = "👤B" if registo['socio'] == Socio.BA else "👤R"
+            estado_icon = "💰" if registo['estado'] == EstadoBoletim.PAGO else "⏳"
+            print(f"  ✅ {numero_excel}: {socio_icon} {estado_icon} €{float(registo['valor']):,.2f} (criado)")
 
     # ========== MÉTODOS AUXILIARES ==========
 
-    def _print_stats(self, entity):
-        """Imprime estatísticas de uma entidade"""
+    def _print_stats(self, entity, linhas, inicio):
+        """Imprime estatísticas de uma entidade (com registos/segundo da escrita)"""
         stats = self.stats[entity]
         total = stats['total']
         new = stats.get('new', 0)
         skip = stats.get('skip', 0)
         updated = stats.get('updated', 0)
         error = stats.get('error', 0)
+        duracao = time.perf_counter() - inicio
+        self.tempos['escrita'][entity] = duracao
 
         print(f"\n📊 {entity.upper()}:")
         if new > 0:
@@ -933,11 +1239,40 @@ class ExcelImporter:
         if error > 0:
             print(f"   ❌ Erros: {error}")
         print(f"   📋 Total processado: {total}")
+        print(f"   ⏱️  {linhas} registos em {duracao:.2f}s ({linhas / duracao if duracao else 0:,.0f} registos/s)")
+
+    def _print_tempos(self, total):
+        """Imprime o tempo de cada fase da importação"""
+        tempos = self.tempos
+        workers = self._workers_efetivos()
+
+        print("⏱️  TEMPOS POR FASE")
+        print(f"   Leitura ({workers} {'processo' if workers == 1 else 'processos'}): {tempos['leitura']:.2f}s")
+        print(f"      Abertura do Excel: {tempos['abertura']:.2f}s")
+        for folha in FOLHAS:
+            linhas, duracao = tempos['folhas'][folha]
+            print(f"      {folha:<14} {linhas:>6} linhas  {duracao:.2f}s")
+        print(f"   Escrita: {sum(tempos['escrita'].values()):.2f}s")
+        for entity, duracao in tempos['escrita'].items():
+            print(f"      {entity:<14} {duracao:.2f}s")
+        if 'ledger' in tempos:
+            print(f"   Ledger de saldos: {tempos['ledger']:.2f}s")
+        if 'commit' in tempos:
+            print(f"   Hashes, sequências e commit: {tempos['commit']:.2f}s")
+        print(f"   Total: {total:.2f}s")
+
+    def _sincronizar_ledger(self):
+        """Sincroniza o ledger de saldos dos registos inseridos/alterados"""
+        movimentos = 0
+        for origem_tipo, ids in self.alterados.items():
+            if ids:
+                movimentos += self.ledger.sincronizar_lote(origem_tipo, ids, self.lote)
+        return movimentos
 
     # ========== EXECUÇÃO PRINCIPAL ==========
 
     def executar(self, limpar_tudo=False):
-        """Executa importação completa"""
+        """Executa importação completa (leitura das folhas → escrita sequencial)"""
         mode_str = "🔍 DRY RUN (preview)" if self.dry_run else "✅ MODO REAL (gravar na DB)"
 
         print("=" * 80)
@@ -946,15 +1281,33 @@ class ExcelImporter:
         print(f"Ficheiro: {self.excel_path}")
         print()
 
-        # Abrir Excel
-        print("📖 A abrir Excel...")
+        inicio = time.perf_counter()
+
+        # Fase 1: ler e normalizar as folhas (antes de qualquer alteração na DB)
+        workers = self._workers_efetivos()
+        print(f"📖 A ler Excel ({workers} {'processo' if workers == 1 else 'processos'})...")
+        if workers < self.workers:
+            print(f"   ℹ️  --workers {self.workers} limitado a {workers} (folhas: {len(FOLHAS)}, CPUs: {os.cpu_count()})")
         try:
-            self.xl = pd.ExcelFile(self.excel_path)
-            print(f"   ✅ Excel aberto ({len(self.xl.sheet_names)} abas)")
+            leituras = self._ler_excel()
+            print(f"   ✅ {sum(l['linhas'] for l in leituras.values())} linhas lidas em {self.tempos['leitura']:.2f}s")
         except Exception as e:
-            print(f"   ❌ Erro ao abrir Excel: {e}")
+            print(f"   ❌ Erro ao ler Excel: {e}")
             return False
 
+        # Hashes do último snapshot (importação delta)
+        hashes = self._hashes_disponiveis()
+        if not hashes:
+            print("   ℹ️  Tabela importacao_hashes não existe (scripts/run_migration_032.py): importação completa")
+        elif self.completo or limpar_tudo:
+            print("   ℹ️  Importação completa: todas as linhas são processadas")
+        elif not self._aplicar_delta(leituras):
+            self._print_delta()
+            print("\n✅ Sem alterações desde o último snapshot importado - nada a fazer")
+            return True
+        else:
+            self._print_delta()
+
         # Limpar dados (se pedido)
         if limpar_tudo:
             print("\n⚠️  A LIMPAR TODOS OS DADOS...")
@@ -962,11 +1315,16 @@ class ExcelImporter:
                 print("   🔍 DRY RUN: Limpeza não executada")
             else:
                 try:
+                    # Ledger com os registos apagados: os movimentos dos novos
+                    # registos são criados no fim (_sincronizar_ledger)
+                    self.session.query(SaldoMovimento).delete()
                     self.session.query(Boletim).delete()
                     self.session.query(Despesa).delete()
                     self.session.query(Projeto).delete()
                     self.session.query(Fornecedor).delete()
                     self.session.query(Cliente).delete()
+                    if hashes:
+                        self.session.query(ImportacaoHash).delete()
                     self.session.commit()
                     print("   ✅ Dados limpos")
                 except Exception as e:
@@ -974,14 +1332,16 @@ class ExcelImporter:
                     print(f"   ❌ Erro ao limpar: {e}")
                     return False
 
-        # Importar
+        # Fase 2: gravar, pela ordem das dependências
         try:
-            self.importar_clientes()
-            self.importar_fornecedores()
-            self.importar_projetos()
-            self.importar_despesas()
-            self.processar_premios()
-            self.importar_boletins()
+            self._carregar_existentes()
+
+            self.importar_clientes(leituras['CLIENTES'])
+            self.importar_fornecedores(leituras['FORNECEDORES'])
+            self.importar_projetos(leituras['PROJETOS'])
+            self.importar_despesas(leituras['DESPESAS'])
+            self.processar_premios(leituras['DESPESAS'])
+            self.importar_boletins(leituras['DESPESAS'])
 
             # Resumo final
             print("\n" + "=" * 80)
@@ -1002,14 +1362,30 @@ class ExcelImporter:
 
             # Commit final (se não for dry run)
             if not self.dry_run:
+                fase = time.perf_counter()
+                movimentos = self._sincronizar_ledger()
+                self.tempos['ledger'] = time.perf_counter() - fase
+                if movimentos:
+                    print(f"📒 Ledger de saldos: {movimentos} movimentos sincronizados")
+
                 print("💾 A gravar todos os dados na base de dados...")
+                fase = time.perf_counter()
+                if hashes:
+                    self._gravar_hashes(leituras)
+                # Os números do Excel são gravados tal como estão: alinhar as sequências
+                SequenciasManager(self.session).sincronizar()
                 self.session.commit()
+                self.tempos['commit'] = time.perf_counter() - fase
                 print("   ✅ Dados gravados com sucesso!")
                 print()
+                self._print_tempos(time.perf_counter() - inicio)
+                print()
                 print("=" * 80)
                 print("✅ IMPORTAÇÃO INCREMENTAL CONCLUÍDA!")
                 print("=" * 80)
             else:
+                self._print_tempos(time.perf_counter() - inicio)
+                print()
                 print("=" * 80)
                 print("🔍 DRY RUN CONCLUÍDO - Nenhum dado foi gravado")
                 print("=" * 80)
@@ -1036,6 +1412,12 @@ def main():
     parser.add_argument('--clear-all', action='store_true', help='Limpar DB antes de importar (cuidado!)')
     parser.add_argument('--excel', type=str, default='excel/CONTABILIDADE_FINAL_20251124.xlsx',
                         help='Caminho para ficheiro Excel')
+    parser.add_argument('--lote', type=int, default=LOTE,
+                        help=f'Registos por INSERT em bulk (default: {LOTE})')
+    parser.add_argument('--completo', action='store_true',
+                        help='Processar todas as linhas (ignorar os hashes do último snapshot)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'Processos para a leitura das folhas (default: 1; máximo: {len(FOLHAS)} e nº de CPUs)')
 
     args = parser.parse_args()
 
@@ -1072,7 +1454,8 @@ def main():
     session = Session()
 
     # Executar
-    importer = ExcelImporter(session, excel_path=args.excel, dry_run=args.dry_run)
+    importer = ExcelImporter(session, excel_path=args.excel, dry_run=args.dry_run,
+                             lote=args.lote, workers=args.workers, completo=args.completo)
     success = importer.executar(limpar_tudo=limpar)
 
     if not success:
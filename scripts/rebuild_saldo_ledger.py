@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reconstrói o ledger saldo_movimentos e verifica a consistência
+
+Uso:
+    python scripts/rebuild_saldo_ledger.py              # reconstrói e verifica
+    python scripts/rebuild_saldo_ledger.py --verificar  # apenas verifica
+"""
+import os
+import sys
+import argparse
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.saldo_movimentos import SaldoMovimentosManager
+
+
+def imprimir_diferencas(diferencas):
+    """Mostra as diferenças entre ledger e tabelas base"""
+    if not diferencas:
+        print("✅ Ledger consistente com o cálculo pelas tabelas base")
+        return
+
+    print("❌ {} diferença(s) encontrada(s):".format(len(diferencas)))
+    for dif in diferencas:
+        print("   {socio} {campo}: tabelas={tabelas} ledger={ledger}".format(**dif))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói o ledger de saldos")
+    parser.add_argument('--verificar', action='store_true',
+                        help="Apenas verificar consistência (não reconstrói)")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./agora_media.db")
+    engine = create_engine(database_url)
+    session = sessionmaker(bind=engine)()
+    manager = SaldoMovimentosManager(session)
+
+    try:
+        if not manager.ledger_disponivel():
+            print("❌ Tabela saldo_movimentos não existe - executar scripts/run_migration_029.py")
+            return False
+
+        if args.verificar:
+            diferencas = manager.verificar_consistencia()
+        else:
+            sucesso, relatorio, erro = manager.rebuild_ledger()
+            if not sucesso:
+                print("❌ Erro ao reconstruir ledger: {}".format(erro))
+                return False
+            print("✅ Ledger reconstruído: {} movimentos".format(relatorio['movimentos']))
+            diferencas = relatorio['diferencas']
+
+        imprimir_diferencas(diferencas)
+        return not diferencas
+
+    finally:
+        session.close()
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
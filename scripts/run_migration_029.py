@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script para executar migration 029
+- Migration 029: Criar ledger saldo_movimentos
+- Popula o ledger a partir das tabelas base (rebuild_ledger)
+"""
+import os
+import sys
+import importlib.util
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.saldo_movimentos import SaldoMovimentosManager
+
+
+def import_migration(migration_file):
+    """Import migration module using importlib"""
+    migration_path = os.path.join(
+        os.path.dirname(__file__),
+        '..',
+        'database',
+        'migrations',
+        migration_file
+    )
+    module_name = "migration_{}".format(migration_file.replace('.py', '').replace('-', '_'))
+    spec = importlib.util.spec_from_file_location(module_name, migration_path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def run_migration_029():
+    """Executa migration 029 e popula o ledger"""
+    print("=" * 80)
+    print("🔄 EXECUTANDO MIGRATION 029")
+    print("=" * 80)
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./agora_media.db")
+    engine = create_engine(database_url)
+
+    try:
+        migration_029 = import_migration('029_create_saldo_movimentos.py')
+        migration_029.upgrade(engine)
+
+        print()
+        print("📋 Populando ledger a partir de projetos, despesas e boletins...")
+        print("-" * 80)
+
+        session = sessionmaker(bind=engine)()
+        sucesso, relatorio, erro = SaldoMovimentosManager(session).rebuild_ledger()
+        session.close()
+
+        if not sucesso:
+            print("❌ Erro: {}".format(erro))
+            return False
+
+        print("  ✅ {} movimentos criados".format(relatorio['movimentos']))
+        if relatorio['diferencas']:
+            print("  ⚠️ Diferenças face ao cálculo pelas tabelas base:")
+            for dif in relatorio['diferencas']:
+                print("     {socio} {campo}: tabelas={tabelas} ledger={ledger}".format(**dif))
+        else:
+            print("  ✅ Saldos do ledger coincidem com o cálculo pelas tabelas base")
+
+        print()
+        print("=" * 80)
+        print("✅ MIGRATION 029 CONCLUÍDA COM SUCESSO")
+        print("=" * 80)
+        print()
+        print("🎯 PRÓXIMOS PASSOS:")
+        print("  1. Definir SALDOS_USAR_LEDGER=True no .env para calcular saldos pelo ledger")
+        print("  2. Verificar consistência com scripts/rebuild_saldo_ledger.py")
+        print()
+
+    except Exception as e:
+        print("❌ Erro: {}".format(e))
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == '__main__':
+    success = run_migration_029()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script para executar migration 030
+- Migration 030: Índices compostos para saldos e relatórios
+"""
+import os
+import sys
+import importlib.util
+from sqlalchemy import create_engine, text
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def import_migration(migration_file):
+    """Import migration module using importlib"""
+    migration_path = os.path.join(
+        os.path.dirname(__file__),
+        '..',
+        'database',
+        'migrations',
+        migration_file
+    )
+    module_name = "migration_{}".format(migration_file.replace('.py', '').replace('-', '_'))
+    spec = importlib.util.spec_from_file_location(module_name, migration_path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def run_migration_030():
+    """Executa migration 030"""
+    print("=" * 80)
+    print("🔄 EXECUTANDO MIGRATION 030")
+    print("=" * 80)
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./agora_media.db")
+    engine = create_engine(database_url)
+
+    try:
+        migration_030 = import_migration('030_indices_compostos_saldos.py')
+        migration_030.upgrade(engine)
+
+        print()
+        print("🔍 Verificando índices...")
+        print("-" * 80)
+
+        with engine.connect() as connection:
+            existentes = {
+                row[0] for row in connection.execute(
+                    text("SELECT name FROM sqlite_master WHERE type='index'")
+                )
+            }
+
+        for nome, tabela, colunas in migration_030.INDICES:
+            if nome not in existentes:
+                print("  ❌ Índice '{}' NÃO encontrado!".format(nome))
+                return False
+            print("  ✅ {} ({}: {})".format(nome, tabela, colunas))
+
+        print()
+        print("=" * 80)
+        print("✅ MIGRATION 030 CONCLUÍDA COM SUCESSO")
+        print("=" * 80)
+        print()
+        print("🎯 PRÓXIMOS PASSOS:")
+        print("  1. Verificar os planos com tests/testar_planos_queries.py")
+        print()
+
+    except Exception as e:
+        print("❌ Erro: {}".format(e))
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == '__main__':
+    success = run_migration_030()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script para executar migration 031
+- Migration 031: Tabela de sequências (números #P, #D, #B, #C, #F, #E, #TD, OR-)
+- Inicializa os contadores com os maiores números existentes
+"""
+import os
+import sys
+import importlib.util
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.sequencias import SequenciasManager
+
+
+def import_migration(migration_file):
+    """Import migration module using importlib"""
+    migration_path = os.path.join(
+        os.path.dirname(__file__),
+        '..',
+        'database',
+        'migrations',
+        migration_file
+    )
+    module_name = "migration_{}".format(migration_file.replace('.py', '').replace('-', '_'))
+    spec = importlib.util.spec_from_file_location(module_name, migration_path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def run_migration_031():
+    """Executa migration 031"""
+    print("=" * 80)
+    print("🔄 EXECUTANDO MIGRATION 031")
+    print("=" * 80)
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./agora_media.db")
+    engine = create_engine(database_url)
+
+    try:
+        migration_031 = import_migration('031_create_sequencias.py')
+        migration_031.upgrade(engine)
+
+        if not inspect(engine).has_table('sequencias'):
+            print("❌ Tabela 'sequencias' NÃO encontrada!")
+            return False
+
+        print()
+        print("🔢 Inicializando sequências...")
+        print("-" * 80)
+
+        session = sessionmaker(bind=engine)()
+        try:
+            manager = SequenciasManager(session)
+            valores = manager.sincronizar()
+            session.commit()
+        finally:
+            session.close()
+
+        for nome, valor in valores.items():
+            print("  ✅ {:<20} último: {:<8} próximo: {}".format(
+                nome, valor, SequenciasManager.formatar(nome, valor + 1)
+            ))
+
+        print()
+        print("=" * 80)
+        print("✅ MIGRATION 031 CONCLUÍDA COM SUCESSO")
+        print("=" * 80)
+
+    except Exception as e:
+        print("❌ Erro: {}".format(e))
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == '__main__':
+    success = run_migration_031()
+    sys.exit(0 if success else 1)
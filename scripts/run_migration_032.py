@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script para executar migration 032
+- Migration 032: Hashes das linhas importadas do Excel (importação delta)
+"""
+import os
+import sys
+import importlib.util
+from sqlalchemy import create_engine, inspect
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def import_migration(migration_file):
+    """Import migration module using importlib"""
+    migration_path = os.path.join(
+        os.path.dirname(__file__),
+        '..',
+        'database',
+        'migrations',
+        migration_file
+    )
+    module_name = "migration_{}".format(migration_file.replace('.py', '').replace('-', '_'))
+    spec = importlib.util.spec_from_file_location(module_name, migration_path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def run_migration_032():
+    """Executa migration 032"""
+    print("=" * 80)
+    print("🔄 EXECUTANDO MIGRATION 032")
+    print("=" * 80)
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./agora_media.db")
+    engine = create_engine(database_url)
+
+    try:
+        migration_032 = import_migration('032_create_importacao_hashes.py')
+        migration_032.upgrade(engine)
+
+        if not inspect(engine).has_table('importacao_hashes'):
+            print("❌ Tabela 'importacao_hashes' NÃO encontrada!")
+            return False
+
+        print()
+        print("💡 A próxima importação do Excel processa todas as linhas e grava os hashes;")
+        print("   as seguintes só processam as linhas novas/alteradas/removidas.")
+        print()
+        print("=" * 80)
+        print("✅ MIGRATION 032 CONCLUÍDA COM SUCESSO")
+        print("=" * 80)
+
+    except Exception as e:
+        print("❌ Erro: {}".format(e))
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == '__main__':
+    success = run_migration_032()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script para executar migration 033
+- Migration 033: Extensão unaccent (pesquisa sem acentos no PostgreSQL)
+"""
+import os
+import sys
+import importlib.util
+from sqlalchemy import create_engine
+from dotenv import load_dotenv
+
+# Load environment
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def import_migration(migration_file):
+    """Import migration module using importlib"""
+    migration_path = os.path.join(
+        os.path.dirname(__file__),
+        '..',
+        'database',
+        'migrations',
+        migration_file
+    )
+    module_name = "migration_{}".format(migration_file.replace('.py', '').replace('-', '_'))
+    spec = importlib.util.spec_from_file_location(module_name, migration_path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def run_migration_033():
+    """Executa migration 033"""
+    print("=" * 80)
+    print("🔄 EXECUTANDO MIGRATION 033")
+    print("=" * 80)
+    print()
+
+    database_url = os.getenv("DATABASE_URL", "sqlite:///./agora_media.db")
+    engine = create_engine(database_url)
+
+    try:
+        migration_033 = import_migration('033_extensao_unaccent.py')
+        migration_033.upgrade(engine)
+
+        print()
+        print("=" * 80)
+        print("✅ MIGRATION 033 CONCLUÍDA COM SUCESSO")
+        print("=" * 80)
+
+    except Exception as e:
+        print("❌ Erro: {}".format(e))
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+
+if __name__ == '__main__':
+    success = run_migration_033()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Apoio partilhado pelos scripts de teste (tests/testar_*.py)
+
+- engine_configurado(): engine da base de dados da aplicação (DATABASE_URL)
+- base_dados_temporaria(): base de dados SQLite vazia numa pasta temporária
+- copia_base_dados(): cópia de agora_media.db numa pasta temporária (para
+  testes que alteram dados sem tocar na base de dados original)
+- contar_queries(): contador de queries de um engine
+- criar_orcamento(): orçamento de teste com items, repartições e proposta
+
+Uso (a partir da raiz do projeto, com PYTHONPATH=.):
+
+    from tests.apoio import base_dados_temporaria, contar_queries
+
+    pasta, engine = base_dados_temporaria("teste.db")
+    query_count = contar_queries(engine)
+    query_count[0] = 0
+    ...operação a medir...
+    print(f"{query_count[0]} queries")
+"""
+import os
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+
+from database.models import Base, Orcamento, OrcamentoReparticao, PropostaSecao, PropostaItem
+
+BASE_DADOS = "agora_media.db"
+
+# Beneficiários das repartições de criar_orcamento()
+BENEFICIARIOS = ('BA', 'RR', 'AGORA', 'FREELANCER_1', 'FREELANCER_2')
+
+
+def engine_configurado() -> Engine:
+    """Engine da base de dados configurada em DATABASE_URL (por omissão agora_media.db)"""
+    load_dotenv()
+    return create_engine(os.getenv("DATABASE_URL", f"sqlite:///./{BASE_DADOS}"))
+
+
+def base_dados_temporaria(nome: str) -> Tuple[tempfile.TemporaryDirectory, Engine]:
+    """
+    Base de dados SQLite vazia (tabelas de Base.metadata) numa pasta temporária
+
+    Args:
+        nome: Nome do ficheiro (ex: 'totais.db')
+
+    Returns:
+        (pasta, engine): no fim, engine.dispose() e pasta.cleanup()
+    """
+    pasta = tempfile.TemporaryDirectory()
+    engine = create_engine(f"sqlite:///{os.path.join(pasta.name, nome)}")
+    Base.metadata.create_all(engine)
+    return pasta, engine
+
+
+def copia_base_dados(nome: str) -> Tuple[tempfile.TemporaryDirectory, str]:
+    """
+    Cópia de agora_media.db numa pasta temporária
+
+    Args:
+        nome: Nome do ficheiro da cópia (ex: 'relatorios.db')
+
+    Returns:
+        (pasta, caminho): no fim, pasta.cleanup()
+    """
+    pasta = tempfile.TemporaryDirectory()
+    caminho = os.path.join(pasta.name, nome)
+    shutil.copy(BASE_DADOS, caminho)
+    return pasta, caminho
+
+
+def contar_queries(engine: Engine) -> List[int]:
+    """
+    Conta as queries executadas no engine (evento before_cursor_execute)
+
+    Args:
+        engine: Engine SQLAlchemy
+
+    Returns:
+        Contador [n]: pôr a 0 antes da operação a medir e ler [0] no fim
+    """
+    query_count = [0]
+
+    def contar_query(conn, cursor, statement, parameters, context, executemany):
+        query_count[0] += 1
+
+    event.listen(engine, "before_cursor_execute", contar_query)
+    return query_count
+
+
+def criar_orcamento(
+    manager,
+    cliente_id: int,
+    codigo: str,
+    n_itens: int,
+    equipamento_id: Optional[int] = None,
+    fornecedor_id: Optional[int] = None
+) -> Orcamento:
+    """
+    Orçamento de teste (com commit)
+
+    - n_itens items CLIENTE criados pelo OrcamentoManager, pelas secções
+      servicos/video/som, com quantidades, dias, preços e descontos
+      variados e uma refeição (secção despesas) em cada 5
+    - uma despesa com a repartição espelhada (tipo 'despesa')
+    - n_itens repartições EMPRESA (serviços e uma comissão em cada 10) pelos
+      BENEFICIARIOS e, se indicado, pelo fornecedor
+    - proposta com 3 secções de n_itens // 3 items
+
+    Args:
+        manager: OrcamentoManager
+        cliente_id: ID do cliente
+        codigo: Código do orçamento
+        n_itens: Número de items (e de repartições)
+        equipamento_id: Equipamento dos items de equipamento e de 1 em cada 3 repartições
+        fornecedor_id: Fornecedor de 1 em cada 6 repartições
+
+    Returns:
+        Orçamento criado
+    """
+    session = manager.db
+    sucesso, orcamento, erro = manager.criar_orcamento(
+        codigo=codigo, data_criacao=date(2025, 1, 1), cliente_id=cliente_id, owner='BA',
+        tem_versao_cliente=True, titulo_cliente=f"Proposta {codigo}"
+    )
+    assert sucesso, erro
+    secoes = {s.tipo: s.id for s in manager.obter_secoes(orcamento.id)}
+
+    for i in range(n_itens):
+        if i % 5 == 4:
+            manager.adicionar_item_v2(orcamento.id, secoes['despesas'], 'refeicao', f"Refeição {i}",
+                                      ordem=i, num_refeicoes=i % 7 + 1, valor_por_refeicao=Decimal('12.50'))
+            continue
+        secao = ('servicos', 'video', 'som')[i % 3]
+        tipo = 'servico' if secao == 'servicos' else 'equipamento'
+        manager.adicionar_item_v2(orcamento.id, secoes[secao], tipo, f"Item {i}", ordem=i,
+                                  quantidade=i % 3 + 1, dias=i % 4 + 1,
+                                  preco_unitario=Decimal(i % 97) + Decimal('0.33'),
+                                  desconto=Decimal('0.15') if i % 11 == 0 else Decimal('0'),
+                                  equipamento_id=equipamento_id if tipo == 'equipamento' else None)
+
+    _, despesa, _ = manager.adicionar_item_v2(orcamento.id, secoes['despesas'], 'outro', "Despesa",
+                                              ordem=n_itens, valor_fixo=Decimal('25.00'))
+    session.add(OrcamentoReparticao(orcamento_id=orcamento.id, tipo='despesa', descricao="Despesa",
+                                    item_cliente_id=despesa.id, valor_fixo=Decimal('25.00'),
+                                    total=Decimal('25.00')))
+
+    for i in range(n_itens):
+        do_fornecedor = fornecedor_id is not None and i % 6 == 5
+        rep = OrcamentoReparticao(
+            orcamento_id=orcamento.id, tipo='comissao' if i % 10 == 0 else 'servico', ordem=i,
+            descricao=f"Repartição {i}",
+            beneficiario=f"FORNECEDOR_{fornecedor_id}" if do_fornecedor else BENEFICIARIOS[i % len(BENEFICIARIOS)],
+            fornecedor_id=fornecedor_id if do_fornecedor else None,
+            equipamento_id=equipamento_id if i % 3 == 0 else None,
+            quantidade=1, dias=1, valor_unitario=Decimal(i % 50) + Decimal('0.10'),
+            percentagem=Decimal('5.1234'), base_calculo=Decimal('1000.00'), total=Decimal('0')
+        )
+        rep.total = rep.calcular_total()
+        session.add(rep)
+
+    for s in range(3):
+        secao = PropostaSecao(orcamento_id=orcamento.id, nome=f"Secção {s}", ordem=s)
+        session.add(secao)
+        session.flush()
+        for i in range(n_itens // 3):
+            session.add(PropostaItem(orcamento_id=orcamento.id, secao_id=secao.id, descricao=f"Item {i}",
+                                     quantidade=1, dias=1, preco_unitario=Decimal('10.00'),
+                                     desconto=Decimal('0'), total=Decimal('10.00'), ordem=i))
+    session.commit()
+    return orcamento
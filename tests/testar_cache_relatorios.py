@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da cache de relatórios (logic/relatorios.py)
+
+Numa cópia da base de dados: voltar a uma seleção anterior (tipo, período,
+ids pré-filtrados) não faz queries, uma gravação feita por um manager
+invalida a cache, as gerações em streaming não passam pela cache e a
+cache respeita os limites de relatórios e de linhas.
+"""
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import logic.relatorios as relatorios
+from logic.relatorios import RelatoriosManager, invalidar_cache
+from logic.projetos import ProjetosManager
+from database.models import Projeto, TipoProjeto, Socio
+from tests.apoio import copia_base_dados, contar_queries
+
+pasta, copia = copia_base_dados("relatorios.db")
+
+engine = create_engine(f"sqlite:///{copia}")
+Session = sessionmaker(bind=engine)
+session = Session()
+
+query_count = contar_queries(engine)
+
+
+def gerar(metodo, **kwargs):
+    """Gera um relatório com um manager novo; devolve (dados, queries)"""
+    query_count[0] = 0
+    dados = getattr(RelatoriosManager(session), metodo)(**kwargs)
+    return dados, query_count[0]
+
+
+def sem_data(dados):
+    dados = dict(dados)
+    dados.pop('data_geracao')
+    return dados
+
+
+erros = []
+invalidar_cache()
+
+print("=" * 80)
+print("🧪 TESTE DA CACHE DE RELATÓRIOS")
+print("=" * 80)
+
+# 1. Alternar entre seleções: só a primeira vez de cada uma faz queries
+selecoes = [
+    ('gerar_relatorio_saldos', {}),
+    ('gerar_relatorio_saldos', {'socio': Socio.BA}),
+    ('gerar_relatorio_projetos', {'tipo': TipoProjeto.EMPRESA}),
+    ('gerar_relatorio_projetos', {'data_inicio': date(2025, 1, 1), 'data_fim': date(2025, 12, 31)}),
+    ('gerar_relatorio_despesas', {}),
+    ('gerar_relatorio_boletins', {}),
+]
+primeiras = {}
+for metodo, kwargs in selecoes:
+    dados, queries = gerar(metodo, **kwargs)
+    primeiras[(metodo, repr(kwargs))] = dados
+    if not queries:
+        erros.append(f"{metodo}{kwargs}: primeira geração sem queries")
+
+for metodo, kwargs in selecoes:
+    dados, queries = gerar(metodo, **kwargs)
+    print(f"{metodo}{kwargs}: {queries} queries ao voltar")
+    if queries:
+        erros.append(f"{metodo}{kwargs}: {queries} queries ao voltar à seleção")
+    if sem_data(dados) != sem_data(primeiras[(metodo, repr(kwargs))]):
+        erros.append(f"{metodo}{kwargs}: resultado da cache diferente")
+
+# Argumentos posicionais/nomeados e ordem dos ids dão a mesma entrada
+ids = [p.id for p in session.query(Projeto).limit(5)]
+gerar('gerar_relatorio_projetos', projeto_ids=ids)
+_, queries = gerar('gerar_relatorio_projetos', projeto_ids=list(reversed(ids)))
+if queries:
+    erros.append("ids pré-filtrados por outra ordem não usaram a cache")
+
+# O resultado é uma cópia: alterá-lo não estraga a cache
+dados, _ = gerar('gerar_relatorio_despesas')
+dados.pop('despesas')
+dados, _ = gerar('gerar_relatorio_despesas')
+if 'despesas' not in dados:
+    erros.append("alterar o resultado alterou a cache")
+
+# 2. Gravação por um manager invalida a cache
+projeto = session.query(Projeto).filter(Projeto.tipo == TipoProjeto.EMPRESA).first()
+antes, _ = gerar('gerar_relatorio_projetos', tipo=TipoProjeto.EMPRESA)
+sucesso, erro = ProjetosManager(session).atualizar(projeto.id, valor_sem_iva=projeto.valor_sem_iva + Decimal('1000'))
+if not sucesso:
+    erros.append(f"atualizar projeto falhou: {erro}")
+depois, queries = gerar('gerar_relatorio_projetos', tipo=TipoProjeto.EMPRESA)
+print(f"Após gravar um projeto: {queries} queries, total {antes['total_valor_fmt']} → {depois['total_valor_fmt']}")
+if not queries or round(depois['total_valor'] - antes['total_valor'], 2) != 1000:
+    erros.append("gravação não invalidou a cache")
+
+# 3. Streaming não passa pela cache
+antes = len(relatorios._cache)
+for _ in range(2):
+    dados, queries = gerar('gerar_relatorio_despesas', streaming=True)
+    list(dados['despesas'])
+    if not queries:
+        erros.append("geração em streaming veio da cache")
+if len(relatorios._cache) != antes:
+    erros.append("geração em streaming guardada na cache")
+
+# 4. Limites: número de relatórios e total de linhas
+for ano in range(2000, 2000 + relatorios.CACHE_MAX_RELATORIOS + 4):
+    gerar('gerar_relatorio_boletins', data_inicio=date(ano, 1, 1), data_fim=date(ano, 12, 31))
+print(f"Cache: {len(relatorios._cache)} relatórios, {relatorios._cache_linhas} linhas")
+if len(relatorios._cache) > relatorios.CACHE_MAX_RELATORIOS:
+    erros.append(f"cache com {len(relatorios._cache)} relatórios")
+_, queries = gerar('gerar_relatorio_boletins', data_inicio=date(2000, 1, 1), data_fim=date(2000, 12, 31))
+if not queries:
+    erros.append("relatório menos usado não saiu da cache")
+
+limite = relatorios.CACHE_MAX_LINHAS
+relatorios.CACHE_MAX_LINHAS = 100
+invalidar_cache()
+gerar('gerar_relatorio_despesas')
+_, queries = gerar('gerar_relatorio_despesas')
+if not queries or relatorios._cache_linhas > relatorios.CACHE_MAX_LINHAS:
+    erros.append("relatório acima do limite de linhas guardado na cache")
+relatorios.CACHE_MAX_LINHAS = limite
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ CACHE DE RELATÓRIOS OK")
+print("=" * 80)
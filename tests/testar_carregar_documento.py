@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste do carregamento do orçamento completo (OrcamentoManager.carregar_documento)
+
+Numa base de dados temporária, com um orçamento pequeno e um grande:
+- carregar_documento() e percorrer todas as relações (secções, subsecções,
+  items, equipamento, repartições, fornecedor, proposta) faz o mesmo número
+  de queries para os dois orçamentos
+- o DocumentoOrcamento criado a partir do orçamento carregado não faz
+  queries e coincide com o lido diretamente da DB
+- a exportação da proposta para PDF faz um número fixo de queries
+"""
+import os
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Cliente, Equipamento, Fornecedor, EstatutoFornecedor
+from logic.orcamentos import OrcamentoManager
+from logic.orcamento_documento import DocumentoOrcamento
+from logic.proposta_exporter import PropostaExporter
+from tests.apoio import base_dados_temporaria, contar_queries, criar_orcamento
+
+N_LINHAS = 200
+
+pasta, engine = base_dados_temporaria("documento.db")
+session = sessionmaker(bind=engine)()
+manager = OrcamentoManager(session)
+query_count = contar_queries(engine)
+
+
+def percorrer(orcamento):
+    """Acede a todas as relações usadas pelo formulário, pela aprovação e pelo PDF"""
+    visitados = [orcamento.cliente.nome]
+    for secao in orcamento.secoes:
+        visitados += [s.nome for s in secao.subsecoes]
+        for item in secao.itens:
+            visitados.append((item.secao.nome, item.equipamento.numero if item.equipamento else None))
+    for rep in orcamento.reparticoes:
+        visitados.append((rep.equipamento.numero if rep.equipamento else None,
+                          rep.fornecedor.nome if rep.fornecedor else None))
+    for secao in orcamento.proposta_secoes:
+        visitados += [item.descricao for item in secao.itens]
+    return visitados
+
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DO CARREGAMENTO DO ORÇAMENTO COMPLETO")
+print("=" * 80)
+
+cliente = Cliente(numero="#C0001", nome="Cliente Teste", nome_formal="Cliente Teste, Lda")
+equipamento = Equipamento(numero="#E0001", produto="Câmara")
+fornecedor = Fornecedor(numero="#F0001", nome="Rental Co", estatuto=EstatutoFornecedor.EMPRESA)
+session.add_all([cliente, equipamento, fornecedor])
+session.commit()
+
+pequeno = criar_orcamento(manager, cliente.id, "OR-TESTE-PEQUENO", 6, equipamento.id, fornecedor.id).id
+grande = criar_orcamento(manager, cliente.id, "OR-TESTE-GRANDE", N_LINHAS, equipamento.id, fornecedor.id).id
+
+# 1. Número fixo de queries
+queries = {}
+for orcamento_id in (pequeno, grande):
+    session.expire_all()
+    query_count[0] = 0
+    orcamento = manager.carregar_documento(orcamento_id)
+    percorrer(orcamento)
+    queries[orcamento.codigo] = query_count[0]
+    if sum(len(s.itens) for s in orcamento.secoes) != len(orcamento.itens):
+        erros.append(f"{orcamento.codigo}: items das secções não coincidem com os do orçamento")
+print(f"carregar_documento + todas as relações: {queries}")
+if queries["OR-TESTE-PEQUENO"] != queries["OR-TESTE-GRANDE"]:
+    erros.append(f"queries dependem do número de linhas: {queries}")
+if queries["OR-TESTE-GRANDE"] > 6:
+    erros.append(f"carregar_documento fez {queries['OR-TESTE-GRANDE']} queries")
+
+if manager.carregar_documento(999999) is not None:
+    erros.append("orçamento inexistente não devolveu None")
+
+# 2. Documento a partir do orçamento carregado: sem queries, igual ao lido da DB
+orcamento = manager.carregar_documento(grande)
+query_count[0] = 0
+documento = DocumentoOrcamento(session, grande, orcamento)
+print(f"DocumentoOrcamento a partir do orçamento carregado: {query_count[0]} queries")
+if query_count[0]:
+    erros.append(f"documento a partir do orçamento fez {query_count[0]} queries")
+lido = DocumentoOrcamento(session, grande)
+if documento.totais.como_dict() != lido.totais.como_dict():
+    erros.append("totais do documento diferentes dos lidos da DB")
+if [i.id for i in documento.itens.values()] != [i.id for i in lido.itens.values()]:
+    erros.append("ordem dos items diferente da lida da DB")
+
+# Dados frescos depois de uma gravação em bulk do documento
+rep = next(iter(documento.reparticoes.values()))
+documento.alterar_reparticao(rep.id, quantidade=3)
+documento.gravar()
+orcamento = manager.carregar_documento(grande)
+if next(r for r in orcamento.reparticoes if r.id == rep.id).quantidade != 3:
+    erros.append("carregar_documento devolveu dados antigos depois de gravar")
+
+# 3. Exportação da proposta
+pdf = os.path.join(pasta.name, "proposta.pdf")
+queries = {}
+for orcamento_id in (pequeno, grande):
+    session.expire_all()
+    query_count[0] = 0
+    PropostaExporter(session).exportar_pdf(orcamento_id, pdf)
+    queries[orcamento_id] = query_count[0]
+print(f"Exportar proposta: {list(queries.values())} queries")
+if len(set(queries.values())) != 1:
+    erros.append(f"exportar proposta: queries dependem do número de linhas: {queries}")
+if not os.path.getsize(pdf):
+    erros.append("PDF vazio")
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ CARREGAMENTO DO ORÇAMENTO OK")
+print("=" * 80)
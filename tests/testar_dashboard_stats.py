@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste do DashboardStatsService
+
+Verifica que os contadores agrupados são iguais às contagens individuais,
+que a segunda chamada vem da cache (0 queries) e que uma alteração a
+projetos invalida a cache.
+"""
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from logic.dashboard_stats import DashboardStatsService
+from database.models import Projeto, TipoProjeto, EstadoProjeto, Socio
+from tests.apoio import engine_configurado, contar_queries
+
+engine = engine_configurado()
+Session = sessionmaker(bind=engine)
+session = Session()
+
+query_count = contar_queries(engine)
+
+
+def contar(*condicoes):
+    return session.query(func.count(Projeto.id)).filter(*condicoes).scalar() or 0
+
+
+print("=" * 80)
+print("🧪 TESTE DO DASHBOARD STATS SERVICE")
+print("=" * 80)
+
+service = DashboardStatsService(session)
+erros = []
+
+query_count[0] = 0
+stats = service.obter_estatisticas()
+print(f"Primeira chamada: {query_count[0]} queries")
+
+# Comparar com as contagens individuais (implementação antiga do dashboard)
+esperado = {
+    ('BA', 'pessoais'): contar(Projeto.tipo == TipoProjeto.PESSOAL, Projeto.owner == 'BA', Projeto.estado == EstadoProjeto.PAGO),
+    ('BA', 'empresa'): contar(Projeto.tipo == TipoProjeto.EMPRESA, Projeto.owner == 'BA', Projeto.estado == EstadoProjeto.PAGO),
+    ('RR', 'pessoais'): contar(Projeto.tipo == TipoProjeto.PESSOAL, Projeto.owner == 'RR', Projeto.estado == EstadoProjeto.PAGO),
+    ('RR', 'empresa'): contar(Projeto.tipo == TipoProjeto.EMPRESA, Projeto.owner == 'RR', Projeto.estado == EstadoProjeto.PAGO),
+}
+for (socio, tipo), valor in esperado.items():
+    obtido = stats['por_socio'][socio][tipo]
+    print(f"   {socio} {tipo:<9} {obtido:>4} (esperado {valor})")
+    if obtido != valor:
+        erros.append(f"por_socio {socio}/{tipo}: {obtido} != {valor}")
+
+esperado_projetos = {
+    'total': contar(),
+    'recebidos': contar(Projeto.estado == EstadoProjeto.PAGO),
+    'faturados': contar(Projeto.estado == EstadoProjeto.FINALIZADO),
+    'nao_faturados': contar(Projeto.estado == EstadoProjeto.ATIVO),
+}
+for chave, valor in esperado_projetos.items():
+    obtido = stats['projetos'][chave]
+    print(f"   projetos {chave:<14} {obtido:>4} (esperado {valor})")
+    if obtido != valor:
+        erros.append(f"projetos {chave}: {obtido} != {valor}")
+
+saldos = service.calculator.calcular_saldos_socios()
+if saldos[Socio.BA]['saldo_total'] != stats['saldos'][Socio.BA]['saldo_total']:
+    erros.append("saldo BA diferente")
+
+# Cache: nova instância (como ao voltar ao dashboard) não faz queries
+query_count[0] = 0
+DashboardStatsService(session).obter_estatisticas()
+print(f"\nSegunda chamada (cache): {query_count[0]} queries")
+if query_count[0] != 0:
+    erros.append("segunda chamada não veio da cache")
+
+# Alterar um projeto invalida a cache
+projeto = session.query(Projeto).filter(Projeto.estado != EstadoProjeto.PAGO).first()
+if projeto:
+    projeto.estado = EstadoProjeto.PAGO
+    session.flush()
+    query_count[0] = 0
+    alterado = service.obter_estatisticas()
+    print(f"Depois de alterar um projeto: {query_count[0]} queries, recebidos={alterado['projetos']['recebidos']}")
+    if alterado['projetos']['recebidos'] != esperado_projetos['recebidos'] + 1:
+        erros.append("cache não invalidada após alteração de projeto")
+    session.rollback()
+
+    # O rollback também invalida (a cache tinha lido a alteração desfeita)
+    if service.obter_estatisticas()['projetos']['recebidos'] != esperado_projetos['recebidos']:
+        erros.append("cache não invalidada após rollback")
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ DASHBOARD STATS OK")
+print("=" * 80)
+
+session.close()
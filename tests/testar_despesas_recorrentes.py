@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da geração em bulk de despesas recorrentes (DespesasManager.gerar_despesas_recorrentes)
+
+Numa cópia da base de dados (com templates de teste): gera um ano inteiro de despesas a partir dos
+templates, verifica contagens, números #D consecutivos, dias ajustados ao
+mês e que uma segunda execução não gera duplicados.
+"""
+import time
+from calendar import monthrange
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from logic.despesas import DespesasManager
+from database.models import Despesa, DespesaTemplate, TipoDespesa
+from tests.apoio import copia_base_dados, contar_queries
+
+ANO = 2031  # Ano sem despesas geradas
+NUM_TEMPLATES = 40
+
+pasta, copia = copia_base_dados("recorrentes.db")
+
+engine = create_engine(f"sqlite:///{copia}")
+Session = sessionmaker(bind=engine)
+session = Session()
+
+query_count = contar_queries(engine)
+
+# Templates de teste (dias 1-31, para testar o ajuste ao fim do mês)
+session.add_all([
+    DespesaTemplate(
+        numero=f"#TD9{i:05d}",
+        tipo=TipoDespesa.FIXA_MENSAL,
+        descricao=f"Template de teste {i}",
+        valor_sem_iva=100 + i,
+        valor_com_iva=123 + i,
+        dia_mes=(i % 31) + 1
+    )
+    for i in range(NUM_TEMPLATES)
+])
+session.commit()
+
+manager = DespesasManager(session)
+templates = session.query(DespesaTemplate).all()
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DE GERAÇÃO EM BULK DE DESPESAS RECORRENTES")
+print("=" * 80)
+print(f"Templates: {len(templates)}")
+
+# Ano inteiro
+query_count[0] = 0
+inicio = time.perf_counter()
+geradas, erros_geracao = manager.gerar_despesas_recorrentes(date(ANO, 1, 1), date(ANO, 12, 31))
+duracao = time.perf_counter() - inicio
+print(f"Ano {ANO}: {geradas} despesas em {duracao * 1000:.1f} ms ({query_count[0]} queries)")
+
+erros.extend(erros_geracao)
+if geradas != len(templates) * 12:
+    erros.append(f"esperadas {len(templates) * 12} despesas, geradas {geradas}")
+if duracao >= 1:
+    erros.append(f"geração demorou {duracao:.2f}s (>= 1s)")
+
+despesas = session.query(Despesa).filter(
+    Despesa.data >= date(ANO, 1, 1), Despesa.data <= date(ANO, 12, 31),
+    Despesa.despesa_template_id.isnot(None)
+).order_by(Despesa.id).all()
+
+numeros = [int(d.numero.replace('#D', '')) for d in despesas]
+if not numeros:
+    erros.append("nenhuma despesa gerada encontrada")
+elif numeros != list(range(numeros[0], numeros[0] + len(numeros))):
+    erros.append("números #D não são consecutivos")
+
+por_template = {t.id: t for t in templates}
+for despesa in despesas:
+    template = por_template[despesa.despesa_template_id]
+    dia = min(template.dia_mes, monthrange(ANO, despesa.data.month)[1])
+    if despesa.data.day != dia or despesa.valor_sem_iva != template.valor_sem_iva:
+        erros.append(f"{despesa.numero}: data/valor diferente do template {template.numero}")
+        break
+
+# Segunda execução (e API antiga por mês) não gera duplicados
+geradas_2, _ = manager.gerar_despesas_recorrentes(date(ANO, 1, 1), date(ANO, 12, 31))
+geradas_mes, _ = manager.gerar_despesas_recorrentes_mes(ANO, 6)
+print(f"Segunda execução: {geradas_2} despesas; gerar_despesas_recorrentes_mes({ANO}, 6): {geradas_mes}")
+if geradas_2 or geradas_mes:
+    erros.append("despesas duplicadas na segunda execução")
+
+# Mês seguinte pela API por mês
+geradas_mes, _ = manager.gerar_despesas_recorrentes_mes(ANO + 1, 1)
+print(f"gerar_despesas_recorrentes_mes({ANO + 1}, 1): {geradas_mes}")
+if geradas_mes != len(templates):
+    erros.append("gerar_despesas_recorrentes_mes não gerou um mês completo")
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ GERAÇÃO EM BULK OK")
+print("=" * 80)
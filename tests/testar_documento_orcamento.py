@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste do documento de orçamento em memória (logic/orcamento_documento.py)
+
+Numa cópia da base de dados:
+- carregar o documento faz um número fixo de queries
+- ajustar comissões (setas ▲▼) não faz queries e os totais mantidos por
+  diferenças coincidem com a soma das linhas
+- gravar() escreve só as linhas alteradas, numa única transação, e o
+  resultado lido da DB coincide com o documento
+"""
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.models.orcamento import Orcamento, OrcamentoReparticao
+from logic.orcamento_documento import DocumentoOrcamento
+
+BASE_DADOS = "agora_media.db"
+
+pasta = tempfile.mkdtemp()
+copia = os.path.join(pasta, "orcamentos.db")
+shutil.copy(BASE_DADOS, copia)
+
+engine = create_engine(f"sqlite:///{copia}")
+Session = sessionmaker(bind=engine)
+session = Session()
+
+# Contador de queries e de commits
+statements = []
+commits = [0]
+
+
+def registar_query(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement.split()[0].upper())
+
+
+def registar_commit(conn):
+    commits[0] += 1
+
+
+event.listen(engine, "before_cursor_execute", registar_query)
+event.listen(engine, "commit", registar_commit)
+
+
+def somar(documento):
+    """Totais recalculados do zero a partir das linhas do documento"""
+    grupos, beneficiarios = {}, {}
+    for rep in documento.reparticoes.values():
+        grupos[rep.tipo] = grupos.get(rep.tipo, Decimal('0')) + rep.total
+        if rep.beneficiario:
+            beneficiarios[rep.beneficiario] = beneficiarios.get(rep.beneficiario, Decimal('0')) + rep.total
+    subtotais = {s.id: sum((i.total for i in s.itens), Decimal('0')) for s in documento.secoes.values()}
+    return {
+        'total_cliente': sum((i.total for i in documento.itens.values()), Decimal('0')),
+        'total_empresa': sum(grupos.values(), Decimal('0')),
+        'grupos': grupos,
+        'beneficiarios': beneficiarios,
+        'secoes': subtotais,
+    }
+
+
+def mantidos(documento):
+    """Totais mantidos pelo documento"""
+    return {
+        'total_cliente': documento.total_cliente,
+        'total_empresa': documento.total_empresa,
+        'grupos': dict(documento.totais.subtotais_grupo),
+        'beneficiarios': dict(documento.totais_beneficiario),
+        'secoes': {s.id: documento.subtotal_secao(s.id) for s in documento.secoes.values()},
+    }
+
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DO DOCUMENTO DE ORÇAMENTO EM MEMÓRIA")
+print("=" * 80)
+
+orcamento_id = session.query(OrcamentoReparticao.orcamento_id)\
+    .filter(OrcamentoReparticao.tipo == 'comissao').limit(1).scalar()
+if not orcamento_id:
+    print("⚠️  Sem orçamentos com comissões na base de dados")
+    raise SystemExit(0)
+
+# 1. Carregar
+statements.clear()
+documento = DocumentoOrcamento(session, orcamento_id)
+print(f"Orçamento {orcamento_id}: {len(documento.itens)} items, {len(documento.reparticoes)} repartições, "
+      f"{len(statements)} queries ao carregar")
+if len(statements) > 3:
+    erros.append(f"carregar fez {len(statements)} queries")
+if mantidos(documento) != somar(documento):
+    erros.append("totais ao carregar diferentes da soma das linhas")
+
+# 2. Setas: 200 ajustes sem queries, totais sempre coerentes
+comissoes = [r for r in documento.reparticoes.values() if r.tipo == 'comissao']
+comissao = comissoes[0]
+percentagem_inicial = comissao.percentagem
+statements.clear()
+for i in range(200):
+    incremento = Decimal('0.0001') if i < 150 else Decimal('-0.0001')
+    documento.ajustar_percentagem(comissao.id, incremento)
+    if mantidos(documento) != somar(documento):
+        erros.append(f"totais incoerentes após o ajuste {i + 1}")
+        break
+print(f"200 ajustes: {percentagem_inicial}% → {comissao.percentagem}%, {len(statements)} queries")
+if statements:
+    erros.append(f"ajustes fizeram {len(statements)} queries")
+if comissao.percentagem != percentagem_inicial + Decimal('0.0100'):
+    erros.append(f"percentagem final {comissao.percentagem}")
+esperado = (comissao.base_calculo * comissao.percentagem / 100).quantize(Decimal('0.01'))
+if comissao.total != esperado:
+    erros.append(f"total da comissão {comissao.total} (esperado {esperado})")
+
+# Limites 0-100
+documento.definir_percentagem(comissao.id, Decimal('150'))
+if comissao.percentagem != Decimal('100'):
+    erros.append("percentagem acima de 100 não foi limitada")
+documento.definir_percentagem(comissao.id, Decimal('-3'))
+if comissao.percentagem != Decimal('0'):
+    erros.append("percentagem negativa não foi limitada")
+documento.definir_percentagem(comissao.id, percentagem_inicial + Decimal('0.0100'))
+
+# Mudar de beneficiário move o total
+outra = next((r for r in documento.reparticoes.values() if r.tipo == 'servico'), None)
+if outra:
+    beneficiario = outra.beneficiario
+    documento.alterar_reparticao(outra.id, beneficiario='RR' if beneficiario != 'RR' else 'BA')
+    if mantidos(documento) != somar(documento):
+        erros.append("totais incoerentes após mudar o beneficiário")
+    documento.alterar_reparticao(outra.id, beneficiario=beneficiario)
+    if outra.suja and outra.alterados != {'beneficiario'}:
+        erros.append(f"colunas alteradas: {outra.alterados}")
+
+# Alterar um item CLIENTE atualiza secção e TOTAL CLIENTE
+item = next((i for i in documento.itens.values() if i.tipo in ('servico', 'equipamento')), None)
+if item:
+    total_cliente = documento.total_cliente
+    documento.alterar_item(item.id, quantidade=(item.quantidade or 0) + 1)
+    if mantidos(documento) != somar(documento) or documento.total_cliente == total_cliente:
+        erros.append("totais incoerentes após alterar um item")
+
+# 3. Gravar: só linhas alteradas, uma transação
+sujas = sum(1 for l in (*documento.itens.values(), *documento.reparticoes.values()) if l.suja)
+statements.clear()
+commits[0] = 0
+sucesso, erro = documento.gravar()
+updates = statements.count('UPDATE')
+print(f"Gravar: {sujas} linhas alteradas, {updates} UPDATE, {commits[0]} commit(s)")
+if not sucesso:
+    erros.append(f"gravar falhou: {erro}")
+if commits[0] != 1 or updates > 3:
+    erros.append(f"gravar fez {updates} UPDATE e {commits[0]} commits")
+if documento.tem_alteracoes:
+    erros.append("linhas continuam marcadas como alteradas depois de gravar")
+
+statements.clear()
+documento.gravar()
+if statements:
+    erros.append("gravar sem alterações fez queries")
+
+relido = DocumentoOrcamento(session, orcamento_id)
+if mantidos(relido) != mantidos(documento):
+    erros.append("documento relido da DB diferente do gravado")
+if relido.reparticoes[comissao.id].percentagem != comissao.percentagem:
+    erros.append("percentagem não foi gravada")
+valor_total = session.query(Orcamento.valor_total).filter(Orcamento.id == orcamento_id).scalar()
+if valor_total != documento.total_cliente:
+    erros.append(f"valor_total do orçamento {valor_total} (esperado {documento.total_cliente})")
+
+# recarregar() descarta alterações não gravadas
+gravada = comissao.percentagem
+documento.ajustar_percentagem(comissao.id, Decimal('1'))
+documento.recarregar()
+if documento.tem_alteracoes or documento.reparticoes[comissao.id].percentagem != gravada:
+    erros.append("recarregar não descartou as alterações")
+
+session.close()
+engine.dispose()
+shutil.rmtree(pasta)
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ DOCUMENTO DE ORÇAMENTO OK")
+print("=" * 80)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da duplicação em bulk de orçamentos e boletins (logic/clonagem.py)
+
+Numa base de dados temporária:
+- duplicar um orçamento copia secções (com a hierarquia), items, repartições
+  (despesas espelhadas apontam para o item copiado) e a proposta
+- duplicar 1 ou 20 orçamentos, pequenos ou grandes, faz o mesmo número de
+  queries
+- duplicar um boletim para os 12 meses faz o mesmo número de queries que
+  duplicar um só; as cópias têm as linhas, os totais e os movimentos do
+  ledger de saldos
+- com os ids atribuídos pela base de dados (INSERT ... RETURNING, como no
+  PostgreSQL) a cópia de um orçamento é igual
+"""
+from datetime import date
+from unittest import mock
+from decimal import Decimal
+from sqlalchemy.orm import sessionmaker
+
+from database.models import (
+    Cliente, Socio, EstadoBoletim, TipoDeslocacao, SaldoMovimento,
+    OrcamentoSecao, OrcamentoItem, OrcamentoReparticao, PropostaSecao
+)
+from logic.orcamentos import OrcamentoManager
+from logic.boletins import BoletinsManager
+from logic.boletim_linhas import BoletimLinhasManager
+from logic.saldo_movimentos import ORIGEM_BOLETIM
+from tests.apoio import base_dados_temporaria, contar_queries, criar_orcamento
+
+pasta, engine = base_dados_temporaria("duplicar.db")
+session = sessionmaker(bind=engine)()
+manager = OrcamentoManager(session)
+boletins_manager = BoletinsManager(session)
+query_count = contar_queries(engine)
+
+
+def grafo(orcamento_id):
+    """Conteúdo do orçamento sem ids (para comparar original e cópia)"""
+    secoes = {s.id: s for s in session.query(OrcamentoSecao).filter_by(orcamento_id=orcamento_id)}
+    itens = {i.id: i for i in session.query(OrcamentoItem).filter_by(orcamento_id=orcamento_id)}
+    return {
+        'secoes': sorted((s.tipo, s.nome, s.ordem, secoes[s.parent_id].tipo if s.parent_id else None)
+                         for s in secoes.values()),
+        'itens': sorted((secoes[i.secao_id].tipo, i.descricao, i.total) for i in itens.values()),
+        'reparticoes': sorted(
+            (r.tipo, r.descricao, r.total, itens[r.item_cliente_id].descricao if r.item_cliente_id else None)
+            for r in session.query(OrcamentoReparticao).filter_by(orcamento_id=orcamento_id)
+        ),
+        'proposta': sorted(
+            (s.nome, i.descricao, i.total)
+            for s in session.query(PropostaSecao).filter_by(orcamento_id=orcamento_id)
+            for i in s.itens
+        ),
+    }
+
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DE DUPLICAÇÃO EM BULK")
+print("=" * 80)
+
+cliente = Cliente(numero="#C0001", nome="Cliente Teste", nome_formal="Cliente Teste, Lda")
+session.add(cliente)
+session.commit()
+
+pequeno = criar_orcamento(manager, cliente.id, "OR-TESTE-PEQUENO", 3)
+grande = criar_orcamento(manager, cliente.id, "OR-TESTE-GRANDE", 150)
+
+# 1. Cópia completa de um orçamento
+sucesso, copia, erro = manager.duplicar_orcamento(grande.id)
+if not sucesso:
+    erros.append(f"duplicar_orcamento falhou: {erro}")
+else:
+    if copia.codigo != "OR-TESTE-GRANDE-COPIA" or copia.status != 'rascunho' or copia.projeto_id:
+        erros.append(f"cópia com código/estado inesperado: {copia.codigo} {copia.status}")
+    if grafo(copia.id) != grafo(grande.id):
+        erros.append("conteúdo da cópia diferente do original")
+    ids_originais = {i.id for i in session.query(OrcamentoItem).filter_by(orcamento_id=grande.id)}
+    espelhada = session.query(OrcamentoReparticao).filter_by(orcamento_id=copia.id, tipo='despesa').one()
+    if espelhada.item_cliente_id in ids_originais:
+        erros.append("despesa espelhada da cópia aponta para o item do original")
+    sucesso, erro = manager.verificar_totais(copia.id)
+    if not sucesso:
+        erros.append(f"totais da cópia: {erro}")
+
+_, segunda, _ = manager.duplicar_orcamento(grande.id)
+if not segunda or segunda.codigo != "OR-TESTE-GRANDE-COPIA-2":
+    erros.append(f"segunda cópia com código {segunda.codigo if segunda else None}")
+
+sucesso, _, erro = manager.duplicar_orcamento(grande.id, "OR-TESTE-PEQUENO")
+if sucesso or "já existe" not in (erro or ""):
+    erros.append("código repetido foi aceite")
+
+# 2. Número de queries independente do tamanho e do número de cópias
+queries = {}
+for nome, ids in (("1 pequeno", [pequeno.id]), ("1 grande", [grande.id]), ("20 grandes", [grande.id] * 20)):
+    session.expire_all()
+    query_count[0] = 0
+    sucesso, novos, erro = manager.duplicar_orcamentos(ids)
+    queries[nome] = query_count[0]
+    if not sucesso or len(novos) != len(ids):
+        erros.append(f"duplicar_orcamentos({nome}) falhou: {erro}")
+print(f"duplicar_orcamentos: {queries}")
+if len(set(queries.values())) != 1:
+    erros.append(f"queries dependem do tamanho/número de cópias: {queries}")
+
+# 3. Boletins: um boletim para os 12 meses
+sucesso, boletim, erro = boletins_manager.criar(
+    Socio.BA, 1, 2025, date(2025, 1, 31), Decimal('72.65'), Decimal('167.07'), Decimal('0.40')
+)
+linhas_manager = BoletimLinhasManager(session)
+for i in range(10):
+    linhas_manager.criar(boletim.id, f"Deslocação {i}", TipoDeslocacao.NACIONAL if i % 2 else TipoDeslocacao.ESTRANGEIRO,
+                         dias=Decimal('1.5'), kms=100)
+linhas_manager.recalcular_totais_boletim(boletim.id)
+boletins_manager.marcar_como_pago(boletim.id, date(2025, 2, 1))
+session.refresh(boletim)
+
+query_count[0] = 0
+sucesso, novo, erro = boletins_manager.duplicar_boletim(boletim.id)
+queries_um = query_count[0]
+if not sucesso:
+    erros.append(f"duplicar_boletim falhou: {erro}")
+
+query_count[0] = 0
+sucesso, novos_ids, erro = boletins_manager.duplicar_boletins([boletim.id] * 12, [(2026, mes) for mes in range(1, 13)])
+queries_doze = query_count[0]
+print(f"duplicar boletim: 1 cópia {queries_um} queries, 12 cópias {queries_doze} queries")
+if not sucesso:
+    erros.append(f"duplicar_boletins falhou: {erro}")
+if queries_doze > queries_um:
+    erros.append(f"12 cópias fizeram {queries_doze} queries (1 cópia: {queries_um})")
+
+copias = [boletins_manager.obter_por_id(i, perfil='detalhe') for i in novos_ids]
+if [(c.ano, c.mes) for c in copias] != [(2026, mes) for mes in range(1, 13)]:
+    erros.append("períodos das cópias errados")
+if len({c.numero for c in copias} | {boletim.numero, novo.numero}) != 14:
+    erros.append("números de boletim repetidos")
+for c in [novo] + copias:
+    if c.estado != EstadoBoletim.PENDENTE or c.data_pagamento is not None:
+        erros.append(f"{c.numero}: cópia não ficou pendente")
+        break
+    if c.valor_total != boletim.valor_total or c.valor != boletim.valor:
+        erros.append(f"{c.numero}: totais {c.valor_total} (original {boletim.valor_total})")
+        break
+    linhas = [(l.ordem, l.servico, l.tipo, l.dias, l.kms) for l in c.linhas]
+    if linhas != [(l.ordem, l.servico, l.tipo, l.dias, l.kms) for l in boletim.linhas]:
+        erros.append(f"{c.numero}: linhas diferentes do original")
+        break
+
+movimentos = session.query(SaldoMovimento).filter(
+    SaldoMovimento.origem_tipo == ORIGEM_BOLETIM, SaldoMovimento.origem_id.in_(novos_ids)
+).count()
+if movimentos != 12:
+    erros.append(f"ledger: {movimentos} movimentos para 12 cópias")
+
+sucesso, _, erro = boletins_manager.duplicar_boletins([999999])
+if sucesso:
+    erros.append("boletim inexistente foi duplicado")
+
+# 4. Ids atribuídos pela base de dados (RETURNING ordenado, como no PostgreSQL)
+with mock.patch('logic.clonagem._ids_pela_base_de_dados', return_value=True):
+    sucesso, copia, erro = manager.duplicar_orcamento(grande.id, "OR-TESTE-RETURNING")
+if not sucesso:
+    erros.append(f"duplicar_orcamento com RETURNING falhou: {erro}")
+elif grafo(copia.id) != grafo(grande.id):
+    erros.append("conteúdo da cópia com RETURNING diferente do original")
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ DUPLICAÇÃO EM BULK OK")
+print("=" * 80)
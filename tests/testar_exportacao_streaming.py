@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da exportação em streaming dos relatórios (logic/exportacao_streaming.py)
+
+Gera despesas sintéticas em bases de dados temporárias com dois tamanhos
+(N e 4N) e exporta o relatório de despesas para Excel e PDF:
+- as estatísticas em streaming são iguais às do relatório normal
+- o Excel tem todas as linhas, com os estilos nomeados e células fundidas
+- o PDF tem o cabeçalho das colunas em todas as páginas
+- a memória de pico não cresce com o número de linhas e o tempo cresce
+  de forma linear
+"""
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+import openpyxl
+from reportlab import rl_config
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, Despesa, Fornecedor, TipoDespesa, EstadoDespesa
+from logic.relatorios import RelatoriosManager
+
+N = 1000
+TIPOS = list(TipoDespesa)
+ESTADOS = list(EstadoDespesa)
+
+# PDF sem compressão, para contar páginas e cabeçalhos no ficheiro
+rl_config.pageCompression = 0
+
+
+def criar_db(caminho, n):
+    """DB temporária com n despesas ao longo de vários anos"""
+    engine = create_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    fornecedor = Fornecedor(numero="#F0001", nome="Fornecedor Teste")
+    session.add(fornecedor)
+    session.flush()
+    session.execute(insert(Despesa), [
+        {
+            'numero': f"#D{i:06d}",
+            'tipo': TIPOS[i % len(TIPOS)],
+            'estado': ESTADOS[i % len(ESTADOS)],
+            'data': date(2020, 1, 1) + timedelta(days=i % 2000),
+            'credor_id': fornecedor.id,
+            'descricao': f"Despesa sintética número {i} com descrição longa para cortar",
+            'valor_sem_iva': Decimal(i % 997) + Decimal('0.25'),
+            'valor_com_iva': (Decimal(i % 997) + Decimal('0.25')) * Decimal('1.23'),
+        }
+        for i in range(1, n + 1)
+    ])
+    session.commit()
+    return engine, session
+
+
+def exportar(session, pasta):
+    """Exporta o relatório de despesas em streaming; devolve (duração, pico de memória)"""
+    manager = RelatoriosManager(session)
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    manager.exportar_excel(manager.gerar_relatorio_despesas(streaming=True), os.path.join(pasta, "despesas.xlsx"))
+    manager.exportar_pdf(manager.gerar_relatorio_despesas(streaming=True), os.path.join(pasta, "despesas.pdf"))
+    duracao = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duracao, pico
+
+
+erros = []
+medicoes = {}
+
+print("=" * 80)
+print("🧪 TESTE DE EXPORTAÇÃO EM STREAMING")
+print("=" * 80)
+
+for n in (N, 4 * N):
+    with tempfile.TemporaryDirectory() as pasta:
+        engine, session = criar_db(os.path.join(pasta, "teste.db"), n)
+        manager = RelatoriosManager(session)
+
+        # 1. Estatísticas em streaming == relatório normal
+        normal = manager.gerar_relatorio_despesas()
+        streaming = manager.gerar_relatorio_despesas(streaming=True)
+        linhas_normal = normal.pop('despesas')
+        linhas_streaming = list(streaming.pop('despesas'))
+        normal.pop('data_geracao')
+        streaming.pop('data_geracao')
+        if normal != streaming:
+            erros.append(f"n={n}: estatísticas em streaming diferentes do relatório normal")
+        if linhas_normal != linhas_streaming:
+            erros.append(f"n={n}: linhas em streaming diferentes do relatório normal")
+
+        # 2. Exportação
+        duracao, pico = exportar(session, pasta)
+        medicoes[n] = (duracao, pico)
+        print(f"{n:>6} despesas: {duracao:.2f}s, pico de memória {pico / 1024 / 1024:.1f} MB")
+
+        # 3. Excel: todas as linhas, estilos nomeados, células fundidas
+        ws = openpyxl.load_workbook(os.path.join(pasta, "despesas.xlsx")).active
+        cabecalho = next(row for row in ws.iter_rows(min_col=1, max_col=1) if row[0].value == 'Nº')[0].row
+        linhas = ws.max_row - cabecalho
+        if linhas != n:
+            erros.append(f"n={n}: Excel com {linhas} linhas de dados")
+        if ws.cell(cabecalho, 1).style != 'rel_cabecalho_despesas':
+            erros.append(f"n={n}: cabeçalho do Excel sem estilo nomeado")
+        pares = [ws.cell(r, 1).style for r in range(cabecalho + 1, cabecalho + 5)]
+        if sorted(set(pares)) != ['Normal', 'rel_texto_alt']:
+            erros.append(f"n={n}: linhas sem fundo alternado ({pares})")
+        if ws.cell(cabecalho + 1, 6).alignment.horizontal != 'right':
+            erros.append(f"n={n}: valores não alinhados à direita")
+        if 'A1:H1' not in {str(r) for r in ws.merged_cells.ranges}:
+            erros.append(f"n={n}: título não fundido")
+
+        # 4. PDF: cabeçalho das colunas em todas as páginas
+        pdf = open(os.path.join(pasta, "despesas.pdf"), 'rb').read()
+        paginas = len(re.findall(rb'/Type /Page\b', pdf))
+        cabecalhos = pdf.count(b'(Credor)')
+        print(f"         PDF: {paginas} páginas, cabeçalho em {cabecalhos}")
+        if paginas < 2 or cabecalhos != paginas:
+            erros.append(f"n={n}: PDF com {paginas} páginas e {cabecalhos} cabeçalhos")
+
+        session.close()
+        engine.dispose()
+
+# 5. Memória limitada e tempo linear (4x as linhas)
+(t1, m1), (t4, m4) = medicoes[N], medicoes[4 * N]
+print(f"4x linhas: tempo x{t4 / t1:.1f}, memória x{m4 / m1:.1f}")
+if m4 > 2 * m1:
+    erros.append(f"memória cresce com as linhas: {m1 / 1024 / 1024:.1f} MB → {m4 / 1024 / 1024:.1f} MB")
+if t4 > 6 * t1:
+    erros.append(f"tempo não linear: {t1:.2f}s → {t4:.2f}s")
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ EXPORTAÇÃO EM STREAMING OK")
+print("=" * 80)
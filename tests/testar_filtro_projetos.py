@@ -45,7 +45,7 @@ for proj in relatorio['projetos'][:5]:
 # Test 3: Apenas Pessoais Bruno
 print("\n[TESTE 3] Filtro: APENAS PESSOAIS BA")
 print("-" * 80)
-relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL_BA)
+relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL, owner='BA')
 print(f"Total de projetos: {relatorio['total_projetos']}")
 print(f"Valor total: {relatorio['total_valor_fmt']}")
 for proj in relatorio['projetos'][:5]:
@@ -54,7 +54,7 @@ for proj in relatorio['projetos'][:5]:
 # Test 4: Apenas Pessoais Rafael
 print("\n[TESTE 4] Filtro: APENAS PESSOAIS RR")
 print("-" * 80)
-relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL_RR)
+relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL, owner='RR')
 print(f"Total de projetos: {relatorio['total_projetos']}")
 print(f"Valor total: {relatorio['total_valor_fmt']}")
 for proj in relatorio['projetos'][:5]:
@@ -53,7 +53,8 @@ if relatorio['projetos']:
 print("\n[TESTE 3] FILTRO: Pessoais Bruno + Não Faturado")
 print("-" * 80)
 relatorio = manager.gerar_relatorio_projetos(
-    tipo=TipoProjeto.PESSOAL_BRUNO,
+    tipo=TipoProjeto.PESSOAL,
+    owner='BA',
     estado=EstadoProjeto.ATIVO
 )
 print(f"Total de projetos: {relatorio['total_projetos']}")
@@ -68,7 +69,8 @@ if relatorio['projetos']:
 print("\n[TESTE 4] FILTRO: Pessoais Rafael + Faturado")
 print("-" * 80)
 relatorio = manager.gerar_relatorio_projetos(
-    tipo=TipoProjeto.PESSOAL_RAFAEL,
+    tipo=TipoProjeto.PESSOAL,
+    owner='RR',
     estado=EstadoProjeto.FINALIZADO
 )
 print(f"Total de projetos: {relatorio['total_projetos']}")
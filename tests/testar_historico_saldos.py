@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste do histórico de saldos (obter_historico_saldos)
+
+Para cada granularidade ('semana', 'mes', 'ano') e cada sócio, verifica que:
+- os períodos cobrem o intervalo sem falhas nem sobreposições (semanas de
+  segunda a domingo, meses e anos civis, cortados em data_inicio/data_fim)
+- o saldo inicial e o saldo no fim de cada período coincidem exatamente com
+  _calcular_saldo() com data_fim = dia anterior / fim do período
+- a soma dos deltas dá a diferença entre saldo final e saldo inicial
+
+O intervalo começa e acaba a meio de uma semana, de um mês e de um ano, para
+testar os limites dos períodos.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import sessionmaker
+
+from logic.saldos import SaldosCalculator
+from database.models import Socio
+from tests.apoio import engine_configurado, contar_queries
+
+engine = engine_configurado()
+Session = sessionmaker(bind=engine)
+session = Session()
+
+query_count = contar_queries(engine)
+
+calculator = SaldosCalculator(session)
+
+DATA_INICIO = date(2025, 2, 12)   # quarta-feira
+DATA_FIM = date(2026, 1, 15)      # quinta-feira
+
+
+def verificar_periodos(periodos, granularidade):
+    """Devolve a lista de problemas nos limites dos períodos"""
+    problemas = []
+    if periodos[0]['inicio'] != DATA_INICIO or periodos[-1]['fim'] != DATA_FIM:
+        problemas.append("períodos não cobrem o intervalo")
+    for anterior, atual in zip(periodos, periodos[1:]):
+        if atual['inicio'] != anterior['fim'] + timedelta(days=1):
+            problemas.append(f"falha/sobreposição entre {anterior['fim']} e {atual['inicio']}")
+    for periodo in periodos[1:]:
+        inicio = periodo['inicio']
+        if granularidade == 'semana' and inicio.weekday() != 0:
+            problemas.append(f"semana começa em {inicio} (não é segunda)")
+        elif granularidade == 'mes' and inicio.day != 1:
+            problemas.append(f"mês começa em {inicio}")
+        elif granularidade == 'ano' and (inicio.month, inicio.day) != (1, 1):
+            problemas.append(f"ano começa em {inicio}")
+    return problemas
+
+
+print("=" * 80)
+print("🧪 TESTE DO HISTÓRICO DE SALDOS")
+print("=" * 80)
+
+falhas = 0
+for granularidade in SaldosCalculator.GRANULARIDADES:
+    for socio in (Socio.BA, Socio.RR):
+        print(f"\n[{granularidade} / {socio.value}]")
+        print("-" * 80)
+
+        query_count[0] = 0
+        historico = calculator.obter_historico_saldos(socio, DATA_INICIO, DATA_FIM, granularidade)
+        queries = query_count[0]
+        periodos = historico['periodos']
+        print(f"  {len(periodos)} períodos, {queries} queries")
+
+        problemas = verificar_periodos(periodos, granularidade)
+
+        esperado = calculator._calcular_saldo(socio, data_fim=DATA_INICIO - timedelta(days=1))
+        if historico['saldo_inicial'] != esperado['saldo_total']:
+            problemas.append(
+                f"saldo inicial {historico['saldo_inicial']} (esperado {esperado['saldo_total']})"
+            )
+
+        for periodo in periodos:
+            esperado = calculator._calcular_saldo(socio, data_fim=periodo['fim'])
+            if periodo['saldo'] != esperado['saldo_total']:
+                problemas.append(
+                    f"saldo em {periodo['fim']}: {periodo['saldo']} (esperado {esperado['saldo_total']})"
+                )
+
+        # Em Decimal: somar os floats acumula erros de arredondamento
+        soma_deltas = sum(Decimal(str(periodo['delta'])) for periodo in periodos)
+        variacao = Decimal(str(historico['saldo_final'])) - Decimal(str(historico['saldo_inicial']))
+        if soma_deltas != variacao:
+            problemas.append(f"soma dos deltas {soma_deltas:.2f} não bate com a variação do saldo")
+
+        if problemas:
+            falhas += len(problemas)
+            for problema in problemas[:5]:
+                print(f"  ❌ {problema}")
+        else:
+            print(f"  ✅ saldo €{historico['saldo_inicial']:,.2f} -> €{historico['saldo_final']:,.2f} (idêntico)")
+
+# Com investimento inicial
+historico = calculator.obter_historico_saldos(Socio.BA, DATA_INICIO, DATA_FIM, 'ano', incluir_investimento=True)
+esperado = calculator._calcular_saldo(Socio.BA, incluir_investimento=True, data_fim=DATA_FIM)
+if historico['saldo_final'] != esperado['saldo_total']:
+    falhas += 1
+    print(f"\n❌ Com investimento: {historico['saldo_final']} (esperado {esperado['saldo_total']})")
+
+session.close()
+
+print("\n" + "=" * 80)
+if falhas:
+    print(f"❌ {falhas} DIFERENÇA(S) ENCONTRADA(S)")
+else:
+    print("✅ TESTE COMPLETO")
+print("=" * 80)
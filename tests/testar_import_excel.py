@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da importação do Excel (scripts/import_from_excel.py)
+
+Importa o Excel mais recente para duas bases de dados vazias: uma com a
+leitura no próprio processo (--workers 1) e outra com a leitura repartida
+por um pool de processos (--workers 2). Os registos lidos e o conteúdo
+gravado têm de ser iguais; uma segunda importação não tem delta.
+
+Importação delta: o snapshot anterior seguido do mais recente (só as
+linhas novas/alteradas) tem de dar o mesmo resultado que o mesmo par de
+importações com --completo.
+
+Reimportação do snapshot anterior com --clear-all: o ledger de saldos fica consistente (sem
+movimentos dos registos apagados).
+"""
+import contextlib
+import glob
+import io
+import os
+import pickle
+import tempfile
+from unittest import mock
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, Cliente, Fornecedor, Projeto, Despesa, Boletim
+from logic.saldo_movimentos import SaldoMovimentosManager
+from scripts.import_from_excel import ExcelImporter
+
+SNAPSHOTS = sorted(glob.glob("excel/CONTABILIDADE_FINAL_*.xlsx"))
+EXCEL = SNAPSHOTS[-1]
+ANTERIOR = SNAPSHOTS[-2]
+
+
+def importar(caminho, workers=1, excel=EXCEL, completo=False, limpar=False):
+    """Importa o Excel para a DB em caminho; devolve (importer, sucesso, output)"""
+    engine = create_engine(f"sqlite:///{caminho}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    importer = ExcelImporter(session, excel_path=excel, workers=workers, completo=completo)
+    output = io.StringIO()
+    # Forçar o pool mesmo numa máquina com um só CPU
+    with mock.patch('os.cpu_count', return_value=4), contextlib.redirect_stdout(output):
+        sucesso = importer.executar(limpar_tudo=limpar)
+    session.close()
+    engine.dispose()
+    return importer, sucesso, output.getvalue()
+
+
+def conteudo(caminho):
+    """Conteúdo das tabelas importadas, por chave natural"""
+    engine = create_engine(f"sqlite:///{caminho}")
+    session = sessionmaker(bind=engine)()
+    dados = {
+        'clientes': sorted(session.execute(select(Cliente.numero, Cliente.nome, Cliente.nif)).tuples()),
+        'fornecedores': sorted(session.execute(
+            select(Fornecedor.numero, Fornecedor.nome, Fornecedor.classificacao)).tuples()),
+        'projetos': sorted(session.execute(select(
+            Projeto.numero, Projeto.owner, Projeto.estado, Projeto.valor_sem_iva,
+            Projeto.premio_bruno, Projeto.premio_rafael)).tuples()),
+        'despesas': sorted(session.execute(select(
+            Despesa.numero, Despesa.tipo, Despesa.estado, Despesa.data, Despesa.valor_com_iva)).tuples()),
+        'boletins': sorted(session.execute(select(
+            Boletim.socio, Boletim.data_emissao, Boletim.valor, Boletim.estado)).tuples(), key=str),
+    }
+    session.close()
+    engine.dispose()
+    return dados
+
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DE IMPORTAÇÃO DO EXCEL")
+print("=" * 80)
+print(f"Excel: {EXCEL}")
+
+with tempfile.TemporaryDirectory() as pasta:
+    sequencial_db = os.path.join(pasta, "sequencial.db")
+    paralelo_db = os.path.join(pasta, "paralelo.db")
+
+    # 1. Leitura no próprio processo
+    sequencial, sucesso, output = importar(sequencial_db, workers=1)
+    print(f"Sequencial: leitura {sequencial.tempos['leitura']:.2f}s, "
+          f"escrita {sum(sequencial.tempos['escrita'].values()):.2f}s")
+    if not sucesso:
+        erros.append(f"importação sequencial falhou:\n{output[-2000:]}")
+    if "TEMPOS POR FASE" not in output:
+        erros.append("tempos por fase não impressos")
+
+    # 2. Leitura num pool de processos
+    paralelo, sucesso, output = importar(paralelo_db, workers=2)
+    print(f"Paralelo:   leitura {paralelo.tempos['leitura']:.2f}s, "
+          f"escrita {sum(paralelo.tempos['escrita'].values()):.2f}s")
+    if not sucesso:
+        erros.append(f"importação paralela falhou:\n{output[-2000:]}")
+    if "Leitura (2 processos)" not in output:
+        erros.append("leitura paralela não usou 2 processos")
+
+    # 3. Mesmos registos lidos e mesmo conteúdo gravado
+    leitura = sequencial._ler_excel()
+    if leitura['DESPESAS']['registos'] != pickle.loads(pickle.dumps(leitura['DESPESAS']['registos'])):
+        erros.append("registos da folha DESPESAS não sobrevivem a pickle")
+
+    for folha, (linhas, _) in sequencial.tempos['folhas'].items():
+        if paralelo.tempos['folhas'][folha][0] != linhas:
+            erros.append(f"{folha}: {linhas} linhas lidas em sequencial, "
+                         f"{paralelo.tempos['folhas'][folha][0]} em paralelo")
+
+    dados_sequencial = conteudo(sequencial_db)
+    dados_paralelo = conteudo(paralelo_db)
+    for tabela, registos in dados_sequencial.items():
+        print(f"  {tabela}: {len(registos)} registos")
+        if not registos:
+            erros.append(f"{tabela}: nada importado")
+        if registos != dados_paralelo[tabela]:
+            erros.append(f"{tabela}: conteúdo diferente entre sequencial e paralelo")
+
+    # 4. Reimportar o mesmo Excel: delta vazio, nada processado
+    reimportacao, sucesso, output = importar(paralelo_db)
+    novos = {entity: reimportacao.stats[entity]['total']
+             for entity in ('clientes', 'fornecedores', 'projetos', 'despesas', 'boletins')}
+    print(f"Reimportação: processados {novos}")
+    if not sucesso or any(novos.values()):
+        erros.append(f"reimportação processou registos: {novos}")
+    if "Sem alterações desde o último snapshot" not in output:
+        erros.append("reimportação sem delta não foi reportada")
+    if conteudo(paralelo_db) != dados_paralelo:
+        erros.append("reimportação alterou o conteúdo")
+
+    # 5. Snapshot anterior → mais recente: delta igual a importação completa
+    delta_db = os.path.join(pasta, "delta.db")
+    completo_db = os.path.join(pasta, "completo.db")
+    print(f"Delta: {ANTERIOR} → {EXCEL}")
+    importar(delta_db, excel=ANTERIOR)
+    importar(completo_db, excel=ANTERIOR)
+    delta, sucesso_delta, output = importar(delta_db)
+    completo, sucesso_completo, _ = importar(completo_db, completo=True)
+    if not (sucesso_delta and sucesso_completo):
+        erros.append(f"importação do snapshot mais recente falhou:\n{output[-2000:]}")
+    if delta.delta is None or "DELTA desde o último snapshot" not in output:
+        erros.append("delta não calculado/impresso")
+    else:
+        processadas = sum(len(d['novas']) + len(d['alteradas']) for d in delta.delta.values())
+        inalteradas = sum(d['inalteradas'] for d in delta.delta.values())
+        print(f"  {processadas} linhas novas/alteradas, {inalteradas} inalteradas")
+        if not processadas or not inalteradas:
+            erros.append("delta sem linhas alteradas ou sem linhas inalteradas")
+    if conteudo(delta_db) != conteudo(completo_db):
+        erros.append("importação delta difere da importação completa")
+    if completo.delta is not None:
+        erros.append("--completo calculou delta")
+
+    # 6. --clear-all com o snapshot anterior (menos registos): o ledger só tem
+    # os movimentos dos registos reimportados
+    _, sucesso, output = importar(sequencial_db, excel=ANTERIOR, limpar=True)
+    engine = create_engine(f"sqlite:///{sequencial_db}")
+    session = sessionmaker(bind=engine)()
+    diferencas = SaldoMovimentosManager(session).verificar_consistencia()
+    session.close()
+    engine.dispose()
+    print(f"--clear-all ({ANTERIOR}): {len(diferencas)} diferença(s) no ledger")
+    if not sucesso:
+        erros.append(f"importação com --clear-all falhou:\n{output[-2000:]}")
+    if diferencas:
+        erros.append(f"ledger inconsistente após --clear-all: {diferencas}")
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ IMPORTAÇÃO OK")
+print("=" * 80)
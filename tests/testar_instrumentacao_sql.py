@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da instrumentação SQL (utils/instrumentacao_sql.py)
+
+Verifica que as queries são atribuídas ao ecrã e ao método de manager que
+as originaram e que o resumo é exportável em JSON.
+"""
+import json
+import os
+import tempfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
+
+from logic.projetos import ProjetosManager
+from logic.saldos import SaldosCalculator
+from ui.screens.projetos import ProjetosScreen
+from utils.instrumentacao_sql import InstrumentacaoSQL, SEM_ECRA
+
+load_dotenv()
+
+# Create database session
+database_url = os.getenv("DATABASE_URL", "sqlite:///./agora_media.db")
+engine = create_engine(database_url)
+Session = sessionmaker(bind=engine)
+session = Session()
+
+instrumentacao = InstrumentacaoSQL()
+instrumentacao.ligar(engine)
+
+print("=" * 80)
+print("🧪 TESTE DE INSTRUMENTAÇÃO SQL")
+print("=" * 80)
+
+# Ecrã sem widgets: só o manager, como em ProjetosScreen.__init__
+screen = ProjetosScreen.__new__(ProjetosScreen)
+screen.manager = ProjetosManager(session)
+screen.load_data()
+
+# Fora de qualquer ecrã
+SaldosCalculator(session).calcular_saldo_bruno()
+
+resumo = instrumentacao.resumo()
+print(f"Total: {resumo['total_queries']} queries, {resumo['tempo_total_ms']} ms")
+print("\nPor ecrã:")
+for entrada in resumo['por_ecra']:
+    print(f"   {entrada['queries']:>4} queries {entrada['tempo_ms']:>8} ms  {entrada['nome']}")
+print("\nPor método:")
+for entrada in resumo['por_metodo']:
+    print(f"   {entrada['queries']:>4} queries {entrada['tempo_ms']:>8} ms  {entrada['nome']}")
+
+ecras = {entrada['nome'] for entrada in resumo['por_ecra']}
+metodos = {entrada['nome'] for entrada in resumo['por_metodo']}
+
+erros = []
+if 'ProjetosScreen' not in ecras:
+    erros.append("queries do load_data não atribuídas a ProjetosScreen")
+if SEM_ECRA not in ecras:
+    erros.append("queries do SaldosCalculator atribuídas a um ecrã")
+if 'ProjetosManager.listar_todos' not in metodos:
+    erros.append("ProjetosManager.listar_todos em falta nos métodos")
+if not any(nome.startswith('SaldosCalculator.') for nome in metodos):
+    erros.append("SaldosCalculator em falta nos métodos")
+if len(resumo['queries_lentas']) != min(resumo['total_queries'], InstrumentacaoSQL.MAX_LENTAS):
+    erros.append("número de queries lentas incorreto")
+
+with tempfile.TemporaryDirectory() as pasta:
+    caminho = instrumentacao.exportar_json(os.path.join(pasta, "diagnostico_sql.json"))
+    with open(caminho, encoding='utf-8') as f:
+        if json.load(f)['total_queries'] != resumo['total_queries']:
+            erros.append("JSON exportado diferente do resumo")
+
+instrumentacao.desligar()
+antes = instrumentacao.total_queries
+ProjetosManager(session).listar_todos()
+if instrumentacao.total_queries != antes:
+    erros.append("queries registadas depois de desligar()")
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ INSTRUMENTAÇÃO OK")
+print("=" * 80)
+
+session.close()
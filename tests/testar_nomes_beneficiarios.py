@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da resolução de nomes de beneficiários (logic/beneficiarios.py)
+
+Numa base de dados temporária:
+- resolver os beneficiários de um orçamento faz uma query por tipo
+  (freelancers, fornecedores), independentemente de quantos são
+- voltar a resolver não faz queries (cache na sessão)
+- gravar um freelancer ou fornecedor pelo manager invalida a cache
+- ids desconhecidos ou inválidos são mostrados tal como estão
+"""
+from sqlalchemy.orm import sessionmaker
+
+from database.models import EstatutoFornecedor
+from logic.beneficiarios import NomesBeneficiarios
+from logic.freelancers import FreelancersManager
+from logic.fornecedores import FornecedoresManager
+from tests.apoio import base_dados_temporaria, contar_queries
+
+N_POR_TIPO = 30
+
+pasta, engine = base_dados_temporaria("beneficiarios.db")
+session = sessionmaker(bind=engine)()
+
+query_count = contar_queries(engine)
+
+
+def resolver(ids):
+    """Resolve com um resolver novo; devolve (nomes, queries)"""
+    query_count[0] = 0
+    nomes = NomesBeneficiarios(session).resolver(ids)
+    return nomes, query_count[0]
+
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DE NOMES DE BENEFICIÁRIOS")
+print("=" * 80)
+
+freelancers_manager = FreelancersManager(session)
+fornecedores_manager = FornecedoresManager(session)
+freelancers = [freelancers_manager.criar(nome=f"Freelancer {i}")[1] for i in range(N_POR_TIPO)]
+fornecedores = [fornecedores_manager.criar(nome=f"Fornecedor {i}", estatuto=EstatutoFornecedor.EMPRESA)[1]
+                for i in range(N_POR_TIPO)]
+
+ids = ['BA', 'RR', 'AGORA']
+ids += [f"FREELANCER_{f.id}" for f in freelancers]
+ids += [f"FORNECEDOR_{f.id}" for f in fornecedores]
+ids += ['FREELANCER_99999', 'FORNECEDOR_abc', 'OUTRO']
+
+# 1. Uma query por tipo
+nomes, queries = resolver(ids)
+print(f"{len(ids)} beneficiários: {queries} queries")
+if queries != 2:
+    erros.append(f"resolver fez {queries} queries (esperado 2)")
+
+esperados = {
+    'BA': 'BA - Bruno',
+    f"FREELANCER_{freelancers[3].id}": f"FREELANCER_{freelancers[3].id} - Freelancer 3",
+    f"FORNECEDOR_{fornecedores[7].id}": f"FORNECEDOR_{fornecedores[7].id} - Fornecedor 7",
+    'FREELANCER_99999': 'FREELANCER_99999',
+    'FORNECEDOR_abc': 'FORNECEDOR_abc',
+    'OUTRO': 'OUTRO',
+}
+for beneficiario_id, esperado in esperados.items():
+    if nomes.get(beneficiario_id) != esperado:
+        erros.append(f"{beneficiario_id}: {nomes.get(beneficiario_id)!r} (esperado {esperado!r})")
+
+# 2. Cache na sessão (incluindo ids inexistentes)
+_, queries = resolver(ids)
+print(f"Voltar a resolver: {queries} queries")
+if queries:
+    erros.append(f"resolver de novo fez {queries} queries")
+
+_, queries = resolver(['BA', f"FREELANCER_{freelancers[0].id}"])
+if queries:
+    erros.append("subconjunto já resolvido fez queries")
+
+# 3. Gravações pelos managers invalidam a cache
+freelancer_id = freelancers[0].id
+freelancers_manager.atualizar(freelancer_id, nome="Freelancer Renomeado")
+nomes, queries = resolver(ids)
+print(f"Após atualizar um freelancer: {queries} queries")
+if nomes[f"FREELANCER_{freelancer_id}"] != f"FREELANCER_{freelancer_id} - Freelancer Renomeado":
+    erros.append(f"nome do freelancer não foi atualizado: {nomes[f'FREELANCER_{freelancer_id}']}")
+
+fornecedor_id = fornecedores[0].id
+fornecedores_manager.atualizar(fornecedor_id, nome="Fornecedor Renomeado")
+nomes, _ = resolver(ids)
+if nomes[f"FORNECEDOR_{fornecedor_id}"] != f"FORNECEDOR_{fornecedor_id} - Fornecedor Renomeado":
+    erros.append(f"nome do fornecedor não foi atualizado: {nomes[f'FORNECEDOR_{fornecedor_id}']}")
+
+sucesso, novo, _ = freelancers_manager.criar(nome="Freelancer Novo")
+nomes, _ = resolver([f"FREELANCER_{novo.id}"])
+if nomes[f"FREELANCER_{novo.id}"] != f"FREELANCER_{novo.id} - Freelancer Novo":
+    erros.append("freelancer criado depois da cache não foi resolvido")
+
+# Outra sessão tem a sua própria cache
+outra = sessionmaker(bind=engine)()
+query_count[0] = 0
+NomesBeneficiarios(outra).resolver(ids)
+if query_count[0] != 2:
+    erros.append(f"outra sessão fez {query_count[0]} queries (esperado 2)")
+outra.close()
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ NOMES DE BENEFICIÁRIOS OK")
+print("=" * 80)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste dos perfis de carregamento (logic/perfis_carregamento.py)
+
+Renderiza as linhas dos ecrãs de listagem (item_to_dict) com os listar_*
+dos managers e verifica que o número de queries não depende do número de
+linhas (sem N+1). Também verifica as consultas paginadas (consulta_lista).
+"""
+from sqlalchemy.orm import sessionmaker
+
+from logic.projetos import ProjetosManager
+from logic.despesas import DespesasManager
+from logic.boletins import BoletinsManager
+from logic.clientes import ClientesManager
+from logic.fornecedores import FornecedoresManager
+from logic.relatorios import RelatoriosManager
+from ui.screens.projetos import ProjetosScreen
+from ui.screens.despesas import DespesasScreen
+from ui.screens.boletins import BoletinsScreen
+from ui.screens.clientes import ClientesScreen
+from ui.screens.fornecedores import FornecedoresScreen
+from tests.apoio import engine_configurado, contar_queries
+
+engine = engine_configurado()
+Session = sessionmaker(bind=engine)
+session = Session()
+
+query_count = contar_queries(engine)
+
+
+def renderizar(screen_class, items, limite=None):
+    """Converte items em linhas da tabela como o ecrã faz (sem criar widgets)"""
+    screen = screen_class.__new__(screen_class)
+    return [screen.item_to_dict(item) for item in items[:limite]]
+
+
+def contar(funcao):
+    """Executa funcao() com a sessão limpa e devolve o número de queries"""
+    session.expunge_all()
+    query_count[0] = 0
+    funcao()
+    return query_count[0]
+
+
+print("=" * 80)
+print("🧪 TESTE DE PERFIS DE CARREGAMENTO")
+print("=" * 80)
+
+casos = [
+    ("Projetos", ProjetosScreen, ProjetosManager(session).listar_todos),
+    ("Despesas", DespesasScreen, DespesasManager(session).listar_todas),
+    ("Boletins", BoletinsScreen, BoletinsManager(session).listar_todos),
+    ("Clientes", ClientesScreen, lambda: ClientesManager(session).listar_todos(perfil='lista')),
+    ("Fornecedores", FornecedoresScreen, lambda: FornecedoresManager(session).listar_todos(perfil='lista')),
+]
+
+erros = 0
+for nome, screen_class, listar in casos:
+    total = len(listar())
+    poucas = contar(lambda: renderizar(screen_class, listar(), limite=1))
+    todas = contar(lambda: renderizar(screen_class, listar()))
+    ok = poucas == todas
+    erros += 0 if ok else 1
+    print(f"{'✅' if ok else '❌'} {nome:<13} {total:>5} linhas: {poucas} queries (1 linha) / {todas} queries (todas)")
+
+print()
+print("Consultas paginadas (consulta_lista):")
+consultas = [
+    ("Projetos", ProjetosScreen, ProjetosManager(session).consulta_lista),
+    ("Despesas", DespesasScreen, DespesasManager(session).consulta_lista),
+    ("Boletins", BoletinsScreen, BoletinsManager(session).consulta_lista),
+]
+for nome, screen_class, consulta in consultas:
+    poucas = contar(lambda: renderizar(screen_class, consulta().pagina(1)))
+    todas = contar(lambda: renderizar(screen_class, consulta().pagina(200)))
+    ids = contar(lambda: consulta().pesquisar("a").ids_correspondentes([1, 2, 3]))
+    ok = poucas == todas
+    erros += 0 if ok else 1
+    print(f"{'✅' if ok else '❌'} {nome:<13} página de 1: {poucas} queries / página de 200: {todas} queries "
+          f"(ids_correspondentes: {ids})")
+
+print()
+print("Relatórios (perfil 'relatorio'):")
+relatorios = RelatoriosManager(session)
+n = contar(lambda: relatorios.gerar_relatorio_despesas())
+print(f"   gerar_relatorio_despesas: {n} queries")
+
+print()
+print("=" * 80)
+print("✅ SEM N+1" if erros == 0 else f"❌ {erros} LISTAGEM(ENS) COM N+1")
+print("=" * 80)
+
+session.close()
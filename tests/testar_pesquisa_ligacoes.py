@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da pesquisa sem acentos (normalizar()) em várias ligações do pool
+
+Numa base de dados temporária:
+- uma pesquisa feita numa sessão e paginada depois de um commit funciona
+- uma sessão noutra thread (ligação diferente do mesmo engine, como o
+  worker dos relatórios) também tem normalizar()
+- a pesquisa ignora acentos e maiúsculas
+"""
+import os
+import tempfile
+import threading
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, TipoProjeto
+from logic.projetos import ProjetosManager
+from logic.consulta_lista import registar_funcoes_sql
+
+pasta = tempfile.TemporaryDirectory()
+engine = create_engine(f"sqlite:///{os.path.join(pasta.name, 'pesquisa.db')}")
+Base.metadata.create_all(engine)
+Session = sessionmaker(bind=engine)
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DA PESQUISA EM VÁRIAS LIGAÇÕES")
+print("=" * 80)
+
+session = Session()
+manager = ProjetosManager(session)
+for descricao in ("Vídeo institucional", "VIDEO evento", "Fotografia", "Animação vídeo"):
+    manager.criar(TipoProjeto.EMPRESA, None, descricao, Decimal('100.00'))
+
+# 1. Pesquisa, commit e página seguinte (pode ser outra ligação do pool)
+consulta = manager.consulta_lista().pesquisar("video")
+primeira = consulta.pagina(2, offset=0)
+session.commit()
+segunda = consulta.pagina(2, offset=2)
+print(f"Pesquisa 'video': {len(primeira)} + {len(segunda)} projetos")
+if len(primeira) + len(segunda) != 3:
+    erros.append(f"pesquisa sem acentos devolveu {len(primeira) + len(segunda)} projetos (esperado 3)")
+
+# 2. Outra thread, com a ligação da primeira sessão ainda em uso
+session.connection()
+resultado = {}
+
+
+def pesquisar_noutra_thread():
+    outra = Session()
+    try:
+        resultado['total'] = ProjetosManager(outra).consulta_lista().pesquisar("animacao").total()
+    except Exception as e:
+        resultado['erro'] = str(e)
+    finally:
+        outra.close()
+
+
+thread = threading.Thread(target=pesquisar_noutra_thread)
+thread.start()
+thread.join()
+print(f"Pesquisa noutra thread: {resultado}")
+if resultado.get('total') != 1:
+    erros.append(f"pesquisa noutra ligação: {resultado}")
+
+if not registar_funcoes_sql(engine):
+    erros.append("registar_funcoes_sql não reconheceu o SQLite")
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ PESQUISA EM VÁRIAS LIGAÇÕES OK")
+print("=" * 80)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste de regressão dos planos de queries (EXPLAIN QUERY PLAN, SQLite)
+
+Executa os cálculos do SaldosCalculator e os relatórios do RelatoriosManager
+numa cópia da base de dados com a migration 030 aplicada, regista todas as
+queries SELECT e falha se um caso terminar com erro ou se alguma query fizer
+um full table scan (SCAN <tabela> sem índice). SCAN de subqueries (anon_1,
+...) e de índices "covering" são aceites.
+
+Os relatórios são gerados com filtros (período, estado, tipo, sócio): uma
+listagem sem filtros percorre necessariamente a tabela toda.
+"""
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from logic.saldos import SaldosCalculator
+from logic.relatorios import RelatoriosManager
+from database.models import (
+    Socio, TipoProjeto, EstadoProjeto, TipoDespesa, EstadoDespesa, EstadoBoletim
+)
+
+BASE_DADOS = "agora_media.db"
+
+
+def aplicar_migration_030(engine):
+    caminho = os.path.join(os.path.dirname(__file__), '..', 'database', 'migrations', '030_indices_compostos_saldos.py')
+    spec = importlib.util.spec_from_file_location("migration_030", caminho)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    migration.upgrade(engine)
+
+
+# Queries SELECT executadas
+capturadas = []
+session = None
+tabelas = set()
+
+
+def capturar_query(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        capturadas.append((statement, parameters))
+
+
+def full_scans(statement, parameters):
+    """Linhas do plano que percorrem uma tabela sem índice"""
+    plano = session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    scans = []
+    for linha in plano:
+        detalhe = linha[-1]
+        partes = detalhe.split()
+        if partes[0] == "SCAN" and partes[1] in tabelas and "INDEX" not in detalhe:
+            scans.append(detalhe)
+    return scans
+
+
+if __name__ == "__main__":
+    pasta = tempfile.mkdtemp()
+    copia = os.path.join(pasta, "planos.db")
+    shutil.copy(BASE_DADOS, copia)
+
+    engine = create_engine(f"sqlite:///{copia}")
+    aplicar_migration_030(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    tabelas = {
+        linha[0] for linha in session.connection().exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+
+    event.listen(engine, "before_cursor_execute", capturar_query)
+
+    calculator = SaldosCalculator(session, usar_ledger=False)
+    relatorios = RelatoriosManager(session)
+    inicio, fim = date(2025, 1, 1), date(2025, 12, 31)
+
+    casos = [
+        ("SaldosCalculator.calcular_saldo_bruno", lambda: calculator.calcular_saldo_bruno()),
+        ("SaldosCalculator.calcular_saldo_rafael (período)", lambda: calculator.calcular_saldo_rafael(data_inicio=inicio, data_fim=fim)),
+        ("SaldosCalculator.calcular_saldos_socios", lambda: calculator.calcular_saldos_socios()),
+        ("SaldosCalculator.calcular_saldos_socios (período)", lambda: calculator.calcular_saldos_socios(data_inicio=inicio, data_fim=fim)),
+        ("SaldosCalculator.obter_historico_mensal", lambda: calculator.obter_historico_mensal(Socio.BA, 2025)),
+        ("SaldosCalculator.obter_historico_saldos", lambda: calculator.obter_historico_saldos(Socio.RR, inicio, fim, 'mes')),
+        ("SaldosCalculator.obter_breakdown_detalhado", lambda: calculator.obter_breakdown_detalhado(Socio.BA)),
+        ("RelatoriosManager.gerar_relatorio_saldos", lambda: relatorios.gerar_relatorio_saldos(data_inicio=inicio, data_fim=fim)),
+        ("RelatoriosManager.gerar_relatorio_financeiro_mensal", lambda: relatorios.gerar_relatorio_financeiro_mensal(inicio, fim)),
+        ("RelatoriosManager.gerar_relatorio_projetos", lambda: relatorios.gerar_relatorio_projetos(
+            tipo=TipoProjeto.PESSOAL, estado=EstadoProjeto.PAGO, data_inicio=inicio, data_fim=fim)),
+        ("RelatoriosManager.gerar_relatorio_despesas", lambda: relatorios.gerar_relatorio_despesas(
+            tipo=TipoDespesa.FIXA_MENSAL, estado=EstadoDespesa.PAGO, data_inicio=inicio, data_fim=fim)),
+        ("RelatoriosManager.gerar_relatorio_boletins", lambda: relatorios.gerar_relatorio_boletins(
+            socio=Socio.BA, estado=EstadoBoletim.PAGO, data_inicio=inicio, data_fim=fim)),
+    ]
+
+    print("=" * 80)
+    print("🧪 TESTE DE PLANOS DE QUERIES (EXPLAIN QUERY PLAN)")
+    print("=" * 80)
+
+    falhas = 0
+    for nome, funcao in casos:
+        capturadas.clear()
+        erro = None
+        try:
+            funcao()
+        except Exception as e:
+            # Os planos das queries executadas até ao erro continuam a ser verificados
+            erro = e
+
+        problemas = []
+        for statement, parameters in dict.fromkeys((s, tuple(p) if isinstance(p, list) else p) for s, p in capturadas):
+            scans = full_scans(statement, parameters)
+            if scans:
+                problemas.append((scans, statement))
+
+        if problemas or erro:
+            falhas += 1
+            print(f"❌ {nome}: {len(capturadas)} queries, {len(problemas)} com full scan")
+            if erro:
+                print(f"     terminou com erro: {erro!r}")
+            for scans, statement in problemas:
+                print(f"     {', '.join(scans)}: {' '.join(statement.split())[:200]}...")
+        else:
+            print(f"✅ {nome}: {len(capturadas)} queries")
+
+    session.close()
+    engine.dispose()
+    shutil.rmtree(pasta, ignore_errors=True)
+
+    print()
+    print("=" * 80)
+    print("✅ NENHUM FULL TABLE SCAN" if falhas == 0 else f"❌ {falhas} CASO(S) COM FULL TABLE SCAN OU ERRO")
+    print("=" * 80)
+
+    sys.exit(1 if falhas else 0)
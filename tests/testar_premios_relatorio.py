@@ -59,7 +59,7 @@ print(f"  Prémio RR: {proj['premio_rafael_fmt']}")
 # Test 3: Pessoais BA - NÃO deve mostrar prémios
 print("\n\n[TESTE 3] Filtro: PESSOAIS BRUNO (deve mostrar prémios: False)")
 print("-" * 80)
-relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL_BRUNO)
+relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL, owner='BA')
 print(f"mostrar_premios: {relatorio['mostrar_premios']}")
 print(f"Total de projetos: {relatorio['total_projetos']}")
 print(f"Valor Total: {relatorio['total_valor_fmt']}")
@@ -72,7 +72,7 @@ print(f"  (Prémios não devem aparecer na UI)")
 # Test 4: Pessoais RR - NÃO deve mostrar prémios
 print("\n\n[TESTE 4] Filtro: PESSOAIS RAFAEL (deve mostrar prémios: False)")
 print("-" * 80)
-relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL_RAFAEL)
+relatorio = manager.gerar_relatorio_projetos(tipo=TipoProjeto.PESSOAL, owner='RR')
 print(f"mostrar_premios: {relatorio['mostrar_premios']}")
 print(f"Total de projetos: {relatorio['total_projetos']}")
 print(f"Valor Total: {relatorio['total_valor_fmt']}")
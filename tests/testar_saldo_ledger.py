@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da sincronização do ledger de saldos (saldo_movimentos)
+
+Numa base de dados temporária, cria, altera, muda de estado e apaga
+projetos, despesas e boletins através dos managers, e duplica boletins em
+bulk e importa boletins como o import do Excel. Depois de cada passo, os saldos calculados com usar_ledger=True e
+usar_ledger=False têm de ser exatamente iguais (sem tolerância):
+- _calcular_saldo() de cada sócio, com e sem filtros de datas
+- calcular_saldos_socios()
+- obter_historico_saldos() em cada granularidade
+- verificar_consistencia() sem diferenças
+
+Os boletins importados têm valores com mais de 2 casas decimais (ex: 0.25 x
+72.65 = 18.1625, como na base de dados real), o caso em que os dois caminhos
+divergiam.
+"""
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from database.models import (
+    Base, Boletim, Socio, EstadoBoletim, TipoProjeto, EstadoProjeto, TipoDespesa, EstadoDespesa, TipoDeslocacao
+)
+from logic.saldos import SaldosCalculator
+from logic.saldo_movimentos import SaldoMovimentosManager, ORIGEM_BOLETIM
+from logic.projetos import ProjetosManager
+from logic.despesas import DespesasManager
+from logic.boletins import BoletinsManager
+from logic.boletim_linhas import BoletimLinhasManager
+
+pasta = tempfile.TemporaryDirectory()
+engine = create_engine(f"sqlite:///{os.path.join(pasta.name, 'ledger.db')}")
+Base.metadata.create_all(engine)
+session = sessionmaker(bind=engine)()
+
+projetos = ProjetosManager(session)
+despesas = DespesasManager(session)
+boletins = BoletinsManager(session)
+linhas = BoletimLinhasManager(session)
+
+CENARIOS = [
+    {},
+    {'incluir_investimento': True},
+    {'data_inicio': date(2025, 3, 1), 'data_fim': date(2025, 9, 30)},
+]
+
+erros = []
+
+
+def comparar(etapa):
+    """Compara os dois caminhos de cálculo; regista as diferenças"""
+    tabelas = SaldosCalculator(session, usar_ledger=False)
+    ledger = SaldosCalculator(session, usar_ledger=True)
+    diferencas = []
+
+    for kwargs in CENARIOS:
+        for socio in (Socio.BA, Socio.RR):
+            esperado = tabelas._calcular_saldo(socio, **kwargs)
+            obtido = ledger._calcular_saldo(socio, **kwargs)
+            if esperado != obtido:
+                diferencas.append(f"_calcular_saldo({socio.value}, {kwargs}): {esperado} != {obtido}")
+        if tabelas.calcular_saldos_socios(**kwargs) != ledger.calcular_saldos_socios(**kwargs):
+            diferencas.append(f"calcular_saldos_socios({kwargs})")
+
+    for granularidade in SaldosCalculator.GRANULARIDADES:
+        for socio in (Socio.BA, Socio.RR):
+            args = (socio, date(2025, 1, 15), date(2026, 2, 10), granularidade)
+            if tabelas.obter_historico_saldos(*args) != ledger.obter_historico_saldos(*args):
+                diferencas.append(f"obter_historico_saldos({socio.value}, {granularidade})")
+
+    consistencia = SaldoMovimentosManager(session).verificar_consistencia()
+    if consistencia:
+        diferencas.append(f"verificar_consistencia: {consistencia}")
+
+    saldo = tabelas._calcular_saldo(Socio.BA)['saldo_total']
+    if diferencas:
+        erros.extend(f"{etapa}: {d}" for d in diferencas)
+        print(f"❌ {etapa}: {len(diferencas)} diferença(s)")
+    else:
+        print(f"✅ {etapa}: saldo BA €{saldo:,.3f} (idêntico nos dois caminhos)")
+
+
+def verificar(resultado):
+    """Falha o teste se uma operação de um manager falhar"""
+    if not resultado[0]:
+        raise RuntimeError(resultado[-1])
+    return resultado[1] if len(resultado) == 3 else None
+
+
+def criar_boletim(socio, mes, dias_nacionais, dias_estrangeiro):
+    """Boletim com linhas, criado pelos managers"""
+    boletim = verificar(boletins.criar(
+        socio, mes, 2025, date(2025, mes, 28), Decimal('72.65'), Decimal('167.07'), Decimal('0.40')
+    ))
+    for dias in dias_nacionais:
+        verificar(linhas.criar(boletim.id, "Serviço", TipoDeslocacao.NACIONAL, dias=Decimal(dias)))
+    for dias in dias_estrangeiro:
+        verificar(linhas.criar(boletim.id, "Serviço", TipoDeslocacao.ESTRANGEIRO, dias=Decimal(dias), kms=37))
+    linhas.recalcular_totais_boletim(boletim.id)
+    return boletim
+
+
+print("=" * 80)
+print("🧪 TESTE DA SINCRONIZAÇÃO DO LEDGER DE SALDOS")
+print("=" * 80)
+
+# 1. Criar
+pessoal = verificar(projetos.criar(
+    TipoProjeto.PESSOAL, None, "Projeto pessoal", Decimal('1500.00'), owner='BA',
+    data_faturacao=date(2025, 2, 10), estado=EstadoProjeto.PAGO
+))
+empresa = verificar(projetos.criar(
+    TipoProjeto.EMPRESA, None, "Projeto empresa", Decimal('5000.00'),
+    data_faturacao=date(2025, 4, 5), estado=EstadoProjeto.FINALIZADO,
+    premio_bruno=Decimal('333.33'), premio_rafael=Decimal('166.67')
+))
+fixa = verificar(despesas.criar(
+    TipoDespesa.FIXA_MENSAL, date(2025, 3, 1), "Renda", Decimal('100.01'), Decimal('123.01'),
+    estado=EstadoDespesa.PAGO, data_pagamento=date(2025, 3, 1)
+))
+pessoal_rr = verificar(despesas.criar(
+    TipoDespesa.PESSOAL_RR, date(2025, 5, 20), "Despesa pessoal", Decimal('45.55'), Decimal('56.03')
+))
+boletim_ba = criar_boletim(Socio.BA, 1, ['0.25'], [])
+boletim_rr = criar_boletim(Socio.RR, 6, ['1.5', '0.25'], ['0.5'])
+verificar(boletins.marcar_como_pago(boletim_ba.id, date(2025, 2, 1)) + (None,))
+comparar("Criar")
+
+# 2. Alterar
+verificar(projetos.atualizar(pessoal.id, valor_sem_iva=Decimal('1750.50')))
+verificar(despesas.atualizar(fixa.id, valor_sem_iva=Decimal('99.99')))
+linha = linhas.listar_por_boletim(boletim_rr.id)[0]
+verificar(linhas.atualizar(linha.id, "Serviço", TipoDeslocacao.NACIONAL, Decimal('0.25'), 0))
+linhas.recalcular_totais_boletim(boletim_rr.id)
+comparar("Alterar")
+
+# 3. Mudar de estado
+verificar(projetos.mudar_estado(empresa.id, EstadoProjeto.PAGO, date(2025, 4, 30)) + (None,))
+verificar(despesas.mudar_estado(pessoal_rr.id, EstadoDespesa.PAGO, date(2025, 5, 31)) + (None,))
+verificar(boletins.marcar_como_pago(boletim_rr.id, date(2025, 7, 1)) + (None,))
+verificar(boletins.marcar_como_pendente(boletim_ba.id) + (None,))
+comparar("Mudar estado")
+
+# 4. Duplicar em bulk
+novos_ids = verificar(boletins.duplicar_boletins(
+    [boletim_ba.id, boletim_rr.id] * 6, [(2025, mes) for mes in range(7, 13)] * 2
+))
+for boletim_id in novos_ids:
+    verificar(boletins.marcar_como_pago(boletim_id, date(2026, 1, 5)) + (None,))
+comparar("Duplicar boletins")
+
+# 5. Importar (INSERT em bulk de valores do Excel + sincronizar_lote, como o import)
+valores = ['18.1625', '108.975', '345.0875', '399.575', '90.8125', '127.1375', '108.975', '18.1625']
+importados = session.execute(insert(Boletim).returning(Boletim.id), [
+    {
+        'numero': f"#B9{i:03d}", 'socio': (Socio.BA, Socio.RR)[i % 2], 'data_emissao': date(2025, 3 + i, 15),
+        'valor': Decimal(valor), 'valor_total': Decimal(valor),
+        'estado': EstadoBoletim.PAGO if i < 6 else EstadoBoletim.PENDENTE,
+    }
+    for i, valor in enumerate(valores)
+]).scalars().all()
+SaldoMovimentosManager(session).sincronizar_lote(ORIGEM_BOLETIM, importados)
+session.commit()
+comparar("Importar boletins")
+
+verificar(boletins.marcar_como_pago(importados[6], date(2025, 10, 1)) + (None,))
+verificar(boletins.marcar_como_pendente(importados[0]) + (None,))
+comparar("Mudar estado de importados")
+
+# 6. Apagar
+verificar(projetos.apagar(pessoal.id) + (None,))
+verificar(despesas.apagar(fixa.id) + (None,))
+verificar(boletins.apagar(boletim_rr.id) + (None,))
+comparar("Apagar")
+
+# 7. Reconstruir o ledger não muda nada
+sucesso, relatorio, erro = SaldoMovimentosManager(session).rebuild_ledger()
+if not sucesso or relatorio['diferencas']:
+    erros.append(f"rebuild_ledger: {erro or relatorio['diferencas']}")
+comparar("Rebuild")
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ LEDGER DE SALDOS OK")
+print("=" * 80)
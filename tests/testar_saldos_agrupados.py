@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste do cálculo agrupado de saldos (calcular_saldos_socios)
+
+Verifica que o modo agrupado devolve exatamente o mesmo resultado que
+calcular_saldo_bruno() / calcular_saldo_rafael() e conta as queries.
+"""
+from datetime import date
+from sqlalchemy.orm import sessionmaker
+
+from logic.saldos import SaldosCalculator
+from database.models import Socio
+from tests.apoio import engine_configurado, contar_queries
+
+engine = engine_configurado()
+Session = sessionmaker(bind=engine)
+session = Session()
+
+query_count = contar_queries(engine)
+
+calculator = SaldosCalculator(session)
+
+print("=" * 80)
+print("🧪 TESTE DE CÁLCULO AGRUPADO DE SALDOS")
+print("=" * 80)
+
+cenarios = [
+    ("Sem filtros", {}),
+    ("Com investimento inicial", {'incluir_investimento': True}),
+    ("Período 2024-01-01 a 2025-06-30", {'data_inicio': date(2024, 1, 1), 'data_fim': date(2025, 6, 30)}),
+]
+
+falhas = 0
+for nome, kwargs in cenarios:
+    print(f"\n[{nome}]")
+    print("-" * 80)
+
+    query_count[0] = 0
+    saldo_bruno = calculator.calcular_saldo_bruno(**kwargs)
+    saldo_rafael = calculator.calcular_saldo_rafael(**kwargs)
+    queries_individual = query_count[0]
+
+    query_count[0] = 0
+    saldos = calculator.calcular_saldos_socios(**kwargs)
+    queries_agrupado = query_count[0]
+
+    print(f"  Queries individual: {queries_individual}")
+    print(f"  Queries agrupado:   {queries_agrupado}")
+
+    for socio, esperado in ((Socio.BA, saldo_bruno), (Socio.RR, saldo_rafael)):
+        if saldos[socio] == esperado:
+            print(f"  ✅ {socio.value}: saldo €{esperado['saldo_total']:,.2f} (idêntico)")
+        else:
+            falhas += 1
+            print(f"  ❌ {socio.value}: resultados diferentes")
+            print(f"     individual: {esperado}")
+            print(f"     agrupado:   {saldos[socio]}")
+
+session.close()
+
+print("\n" + "=" * 80)
+if falhas:
+    print(f"❌ {falhas} DIFERENÇA(S) ENCONTRADA(S)")
+else:
+    print("✅ TESTE COMPLETO")
+print("=" * 80)
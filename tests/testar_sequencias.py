@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da tabela de sequências (logic/sequencias.py)
+
+Numa cópia da base de dados: números calculados sem a migration 031,
+inicialização dos contadores, reserva com uma única query, rollback,
+blocos, inicialização automática de uma sequência em falta, códigos de
+orçamento manuais e reservas concorrentes (várias sessões em threads).
+"""
+import importlib.util
+import os
+import threading
+from datetime import date
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from logic.sequencias import SequenciasManager, SEQUENCIAS
+from logic.boletins import BoletinsManager
+from logic.orcamentos import OrcamentoManager
+from tests.apoio import copia_base_dados, contar_queries
+
+NUM_THREADS = 8
+RESERVAS_POR_THREAD = 25
+
+
+def aplicar_migration_031(engine):
+    caminho = os.path.join(os.path.dirname(__file__), '..', 'database', 'migrations', '031_create_sequencias.py')
+    spec = importlib.util.spec_from_file_location("migration_031", caminho)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    migration.upgrade(engine)
+
+
+pasta, copia = copia_base_dados("sequencias.db")
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DE SEQUÊNCIAS")
+print("=" * 80)
+
+# 1. Sem a migration: maior número existente + 1 (nada é gravado)
+engine_antigo = create_engine(f"sqlite:///{copia}")
+session = sessionmaker(bind=engine_antigo)()
+sem_tabela = {nome: SequenciasManager(session).espreitar(nome) for nome in SEQUENCIAS}
+print(f"Sem migration: {sem_tabela}")
+session.close()
+engine_antigo.dispose()
+
+# 2. Migration + inicialização
+engine = create_engine(f"sqlite:///{copia}")
+aplicar_migration_031(engine)
+Session = sessionmaker(bind=engine)
+session = Session()
+valores = SequenciasManager(session).sincronizar()
+session.commit()
+
+for nome, valor in valores.items():
+    if SequenciasManager.formatar(nome, valor + 1) != sem_tabela[nome]:
+        erros.append(f"{nome}: inicializada em {valor}, esperado {sem_tabela[nome]}")
+
+query_count = contar_queries(engine)
+
+# 3. Reserva numa query (UPDATE ... RETURNING)
+manager = SequenciasManager(session)
+query_count[0] = 0
+numero = BoletinsManager(session).gerar_proximo_numero()
+print(f"Boletim: {numero} ({query_count[0]} queries)")
+if numero != sem_tabela['boletins']:
+    erros.append(f"boletim {numero}, esperado {sem_tabela['boletins']}")
+if query_count[0] > 2:  # BEGIN implícito não conta; UPDATE RETURNING (+ SELECT sem RETURNING)
+    erros.append(f"reserva com {query_count[0]} queries")
+
+# 4. Rollback liberta o número
+session.rollback()
+if BoletinsManager(session).gerar_proximo_numero() != numero:
+    erros.append("rollback não libertou o número reservado")
+session.commit()
+
+# 5. Blocos consecutivos
+bloco = manager.reservar_bloco('despesas', 100)
+seguinte = manager.proximo('despesas')
+session.commit()
+valores_bloco = [SequenciasManager.extrair('despesas', n) for n in bloco + [seguinte]]
+print(f"Bloco de despesas: {bloco[0]} .. {bloco[-1]}, seguinte {seguinte}")
+if valores_bloco != list(range(valores_bloco[0], valores_bloco[0] + 101)):
+    erros.append("bloco de despesas não é consecutivo")
+
+# 6. Sequência em falta é inicializada automaticamente
+session.execute(text("DELETE FROM sequencias WHERE nome = 'clientes'"))
+session.commit()
+cliente = manager.proximo('clientes')
+session.commit()
+print(f"Cliente (sequência recriada): {cliente}")
+if cliente != sem_tabela['clientes']:
+    erros.append(f"cliente {cliente}, esperado {sem_tabela['clientes']}")
+
+# 7. Código de orçamento manual avança a sequência
+orcamentos = OrcamentoManager(session)
+sucesso, orcamento, erro = orcamentos.criar_orcamento(codigo="OR-00500", data_criacao=date.today(), owner='BA')
+sugestao = orcamentos.gerar_proximo_codigo()
+print(f"Orçamento OR-00500 criado ({sucesso}), próxima sugestão: {sugestao}")
+if not sucesso or sugestao != "OR-00501":
+    erros.append(f"sugestão de código {sugestao} após OR-00500 ({erro})")
+
+session.close()
+
+# 8. Reservas concorrentes (uma sessão por thread)
+reservados = []
+falhas = []
+trinco = threading.Lock()
+
+
+def reservar_varios():
+    sessao = Session()
+    try:
+        for _ in range(RESERVAS_POR_THREAD):
+            numero = SequenciasManager(sessao).proximo('projetos')
+            sessao.commit()
+            with trinco:
+                reservados.append(numero)
+    except Exception as e:
+        falhas.append(repr(e))
+    finally:
+        sessao.close()
+
+
+threads = [threading.Thread(target=reservar_varios) for _ in range(NUM_THREADS)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+print(f"Concorrência: {len(reservados)} números em {NUM_THREADS} threads, {len(set(reservados))} distintos")
+if falhas:
+    erros.append(f"erros nas threads: {falhas[0]}")
+if len(set(reservados)) != len(reservados) or len(reservados) != NUM_THREADS * RESERVAS_POR_THREAD:
+    erros.append("números duplicados ou em falta nas reservas concorrentes")
+
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ SEQUÊNCIAS OK")
+print("=" * 80)
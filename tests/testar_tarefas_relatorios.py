@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da execução de relatórios em segundo plano (logic/tarefas_relatorios.py)
+
+- o preview gerado na thread de trabalho é igual ao gerado diretamente
+- várias exportações ficam em fila e correm pela ordem de submissão,
+  cada uma com a sua sessão, e os callbacks correm na thread principal
+- tarefas em fila canceladas não correm; a tarefa a correr pára no
+  próximo ponto de verificação e o ficheiro incompleto é apagado
+"""
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from logic.relatorios import RelatoriosManager
+from logic.tarefas_relatorios import (
+    ExecutorRelatorios, TarefaRelatorio, TarefaCancelada, gerar_relatorio, exportar_relatorio
+)
+
+engine = create_engine(os.getenv("DATABASE_URL", "sqlite:///./agora_media.db"))
+Session = sessionmaker(bind=engine)
+sessoes = []
+
+
+def fabrica_sessao():
+    sessao = Session()
+    sessoes.append(sessao)
+    return sessao
+
+
+def esperar(executor, limite=120):
+    """Consulta o executor como a UI faz com after() até não haver tarefas"""
+    inicio = time.perf_counter()
+    while executor.processar_eventos():
+        if time.perf_counter() - inicio > limite:
+            raise TimeoutError("tarefas não terminaram")
+        time.sleep(0.05)
+
+
+erros = []
+principal = threading.current_thread()
+
+print("=" * 80)
+print("🧪 TESTE DE RELATÓRIOS EM SEGUNDO PLANO")
+print("=" * 80)
+
+# 1. Preview em segundo plano == geração direta
+executor = ExecutorRelatorios(fabrica_sessao)
+resultados = []
+executor.submeter("Preview", gerar_relatorio, 'gerar_relatorio_projetos', {},
+                  ao_concluir=resultados.append)
+esperar(executor)
+direto = RelatoriosManager(Session()).gerar_relatorio_projetos()
+if not resultados:
+    erros.append("preview não concluído")
+else:
+    preview = dict(resultados[0])
+    for dados in (preview, direto):
+        dados.pop('data_geracao')
+    if preview != direto:
+        erros.append("preview em segundo plano diferente da geração direta")
+    print(f"Preview: {preview['total_projetos']} projetos")
+
+with tempfile.TemporaryDirectory() as pasta:
+    # 2. Exportações em fila, pela ordem de submissão
+    pedidos = [
+        ('gerar_relatorio_despesas', {}, 'pdf', os.path.join(pasta, "despesas.pdf")),
+        ('gerar_relatorio_projetos', {}, 'excel', os.path.join(pasta, "projetos.xlsx")),
+        ('gerar_relatorio_saldos', {}, 'excel', os.path.join(pasta, "saldos.xlsx")),
+    ]
+    concluidas = []
+    threads_callbacks = set()
+    progressos = []
+    sessoes.clear()
+
+    def ao_concluir(filename):
+        threads_callbacks.add(threading.current_thread())
+        concluidas.append(os.path.basename(filename))
+
+    def ao_progresso(tarefa):
+        threads_callbacks.add(threading.current_thread())
+        progressos.append((tarefa.descricao, tarefa.progresso))
+
+    tarefas = [
+        executor.submeter(os.path.basename(f), exportar_relatorio, nome, args, formato, f,
+                          ao_concluir=ao_concluir, ao_progresso=ao_progresso,
+                          ao_erro=lambda e: erros.append(f"exportação falhou: {e}"))
+        for nome, args, formato, f in pedidos
+    ]
+    if len(executor.tarefas) != 3:
+        erros.append(f"{len(executor.tarefas)} tarefas em fila (esperadas 3)")
+    esperar(executor)
+
+    esperadas = [os.path.basename(f) for *_, f in pedidos]
+    print(f"Exportações: {concluidas}")
+    if concluidas != esperadas:
+        erros.append(f"ordem das exportações: {concluidas}")
+    if any(not os.path.exists(f) for *_, f in pedidos):
+        erros.append("ficheiro exportado em falta")
+    if threads_callbacks != {principal}:
+        erros.append("callbacks fora da thread principal")
+    if not any(descricao == "despesas.pdf" and 0 < progresso < 1 for descricao, progresso in progressos):
+        erros.append("sem progresso intermédio na exportação de despesas")
+    if len(sessoes) != 3 or any(s.in_transaction() for s in sessoes):
+        erros.append(f"sessões por tarefa: {len(sessoes)} (esperadas 3, todas fechadas)")
+    if any(t.estado != TarefaRelatorio.CONCLUIDA for t in tarefas):
+        erros.append("tarefas não concluídas")
+
+    # 3. Cancelar: a tarefa a correr pára e as que estão em fila não correm
+    a_correr = threading.Event()
+
+    def bloquear(manager, tarefa):
+        a_correr.set()
+        while True:
+            tarefa.reportar(0)  # ponto de verificação do cancelamento
+            time.sleep(0.01)
+
+    executadas = []
+    bloqueada = executor.submeter("Bloqueada", bloquear)
+    em_fila = [executor.submeter(f"Em fila {i}", lambda manager, tarefa, i=i: executadas.append(i))
+               for i in range(3)]
+    a_correr.wait(10)
+    em_fila[1].cancelar()
+    bloqueada.cancelar()
+    esperar(executor)
+    estados = [bloqueada.estado] + [t.estado for t in em_fila]
+    print(f"Cancelamento: {estados}")
+    if bloqueada.estado != TarefaRelatorio.CANCELADA:
+        erros.append("tarefa a correr não foi cancelada")
+    if executadas != [0, 2] or em_fila[1].estado != TarefaRelatorio.CANCELADA:
+        erros.append(f"tarefas em fila executadas: {executadas}")
+
+    # 4. Exportação cancelada a meio: ficheiro incompleto apagado
+    filename = os.path.join(pasta, "cancelada.pdf")
+    tarefa = TarefaRelatorio(0, "Cancelada", exportar_relatorio, (), {})
+    acompanhar = tarefa.acompanhar
+
+    def acompanhar_e_cancelar(itens, total, mensagem="Linhas", passo=100):
+        for indice, item in enumerate(acompanhar(itens, total, mensagem, passo=1)):
+            if indice == 50:
+                tarefa.cancelar()
+            yield item
+
+    tarefa.acompanhar = acompanhar_e_cancelar
+    try:
+        exportar_relatorio(RelatoriosManager(Session()), tarefa, 'gerar_relatorio_despesas', {}, 'pdf', filename)
+        erros.append("exportação cancelada terminou")
+    except TarefaCancelada:
+        pass
+    if os.path.exists(filename):
+        erros.append("ficheiro de exportação cancelada não foi apagado")
+
+executor.fechar()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ RELATÓRIOS EM SEGUNDO PLANO OK")
+print("=" * 80)
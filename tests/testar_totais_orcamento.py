@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste dos totais incrementais de orçamentos (logic/orcamento_totais.py)
+
+Numa base de dados temporária com um orçamento de 200 linhas:
+- adicionar/alterar/eliminar items pelo OrcamentoManager mantém o
+  valor_total por diferenças, com o mesmo número de queries para um
+  orçamento pequeno e para um grande
+- centenas de edições aleatórias no documento em memória mantêm os
+  subtotais por secção/grupo, os totais por beneficiário e os totais
+  CLIENTE/EMPRESA iguais a um cálculo completo (verificar())
+- uma edição custa muito menos do que o cálculo completo
+"""
+import random
+import time
+from decimal import Decimal
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Cliente
+from logic.orcamentos import OrcamentoManager
+from logic.orcamento_documento import DocumentoOrcamento
+from logic.orcamento_totais import TotaisOrcamento
+from tests.apoio import BENEFICIARIOS, base_dados_temporaria, contar_queries, criar_orcamento
+
+N_LINHAS = 200
+
+random.seed(42)
+pasta, engine = base_dados_temporaria("totais.db")
+session = sessionmaker(bind=engine)()
+manager = OrcamentoManager(session)
+query_count = contar_queries(engine)
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DE TOTAIS INCREMENTAIS DE ORÇAMENTOS")
+print("=" * 80)
+
+cliente = Cliente(numero="#C0001", nome="Cliente Teste", nome_formal="Cliente Teste, Lda")
+session.add(cliente)
+session.commit()
+
+pequeno = criar_orcamento(manager, cliente.id, "OR-TESTE-PEQUENO", 10)
+grande = criar_orcamento(manager, cliente.id, "OR-TESTE-GRANDE", N_LINHAS)
+
+# 1. valor_total mantido por diferenças pelo manager
+for orcamento in (pequeno, grande):
+    sucesso, erro = manager.verificar_totais(orcamento.id)
+    if not sucesso:
+        erros.append(f"{orcamento.codigo}: {erro}")
+
+queries = {}
+for orcamento in (pequeno, grande):
+    item = manager.obter_itens(orcamento.id)[1]
+    session.expire_all()
+    query_count[0] = 0
+    manager.atualizar_item_v2(item.id, quantidade=item.quantidade + 2)
+    queries[orcamento.codigo] = query_count[0]
+    sucesso, erro = manager.verificar_totais(orcamento.id)
+    if not sucesso:
+        erros.append(f"{orcamento.codigo} após atualizar: {erro}")
+print(f"atualizar_item_v2: {queries}")
+if queries["OR-TESTE-PEQUENO"] != queries["OR-TESTE-GRANDE"]:
+    erros.append(f"queries de atualizar_item_v2 dependem do número de linhas: {queries}")
+
+item = manager.obter_itens(grande.id)[5]
+manager.eliminar_item(item.id)
+sucesso, erro = manager.verificar_totais(grande.id)
+if not sucesso:
+    erros.append(f"após eliminar item: {erro}")
+
+# 2. Edições aleatórias no documento == cálculo completo
+documento = DocumentoOrcamento(session, grande.id)
+itens = list(documento.itens.values())
+reparticoes = list(documento.reparticoes.values())
+comissoes = [r for r in reparticoes if r.tipo == 'comissao']
+secoes = list(documento.secoes)
+print(f"Documento: {len(itens)} items, {len(reparticoes)} repartições")
+
+N_EDICOES = 1000
+inicio = time.perf_counter()
+for i in range(N_EDICOES):
+    escolha = i % 4
+    if escolha == 0:
+        item = random.choice([x for x in itens if x.tipo in ('servico', 'equipamento')])
+        documento.alterar_item(item.id, quantidade=random.randint(1, 5))
+    elif escolha == 1:
+        documento.ajustar_percentagem(random.choice(comissoes).id, Decimal(random.choice(['0.0001', '-0.0001'])))
+    elif escolha == 2:
+        rep = random.choice(reparticoes)
+        documento.alterar_reparticao(rep.id, beneficiario=random.choice(BENEFICIARIOS))
+    else:
+        item = random.choice(itens)
+        documento.alterar_item(item.id, secao_id=random.choice(secoes))
+    if i % 100 == 0:
+        diferencas = documento.verificar_totais()
+        if diferencas:
+            erros.append(f"edição {i}: {diferencas[:3]}")
+            break
+duracao_edicoes = time.perf_counter() - inicio
+
+diferencas = documento.verificar_totais()
+if diferencas:
+    erros.append(f"após {N_EDICOES} edições: {diferencas[:3]}")
+
+# Edição vs cálculo completo
+inicio = time.perf_counter()
+for _ in range(100):
+    TotaisOrcamento.calcular(documento.itens.values(), documento.reparticoes.values())
+duracao_completo = (time.perf_counter() - inicio) / 100
+por_edicao = duracao_edicoes / N_EDICOES
+print(f"Edição: {por_edicao * 1e6:.0f} µs (com verificações) vs cálculo completo: {duracao_completo * 1e6:.0f} µs")
+
+inicio = time.perf_counter()
+for _ in range(N_EDICOES):
+    documento.ajustar_percentagem(comissoes[0].id, Decimal('0.0001'))
+por_ajuste = (time.perf_counter() - inicio) / N_EDICOES
+print(f"Seta ▲ numa comissão: {por_ajuste * 1e6:.0f} µs")
+if por_ajuste * 5 > duracao_completo:
+    erros.append("ajuste incremental não é mais rápido do que o cálculo completo")
+
+# 3. Gravado == mantido em memória
+sucesso, erro = documento.gravar()
+if not sucesso:
+    erros.append(f"gravar falhou: {erro}")
+if manager.calcular_totais(grande.id).como_dict() != documento.totais.como_dict():
+    erros.append("totais gravados diferentes dos mantidos em memória")
+sucesso, erro = manager.verificar_totais(grande.id)
+if not sucesso:
+    erros.append(f"valor_total após gravar: {erro}")
+
+# Beneficiário sem linhas desaparece dos totais
+totais = TotaisOrcamento.calcular([], reparticoes[:1])
+totais.remover_reparticao(reparticoes[0])
+if totais.totais_beneficiario or totais.subtotais_grupo or totais.total_empresa:
+    erros.append(f"totais vazios após remover a única linha: {totais.como_dict()}")
+
+session.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ TOTAIS INCREMENTAIS OK")
+print("=" * 80)
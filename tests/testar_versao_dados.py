@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Teste da versão dos dados (logic/versao_dados.py) com duas sessões
+
+Numa base de dados temporária:
+- a sessão A altera um projeto e faz flush (sem commit)
+- a sessão B (outra ligação, como o worker dos relatórios) calcula as
+  estatísticas do dashboard entre o flush e o commit: lê os dados antigos
+- depois do commit de A, B tem de recalcular e ver a alteração (a cache não
+  pode ficar com os dados antigos guardados sob a versão nova)
+- o mesmo para o rollback
+"""
+import os
+import tempfile
+from decimal import Decimal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Base, TipoProjeto, EstadoProjeto
+from logic.projetos import ProjetosManager
+from logic.dashboard_stats import DashboardStatsService
+from logic.versao_dados import versao
+
+pasta = tempfile.TemporaryDirectory()
+engine = create_engine(f"sqlite:///{os.path.join(pasta.name, 'versao.db')}")
+Base.metadata.create_all(engine)
+Session = sessionmaker(bind=engine)
+
+erros = []
+
+print("=" * 80)
+print("🧪 TESTE DA VERSÃO DOS DADOS COM DUAS SESSÕES")
+print("=" * 80)
+
+sessao_a = Session()
+sessao_b = Session()
+manager = ProjetosManager(sessao_a)
+projetos = [
+    manager.criar(TipoProjeto.EMPRESA, None, f"Projeto {i}", Decimal('100.00'), estado=EstadoProjeto.ATIVO)[1]
+    for i in range(3)
+]
+
+
+def recebidos():
+    """Projetos recebidos vistos pelo dashboard da sessão B"""
+    sessao_b.commit()  # nova transação de leitura
+    return DashboardStatsService(sessao_b).obter_estatisticas()['projetos']['recebidos']
+
+
+if recebidos() != 0:
+    erros.append("estado inicial inesperado")
+
+# 1. Flush em A, cálculo em B, commit em A
+projetos[0].estado = EstadoProjeto.PAGO
+sessao_a.flush()
+antes = versao('projetos')
+durante = recebidos()
+print(f"Entre o flush e o commit, B vê {durante} recebido(s) (dados ainda não gravados)")
+sessao_a.commit()
+if versao('projetos') == antes:
+    erros.append("commit não alterou a versão de projetos")
+depois = recebidos()
+print(f"Depois do commit, B vê {depois} recebido(s)")
+if depois != 1:
+    erros.append(f"após commit: {depois} recebidos (esperado 1) - cache com dados antigos")
+
+# 2. Flush em A, cálculo em B, rollback em A
+projetos[1].estado = EstadoProjeto.PAGO
+sessao_a.flush()
+recebidos()
+sessao_a.rollback()
+depois = recebidos()
+print(f"Depois do rollback, B vê {depois} recebido(s)")
+if depois != 1:
+    erros.append(f"após rollback: {depois} recebidos (esperado 1)")
+
+sessao_a.close()
+sessao_b.close()
+engine.dispose()
+pasta.cleanup()
+
+print()
+print("=" * 80)
+if erros:
+    for erro in erros:
+        print(f"❌ {erro}")
+else:
+    print("✅ VERSÃO DOS DADOS OK")
+print("=" * 80)
@@ -71,6 +71,26 @@ MÉTODOS PARA OVERRIDE:
 - on_item_double_click(data) - Ação ao duplo clique
 - on_new_item() - Ação do botão "Novo"
 - apply_filters(items) - Aplicar filtros aos dados
+- get_search_text(item, row) - Texto indexado para a pesquisa
+
+Após ações sobre poucos items, update_items(items) / remove_items(ids)
+atualizam só essas linhas (sem load_data nem reconstruir a tabela).
+
+MODO CONSULTA (tabelas grandes):
+--------------------------------
+Se get_query(filters) devolver uma ConsultaLista (logic/consulta_lista.py),
+filtros, pesquisa e ordenação das colunas são feitos na BD (WHERE/ORDER BY)
+e os dados são carregados por páginas de PAGE_SIZE ao fazer scroll. As
+linhas carregadas também entram no índice de pesquisa: se já estão todas
+carregadas e o texto só restringe a pesquisa anterior (ex: "vid" -> "video"),
+a pesquisa filtra-as em memória sem voltar à BD.
+
+PESQUISA E FILTROS:
+-------------------
+load_data() só é chamado quando os dados são invalidados (refresh_data(),
+botão Atualizar, após criar/editar/apagar). A pesquisa (com debounce) e os
+filtros de chips trabalham sobre a lista em memória e um índice de texto
+(minúsculas, sem acentos) construído uma vez por carregamento.
 
 SLOTS DISPONÍVEIS:
 ------------------
@@ -89,6 +109,7 @@ from sqlalchemy.orm import Session
 from abc import abstractmethod
 
 from ui.components.data_table_v2 import DataTableV2
+from utils.texto import normalizar_pesquisa
 from assets.resources import get_icon
 
 
@@ -108,6 +129,12 @@ class BaseScreen(ctk.CTkFrame):
     override métodos opcionais para personalização.
     """
 
+    # Tempo (ms) sem escrever antes de aplicar a pesquisa
+    SEARCH_DEBOUNCE_MS = 250
+
+    # Modo consulta: linhas carregadas por página
+    PAGE_SIZE = 200
+
     def __init__(
         self,
         parent,
@@ -138,6 +165,13 @@ class BaseScreen(ctk.CTkFrame):
         self._filter_chips = {}  # {key: {value: chip_widget}}
         self._search_chip = None  # Chip da pesquisa ativa
         self._action_buttons = {}  # {label: {button, min_selection, max_selection}}
+        self._items = None  # Items de load_data() (None = invalidado, recarregar)
+        self._rows = {}  # {id(item): dict da tabela}
+        self._search_index = {}  # {id(item): texto normalizado}
+        self._search_after_id = None  # Pesquisa pendente (debounce)
+        self._query = None  # ConsultaLista ativa (modo consulta)
+        self._has_more = False  # Modo consulta: há mais páginas por carregar
+        self._query_search = ''  # Modo consulta: pesquisa (normalizada) das linhas carregadas
 
         # Configure frame
         self.configure(fg_color="transparent")
@@ -408,8 +442,8 @@ class BaseScreen(ctk.CTkFrame):
             # Atualizar aparência do filtro
             self._update_filter_appearance(filter_key)
 
-            # Refresh data
-            self.refresh_data()
+            # Filtrar dados em memória
+            self.update_view()
 
     def _update_filter_appearance(self, filter_key: str):
         """Atualiza aparência do filtro baseado em seleções ativas."""
@@ -478,9 +512,8 @@ class BaseScreen(ctk.CTkFrame):
             self._search_chip.destroy()
             self._search_chip = None
 
-            # Clear search and refresh
+            # Clear search (trace aplica a pesquisa vazia)
             self.search_var.set("")
-            self.refresh_data()
 
     def _clear_all_chips(self):
         """Limpa todos os chips de filtros."""
@@ -580,7 +613,10 @@ class BaseScreen(ctk.CTkFrame):
             height=100,  # Mínimo, vai expandir
             on_row_double_click=self._on_row_double_click,
             on_selection_change=self._on_selection_change,
-            on_row_right_click=self._on_row_right_click
+            on_row_right_click=self._on_row_right_click,
+            on_sort_change=self._on_sort_change,
+            on_scroll_end=self._load_next_page,
+            virtualized=self.config.get('virtualized', True)  # Só linhas visíveis têm widgets
         )
         # Expandir tabela para ocupar MÁXIMO espaço disponível
         self.table.pack(fill="both", expand=True, padx=30, pady=0)
@@ -607,7 +643,37 @@ class BaseScreen(ctk.CTkFrame):
                 self._search_chip.destroy()
                 self._search_chip = None
 
-        self.refresh_data()
+        # Debounce: só filtra quando o utilizador pára de escrever
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(self.SEARCH_DEBOUNCE_MS, self._run_pending_search)
+
+    def _run_pending_search(self):
+        """Aplica a pesquisa pendente (chamado pelo debounce)."""
+        self._search_after_id = None
+        if not self._refine_loaded_search():
+            self.update_view()
+
+    def _refine_loaded_search(self) -> bool:
+        """
+        Modo consulta: filtra em memória as linhas já carregadas, se possível.
+
+        Só quando a BD já devolveu todas as linhas da pesquisa anterior e o
+        novo texto a restringe (começa pelo texto anterior): o resultado é
+        então um subconjunto das linhas carregadas.
+
+        Returns:
+            True se a tabela foi atualizada sem aceder à BD
+        """
+        if self._query is None or self._has_more:
+            return False
+        search_text = normalizar_pesquisa(self._search_text())
+        if not search_text.startswith(self._query_search):
+            return False
+
+        items = self.filter_by_search(self._items, search_text)
+        self.table.set_data([self._rows[id(item)] for item in items], reset_sort=False)
+        return True
 
     def _clear_search(self):
         """Limpa o campo de pesquisa."""
@@ -638,8 +704,8 @@ class BaseScreen(ctk.CTkFrame):
         # Atualizar aparência do dropdown
         self._update_filter_appearance(key)
 
-        # Refresh data
-        self.refresh_data()
+        # Filtrar dados em memória
+        self.update_view()
 
     def _on_filter_change(self, key: str, value: str):
         """Handler para mudança em filtro (backward compatibility)."""
@@ -736,9 +802,39 @@ class BaseScreen(ctk.CTkFrame):
     # ========== Public Methods ==========
 
     def refresh_data(self):
-        """Recarrega os dados da tabela aplicando filtros."""
-        # Carregar dados
-        items = self.load_data()
+        """Recarrega os dados da BD e atualiza a tabela aplicando pesquisa e filtros."""
+        self.invalidate_data()
+        self.update_view()
+
+    def invalidate_data(self):
+        """Marca os dados em memória como desatualizados (próxima vista recarrega da BD)."""
+        self._items = None
+        self._rows = {}
+        self._search_index = {}
+
+    def update_view(self):
+        """
+        Atualiza a tabela a partir dos dados em memória (pesquisa + filtros).
+
+        Só acede à BD (load_data) se os dados tiverem sido invalidados.
+        No modo consulta (get_query) recarrega a primeira página da BD.
+        """
+        query = self._build_query()
+        if query is not None:
+            self._query = query
+            self._query_search = normalizar_pesquisa(self._search_text())
+            self._items = []
+            self._rows = {}
+            self._search_index = {}
+            self._has_more = True
+            self._append_page(reset=True)
+            return
+        self._query = None
+
+        if self._items is None:
+            self._load_items()
+
+        items = self._items
 
         # Aplicar pesquisa
         search_text = getattr(self, 'search_var', None)
@@ -751,10 +847,145 @@ class BaseScreen(ctk.CTkFrame):
         filters = self.get_current_filters()
         items = self.apply_filters(items, filters)
 
-        # Converter para dict e atualizar tabela
-        data = [self.item_to_dict(item) for item in items]
+        # Reutilizar dicts já convertidos
+        data = []
+        for item in items:
+            row = self._rows.get(id(item))
+            if row is None:
+                row = self.item_to_dict(item)
+            data.append(row)
         self.table.set_data(data)
 
+    def _search_text(self) -> str:
+        """Texto de pesquisa atual (lowercase)."""
+        search_var = getattr(self, 'search_var', None)
+        return search_var.get().strip().lower() if search_var else ''
+
+    def _build_query(self):
+        """ConsultaLista com filtros, pesquisa e ordenação atuais (None = modo em memória)."""
+        query = self.get_query(self.get_current_filters())
+        if query is not None:
+            query.pesquisar(self._search_text())
+            query.ordenar(self.table.sort_column, self.table.sort_direction)
+        return query
+
+    def _append_page(self, reset: bool = False):
+        """Modo consulta: carrega a próxima página e acrescenta-a à tabela."""
+        items = self._query.pagina(self.PAGE_SIZE, offset=len(self._items))
+        self._has_more = len(items) == self.PAGE_SIZE
+
+        rows = []
+        for item in items:
+            row = self.item_to_dict(item)
+            self._items.append(item)
+            self._rows[id(item)] = row
+            self._search_index[id(item)] = normalizar_pesquisa(self.get_search_text(item, row))
+            rows.append(row)
+
+        if reset:
+            self.table.set_data(rows, reset_sort=False)
+        elif rows:
+            self.table.upsert_rows(rows)
+
+    def _load_next_page(self):
+        """Scroll chegou ao fim da tabela: carregar mais linhas (modo consulta)."""
+        if self._query is not None and self._has_more:
+            self._append_page()
+
+    def _on_sort_change(self, column_key: Optional[str], direction: Optional[str]) -> bool:
+        """Clique no header: no modo consulta ordena na BD (ORDER BY)."""
+        if self._query is None:
+            return False  # Tabela ordena as linhas carregadas
+        self.update_view()
+        return True
+
+    def _load_items(self):
+        """Carrega os items da BD e constrói o índice de pesquisa."""
+        self._items = self.load_data() or []
+        self._rows = {}
+        self._search_index = {}
+
+        for item in self._items:
+            row = self.item_to_dict(item)
+            self._rows[id(item)] = row
+            self._search_index[id(item)] = normalizar_pesquisa(self.get_search_text(item, row))
+
+    def update_items(self, items: list):
+        """
+        Atualiza na tabela apenas os items indicados (criados ou alterados).
+
+        Evita recarregar a BD e reconstruir a tabela após ações sobre poucos
+        items (ex: marcar como pago). Items que deixam de passar a pesquisa /
+        filtros ativos são retirados da tabela.
+
+        Args:
+            items: Objetos (models) já atualizados na sessão
+        """
+        if self._items is None:
+            self.update_view()
+            return
+
+        search_text = self._search_text()
+        filters = self.get_current_filters()
+
+        rows = [self.item_to_dict(item) for item in items]
+
+        # Modo consulta: a BD diz quais continuam a passar filtros/pesquisa
+        ids_visiveis = None
+        query = self._build_query() if self._query is not None else None
+        if query is not None:
+            ids_visiveis = query.ids_correspondentes([row['id'] for row in rows])
+
+        upserts = []
+        removals = []
+        for item, row in zip(items, rows):
+            if id(item) not in self._rows:
+                self._items.append(item)
+            self._rows[id(item)] = row
+            self._search_index[id(item)] = normalizar_pesquisa(self.get_search_text(item, row))
+
+            if ids_visiveis is not None:
+                visiveis = [item] if row['id'] in ids_visiveis else []
+            else:
+                visiveis = [item]
+                if search_text:
+                    visiveis = self.filter_by_search(visiveis, search_text)
+                visiveis = self.apply_filters(visiveis, filters)
+
+            if visiveis:
+                upserts.append(row)
+            else:
+                removals.append(row['id'])
+
+        if removals:
+            self.table.remove_rows(removals)
+        if upserts:
+            self.table.upsert_rows(upserts)
+
+    def remove_items(self, item_ids: list):
+        """
+        Remove da tabela (e dos dados em memória) os items com os ids indicados.
+
+        Args:
+            item_ids: Lista de ids (chave 'id' de item_to_dict)
+        """
+        item_ids = set(item_ids)
+        if self._items is not None:
+            removidos = [item for item in self._items if self._rows.get(id(item), {}).get('id') in item_ids]
+            for item in removidos:
+                self._rows.pop(id(item), None)
+                self._search_index.pop(id(item), None)
+            self._items = [item for item in self._items if id(item) in self._rows]
+
+        self.table.remove_rows(item_ids)
+
+    def destroy(self):
+        """Cancela pesquisa pendente antes de destruir o screen."""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        super().destroy()
+
     def get_current_filters(self) -> Dict[str, List[str]]:
         """Retorna filtros ativos (multi-seleção)."""
         return {
@@ -855,6 +1086,9 @@ class BaseScreen(ctk.CTkFrame):
         """
         Filtra items pelo texto de pesquisa.
 
+        Por omissão usa o índice em memória: cada palavra pesquisada (sem
+        acentos) tem de aparecer no texto de get_search_text().
+
         Args:
             items: Lista de objetos
             search_text: Texto de pesquisa (lowercase)
@@ -862,7 +1096,53 @@ class BaseScreen(ctk.CTkFrame):
         Returns:
             Lista filtrada
         """
-        return items
+        termos = normalizar_pesquisa(search_text).split()
+        if not termos:
+            return items
+
+        resultado = []
+        for item in items:
+            texto = self._search_index.get(id(item))
+            if texto is None:
+                texto = normalizar_pesquisa(self.get_search_text(item, self.item_to_dict(item)))
+            if all(termo in texto for termo in termos):
+                resultado.append(item)
+        return resultado
+
+    def get_search_text(self, item, row: dict) -> str:
+        """
+        Define o texto pesquisável de um item (indexado uma vez por carregamento).
+
+        Por omissão: valores de texto das colunas visíveis da tabela
+        (ex: numero, descricao, cliente_nome).
+
+        Args:
+            item: Objeto model
+            row: Dict da tabela (resultado de item_to_dict)
+
+        Returns:
+            Texto a indexar
+        """
+        partes = []
+        for column in self.table.base_columns:
+            valor = row.get(column['key'])
+            if isinstance(valor, str):
+                partes.append(valor)
+        return ' '.join(partes)
+
+    def get_query(self, filters: Dict[str, List[str]]):
+        """
+        Ativa o modo consulta: filtros, pesquisa, ordenação e paginação na BD.
+
+        Args:
+            filters: Filtros ativos dos chips {key: [label1, ...]}
+
+        Returns:
+            ConsultaLista do manager com os filtros aplicados
+            (ex: self.manager.consulta_lista().filtrar({...})), ou None para
+            o modo em memória (load_data + filter_by_search + apply_filters)
+        """
+        return None
 
     def apply_filters(self, items: list, filters: Dict[str, List[str]]) -> list:
         """
@@ -2,8 +2,13 @@
 """
 Componente de Tabela V2 com scroll horizontal e vertical
 Resolve problemas de overflow e scroll do DataTable original
+
+Modo virtualizado (virtualized=True): só as linhas visíveis (+ overscan) têm
+widgets; os widgets são reciclados durante o scroll. Seleção, ordenação e
+shift-click funcionam sobre a lista de dados (data_rows), não sobre widgets.
 """
 import customtkinter as ctk
+import math
 import platform
 import tkinter as tk
 from typing import List, Dict, Callable, Optional
@@ -59,6 +64,11 @@ class DataTableV2(ctk.CTkFrame):
     Colunas responsivas: expandem em fullscreen, scroll horizontal em janelas pequenas
     """
 
+    # Modo virtualizado: altura fixa por linha (px, antes do scaling) e linhas extra
+    # materializadas acima/abaixo da área visível
+    ROW_HEIGHT = 40
+    OVERSCAN_ROWS = 10
+
     def __init__(
         self,
         parent,
@@ -67,6 +77,9 @@ class DataTableV2(ctk.CTkFrame):
         on_row_double_click: Optional[Callable] = None,
         on_selection_change: Optional[Callable] = None,
         on_row_right_click: Optional[Callable] = None,
+        virtualized: bool = False,
+        on_sort_change: Optional[Callable] = None,
+        on_scroll_end: Optional[Callable] = None,
         **kwargs
     ):
         """
@@ -85,6 +98,12 @@ class DataTableV2(ctk.CTkFrame):
             on_row_double_click: Optional callback when row is double-clicked (receives row data)
             on_selection_change: Optional callback when selection changes (receives list of selected data)
             on_row_right_click: Optional callback when row is right-clicked (receives event and row data)
+            virtualized: If True, only visible rows (plus overscan) get widgets, recycled on scroll
+            on_sort_change: Optional callback (column_key, direction) when a header is clicked.
+                Return True if the sort was handled elsewhere (e.g. ORDER BY in the query),
+                False to sort the loaded rows locally
+            on_scroll_end: Optional callback when the view is scrolled to the last row
+                (used to load the next page)
         """
         super().__init__(parent, **kwargs)
 
@@ -99,10 +118,20 @@ class DataTableV2(ctk.CTkFrame):
         self.is_mac = platform.system() == "Darwin"
         self.last_canvas_width = 0
 
+        # Virtualized mode: row_widgets is the pool of recycled rows
+        self.virtualized = virtualized
+        self._row_height = int(self.ROW_HEIGHT * self._get_widget_scaling())
+        self._render_pending = False
+        self._cell_font = None
+        self._cell_font_strike = None
+
         # Callbacks
         self.on_row_double_click = on_row_double_click
         self.on_selection_change = on_selection_change
         self.on_row_right_click = on_row_right_click
+        self.on_sort_change = on_sort_change
+        self.on_scroll_end = on_scroll_end
+        self._scroll_end_pending = False
 
         # Selection state
         self.selected_rows = set()  # Set of row indices
@@ -148,7 +177,7 @@ class DataTableV2(ctk.CTkFrame):
 
         # Configure canvas
         self.canvas.configure(
-            yscrollcommand=self.v_scrollbar.set,
+            yscrollcommand=self._on_y_scroll,
             xscrollcommand=self.h_scrollbar.set
         )
 
@@ -241,25 +270,38 @@ class DataTableV2(ctk.CTkFrame):
             if self.data_rows:
                 self._rebuild_table()
 
+        # Virtualized: more/less rows may be visible after a height change
+        if self.virtualized:
+            self._schedule_render()
+
+    def _rebuild_header(self):
+        """Clear and rebuild header (widths / sort indicator)"""
+        for widget in self.header_widgets:
+            widget.destroy()
+        self.header_widgets = []
+        self.create_header()
+
     def _rebuild_table(self):
         """Rebuild table with updated column widths"""
         # Store current data
         current_data = self.data_rows.copy()
 
         # Clear and rebuild header
-        for widget in self.header_widgets:
-            widget.destroy()
-        self.header_widgets = []
-        self.create_header()
+        self._rebuild_header()
 
         # Clear and rebuild rows
         for widget in self.row_widgets:
             widget.destroy()
         self.row_widgets = []
+        self.row_data_map.clear()
 
         # Recreate rows with new widths
-        for index, item in enumerate(current_data):
-            self.add_row(item, index)
+        if self.virtualized:
+            self._set_virtual_height()
+            self._render_visible_rows()
+        else:
+            for index, item in enumerate(current_data):
+                self.add_row(item, index)
 
         # Update scroll region
         self.inner_frame.update_idletasks()
@@ -329,8 +371,8 @@ class DataTableV2(ctk.CTkFrame):
 
     def _select_all(self, event=None):
         """Select all rows"""
-        # Select all row indices
-        self.selected_rows = set(range(len(self.row_widgets)))
+        # Select all row indices (of the data, not only materialized rows)
+        self.selected_rows = set(range(len(self.data_rows)))
 
         # Update colors for all rows
         for row_frame in self.row_widgets:
@@ -339,8 +381,8 @@ class DataTableV2(ctk.CTkFrame):
                 self._update_row_color(row_frame, True, is_hovered=is_hovered)
 
         # Update last clicked index to last row
-        if self.row_widgets:
-            self.last_clicked_index = len(self.row_widgets) - 1
+        if self.data_rows:
+            self.last_clicked_index = len(self.data_rows) - 1
 
         # Notify callback
         if self.on_selection_change:
@@ -481,11 +523,19 @@ class DataTableV2(ctk.CTkFrame):
             self.sort_column = column_key
             self.sort_direction = "asc"
 
+        # Sort handled by the owner (e.g. query ORDER BY)?
+        if self.on_sort_change and self.on_sort_change(self.sort_column, self.sort_direction):
+            self._rebuild_header()
+            return
+
         # Apply sort
         self._sort_and_refresh()
 
     def _sort_and_refresh(self):
         """Sort data and refresh table"""
+        # Selection follows the rows (indices change with the new order)
+        selected_ids = {id(self.data_rows[i]) for i in self.selected_rows if i < len(self.data_rows)}
+
         if self.sort_column is None or self.sort_direction is None:
             # No sorting, use original order
             self.data_rows = self.original_data_rows.copy()
@@ -508,32 +558,50 @@ class DataTableV2(ctk.CTkFrame):
                     reverse=reverse
                 )
 
+        self.selected_rows = {i for i, row in enumerate(self.data_rows) if id(row) in selected_ids}
+        self.last_clicked_index = None
+
         # Rebuild table with sorted data
         self._rebuild_table()
 
-    def set_data(self, data: List[Dict]):
+    def set_data(self, data: List[Dict], reset_sort: bool = True):
         """
         Set table data
 
         Args:
             data: List of row dictionaries
+            reset_sort: If False, keep the sort indicator (data already comes sorted)
         """
         # Store original data order
         self.original_data_rows = data.copy()
         self.data_rows = data
 
         # Reset sorting state when new data is loaded
-        self.sort_column = None
-        self.sort_direction = None
-
-        # Clear existing rows
-        for widget in self.row_widgets:
-            widget.destroy()
-        self.row_widgets = []
+        if reset_sort and self.sort_column is not None:
+            self.sort_column = None
+            self.sort_direction = None
+            self._rebuild_header()
+
+        # Selection indices refer to the previous data
+        had_selection = bool(self.selected_rows)
+        self.selected_rows = set()
+        self.last_clicked_index = None
+
+        if self.virtualized:
+            # Keep the row pool, only re-fill the visible window
+            self._set_virtual_height()
+            self.canvas.yview_moveto(0)
+            self._render_visible_rows()
+        else:
+            # Clear existing rows
+            for widget in self.row_widgets:
+                widget.destroy()
+            self.row_widgets = []
+            self.row_data_map.clear()
 
-        # Create new rows
-        for index, item in enumerate(data):
-            self.add_row(item, index)
+            # Create new rows
+            for index, item in enumerate(data):
+                self.add_row(item, index)
 
         # Update scroll region
         self.inner_frame.update_idletasks()
@@ -546,6 +614,9 @@ class DataTableV2(ctk.CTkFrame):
         self.after(1, lambda: self.canvas.yview_moveto(0))
         self.after(1, lambda: self.canvas.xview_moveto(0))
 
+        if had_selection and self.on_selection_change:
+            self.on_selection_change([])
+
     def add_row(self, data: Dict, index: int = 0):
         """
         Add a single row
@@ -554,15 +625,7 @@ class DataTableV2(ctk.CTkFrame):
             data: Row data dictionary (can include '_bg_color' for custom background)
             index: Row index for alternating colors
         """
-        # Check for custom background color
-        if '_bg_color' in data:
-            bg_color = data['_bg_color']
-        else:
-            # Alternating row colors
-            if index % 2 == 0:
-                bg_color = ("#f8f8f8", "#252525")
-            else:
-                bg_color = ("#ffffff", "#1e1e1e")
+        bg_color = self._row_base_color(data, index)
 
         row_frame = ctk.CTkFrame(
             self.inner_frame,
@@ -596,28 +659,7 @@ class DataTableV2(ctk.CTkFrame):
 
         col_index = 0
         for col in self.columns:
-            value = data.get(col['key'], '')
-            original_value = str(value)
-
-            # Format value if formatter provided
-            if 'formatter' in col:
-                value = col['formatter'](value)
-                original_value = str(value)
-
-            # Truncate text if needed
-            truncate = col.get('truncate', True)
-            displayed_value = str(value)
-
-            if truncate:
-                displayed_value = self._truncate_text(
-                    str(value),
-                    col.get('width', 100)
-                )
-
-            # Check if strikethrough should be applied
-            # _strikethrough_except contains keys that should NOT have strikethrough
-            strikethrough_except = data.get('_strikethrough_except', [])
-            should_strikethrough = '_strikethrough_except' in data and col['key'] not in strikethrough_except
+            displayed_value, original_value, should_strikethrough = self._format_cell(data, col)
 
             label = ctk.CTkLabel(
                 row_frame,
@@ -629,7 +671,7 @@ class DataTableV2(ctk.CTkFrame):
             label.grid(row=0, column=col_index, padx=5, pady=5, sticky="w")
 
             # Add tooltip if text was truncated
-            if truncate and displayed_value != original_value:
+            if displayed_value != original_value:
                 ToolTip(label, original_value)
 
             # Propagate scroll events and hover from labels to canvas/row
@@ -656,14 +698,338 @@ class DataTableV2(ctk.CTkFrame):
 
         self.row_widgets.append(row_frame)
 
+    def _row_base_color(self, data: Dict, index: int):
+        """Background color of a row: custom '_bg_color' or alternating colors"""
+        if '_bg_color' in data:
+            return data['_bg_color']
+        if index % 2 == 0:
+            return ("#f8f8f8", "#252525")
+        return ("#ffffff", "#1e1e1e")
+
+    def _format_cell(self, data: Dict, col: Dict):
+        """
+        Format a cell value
+
+        Returns:
+            Tuple (displayed_value, original_value, should_strikethrough)
+        """
+        value = data.get(col['key'], '')
+
+        # Format value if formatter provided
+        if 'formatter' in col:
+            value = col['formatter'](value)
+        original_value = str(value)
+
+        # Truncate text if needed
+        displayed_value = original_value
+        if col.get('truncate', True):
+            displayed_value = self._truncate_text(original_value, col.get('width', 100))
+
+        # _strikethrough_except contains keys that should NOT have strikethrough
+        should_strikethrough = (
+            '_strikethrough_except' in data
+            and col['key'] not in data['_strikethrough_except']
+        )
+        return displayed_value, original_value, should_strikethrough
+
+    # ========== Virtualized mode ==========
+
+    def _on_y_scroll(self, first, last):
+        """Canvas yscrollcommand: update scrollbar and visible rows"""
+        self.v_scrollbar.set(first, last)
+        if self.virtualized:
+            self._schedule_render()
+
+        # Reached the last row: let the owner load more
+        if self.on_scroll_end and self.data_rows and float(last) >= 0.999 and not self._scroll_end_pending:
+            self._scroll_end_pending = True
+            self.after_idle(self._notify_scroll_end)
+
+    def _notify_scroll_end(self):
+        """Call on_scroll_end (once per idle cycle)"""
+        self._scroll_end_pending = False
+        if self.on_scroll_end:
+            self.on_scroll_end()
+
+    def _schedule_render(self):
+        """Render visible rows once per idle cycle (scroll events come in bursts)"""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render_visible_rows)
+
+    def _set_virtual_height(self):
+        """Size the inner frame to the full data height (rows are placed, not packed)"""
+        total_height = max(len(self.data_rows) * self._row_height, 1)
+        self.canvas.itemconfig(self.canvas_window, height=total_height)
+
+    def _render_visible_rows(self):
+        """Materialize only the visible window of rows (plus overscan), recycling the pool"""
+        self._render_pending = False
+        if not self.virtualized or not self.winfo_exists():
+            return
+
+        total = len(self.data_rows)
+        top_fraction = self.canvas.yview()[0]
+        view_height = max(self.canvas.winfo_height(), self._row_height)
+
+        first_visible = int(top_fraction * total)
+        visible_count = math.ceil(view_height / self._row_height) + 1
+        first = max(0, first_visible - self.OVERSCAN_ROWS)
+        last = min(total, first_visible + visible_count + self.OVERSCAN_ROWS)
+
+        # Grow pool if needed (never shrinks, widgets are reused)
+        while len(self.row_widgets) < last - first:
+            self.row_widgets.append(self._create_pool_row())
+
+        for offset, row_frame in enumerate(self.row_widgets):
+            index = first + offset
+            if index < last:
+                self._fill_pool_row(row_frame, index)
+                row_frame.place(
+                    x=2, y=index * self._row_height + 1,
+                    relwidth=1.0, width=-4, height=self._row_height - 2
+                )
+            else:
+                row_frame._index = None
+                row_frame._data = None
+                row_frame.place_forget()
+
+    def _create_pool_row(self):
+        """Create a reusable row (frame + one label per column)"""
+        if self._cell_font is None:
+            self._cell_font = ctk.CTkFont(size=12)
+            self._cell_font_strike = ctk.CTkFont(size=12, overstrike=True)
+
+        row_frame = ctk.CTkFrame(self.inner_frame, corner_radius=6)
+        row_frame._index = None
+        row_frame._data = None
+        row_frame._is_hovered = False
+        row_frame._base_color = None
+        row_frame._labels = []
+
+        widgets = [row_frame]
+        for col_index, col in enumerate(self.columns):
+            label = ctk.CTkLabel(
+                row_frame,
+                text="",
+                font=self._cell_font,
+                width=col.get('width', 100),
+                anchor="w"
+            )
+            label.grid(row=0, column=col_index, padx=5, pady=5, sticky="w")
+            label._tooltip = ToolTip(label, "")
+            row_frame._labels.append(label)
+            widgets.append(label)
+
+        # Handlers resolve the row data at event time (the row is recycled)
+        for widget in widgets:
+            widget.bind("<Enter>", lambda e, rf=row_frame: self._on_row_enter(e, rf), add="+")
+            widget.bind("<Leave>", lambda e, rf=row_frame: self._on_row_leave(e, rf), add="+")
+            widget.bind("<Button-1>", lambda e, rf=row_frame: self._on_row_click(e, rf))
+            widget.bind("<Double-Button-1>", lambda e, rf=row_frame: self._on_pool_row_double_click(rf))
+            right_click = "<Button-2>" if self.is_mac else "<Button-3>"
+            widget.bind(right_click, lambda e, rf=row_frame: self._on_pool_row_right_click(e, rf))
+            self._bind_shortcuts_to_widget(widget)
+
+        return row_frame
+
+    def _fill_pool_row(self, row_frame, index: int):
+        """Show data_rows[index] in a pooled row"""
+        data = self.data_rows[index]
+
+        if row_frame._index != index or row_frame._data is not data:
+            row_frame._index = index
+            row_frame._data = data
+            row_frame._base_color = self._row_base_color(data, index)
+
+            for col, label in zip(self.columns, row_frame._labels):
+                displayed_value, original_value, should_strikethrough = self._format_cell(data, col)
+                label.configure(
+                    text=displayed_value,
+                    font=self._cell_font_strike if should_strikethrough else self._cell_font
+                )
+                label._tooltip.text = original_value if displayed_value != original_value else ""
+
+        self._update_row_color(
+            row_frame, index in self.selected_rows, is_hovered=row_frame._is_hovered
+        )
+
+    def _on_pool_row_double_click(self, row_frame):
+        """Double click on a pooled row"""
+        if row_frame._data is not None:
+            self._on_row_double_click(row_frame._data)
+
+    def _on_pool_row_right_click(self, event, row_frame):
+        """Right click on a pooled row"""
+        if row_frame._data is not None:
+            self._on_row_right_click(event, dict(row_frame._data))
+
+    # ========== Keyed updates (by row 'id') ==========
+
+    def update_row(self, row_id, data: Dict) -> bool:
+        """
+        Replace the row with the given 'id' keeping its position and selection
+
+        Args:
+            row_id: Value of the row 'id' key
+            data: New row dictionary
+
+        Returns:
+            True if the row exists and was updated
+        """
+        if data.get('id') != row_id:
+            data = {**data, 'id': row_id}
+        return bool(self.upsert_rows([data], append_new=False))
+
+    def upsert_rows(self, rows: List[Dict], append_new: bool = True) -> int:
+        """
+        Update rows by 'id' in place; append rows with unknown 'id'
+
+        Only the affected rows are re-rendered (the whole table is rebuilt
+        only if new rows arrive while a column sort is active).
+
+        Args:
+            rows: Row dictionaries (must contain 'id')
+            append_new: If False, rows with unknown 'id' are ignored
+
+        Returns:
+            Number of rows updated or inserted
+        """
+        positions = {row.get('id'): i for i, row in enumerate(self.original_data_rows)}
+        display_positions = {row.get('id'): i for i, row in enumerate(self.data_rows)}
+
+        changed = 0
+        appended = []
+        for data in rows:
+            row_id = data.get('id')
+            if row_id in positions:
+                self.original_data_rows[positions[row_id]] = data
+                index = display_positions[row_id]
+                self.data_rows[index] = data
+                self._refresh_row(index)
+                changed += 1
+            elif append_new:
+                self.original_data_rows.append(data)
+                appended.append(data)
+                changed += 1
+
+        if appended:
+            if self.sort_column is not None:
+                self._sort_and_refresh()
+            else:
+                # data_rows may be the same list as original_data_rows (set_data)
+                if self.data_rows is not self.original_data_rows:
+                    self.data_rows.extend(appended)
+                self._after_rows_changed(appended_from=len(self.data_rows) - len(appended))
+
+        if changed and self.selected_rows and self.on_selection_change:
+            self.on_selection_change(self.get_selected_data())
+
+        return changed
+
+    def remove_rows(self, row_ids) -> int:
+        """
+        Remove rows by 'id' (selection of the remaining rows is kept)
+
+        Args:
+            row_ids: Iterable of 'id' values
+
+        Returns:
+            Number of rows removed
+        """
+        row_ids = set(row_ids)
+        removed = [row for row in self.data_rows if row.get('id') in row_ids]
+        if not removed:
+            return 0
+
+        selected_ids = {id(self.data_rows[i]) for i in self.selected_rows if i < len(self.data_rows)}
+        had_selection = bool(self.selected_rows)
+
+        kept_indices = [i for i, row in enumerate(self.data_rows) if row.get('id') not in row_ids]
+        self.original_data_rows = [row for row in self.original_data_rows if row.get('id') not in row_ids]
+        self.data_rows = [self.data_rows[i] for i in kept_indices]
+        self.selected_rows = {i for i, row in enumerate(self.data_rows) if id(row) in selected_ids}
+        self.last_clicked_index = None
+
+        if not self.virtualized:
+            # Destroy removed row widgets and re-index the rest
+            kept = set(kept_indices)
+            remaining = []
+            for row_frame in self.row_widgets:
+                if row_frame._index in kept:
+                    remaining.append(row_frame)
+                else:
+                    self.row_data_map.pop(row_frame, None)
+                    row_frame.destroy()
+            self.row_widgets = remaining
+            for index, row_frame in enumerate(self.row_widgets):
+                data, _ = self.row_data_map[row_frame]
+                row_frame._index = index
+                row_frame._base_color = self._row_base_color(data, index)
+                self.row_data_map[row_frame] = (data, index)
+                self._update_row_color(row_frame, index in self.selected_rows, is_hovered=row_frame._is_hovered)
+
+        self._after_rows_changed()
+
+        if had_selection and self.on_selection_change:
+            self.on_selection_change(self.get_selected_data())
+
+        return len(removed)
+
+    def _refresh_row(self, index: int):
+        """Re-render a single row after its data changed"""
+        data = self.data_rows[index]
+
+        if self.virtualized:
+            for row_frame in self.row_widgets:
+                if row_frame._index == index:
+                    row_frame._data = None  # Force re-fill
+                    self._fill_pool_row(row_frame, index)
+            return
+
+        row_frame = self.row_widgets[index]
+        row_frame._base_color = self._row_base_color(data, index)
+        self.row_data_map[row_frame] = (data, index)
+
+        labels = [w for w in row_frame.winfo_children() if isinstance(w, ctk.CTkLabel)]
+        right_click = "<Button-2>" if self.is_mac else "<Button-3>"
+        row_frame.bind("<Double-Button-1>", lambda e, d=data: self._on_row_double_click(d))
+        row_frame.bind(right_click, lambda e, d=data: self._on_row_right_click(e, d))
+
+        for col, label in zip(self.columns, labels):
+            displayed_value, original_value, should_strikethrough = self._format_cell(data, col)
+            label.configure(
+                text=displayed_value,
+                font=ctk.CTkFont(size=12, overstrike=should_strikethrough)
+            )
+            label.bind("<Double-Button-1>", lambda e, d=dict(data): self._on_row_double_click(d))
+            label.bind(right_click, lambda e, d=dict(data): self._on_row_right_click(e, d))
+
+        self._update_row_color(row_frame, index in self.selected_rows, is_hovered=row_frame._is_hovered)
+
+    def _after_rows_changed(self, appended_from: Optional[int] = None):
+        """Update widgets and scroll region after rows were appended/removed"""
+        if self.virtualized:
+            self._set_virtual_height()
+            self._render_visible_rows()
+        elif appended_from is not None:
+            for index in range(appended_from, len(self.data_rows)):
+                self.add_row(self.data_rows[index], index)
+
+        self.inner_frame.update_idletasks()
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
     def clear(self):
         """Clear all data"""
         self.data_rows = []
+        self.original_data_rows = []
         self.selected_rows.clear()
         self.row_data_map.clear()
         for widget in self.row_widgets:
             widget.destroy()
         self.row_widgets = []
+        if self.virtualized:
+            self._set_virtual_height()
 
     def _on_row_enter(self, event, row_frame):
         """Handle mouse enter on row - show hover state"""
@@ -673,6 +1039,8 @@ class DataTableV2(ctk.CTkFrame):
         # Update hover state
         row_frame._is_hovered = True
         index = row_frame._index
+        if index is None:
+            return
         is_selected = index in self.selected_rows
         self._update_row_color(row_frame, is_selected, is_hovered=True)
 
@@ -684,6 +1052,8 @@ class DataTableV2(ctk.CTkFrame):
         # Update hover state
         row_frame._is_hovered = False
         index = row_frame._index
+        if index is None:
+            return
         is_selected = index in self.selected_rows
         self._update_row_color(row_frame, is_selected, is_hovered=False)
 
@@ -693,6 +1063,8 @@ class DataTableV2(ctk.CTkFrame):
         self.canvas.focus_set()
 
         index = row_frame._index
+        if index is None:
+            return
 
         # Check if shift is held
         if event.state & 0x1:  # Shift key is held
@@ -824,14 +1196,12 @@ class DataTableV2(ctk.CTkFrame):
         return f"#{r:02x}{g:02x}{b:02x}"
 
     def get_selected_data(self) -> List[Dict]:
-        """Get data for all selected rows"""
-        selected_data = []
-        for row_frame in self.row_widgets:
-            if hasattr(row_frame, '_index') and row_frame._index in self.selected_rows:
-                if row_frame in self.row_data_map:
-                    data, _ = self.row_data_map[row_frame]
-                    selected_data.append(data)
-        return selected_data
+        """Get data for all selected rows (in display order)"""
+        return [
+            self.data_rows[index]
+            for index in sorted(self.selected_rows)
+            if index < len(self.data_rows)
+        ]
 
     def clear_selection(self):
         """Clear all selected rows"""
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Painel de diagnóstico SQL (escondido, Ctrl+Shift+D na janela principal)
+
+Mostra os contadores da instrumentação SQL (utils/instrumentacao_sql.py):
+queries e tempo por ecrã, por método de manager e as queries mais lentas.
+"""
+import customtkinter as ctk
+from tkinter import filedialog, messagebox
+
+from utils.instrumentacao_sql import InstrumentacaoSQL
+
+
+class DiagnosticoSQLWindow(ctk.CTkToplevel):
+    """
+    Janela com o resumo da instrumentação SQL
+    """
+
+    def __init__(self, parent, instrumentacao: InstrumentacaoSQL, **kwargs):
+        """
+        Initialize diagnostics window
+
+        Args:
+            parent: Parent widget
+            instrumentacao: Instrumentação SQL ativa
+        """
+        super().__init__(parent, **kwargs)
+
+        self.instrumentacao = instrumentacao
+
+        self.title("Diagnóstico SQL")
+        self.geometry("1000x650")
+        self.transient(parent.winfo_toplevel())
+
+        self.create_widgets()
+        self.atualizar()
+
+    def create_widgets(self):
+        """Create window widgets"""
+        toolbar = ctk.CTkFrame(self, fg_color="transparent")
+        toolbar.pack(fill="x", padx=15, pady=(15, 5))
+
+        self.totais_label = ctk.CTkLabel(toolbar, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.totais_label.pack(side="left")
+
+        ctk.CTkButton(toolbar, text="💾 Exportar JSON", width=140, command=self.exportar_json).pack(side="right")
+        ctk.CTkButton(toolbar, text="🗑️ Limpar", width=100, command=self.limpar).pack(side="right", padx=5)
+        ctk.CTkButton(toolbar, text="🔄 Atualizar", width=100, command=self.atualizar).pack(side="right")
+
+        self.texto = ctk.CTkTextbox(self, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        self.texto.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+
+    def atualizar(self):
+        """Re-read the counters and redraw"""
+        resumo = self.instrumentacao.resumo()
+        self.totais_label.configure(
+            text=f"{resumo['total_queries']} queries · {resumo['tempo_total_ms']:.1f} ms desde {resumo['inicio']}"
+        )
+
+        linhas = []
+        for titulo, chave in (("POR ECRÃ", 'por_ecra'), ("POR MÉTODO", 'por_metodo')):
+            linhas.append(titulo)
+            linhas.append(f"{'queries':>8} {'ms':>10}  nome")
+            for entrada in resumo[chave]:
+                linhas.append(f"{entrada['queries']:>8} {entrada['tempo_ms']:>10.1f}  {entrada['nome']}")
+            linhas.append("")
+
+        linhas.append("QUERIES MAIS LENTAS")
+        for registo in resumo['queries_lentas']:
+            sql = ' '.join(registo['sql'].split())
+            linhas.append(f"{registo['tempo_ms']:>10.1f} ms  {registo['ecra']} / {registo['metodo']}")
+            linhas.append(f"             {sql[:300]}")
+
+        self.texto.configure(state="normal")
+        self.texto.delete("1.0", "end")
+        self.texto.insert("1.0", "\n".join(linhas))
+        self.texto.configure(state="disabled")
+
+    def limpar(self):
+        """Reset the counters"""
+        self.instrumentacao.limpar()
+        self.atualizar()
+
+    def exportar_json(self):
+        """Save the summary as JSON"""
+        caminho = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            initialfile="diagnostico_sql.json"
+        )
+        if not caminho:
+            return
+        try:
+            self.instrumentacao.exportar_json(caminho)
+            messagebox.showinfo("Sucesso", f"Diagnóstico exportado para:\n{caminho}", parent=self)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao exportar diagnóstico: {str(e)}", parent=self)
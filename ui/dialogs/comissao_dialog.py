@@ -48,7 +48,7 @@ class ComissaoDialog(BaseDialogMedium):
         except:
             pass
         try:
-            fornecedores = self.fornecedores_manager.listar_ativos()
+            fornecedores = self.fornecedores_manager.listar_ativos(perfil='base')
             for fornecedor in fornecedores:
                 key = f"FORNECEDOR_{fornecedor.id}"
                 self.beneficiarios_map[key] = f"{key} - {fornecedor.nome}"
@@ -45,7 +45,7 @@ class ServicoEmpresaDialog(BaseDialogMedium):
         except:
             pass
         try:
-            fornecedores = self.fornecedores_manager.listar_ativos()
+            fornecedores = self.fornecedores_manager.listar_ativos(perfil='base')
             for fornecedor in fornecedores:
                 key = f"FORNECEDOR_{fornecedor.id}"
                 self.beneficiarios_map[key] = f"{key} - {fornecedor.nome}"
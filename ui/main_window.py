@@ -9,6 +9,7 @@ import logging
 from ui.components.sidebar import Sidebar
 from ui.screens.saldos import SaldosScreen
 from logic.projetos import ProjetosManager
+from utils.instrumentacao_sql import obter_instrumentacao
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +65,10 @@ class MainWindow(ctk.CTkFrame):
         # Atualizar estados de projetos automaticamente ao iniciar
         self._atualizar_estados_projetos_auto()
 
+        # Painel de diagnóstico SQL escondido (só com SQL_INSTRUMENTACAO=True)
+        if obter_instrumentacao():
+            self.winfo_toplevel().bind("<Control-Shift-D>", self._abrir_diagnostico_sql, add="+")
+
     def on_menu_select(self, menu_id: str):
         """
         Handle menu selection
@@ -488,6 +493,21 @@ class MainWindow(ctk.CTkFrame):
         except Exception as e:
             logger.error(f"Erro ao atualizar estados de projetos automaticamente: {e}")
 
+    def _abrir_diagnostico_sql(self, event=None):
+        """Abre o painel de diagnóstico SQL (Ctrl+Shift+D)"""
+        instrumentacao = obter_instrumentacao()
+        if not instrumentacao:
+            return
+
+        janela = getattr(self, '_diagnostico_sql', None)
+        if janela is not None and janela.winfo_exists():
+            janela.atualizar()
+            janela.lift()
+            return
+
+        from ui.components.diagnostico_sql import DiagnosticoSQLWindow
+        self._diagnostico_sql = DiagnosticoSQLWindow(self, instrumentacao)
+
     def handle_logout(self):
         """Handle logout"""
         if self.on_logout:
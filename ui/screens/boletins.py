@@ -95,10 +95,14 @@ class BoletinsScreen(BaseScreen):
             traceback.print_exc()
             return []  # SEMPRE retornar lista vazia em erro
 
+    def get_query(self, filters: Dict[str, List[str]]):
+        """Pesquisa, ordenação e paginação feitas na BD (BoletinsManager.consulta_lista)"""
+        return self.manager.consulta_lista()
+
     def item_to_dict(self, item: Any) -> Dict[str, Any]:
         """Convert boletim object to dict for table"""
-        # Count linhas (deslocações)
-        num_linhas = len(item.linhas) if hasattr(item, 'linhas') and item.linhas else 0
+        # Count linhas (deslocações) - subquery carregada pelo perfil 'lista'
+        num_linhas = item.num_linhas or 0
 
         return {
             'id': item.id,
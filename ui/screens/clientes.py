@@ -62,14 +62,6 @@ class ClientesScreen(BaseScreen):
     def load_data(self) -> List[Any]:
         """Load clientes from database and return as list of objects"""
         try:
-            # Get search filter (widget pode não existir em __init__)
-            search = None
-            if hasattr(self, 'search_entry') and self.search_entry:
-                try:
-                    search = self.search_entry.get().strip() or None
-                except Exception:
-                    pass
-
             # Get order by filter
             order_by = "numero"  # default
             if hasattr(self, 'order_var') and self.order_var:
@@ -78,11 +70,8 @@ class ClientesScreen(BaseScreen):
                 except Exception:
                     pass
 
-            # Apply search or load all
-            if search:
-                clientes = self.manager.pesquisar(search)
-            else:
-                clientes = self.manager.listar_todos(order_by=order_by)
+            # Pesquisa é aplicada em memória pelo BaseScreen
+            clientes = self.manager.listar_todos(order_by=order_by, perfil='lista')
 
             return clientes  # NUNCA None, sempre lista
 
@@ -94,7 +83,7 @@ class ClientesScreen(BaseScreen):
 
     def item_to_dict(self, item: Any) -> Dict[str, Any]:
         """Convert cliente object to dict for table"""
-        projetos_count = len(item.projetos) if hasattr(item, 'projetos') and item.projetos else 0
+        projetos_count = item.num_projetos or 0  # undefer no perfil 'lista'
 
         return {
             'id': item.id,
@@ -106,6 +95,10 @@ class ClientesScreen(BaseScreen):
             '_has_projetos': projetos_count > 0
         }
 
+    def get_search_text(self, item: Any, row: Dict[str, Any]) -> str:
+        """Texto pesquisável: colunas visíveis + nome formal e email"""
+        return ' '.join([super().get_search_text(item, row), item.nome_formal or '', item.email or ''])
+
     def get_context_menu_items(self, data: dict) -> List[Dict[str, Any]]:
         """Define ações do context menu e barra de ações"""
 
@@ -285,7 +278,7 @@ class ClientesScreen(BaseScreen):
                             'País': cliente.pais or '',
                             'Contacto': cliente.contacto or '',
                             'Email': cliente.email or '',
-                            'Projetos': str(len(cliente.projetos))
+                            'Projetos': str(cliente.num_projetos or 0)
                         })
 
             messagebox.showinfo("Sucesso", f"Exportados {len(selected)} cliente(s) para {filename}")
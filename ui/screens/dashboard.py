@@ -4,11 +4,8 @@ Dashboard - Visão geral do sistema
 """
 import customtkinter as ctk
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from logic.saldos import SaldosCalculator
-from database.models import (
-    Socio, Projeto, TipoProjeto, EstadoProjeto
-)
+from logic.dashboard_stats import DashboardStatsService
+from database.models import Socio
 from assets.resources import (
     get_icon,
     DASHBOARD,
@@ -34,7 +31,7 @@ class DashboardScreen(ctk.CTkFrame):
         super().__init__(parent, **kwargs)
 
         self.db_session = db_session
-        self.calculator = SaldosCalculator(db_session)
+        self.stats_service = DashboardStatsService(db_session)
         self.main_window = main_window
 
         # Configure
@@ -394,61 +391,25 @@ class DashboardScreen(ctk.CTkFrame):
 
     def carregar_dados(self):
         """Load and display all dashboard data"""
+        stats = self.stats_service.obter_estatisticas()
 
         # === SALDOS PESSOAIS ===
-        saldo_bruno = self.calculator.calcular_saldo_bruno()
-        saldo_rafael = self.calculator.calcular_saldo_rafael()
+        saldo_bruno = stats['saldos'][Socio.BA]
+        saldo_rafael = stats['saldos'][Socio.RR]
 
         self.bruno_card.value_label.configure(text=f"€ {saldo_bruno['saldo_total']:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
         self.rafael_card.value_label.configure(text=f"€ {saldo_rafael['saldo_total']:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
 
         # === FILTROS PROJETOS POR SÓCIO ===
-        # Pessoais BA: tipo=PESSOAL, owner='BA', estado=PAGO
-        pessoais_ba = self.db_session.query(func.count(Projeto.id)).filter(
-            Projeto.tipo == TipoProjeto.PESSOAL,
-            Projeto.owner == 'BA',
-            Projeto.estado == EstadoProjeto.PAGO
-        ).scalar() or 0
-
-        # Empresa BA: tipo=EMPRESA, owner='BA', estado=PAGO
-        empresa_ba = self.db_session.query(func.count(Projeto.id)).filter(
-            Projeto.tipo == TipoProjeto.EMPRESA,
-            Projeto.owner == 'BA',
-            Projeto.estado == EstadoProjeto.PAGO
-        ).scalar() or 0
-
-        # Pessoais RR: tipo=PESSOAL, owner='RR', estado=PAGO
-        pessoais_rr = self.db_session.query(func.count(Projeto.id)).filter(
-            Projeto.tipo == TipoProjeto.PESSOAL,
-            Projeto.owner == 'RR',
-            Projeto.estado == EstadoProjeto.PAGO
-        ).scalar() or 0
-
-        # Empresa RR: tipo=EMPRESA, owner='RR', estado=PAGO
-        empresa_rr = self.db_session.query(func.count(Projeto.id)).filter(
-            Projeto.tipo == TipoProjeto.EMPRESA,
-            Projeto.owner == 'RR',
-            Projeto.estado == EstadoProjeto.PAGO
-        ).scalar() or 0
-
-        self.pessoais_ba_card.value_label.configure(text=str(pessoais_ba))
-        self.empresa_ba_card.value_label.configure(text=str(empresa_ba))
-        self.pessoais_rr_card.value_label.configure(text=str(pessoais_rr))
-        self.empresa_rr_card.value_label.configure(text=str(empresa_rr))
+        # Projetos pagos por tipo (PESSOAL / EMPRESA) e owner
+        self.pessoais_ba_card.value_label.configure(text=str(stats['por_socio']['BA']['pessoais']))
+        self.empresa_ba_card.value_label.configure(text=str(stats['por_socio']['BA']['empresa']))
+        self.pessoais_rr_card.value_label.configure(text=str(stats['por_socio']['RR']['pessoais']))
+        self.empresa_rr_card.value_label.configure(text=str(stats['por_socio']['RR']['empresa']))
 
         # === PROJETOS ===
-        total_projetos = self.db_session.query(func.count(Projeto.id)).scalar() or 0
-        projetos_recebidos = self.db_session.query(func.count(Projeto.id)).filter(
-            Projeto.estado == EstadoProjeto.PAGO
-        ).scalar() or 0
-        projetos_faturados = self.db_session.query(func.count(Projeto.id)).filter(
-            Projeto.estado == EstadoProjeto.FINALIZADO
-        ).scalar() or 0
-        projetos_nao_faturados = self.db_session.query(func.count(Projeto.id)).filter(
-            Projeto.estado == EstadoProjeto.ATIVO
-        ).scalar() or 0
-
-        self.total_projetos_card.value_label.configure(text=str(total_projetos))
-        self.projetos_recebidos_card.value_label.configure(text=str(projetos_recebidos))
-        self.projetos_faturados_card.value_label.configure(text=str(projetos_faturados))
-        self.projetos_nao_faturados_card.value_label.configure(text=str(projetos_nao_faturados))
+        projetos = stats['projetos']
+        self.total_projetos_card.value_label.configure(text=str(projetos['total']))
+        self.projetos_recebidos_card.value_label.configure(text=str(projetos['recebidos']))
+        self.projetos_faturados_card.value_label.configure(text=str(projetos['faturados']))
+        self.projetos_nao_faturados_card.value_label.configure(text=str(projetos['nao_faturados']))
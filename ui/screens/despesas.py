@@ -59,14 +59,6 @@ class DespesasScreen(BaseScreen):
     def load_data(self) -> List[Any]:
         """Load despesas from database and return as list of objects"""
         try:
-            # Get search filter (widget pode não existir em __init__)
-            search = None
-            if hasattr(self, 'search_entry') and self.search_entry:
-                try:
-                    search = self.search_entry.get().strip() or None
-                except Exception:
-                    pass
-
             # Get dropdown filters
             tipo = "Todos"
             if hasattr(self, 'tipo_filter') and self.tipo_filter:
@@ -82,11 +74,8 @@ class DespesasScreen(BaseScreen):
                 except Exception:
                     pass
 
-            # Apply search
-            if search:
-                despesas = self.manager.filtrar_por_texto(search)
-            else:
-                despesas = self.manager.listar_todas()
+            # Pesquisa é aplicada em memória pelo BaseScreen
+            despesas = self.manager.listar_todas()
 
             # Apply tipo filter
             if tipo != "Todos":
@@ -120,6 +109,10 @@ class DespesasScreen(BaseScreen):
             traceback.print_exc()
             return []  # SEMPRE retornar lista vazia em erro
 
+    def get_query(self, filters: Dict[str, List[str]]):
+        """Pesquisa, ordenação e paginação feitas na BD (DespesasManager.consulta_lista)"""
+        return self.manager.consulta_lista()
+
     def item_to_dict(self, item: Any) -> Dict[str, Any]:
         """Convert despesa object to dict for table"""
         # Reusar lógica de despesa_to_dict() existente mas sem search_text
@@ -63,14 +63,6 @@ class EquipamentoScreen(BaseScreen):
     def load_data(self) -> List[Any]:
         """Load equipamentos from database and return as list of objects"""
         try:
-            # Get search filter (widget pode não existir em __init__)
-            pesquisa = None
-            if hasattr(self, 'search_entry') and self.search_entry:
-                try:
-                    pesquisa = self.search_entry.get().strip() or None
-                except Exception:
-                    pass
-
             # Get tipo filter
             filtro_tipo = None
             if hasattr(self, 'tipo_var') and self.tipo_var:
@@ -92,8 +84,7 @@ class EquipamentoScreen(BaseScreen):
             # Query
             equipamentos = self.manager.listar_equipamentos(
                 filtro_tipo=filtro_tipo,
-                filtro_com_aluguer=filtro_com_aluguer,
-                pesquisa=pesquisa
+                filtro_com_aluguer=filtro_com_aluguer
             )
 
             # Update info label with statistics
@@ -131,6 +122,10 @@ class EquipamentoScreen(BaseScreen):
             '_equipamento': item  # CRÍTICO: guardar objeto original
         }
 
+    def get_search_text(self, item: Any, row: Dict[str, Any]) -> str:
+        """Texto pesquisável: colunas visíveis + descrição"""
+        return ' '.join([super().get_search_text(item, row), item.descricao or ''])
+
     def get_context_menu_items(self, data: dict) -> List[Dict[str, Any]]:
         """Define ações do context menu e barra de ações"""
 
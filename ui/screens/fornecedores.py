@@ -64,14 +64,6 @@ class FornecedoresScreen(BaseScreen):
     def load_data(self) -> List[Any]:
         """Load fornecedores from database and return as list of objects"""
         try:
-            # Get search filter (widget pode não existir em __init__)
-            search = None
-            if hasattr(self, 'search_entry') and self.search_entry:
-                try:
-                    search = self.search_entry.get().strip() or None
-                except Exception:
-                    pass
-
             # Get estatuto filter
             estatuto = None
             if hasattr(self, 'estatuto_var') and self.estatuto_var:
@@ -90,11 +82,8 @@ class FornecedoresScreen(BaseScreen):
                 except Exception:
                     pass
 
-            # Apply search or load all
-            if search:
-                fornecedores = self.manager.pesquisar(search)
-            else:
-                fornecedores = self.manager.listar_todos(estatuto=estatuto, order_by=order_by)
+            # Pesquisa é aplicada em memória pelo BaseScreen
+            fornecedores = self.manager.listar_todos(estatuto=estatuto, order_by=order_by, perfil='lista')
 
             return fornecedores  # NUNCA None, sempre lista
 
@@ -107,7 +96,7 @@ class FornecedoresScreen(BaseScreen):
     def item_to_dict(self, item: Any) -> Dict[str, Any]:
         """Convert fornecedor object to dict for table"""
         color = self.get_estatuto_color(item.estatuto) if item.estatuto else ("#E0E0E0", "#4A4A4A")
-        despesas_count = len(item.despesas) if hasattr(item, 'despesas') and item.despesas else 0
+        despesas_count = item.num_despesas or 0  # undefer no perfil 'lista'
 
         return {
             'id': item.id,
@@ -122,6 +111,10 @@ class FornecedoresScreen(BaseScreen):
             '_fornecedor': item  # CRÍTICO: guardar objeto original
         }
 
+    def get_search_text(self, item: Any, row: Dict[str, Any]) -> str:
+        """Texto pesquisável: colunas visíveis + NIF e email"""
+        return ' '.join([super().get_search_text(item, row), item.nif or '', item.email or ''])
+
     def get_context_menu_items(self, data: dict) -> List[Dict[str, Any]]:
         """Define ações do context menu e barra de ações"""
 
@@ -301,7 +294,7 @@ class FornecedoresScreen(BaseScreen):
                             'NIF': fornecedor.nif or '',
                             'Contacto': fornecedor.contacto or '',
                             'Email': fornecedor.email or '',
-                            'Despesas': str(len(fornecedor.despesas))
+                            'Despesas': str(fornecedor.num_despesas or 0)
                         })
 
             messagebox.showinfo("Sucesso", f"Exportados {len(selected)} fornecedor(es) para {filename}")
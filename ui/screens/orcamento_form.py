@@ -11,8 +11,8 @@ import customtkinter as ctk
 from sqlalchemy.orm import Session
 from logic.orcamentos import OrcamentoManager
 from logic.clientes import ClientesManager
-from logic.freelancers import FreelancersManager
-from logic.fornecedores import FornecedoresManager
+from logic.orcamento_documento import DocumentoOrcamento, ItemDocumento, ReparticaoDocumento
+from logic.beneficiarios import NomesBeneficiarios
 from ui.components.autocomplete_entry import AutocompleteEntry
 from ui.components.date_picker_dropdown import DatePickerDropdown
 from ui.components.date_range_picker_dropdown import DateRangePickerDropdown
@@ -105,8 +105,15 @@ class OrcamentoFormScreen(ctk.CTkFrame):
     LADO EMPRESA: Repartição interna (como a receita é distribuída)
 
     REGRA FUNDAMENTAL: TOTAL_CLIENTE deve ser IGUAL a TOTAL_EMPRESA
+
+    Os items são editados num DocumentoOrcamento em memória; as alterações
+    (ex: setas das comissões) são gravadas de uma vez, ATRASO_GRAVACAO_MS
+    depois da última alteração ou antes de qualquer operação que leia a DB.
     """
 
+    # Intervalo sem alterações antes de gravar o documento (ms)
+    ATRASO_GRAVACAO_MS = 800
+
     def __init__(self, parent, db_session: Session, orcamento_id: Optional[int] = None, **kwargs):
         super().__init__(parent, **kwargs)
 
@@ -114,19 +121,26 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         self.orcamento_id = orcamento_id
         self.manager = OrcamentoManager(db_session)
         self.clientes_manager = ClientesManager(db_session)
-        self.freelancers_manager = FreelancersManager(db_session)
-        self.fornecedores_manager = FornecedoresManager(db_session)
+        self.nomes_beneficiarios = NomesBeneficiarios(db_session)
 
         # Estado
         self.orcamento = None
+        self.documento: Optional[DocumentoOrcamento] = None
         self.alteracoes_pendentes = False
         self.clientes_map = {}
+        self._gravacao_id = None
 
         # Caches para evitar recálculos
         self._total_cliente = Decimal('0')
         self._total_empresa = Decimal('0')
         self._totais_beneficiarios = {}  # {beneficiario_id: (total, nome_display)}
 
+        # Widgets atualizados sem re-renderizar a lista
+        self._widgets_reparticoes = {}  # {rep_id: (label_percentagem, label_total)}
+        self._labels_subtotal_empresa = {}  # {tipo: label}
+        self._labels_beneficiarios = {}  # {beneficiario_id: label_valor}
+        self._label_total_beneficiarios = None
+
         # Configure
         self.configure(fg_color="transparent")
         self.grid_rowconfigure(0, weight=1)
@@ -282,7 +296,7 @@ class OrcamentoFormScreen(ctk.CTkFrame):
     def create_cliente_autocomplete(self, parent):
         """Cria autocomplete para clientes"""
         # Carregar clientes
-        clientes = self.clientes_manager.listar_todos()
+        clientes = self.clientes_manager.listar_todos(perfil='base')
 
         # Criar map de clientes
         self.clientes_map = {}
@@ -675,34 +689,32 @@ class OrcamentoFormScreen(ctk.CTkFrame):
                 self.sincronizar_despesa_cliente_empresa(dialog.item_created_id)
             self.carregar_items_cliente()
 
-    def carregar_items_cliente(self):
-        """Carrega e renderiza todos os items do LADO CLIENTE"""
+    def carregar_items_cliente(self, recarregar: bool = True):
+        """
+        Renderiza todos os items do LADO CLIENTE
+
+        Args:
+            recarregar: Ler o documento da DB antes (False se acabou de ser lido)
+        """
         if not self.orcamento_id:
             return
 
+        if recarregar:
+            self.recarregar_documento()
+
         # Limpar área
         for widget in self.cliente_scroll.winfo_children():
             widget.destroy()
 
-        # Obter secções
-        secoes = self.manager.obter_secoes(self.orcamento_id)
-
         # Organizar secções principais (Serviços, Equipamento, Despesas)
         secoes_principais = {
-            'servicos': next((s for s in secoes if s.tipo == 'servicos'), None),
-            'equipamento': next((s for s in secoes if s.tipo == 'equipamento'), None),
-            'despesas': next((s for s in secoes if s.tipo == 'despesas'), None)
+            'servicos': self.documento.secao_por_tipo('servicos'),
+            'equipamento': self.documento.secao_por_tipo('equipamento'),
+            'despesas': self.documento.secao_por_tipo('despesas')
         }
 
-        total_geral = Decimal('0')
-
         for nome_secao, secao_obj in secoes_principais.items():
-            if not secao_obj:
-                continue
-
-            # Obter items desta secção
-            items = self.manager.obter_itens(self.orcamento_id, secao_obj.id)
-            if not items:
+            if not secao_obj or not secao_obj.itens:
                 continue  # Não mostrar secções vazias
 
             # Frame da secção
@@ -731,10 +743,8 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             ).pack(side="left")
 
             # Items da secção
-            subtotal_secao = Decimal('0')
-            for idx, item in enumerate(items):
+            for idx, item in enumerate(secao_obj.itens):
                 self.renderizar_item_cliente(secao_frame, item, idx)
-                subtotal_secao += item.total
 
             # Subtotal da secção
             subtotal_frame = ctk.CTkFrame(secao_frame, fg_color="transparent")
@@ -742,18 +752,16 @@ class OrcamentoFormScreen(ctk.CTkFrame):
 
             ctk.CTkLabel(
                 subtotal_frame,
-                text=f"Subtotal: €{float(subtotal_secao):.2f}",
+                text=f"Subtotal: €{float(self.documento.subtotal_secao(secao_obj.id)):.2f}",
                 font=ctk.CTkFont(size=13, weight="bold"),
                 text_color=("#2c3e50", "#ecf0f1")
             ).pack(side="right")
 
-            total_geral += subtotal_secao
-
         # Atualizar total geral
-        self._total_cliente = total_geral
+        self._total_cliente = self.documento.total_cliente
         self.atualizar_total_cliente()
 
-    def renderizar_item_cliente(self, parent, item: OrcamentoItem, index: int):
+    def renderizar_item_cliente(self, parent, item: ItemDocumento, index: int):
         """Renderiza um item CLIENTE"""
         # Cor de fundo alternada
         bg_color = ("#ffffff", "#1e1e1e") if index % 2 == 0 else ("#f9f9f9", "#252525")
@@ -878,7 +886,7 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         desc_label.bind("<Button-2>", lambda e: self.mostrar_context_menu_cliente(e, item))
         desc_label.bind("<Button-3>", lambda e: self.mostrar_context_menu_cliente(e, item))
 
-    def mostrar_context_menu_cliente(self, event, item: OrcamentoItem):
+    def mostrar_context_menu_cliente(self, event, item: ItemDocumento):
         """Mostra context menu ao clicar com botão direito num item CLIENTE"""
         menu = tk.Menu(self, tearoff=0)
         menu.add_command(label="✏️  Editar", command=lambda: self.editar_item_cliente(item))
@@ -891,7 +899,7 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         finally:
             menu.grab_release()
 
-    def editar_item_cliente(self, item: OrcamentoItem):
+    def editar_item_cliente(self, item: ItemDocumento):
         """Abre dialog para editar item CLIENTE"""
         # Determinar qual dialog abrir baseado no tipo
         if item.tipo == 'servico':
@@ -917,6 +925,8 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         if not messagebox.askyesno("Confirmar", "Tem certeza que deseja eliminar este item?"):
             return
 
+        self.gravar_documento()
+
         # Verificar se é despesa (tem que eliminar espelhada também)
         item = self.db_session.query(OrcamentoItem).filter(OrcamentoItem.id == item_id).first()
         if item and item.tipo in ['transporte', 'refeicao', 'outro']:
@@ -931,11 +941,11 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         if sucesso:
             self.carregar_items_cliente()
             # Recarregar lado EMPRESA também (para remover espelhada)
-            self.carregar_items_empresa()
+            self.carregar_items_empresa(recarregar=False)
         else:
             messagebox.showerror("Erro", f"Erro ao eliminar: {erro}")
 
-    def duplicar_item_cliente(self, item: OrcamentoItem):
+    def duplicar_item_cliente(self, item: ItemDocumento):
         """Duplica um item CLIENTE"""
         # Abrir dialog apropriado sem ID (modo criar) mas com dados preenchidos
         if item.tipo == 'servico':
@@ -1085,6 +1095,8 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             messagebox.showwarning("Aviso", "Grave o orçamento antes de adicionar items!")
             return
 
+        self.gravar_documento()
+
         if tipo == 'servico':
             dialog = ServicoEmpresaDialog(self, self.db_session, self.orcamento_id)
             self.wait_window(dialog)
@@ -1114,6 +1126,8 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             )
             return
 
+        self.gravar_documento()
+
         # Verificar se já existem comissões
         reparticoes_existentes = self.manager.obter_reparticoes(self.orcamento_id)
         comissoes_existentes = [r for r in reparticoes_existentes if r.tipo == 'comissao']
@@ -1174,17 +1188,27 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             f"Pode editar as percentagens clicando no botão ✏️"
         )
 
-    def carregar_items_empresa(self):
-        """Carrega e renderiza todos os items do LADO EMPRESA"""
+    def carregar_items_empresa(self, recarregar: bool = True):
+        """
+        Renderiza todos os items do LADO EMPRESA
+
+        Args:
+            recarregar: Ler o documento da DB antes (False se acabou de ser lido)
+        """
         if not self.orcamento_id:
             return
 
+        if recarregar:
+            self.recarregar_documento()
+
         # Limpar área
         for widget in self.empresa_scroll.winfo_children():
             widget.destroy()
+        self._widgets_reparticoes = {}
+        self._labels_subtotal_empresa = {}
 
-        # Obter repartições (items EMPRESA)
-        reparticoes = self.manager.obter_reparticoes(self.orcamento_id)
+        # Obter repartições (items EMPRESA) agrupadas por tipo
+        reparticoes = self.documento.reparticoes_por_tipo()
 
         if not reparticoes:
             # Mostrar mensagem se vazio
@@ -1195,22 +1219,10 @@ class OrcamentoFormScreen(ctk.CTkFrame):
                 text_color=("#999", "#666")
             )
             empty_label.pack(pady=40)
+            self._total_empresa = self.documento.total_empresa
             self.atualizar_total_empresa()
             return
 
-        # Agrupar por tipo
-        grupos = {
-            'servico': [],
-            'equipamento': [],
-            'despesa': [],
-            'comissao': []
-        }
-
-        for rep in reparticoes:
-            grupos[rep.tipo].append(rep)
-
-        total_geral = Decimal('0')
-
         # Renderizar grupos
         grupos_display = {
             'servico': ('🔧 SERVIÇOS', "#4CAF50"),
@@ -1219,7 +1231,8 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             'comissao': ('💼 COMISSÕES', "#9C27B0")
         }
 
-        for tipo, items_grupo in grupos.items():
+        for tipo in grupos_display:
+            items_grupo = reparticoes.get(tipo)
             if not items_grupo:
                 continue
 
@@ -1244,29 +1257,27 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             ).pack(side="left")
 
             # Items do grupo
-            subtotal_grupo = Decimal('0')
             for idx, rep in enumerate(items_grupo):
                 self.renderizar_item_empresa(grupo_frame, rep, idx, tipo)
-                subtotal_grupo += rep.total
 
             # Subtotal do grupo
             subtotal_frame = ctk.CTkFrame(grupo_frame, fg_color="transparent")
             subtotal_frame.pack(fill="x", padx=15, pady=(5, 10))
 
-            ctk.CTkLabel(
+            subtotal_label = ctk.CTkLabel(
                 subtotal_frame,
-                text=f"Subtotal: €{float(subtotal_grupo):.2f}",
+                text=f"Subtotal: €{float(self.documento.subtotal_grupo(tipo)):.2f}",
                 font=ctk.CTkFont(size=13, weight="bold"),
                 text_color=("#2c3e50", "#ecf0f1")
-            ).pack(side="right")
-
-            total_geral += subtotal_grupo
+            )
+            subtotal_label.pack(side="right")
+            self._labels_subtotal_empresa[tipo] = subtotal_label
 
         # Atualizar total geral
-        self._total_empresa = total_geral
+        self._total_empresa = self.documento.total_empresa
         self.atualizar_total_empresa()
 
-    def renderizar_item_empresa(self, parent, rep: OrcamentoReparticao, index: int, tipo: str):
+    def renderizar_item_empresa(self, parent, rep: ReparticaoDocumento, index: int, tipo: str):
         """Renderiza um item EMPRESA"""
         # Cor de fundo alternada
         bg_color = ("#ffffff", "#1e1e1e") if index % 2 == 0 else ("#f9f9f9", "#252525")
@@ -1290,6 +1301,8 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         desc_frame.pack(side="left", fill="y")
         desc_frame.pack_propagate(False)  # Manter largura fixa
 
+        percentagem_label = None
+
         # Beneficiário badge
         beneficiario_colors = {
             'BA': ("#4CAF50", "#2e7d32"),
@@ -1448,12 +1461,14 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         total_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
         total_frame.pack(side="left", padx=10)
 
-        ctk.CTkLabel(
+        total_label = ctk.CTkLabel(
             total_frame,
             text=f"€{float(rep.total):.2f}",
             font=ctk.CTkFont(size=13, weight="bold"),
             text_color=("#2e7d32", "#66bb6a")
-        ).pack()
+        )
+        total_label.pack()
+        self._widgets_reparticoes[rep.id] = (percentagem_label, total_label)
 
         # Coluna 4: Ações
         actions_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
@@ -1499,7 +1514,7 @@ class OrcamentoFormScreen(ctk.CTkFrame):
                 text_color=("#999", "#666")
             ).pack()
 
-    def mostrar_context_menu_empresa(self, event, rep: OrcamentoReparticao):
+    def mostrar_context_menu_empresa(self, event, rep: ReparticaoDocumento):
         """Mostra context menu ao clicar com botão direito num item EMPRESA"""
         menu = tk.Menu(self, tearoff=0)
         menu.add_command(label="✏️  Editar", command=lambda: self.editar_item_empresa(rep))
@@ -1512,8 +1527,11 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         finally:
             menu.grab_release()
 
-    def editar_item_empresa(self, rep: OrcamentoReparticao):
+    def editar_item_empresa(self, rep: ReparticaoDocumento):
         """Abre dialog para editar item EMPRESA"""
+        # O dialog lê a repartição da DB
+        self.gravar_documento()
+
         if rep.tipo == 'servico':
             dialog = ServicoEmpresaDialog(self, self.db_session, self.orcamento_id, rep.id)
         elif rep.tipo == 'equipamento':
@@ -1534,14 +1552,17 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         if not messagebox.askyesno("Confirmar", "Tem certeza que deseja eliminar este item?"):
             return
 
+        self.gravar_documento()
         sucesso, erro = self.manager.eliminar_reparticao(rep_id)
         if sucesso:
             self.carregar_items_empresa()
         else:
             messagebox.showerror("Erro", f"Erro ao eliminar: {erro}")
 
-    def duplicar_item_empresa(self, rep: OrcamentoReparticao):
+    def duplicar_item_empresa(self, rep: ReparticaoDocumento):
         """Duplica um item EMPRESA"""
+        self.gravar_documento()
+
         # Abrir dialog apropriado sem ID (modo criar) mas com dados preenchidos
         if rep.tipo == 'servico':
             dialog = ServicoEmpresaDialog(self, self.db_session, self.orcamento_id, None)
@@ -1650,8 +1671,8 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             rep_id: ID da repartição
             event: Evento do click (não usado)
         """
-        # Buscar repartição atual
-        reparticao = self.db_session.query(OrcamentoReparticao).filter_by(id=rep_id).first()
+        # Repartição atual (do documento em memória)
+        reparticao = self.documento.reparticoes.get(rep_id) if self.documento else None
         if not reparticao or reparticao.tipo != 'comissao':
             return
 
@@ -1691,24 +1712,13 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             """Aplica o valor manual"""
             try:
                 valor_str = entry.get().strip().replace(',', '.')
-                novo_valor = float(valor_str)
-
-                # Validar limites
-                if novo_valor < 0:
-                    novo_valor = 0
-                elif novo_valor > 100:
-                    novo_valor = 100
-
-                # Calcular diferença e aplicar
-                valor_atual = float(reparticao.percentagem)
-                diferenca = novo_valor - valor_atual
-
-                if diferenca != 0:
-                    # Atualizar diretamente
-                    reparticao.percentagem = Decimal(str(round(novo_valor, 4)))
-                    reparticao.total = reparticao.calcular_total()
-                    self.db_session.commit()
-                    self.carregar_items_empresa()
+                novo_valor = Decimal(str(float(valor_str)))
+
+                # Aplicar (limitado a 0-100) e gravar após o debounce
+                self.documento.definir_percentagem(rep_id, novo_valor)
+                if reparticao.suja:
+                    self.mostrar_reparticao_alterada(reparticao)
+                    self.agendar_gravacao()
 
                 dialog.destroy()
 
@@ -1746,84 +1756,79 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         """
         Ajusta percentagem de comissão em tempo real (setas ▲▼ discretas)
 
+        Altera só o documento em memória e as labels afetadas; a gravação
+        na DB é feita depois de ATRASO_GRAVACAO_MS sem alterações.
+
         Args:
             rep_id: ID da repartição (comissão)
             incremento: +0.0001 ou -0.0001 (precisão de décimos de milésima)
         """
-        try:
-            # DEBUG: Log chamada do método
-            print(f"\n{'='*60}")
-            print(f"[DEBUG] >>> INÍCIO ajustar_percentagem_comissao")
-            print(f"[DEBUG] rep_id={rep_id}, incremento={incremento}")
-
-            # Buscar repartição no BD
-            reparticao = self.db_session.query(OrcamentoReparticao).filter_by(id=rep_id).first()
-            if not reparticao or reparticao.tipo != 'comissao':
-                print(f"[DEBUG] ERRO: Comissão não encontrada (rep_id={rep_id})")
-                messagebox.showerror("Erro", "Comissão não encontrada")
-                return
+        reparticao = self.documento.ajustar_percentagem(rep_id, Decimal(str(incremento))) if self.documento else None
+        if not reparticao:
+            self.parar_repeat_seta()
+            messagebox.showerror("Erro", "Comissão não encontrada")
+            return
 
-            # ANTES: Verificar estado do objeto
-            print(f"[DEBUG] ANTES - reparticao.id: {reparticao.id}")
-            print(f"[DEBUG] ANTES - reparticao.percentagem (objeto): {reparticao.percentagem}")
-            print(f"[DEBUG] ANTES - reparticao.percentagem (float): {float(reparticao.percentagem):.4f}%")
-            print(f"[DEBUG] ANTES - reparticao.total: €{float(reparticao.total):.2f}")
-            print(f"[DEBUG] ANTES - reparticao.base_calculo: €{float(reparticao.base_calculo):.2f}")
-
-            # Calcular nova percentagem
-            percentagem_atual = float(reparticao.percentagem)
-            nova_percentagem = percentagem_atual + incremento
-
-            print(f"[DEBUG] CÁLCULO: {percentagem_atual:.4f}% + {incremento} = {nova_percentagem:.4f}%")
-
-            # Validar limites: 0.0000% - 100.0000%
-            if nova_percentagem < 0.0000:
-                nova_percentagem = 0.0000
-                print(f"[DEBUG] LIMITE: Fixado em mínimo 0.0000%")
-            elif nova_percentagem > 100.0000:
-                nova_percentagem = 100.0000
-                print(f"[DEBUG] LIMITE: Fixado em máximo 100.0000%")
-
-            # Atualizar percentagem do objeto (arredondar a 4 decimais)
-            reparticao.percentagem = Decimal(str(round(nova_percentagem, 4)))
-            print(f"[DEBUG] UPDATE: reparticao.percentagem = {reparticao.percentagem}")
-
-            # Recalcular total do objeto: base_calculo × (percentagem / 100)
-            total_antigo = reparticao.total
-            reparticao.total = reparticao.calcular_total()
-            print(f"[DEBUG] UPDATE: reparticao.total = {reparticao.total}")
-
-            # DEPOIS: Verificar estado do objeto (antes do commit)
-            print(f"[DEBUG] DEPOIS (antes commit) - reparticao.percentagem: {reparticao.percentagem}")
-            print(f"[DEBUG] DEPOIS (antes commit) - reparticao.total: €{float(reparticao.total):.2f}")
-
-            # Flush para garantir que mudanças são enviadas ao BD
-            self.db_session.flush()
-            print(f"[DEBUG] FLUSH: Mudanças enviadas ao BD (antes commit)")
-
-            # Commit no BD
-            self.db_session.commit()
-            print(f"[DEBUG] COMMIT: Mudanças persistidas no BD")
+        self.mostrar_reparticao_alterada(reparticao)
+        self.agendar_gravacao()
 
-            # Verificar se persistiu corretamente
-            self.db_session.refresh(reparticao)
-            print(f"[DEBUG] REFRESH: reparticao.percentagem = {reparticao.percentagem}")
-            print(f"[DEBUG] REFRESH: reparticao.total = €{float(reparticao.total):.2f}")
+    def mostrar_reparticao_alterada(self, rep: ReparticaoDocumento):
+        """Atualiza apenas as labels que dependem de uma repartição alterada"""
+        percentagem_label, total_label = self._widgets_reparticoes.get(rep.id, (None, None))
+        if percentagem_label:
+            percentagem_label.configure(text=f"{float(rep.percentagem):.4f}%")
+        if total_label:
+            total_label.configure(text=f"€{float(rep.total):.2f}")
 
-            # Recarregar UI para atualizar valor e totais em tempo real
-            print(f"[DEBUG] >>> Recarregando UI...")
-            self.carregar_items_empresa()
-            print(f"[DEBUG] >>> AJUSTE CONCLUÍDO COM SUCESSO!")
-            print(f"{'='*60}\n")
+        subtotal_label = self._labels_subtotal_empresa.get(rep.tipo)
+        if subtotal_label:
+            subtotal_label.configure(text=f"Subtotal: €{float(self.documento.subtotal_grupo(rep.tipo)):.2f}")
 
-        except Exception as e:
-            self.db_session.rollback()
-            print(f"[DEBUG] !!! ERRO FATAL !!!")
-            print(f"[DEBUG] Exceção: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            print(f"{'='*60}\n")
-            messagebox.showerror("Erro", f"Erro ao ajustar percentagem: {str(e)}")
+        self._total_empresa = self.documento.total_empresa
+        self.total_empresa_label.configure(text=f"TOTAL EMPRESA: €{float(self._total_empresa):.2f}")
+        self.atualizar_valores_beneficiarios()
+        self.validar_totais()
+
+    # ===== GRAVAÇÃO DO DOCUMENTO =====
+
+    def recarregar_documento(self):
+        """Grava as alterações pendentes e volta a ler o documento da DB"""
+        self.gravar_documento()
+        if self.documento:
+            self.documento.recarregar()
+        else:
+            self.documento = DocumentoOrcamento(self.db_session, self.orcamento_id)
+
+    def agendar_gravacao(self):
+        """(Re)agenda a gravação do documento para ATRASO_GRAVACAO_MS depois da última alteração"""
+        if self._gravacao_id:
+            self.after_cancel(self._gravacao_id)
+        self._gravacao_id = self.after(self.ATRASO_GRAVACAO_MS, self.gravar_documento)
+
+    def gravar_documento(self) -> bool:
+        """
+        Grava já as alterações pendentes do documento (uma transação)
+
+        Returns:
+            True se não havia nada a gravar ou se gravou com sucesso
+        """
+        if self._gravacao_id:
+            self.after_cancel(self._gravacao_id)
+            self._gravacao_id = None
+
+        if not self.documento or not self.documento.tem_alteracoes:
+            return True
+
+        sucesso, erro = self.documento.gravar()
+        if not sucesso:
+            messagebox.showerror("Erro", f"Erro ao gravar alterações: {erro}")
+        return sucesso
+
+    def destroy(self):
+        """Grava as alterações pendentes antes de fechar"""
+        self.parar_repeat_seta()
+        self.gravar_documento()
+        super().destroy()
 
     def atualizar_total_empresa(self):
         """Atualiza TOTAL EMPRESA"""
@@ -1850,78 +1855,27 @@ class OrcamentoFormScreen(ctk.CTkFrame):
                 'FORNECEDOR_5': (Decimal('200.00'), 'FORNECEDOR_5 - Rental Co')
             }
         """
-        if not self.orcamento:
+        if not self.orcamento or not self.documento:
             return {}
 
-        # Obter reparticões do orçamento
-        reparticoes = self.manager.obter_reparticoes(self.orcamento.id)
-
-        # Agregar por beneficiário
-        totais = {}
-        for rep in reparticoes:
-            beneficiario = rep.beneficiario
-            if not beneficiario:
-                continue
-
-            if beneficiario not in totais:
-                totais[beneficiario] = Decimal('0')
-            totais[beneficiario] += rep.total
-
-        # Resolver nomes
-        totais_com_nomes = {}
-        for beneficiario_id, total in totais.items():
-            nome_display = self._resolver_nome_beneficiario(beneficiario_id)
-            totais_com_nomes[beneficiario_id] = (total, nome_display)
-
-        return totais_com_nomes
+        # Totais por beneficiário já agregados no documento
+        totais = self.documento.totais_beneficiario
 
-    def _resolver_nome_beneficiario(self, beneficiario_id: str) -> str:
-        """
-        Resolve o ID do beneficiário para nome de exibição.
+        # Resolver todos os nomes de uma vez (uma query por tipo, com cache)
+        nomes = self.nomes_beneficiarios.resolver(totais)
 
-        Args:
-            beneficiario_id: 'BA', 'RR', 'AGORA', 'FREELANCER_2', 'FORNECEDOR_5'
-
-        Returns:
-            Nome formatado: 'BA - Bruno', 'FREELANCER_2 - João Silva', etc
-        """
-        # Sócios fixos
-        if beneficiario_id == 'BA':
-            return 'BA - Bruno'
-        elif beneficiario_id == 'RR':
-            return 'RR - Rafael'
-        elif beneficiario_id == 'AGORA':
-            return 'AGORA - Empresa'
-
-        # Freelancers
-        if beneficiario_id.startswith('FREELANCER_'):
-            try:
-                freelancer_id = int(beneficiario_id.replace('FREELANCER_', ''))
-                freelancer = self.freelancers_manager.buscar_por_id(freelancer_id)
-                if freelancer:
-                    return f"{beneficiario_id} - {freelancer.nome}"
-            except (ValueError, AttributeError):
-                pass
-            return beneficiario_id  # Fallback: mostrar só o ID
-
-        # Fornecedores
-        if beneficiario_id.startswith('FORNECEDOR_'):
-            try:
-                fornecedor_id = int(beneficiario_id.replace('FORNECEDOR_', ''))
-                fornecedor = self.fornecedores_manager.obter(fornecedor_id)
-                if fornecedor:
-                    return f"{beneficiario_id} - {fornecedor.nome}"
-            except (ValueError, AttributeError):
-                pass
-            return beneficiario_id  # Fallback: mostrar só o ID
-
-        return beneficiario_id  # Fallback genérico
+        return {
+            beneficiario_id: (total, nomes[beneficiario_id])
+            for beneficiario_id, total in totais.items()
+        }
 
     def atualizar_totais_beneficiarios(self):
         """Atualiza frame de totais por beneficiário (painel lateral direito)"""
         # Limpar container anterior
         for widget in self.beneficiarios_container.winfo_children():
             widget.destroy()
+        self._labels_beneficiarios = {}
+        self._label_total_beneficiarios = None
 
         # Calcular totais
         self._totais_beneficiarios = self.calcular_totais_beneficiarios()
@@ -1998,6 +1952,7 @@ class OrcamentoFormScreen(ctk.CTkFrame):
                 anchor="e"
             )
             label_valor.pack(side="right")
+            self._labels_beneficiarios[beneficiario_id] = label_valor
 
         # Separador antes do total
         separador_total = ctk.CTkFrame(
@@ -2031,6 +1986,28 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             anchor="e"
         )
         label_total_valor.pack(side="right")
+        self._label_total_beneficiarios = label_total_valor
+
+    def atualizar_valores_beneficiarios(self):
+        """
+        Atualiza os valores do painel de beneficiários sem o reconstruir
+
+        Só reconstrói (atualizar_totais_beneficiarios) se o conjunto de
+        beneficiários mudou.
+        """
+        totais = self.documento.totais_beneficiario if self.documento else {}
+        if set(totais) != set(self._labels_beneficiarios):
+            self.atualizar_totais_beneficiarios()
+            return
+
+        for beneficiario_id, total in totais.items():
+            _, nome_display = self._totais_beneficiarios[beneficiario_id]
+            self._totais_beneficiarios[beneficiario_id] = (total, nome_display)
+            self._labels_beneficiarios[beneficiario_id].configure(text=f"€{float(total):,.2f}")
+
+        if self._label_total_beneficiarios:
+            total_geral = sum(totais.values())
+            self._label_total_beneficiarios.configure(text=f"€{float(total_geral):,.2f}")
 
     def validar_totais(self):
         """Valida se TOTAL CLIENTE == TOTAL EMPRESA"""
@@ -2060,6 +2037,9 @@ class OrcamentoFormScreen(ctk.CTkFrame):
     def gravar_rascunho(self):
         """Grava orçamento como rascunho (sem validação de totais)"""
         try:
+            if not self.gravar_documento():
+                return
+
             # Validar campos obrigatórios
             if not self.codigo_entry.get():
                 messagebox.showwarning("Aviso", "Código é obrigatório!")
@@ -2114,6 +2094,9 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             messagebox.showwarning("Aviso", "Grave o orçamento primeiro!")
             return
 
+        if not self.gravar_documento():
+            return
+
         # Validar totais
         if not self.validar_totais():
             messagebox.showerror(
@@ -2184,14 +2167,13 @@ class OrcamentoFormScreen(ctk.CTkFrame):
             "Será criado com cliente, valor e prémios calculados."
         )
 
-        if not confirmacao:
+        if not confirmacao or not self.gravar_documento():
             return
 
         try:
             # 3. Calcular prémios BA/RR das repartições
-            reparticoes = self.manager.obter_reparticoes(self.orcamento_id)
-            premio_ba = sum(r.total for r in reparticoes if r.beneficiario == 'BA')
-            premio_rr = sum(r.total for r in reparticoes if r.beneficiario == 'RR')
+            premio_ba = self.documento.totais_beneficiario.get('BA', Decimal('0'))
+            premio_rr = self.documento.totais_beneficiario.get('RR', Decimal('0'))
 
             # 4. Criar projeto usando ProjetosManager
             from logic.projetos import ProjetosManager
@@ -2240,7 +2222,9 @@ class OrcamentoFormScreen(ctk.CTkFrame):
 
     def carregar_orcamento(self):
         """Carrega dados do orçamento para edição"""
-        self.orcamento = self.manager.obter_orcamento(self.orcamento_id)
+        # Orçamento completo (cliente, secções, items, repartições) num número fixo de queries
+        self.gravar_documento()
+        self.orcamento = self.manager.carregar_documento(self.orcamento_id)
         if not self.orcamento:
             messagebox.showerror("Erro", "Orçamento não encontrado!")
             self.voltar()
@@ -2274,9 +2258,10 @@ class OrcamentoFormScreen(ctk.CTkFrame):
         # Atualizar estado badge
         self.atualizar_estado_badge()
 
-        # Carregar items
-        self.carregar_items_cliente()
-        self.carregar_items_empresa()
+        # Carregar items (documento criado a partir do orçamento já carregado)
+        self.documento = DocumentoOrcamento(self.db_session, self.orcamento_id, self.orcamento)
+        self.carregar_items_cliente(recarregar=False)
+        self.carregar_items_empresa(recarregar=False)
 
         # Reset flag
         self.alteracoes_pendentes = False
@@ -2315,6 +2300,9 @@ class OrcamentoFormScreen(ctk.CTkFrame):
 
     def voltar(self):
         """Volta para listagem de orçamentos"""
+        if not self.gravar_documento():
+            return
+
         if self.alteracoes_pendentes:
             if not messagebox.askyesno(
                 "Alterações Pendentes",
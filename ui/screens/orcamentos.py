@@ -65,13 +65,6 @@ class OrcamentosScreen(BaseScreen):
         """Load orçamentos from database and return as list of dicts"""
         try:
             # Get filters (widgets might not exist yet during initialization)
-            pesquisa = None
-            if hasattr(self, 'search_entry') and self.search_entry:
-                try:
-                    pesquisa = self.search_entry.get().strip() or None
-                except Exception:
-                    pass
-
             filtro_status = None
             if hasattr(self, 'status_combo') and self.status_combo:
                 try:
@@ -84,8 +77,7 @@ class OrcamentosScreen(BaseScreen):
             # Load orcamentos
             orcamentos = self.manager.listar_orcamentos(
                 filtro_status=filtro_status,
-                filtro_cliente_id=self.filtro_cliente_id_inicial,
-                pesquisa=pesquisa
+                filtro_cliente_id=self.filtro_cliente_id_inicial
             )
 
             # Defensive: handle None or empty results
@@ -336,6 +328,12 @@ class OrcamentosScreen(BaseScreen):
         """
         return item
 
+    def get_search_text(self, item: Dict[str, Any], row: Dict[str, Any]) -> str:
+        """Texto pesquisável: colunas visíveis + local e data do evento"""
+        orc = item.get('_orcamento')
+        extra = [orc.local_evento or '', str(orc.data_evento or '')] if orc else []
+        return ' '.join([super().get_search_text(item, row)] + extra)
+
     # ===== BULK OPERATION METHODS FOR ACTION BAR =====
 
     def _editar_selecionado(self):
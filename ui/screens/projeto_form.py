@@ -53,7 +53,7 @@ class ProjetoFormScreen(BaseForm):
         self.is_create = (projeto_id is None)
 
         # Obter clientes ANTES de chamar super().__init__()
-        clientes = self.clientes_manager.listar_todos(order_by="nome")
+        clientes = self.clientes_manager.listar_todos(order_by="nome", perfil='base')
         self.cliente_options = ["(Nenhum)"] + [f"{c.numero} - {c.nome}" for c in clientes]
         self.clientes_map = {f"{c.numero} - {c.nome}": c.id for c in clientes}
 
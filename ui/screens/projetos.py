@@ -38,7 +38,7 @@ class ProjetosScreen(BaseScreen):
         self.clientes_manager = ClientesManager(db_session)
 
         # Carregar clientes para filtro
-        self.clientes_list = self.clientes_manager.listar_todos(order_by='nome')
+        self.clientes_list = self.clientes_manager.listar_todos(order_by='nome', perfil='base')
 
         # Filtros especiais (não são OptionMenu padrão)
         self.filtro_premio_socio = filtro_premio_socio
@@ -80,9 +80,12 @@ class ProjetosScreen(BaseScreen):
         ]
 
     def load_data(self) -> list:
+        return self.manager.listar_todos()
+
+    def refresh_data(self):
         # Atualizar estados automaticamente antes de carregar
         self.manager.atualizar_estados_projetos()
-        return self.manager.listar_todos()
+        super().refresh_data()
 
     def item_to_dict(self, projeto) -> dict:
         cliente_nome = projeto.cliente.nome if projeto.cliente else '-'
@@ -230,57 +233,29 @@ class ProjetosScreen(BaseScreen):
 
         return items
 
-    def filter_by_search(self, items: list, search_text: str) -> list:
-        return self.manager.filtrar_por_texto(search_text)
-
-    def apply_filters(self, items: list, filters: Dict[str, List[str]]) -> list:
-        projetos = items
-
-        # Filtrar por tipo (multi-seleção)
-        tipos_selecionados = filters.get('tipo', [])
-        if tipos_selecionados:
-            tipo_matches = []
-            for tipo in tipos_selecionados:
-                if tipo == "Empresa BA":
-                    tipo_matches.extend([p for p in projetos if p.tipo == TipoProjeto.EMPRESA and p.owner == 'BA'])
-                elif tipo == "Empresa RR":
-                    tipo_matches.extend([p for p in projetos if p.tipo == TipoProjeto.EMPRESA and p.owner == 'RR'])
-                elif tipo == "Pessoal BA":
-                    tipo_matches.extend([p for p in projetos if p.tipo == TipoProjeto.PESSOAL and p.owner == 'BA'])
-                elif tipo == "Pessoal RR":
-                    tipo_matches.extend([p for p in projetos if p.tipo == TipoProjeto.PESSOAL and p.owner == 'RR'])
-
-            # Remove duplicates preserving order
-            seen = set()
-            projetos = [p for p in tipo_matches if not (p.id in seen or seen.add(p.id))]
-
-        # Filtrar por estado (multi-seleção)
-        estados_selecionados = filters.get('estado', [])
-        if estados_selecionados:
-            estado_map = {
-                "Ativo": EstadoProjeto.ATIVO,
-                "Finalizado": EstadoProjeto.FINALIZADO,
-                "Pago": EstadoProjeto.PAGO,
-                "Anulado": EstadoProjeto.ANULADO
-            }
-            estado_enums = [estado_map[e] for e in estados_selecionados if e in estado_map]
-            if estado_enums:
-                projetos = [p for p in projetos if p.estado in estado_enums]
-
-        # Filtros especiais (passados no constructor)
-        if self._filtro_cliente_id:
-            projetos = [p for p in projetos if p.cliente_id == self._filtro_cliente_id]
-
-        if self.filtro_premio_socio:
-            if self.filtro_premio_socio == "BA":
-                projetos = [p for p in projetos if p.premio_bruno and p.premio_bruno > 0]
-            elif self.filtro_premio_socio == "RR":
-                projetos = [p for p in projetos if p.premio_rafael and p.premio_rafael > 0]
-
-        if self.filtro_owner:
-            projetos = [p for p in projetos if p.owner == self.filtro_owner and p.tipo == TipoProjeto.EMPRESA]
+    def get_query(self, filters: Dict[str, List[str]]):
+        """Filtros, pesquisa e ordenação feitos na BD (ProjetosManager.consulta_lista)"""
+        tipo_map = {
+            "Empresa BA": (TipoProjeto.EMPRESA, 'BA'),
+            "Empresa RR": (TipoProjeto.EMPRESA, 'RR'),
+            "Pessoal BA": (TipoProjeto.PESSOAL, 'BA'),
+            "Pessoal RR": (TipoProjeto.PESSOAL, 'RR'),
+        }
+        estado_map = {
+            "Ativo": EstadoProjeto.ATIVO,
+            "Finalizado": EstadoProjeto.FINALIZADO,
+            "Pago": EstadoProjeto.PAGO,
+            "Anulado": EstadoProjeto.ANULADO
+        }
 
-        return projetos
+        return self.manager.consulta_lista().filtrar({
+            'tipo_owner': [tipo_map[t] for t in filters.get('tipo', []) if t in tipo_map],
+            'estado': [estado_map[e] for e in filters.get('estado', []) if e in estado_map],
+            # Filtros especiais (passados no constructor)
+            'cliente_id': [self._filtro_cliente_id] if self._filtro_cliente_id else [],
+            'premio_socio': [self.filtro_premio_socio] if self.filtro_premio_socio else [],
+            'owner_empresa': [self.filtro_owner] if self.filtro_owner else [],
+        })
 
     def calculate_selection_total(self, selected_data: list) -> float:
         return sum(item.get('valor_sem_iva', 0) for item in selected_data)
@@ -509,6 +484,7 @@ class ProjetosScreen(BaseScreen):
 
         sucessos = 0
         erros = []
+        atualizados = []
 
         for data in selected:
             projeto = data.get('_projeto')
@@ -516,12 +492,13 @@ class ProjetosScreen(BaseScreen):
                 sucesso, erro = self.manager.mudar_estado(projeto.id, EstadoProjeto.FINALIZADO)
                 if sucesso:
                     sucessos += 1
+                    atualizados.append(projeto)
                 else:
                     erros.append(f"{projeto.numero}: {erro}")
 
-        # Mostrar resultado
+        # Mostrar resultado (atualiza só as linhas alteradas)
         if sucessos > 0:
-            self.refresh_data()
+            self.update_items(atualizados)
             if len(erros) == 0:
                 messagebox.showinfo("Sucesso", f"{sucessos} projeto(s) marcado(s) como finalizado(s)")
             else:
@@ -549,6 +526,7 @@ class ProjetosScreen(BaseScreen):
 
         sucessos = 0
         erros = []
+        atualizados = []
 
         for data in selected:
             projeto = data.get('_projeto')
@@ -556,12 +534,13 @@ class ProjetosScreen(BaseScreen):
                 sucesso, erro = self.manager.mudar_estado(projeto.id, EstadoProjeto.PAGO)
                 if sucesso:
                     sucessos += 1
+                    atualizados.append(projeto)
                 else:
                     erros.append(f"{projeto.numero}: {erro}")
 
-        # Mostrar resultado
+        # Mostrar resultado (atualiza só as linhas alteradas)
         if sucessos > 0:
-            self.refresh_data()
+            self.update_items(atualizados)
             if len(erros) == 0:
                 messagebox.showinfo("Sucesso", f"{sucessos} projeto(s) marcado(s) como pago(s)")
             else:
@@ -591,6 +570,7 @@ class ProjetosScreen(BaseScreen):
 
         sucessos = 0
         erros = []
+        atualizados = []
 
         for data in selected:
             projeto = data.get('_projeto')
@@ -598,12 +578,13 @@ class ProjetosScreen(BaseScreen):
                 sucesso, erro = self.manager.mudar_estado(projeto.id, EstadoProjeto.ANULADO)
                 if sucesso:
                     sucessos += 1
+                    atualizados.append(projeto)
                 else:
                     erros.append(f"{projeto.numero}: {erro}")
 
-        # Mostrar resultado
+        # Mostrar resultado (atualiza só as linhas alteradas)
         if sucessos > 0:
-            self.refresh_data()
+            self.update_items(atualizados)
             if len(erros) == 0:
                 messagebox.showinfo("Sucesso", f"{sucessos} projeto(s) anulado(s)")
             else:
@@ -633,6 +614,7 @@ class ProjetosScreen(BaseScreen):
 
         sucessos = 0
         erros = []
+        apagados = []
 
         for data in selected:
             projeto = data.get('_projeto')
@@ -640,12 +622,13 @@ class ProjetosScreen(BaseScreen):
                 sucesso, erro = self.manager.apagar(projeto.id)
                 if sucesso:
                     sucessos += 1
+                    apagados.append(data['id'])
                 else:
                     erros.append(f"{projeto.numero}: {erro}")
 
-        # Mostrar resultado
+        # Mostrar resultado (retira só as linhas apagadas)
         if sucessos > 0:
-            self.refresh_data()
+            self.remove_items(apagados)
             if len(erros) == 0:
                 messagebox.showinfo("Sucesso", f"{sucessos} projeto(s) apagado(s)")
             else:
@@ -2,14 +2,15 @@
 """
 Tela de Relatórios - Visualização e exportação
 """
+import os
 import customtkinter as ctk
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, sessionmaker
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 import tkinter.messagebox as messagebox
 from tkinter import filedialog
 
-from logic.relatorios import RelatoriosManager
+from logic.tarefas_relatorios import ExecutorRelatorios, gerar_relatorio, exportar_relatorio
 from database.models import Socio
 from assets.resources import get_icon, RELATORIOS
 
@@ -17,8 +18,14 @@ from assets.resources import get_icon, RELATORIOS
 class RelatoriosScreen(ctk.CTkFrame):
     """
     Tela de relatórios com filtros e exportação
+
+    O preview e as exportações correm em segundo plano (ExecutorRelatorios),
+    cada tarefa com a sua sessão de DB; a tela acompanha-as com after().
     """
 
+    # Intervalo de verificação das tarefas em segundo plano
+    INTERVALO_TAREFAS_MS = 100
+
     def __init__(self, parent, db_session: Session, projeto_ids=None, despesa_ids=None, boletim_ids=None, **kwargs):
         """
         Initialize relatorios screen
@@ -33,12 +40,21 @@ class RelatoriosScreen(ctk.CTkFrame):
         super().__init__(parent, **kwargs)
 
         self.db_session = db_session
-        self.manager = RelatoriosManager(db_session)
         self.current_report_data = None
+        # (método do manager, argumentos) do relatório no preview, para o exportar
+        self.current_report_args = None
         self.projeto_ids_prefilter = projeto_ids
         self.despesa_ids_prefilter = despesa_ids
         self.boletim_ids_prefilter = boletim_ids
 
+        # Background tasks: previews (latest wins) and exports (queued)
+        fabrica_sessao = sessionmaker(bind=db_session.get_bind())
+        self.tarefas_preview = ExecutorRelatorios(fabrica_sessao)
+        self.tarefas_exportacao = ExecutorRelatorios(fabrica_sessao)
+        self.tarefa_preview = None
+        self.ultima_tarefa_texto = ""
+        self._verificacao_id = None
+
         self.configure(fg_color="transparent")
         self.create_widgets()
 
@@ -284,6 +300,29 @@ class RelatoriosScreen(ctk.CTkFrame):
         )
         excel_btn.pack(fill="x")
 
+        # Background exports: progress and cancel
+        self.tarefas_label = ctk.CTkLabel(
+            btn_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="gray",
+            justify="left",
+            wraplength=240
+        )
+        self.tarefas_label.pack(fill="x", pady=(10, 0))
+
+        self.tarefas_progress = ctk.CTkProgressBar(btn_frame)
+        self.tarefas_progress.set(0)
+
+        self.cancelar_btn = ctk.CTkButton(
+            btn_frame,
+            text="✖ Cancelar Exportação",
+            command=self.cancelar_exportacao,
+            height=30,
+            fg_color="gray",
+            hover_color=("gray60", "gray40")
+        )
+
     def create_preview(self, parent):
         """Create preview panel"""
 
@@ -403,94 +442,121 @@ class RelatoriosScreen(ctk.CTkFrame):
         self.gerar_preview()
 
     def gerar_preview(self):
-        """Generate report preview"""
+        """Generate report preview (in the background, replacing any preview still running)"""
         tipo = self.tipo_relatorio.get()
         data_inicio, data_fim = self.get_date_range()
 
         if self.periodo_var.get() == "custom" and (data_inicio is None or data_fim is None):
             return
 
-        # Clear preview
+        if tipo == "Saldos Pessoais":
+            socio_str = self.socio_filter.get()
+            socio = None
+            if socio_str == "BA":
+                socio = Socio.BA
+            elif socio_str == "RR":
+                socio = Socio.RR
+
+            pedido = ('gerar_relatorio_saldos', dict(
+                socio=socio,
+                data_inicio=data_inicio,
+                data_fim=data_fim
+            ), self.render_saldos_preview)
+
+        elif tipo == "Financeiro Mensal":
+            pedido = ('gerar_relatorio_financeiro_mensal', dict(
+                data_inicio=data_inicio,
+                data_fim=data_fim
+            ), self.render_financeiro_preview)
+
+        elif tipo == "Projetos":
+            # Map filter to TipoProjeto enum
+            from database.models import TipoProjeto, EstadoProjeto
+            filtro_tipo_str = self.tipo_projeto_var.get()
+            tipo_projeto = None
+            owner = None
+            if filtro_tipo_str == "empresa":
+                tipo_projeto = TipoProjeto.EMPRESA
+            elif filtro_tipo_str == "bruno":
+                tipo_projeto, owner = TipoProjeto.PESSOAL, 'BA'
+            elif filtro_tipo_str == "rafael":
+                tipo_projeto, owner = TipoProjeto.PESSOAL, 'RR'
+            # "todos" maps to None (no filter)
+
+            # Map filter to EstadoProjeto enum
+            filtro_estado_str = self.estado_projeto_var.get()
+            estado_projeto = None
+            if filtro_estado_str == "ativo":
+                estado_projeto = EstadoProjeto.ATIVO
+            elif filtro_estado_str == "finalizado":
+                estado_projeto = EstadoProjeto.FINALIZADO
+            elif filtro_estado_str == "pago":
+                estado_projeto = EstadoProjeto.PAGO
+            # "todos" maps to None (no filter)
+
+            pedido = ('gerar_relatorio_projetos', dict(
+                tipo=tipo_projeto,
+                estado=estado_projeto,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                projeto_ids=self.projeto_ids_prefilter,  # Pass pre-filter IDs if available
+                owner=owner
+            ), self.render_projetos_preview)
+
+        elif tipo == "Despesas":
+            # Despesas report doesn't have tipo/estado filters yet, just use pre-filter IDs
+            pedido = ('gerar_relatorio_despesas', dict(
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                despesa_ids=self.despesa_ids_prefilter  # Pass pre-filter IDs if available
+            ), self.render_despesas_preview)
+
+        elif tipo == "Boletins":
+            # Boletins report doesn't have tipo/estado filters yet, just use pre-filter IDs
+            pedido = ('gerar_relatorio_boletins', dict(
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                boletim_ids=self.boletim_ids_prefilter  # Pass pre-filter IDs if available
+            ), self.render_boletins_preview)
+
+        else:
+            return
+
+        nome, argumentos, render = pedido
+
+        # Only the latest preview matters
+        if self.tarefa_preview:
+            self.tarefa_preview.cancelar()
+
+        self._limpar_preview()
+        ctk.CTkLabel(
+            self.preview_scroll,
+            text="⏳ A gerar relatório...",
+            font=ctk.CTkFont(size=14),
+            text_color="gray"
+        ).pack(pady=100)
+
+        def ao_concluir(dados):
+            self._limpar_preview()
+            self.current_report_data = dados
+            self.current_report_args = (nome, argumentos)
+            render(dados)
+
+        def ao_erro(erro):
+            self._limpar_preview()
+            messagebox.showerror("Erro", f"Erro ao gerar relatório: {erro}")
+
+        self.tarefa_preview = self.tarefas_preview.submeter(
+            f"Preview: {tipo}", gerar_relatorio, nome, argumentos,
+            ao_concluir=ao_concluir, ao_erro=ao_erro
+        )
+        self._agendar_verificacao_tarefas()
+
+    def _limpar_preview(self):
+        """Clear preview area"""
         for widget in self.preview_scroll.winfo_children():
             widget.destroy()
 
-        try:
-            if tipo == "Saldos Pessoais":
-                socio_str = self.socio_filter.get()
-                socio = None
-                if socio_str == "BA":
-                    socio = Socio.BA
-                elif socio_str == "RR":
-                    socio = Socio.RR
-
-                self.current_report_data = self.manager.gerar_relatorio_saldos(
-                    socio=socio,
-                    data_inicio=data_inicio,
-                    data_fim=data_fim
-                )
-                self.render_saldos_preview(self.current_report_data)
-
-            elif tipo == "Financeiro Mensal":
-                self.current_report_data = self.manager.gerar_relatorio_financeiro_mensal(
-                    data_inicio=data_inicio,
-                    data_fim=data_fim
-                )
-                self.render_financeiro_preview(self.current_report_data)
-
-            elif tipo == "Projetos":
-                # Map filter to TipoProjeto enum
-                from database.models import TipoProjeto, EstadoProjeto
-                filtro_tipo_str = self.tipo_projeto_var.get()
-                tipo_projeto = None
-                if filtro_tipo_str == "empresa":
-                    tipo_projeto = TipoProjeto.EMPRESA
-                elif filtro_tipo_str == "bruno":
-                    tipo_projeto = TipoProjeto.PESSOAL_BRUNO
-                elif filtro_tipo_str == "rafael":
-                    tipo_projeto = TipoProjeto.PESSOAL_RAFAEL
-                # "todos" maps to None (no filter)
-
-                # Map filter to EstadoProjeto enum
-                filtro_estado_str = self.estado_projeto_var.get()
-                estado_projeto = None
-                if filtro_estado_str == "ativo":
-                    estado_projeto = EstadoProjeto.ATIVO
-                elif filtro_estado_str == "finalizado":
-                    estado_projeto = EstadoProjeto.FINALIZADO
-                elif filtro_estado_str == "pago":
-                    estado_projeto = EstadoProjeto.PAGO
-                # "todos" maps to None (no filter)
-
-                self.current_report_data = self.manager.gerar_relatorio_projetos(
-                    tipo=tipo_projeto,
-                    estado=estado_projeto,
-                    data_inicio=data_inicio,
-                    data_fim=data_fim,
-                    projeto_ids=self.projeto_ids_prefilter  # Pass pre-filter IDs if available
-                )
-                self.render_projetos_preview(self.current_report_data)
-
-            elif tipo == "Despesas":
-                # Despesas report doesn't have tipo/estado filters yet, just use pre-filter IDs
-                self.current_report_data = self.manager.gerar_relatorio_despesas(
-                    data_inicio=data_inicio,
-                    data_fim=data_fim,
-                    despesa_ids=self.despesa_ids_prefilter  # Pass pre-filter IDs if available
-                )
-                self.render_despesas_preview(self.current_report_data)
-
-            elif tipo == "Boletins":
-                # Boletins report doesn't have tipo/estado filters yet, just use pre-filter IDs
-                self.current_report_data = self.manager.gerar_relatorio_boletins(
-                    data_inicio=data_inicio,
-                    data_fim=data_fim,
-                    boletim_ids=self.boletim_ids_prefilter  # Pass pre-filter IDs if available
-                )
-                self.render_boletins_preview(self.current_report_data)
-
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao gerar relatório: {e}")
-
     def render_saldos_preview(self, data):
         """Render saldos report preview"""
 
@@ -1472,7 +1538,7 @@ class RelatoriosScreen(ctk.CTkFrame):
         return filename
 
     def exportar_pdf(self):
-        """Export report to PDF"""
+        """Export report to PDF (queued in the background)"""
         if not self.current_report_data:
             messagebox.showwarning("Aviso", "Gere o preview do relatório primeiro!")
             return
@@ -1488,13 +1554,10 @@ class RelatoriosScreen(ctk.CTkFrame):
         )
 
         if filename:
-            try:
-                self.manager.exportar_pdf(self.current_report_data, filename)
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao exportar PDF: {e}")
+            self._submeter_exportacao('pdf', filename)
 
     def exportar_excel(self):
-        """Export report to Excel"""
+        """Export report to Excel (queued in the background)"""
         if not self.current_report_data:
             messagebox.showwarning("Aviso", "Gere o preview do relatório primeiro!")
             return
@@ -1510,7 +1573,76 @@ class RelatoriosScreen(ctk.CTkFrame):
         )
 
         if filename:
-            try:
-                self.manager.exportar_excel(self.current_report_data, filename)
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro ao exportar Excel: {e}")
+            self._submeter_exportacao('excel', filename)
+
+    def _submeter_exportacao(self, formato, filename):
+        """Queue an export of the report shown in the preview"""
+        nome, argumentos = self.current_report_args
+        descricao = f"{'PDF' if formato == 'pdf' else 'Excel'}: {os.path.basename(filename)}"
+
+        def ao_concluir(_):
+            self.ultima_tarefa_texto = f"✅ {descricao}"
+
+        def ao_erro(erro):
+            self.ultima_tarefa_texto = f"❌ {descricao}"
+            messagebox.showerror("Erro", f"Erro ao exportar {'PDF' if formato == 'pdf' else 'Excel'}: {erro}")
+
+        self.tarefas_exportacao.submeter(
+            descricao, exportar_relatorio, nome, argumentos, formato, filename,
+            ao_concluir=ao_concluir, ao_erro=ao_erro
+        )
+        self._agendar_verificacao_tarefas()
+
+    # ========== TAREFAS EM SEGUNDO PLANO ==========
+
+    def _agendar_verificacao_tarefas(self):
+        """Start polling the background tasks (if not already polling)"""
+        if self._verificacao_id is None:
+            self._verificacao_id = self.after(self.INTERVALO_TAREFAS_MS, self._verificar_tarefas)
+        self._atualizar_estado_tarefas()
+
+    def _verificar_tarefas(self):
+        """Deliver finished tasks / progress and keep polling while tasks remain"""
+        self._verificacao_id = None
+        preview_ativo = self.tarefas_preview.processar_eventos()
+        exportacao_ativa = self.tarefas_exportacao.processar_eventos()
+        self._atualizar_estado_tarefas()
+        if preview_ativo or exportacao_ativa:
+            self._verificacao_id = self.after(self.INTERVALO_TAREFAS_MS, self._verificar_tarefas)
+
+    def _atualizar_estado_tarefas(self):
+        """Show progress of the export queue (hidden when idle)"""
+        tarefas = self.tarefas_exportacao.tarefas
+        if not tarefas:
+            self.tarefas_progress.pack_forget()
+            self.cancelar_btn.pack_forget()
+            self.tarefas_label.configure(text=self.ultima_tarefa_texto)
+            return
+
+        atual = self.tarefas_exportacao.tarefa_atual or tarefas[0]
+        texto = f"⏳ {atual.descricao}"
+        if atual.mensagem:
+            texto += f"\n{atual.mensagem}"
+        if len(tarefas) > 1:
+            texto += f"\n+{len(tarefas) - 1} em fila"
+        self.tarefas_label.configure(text=texto)
+        self.tarefas_progress.set(atual.progresso)
+        if not self.tarefas_progress.winfo_ismapped():
+            self.tarefas_progress.pack(fill="x", pady=(5, 5))
+            self.cancelar_btn.pack(fill="x")
+
+    def cancelar_exportacao(self):
+        """Cancel the running export (queued exports continue)"""
+        atual = self.tarefas_exportacao.tarefa_atual
+        if atual:
+            atual.cancelar()
+            self.ultima_tarefa_texto = f"✖ {atual.descricao} (cancelado)"
+
+    def destroy(self):
+        """Cancel background tasks before destroying the screen"""
+        if self._verificacao_id is not None:
+            self.after_cancel(self._verificacao_id)
+            self._verificacao_id = None
+        self.tarefas_preview.fechar()
+        self.tarefas_exportacao.fechar()
+        super().destroy()
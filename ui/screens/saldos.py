@@ -435,8 +435,9 @@ class SaldosScreen(ctk.CTkFrame):
         """Load and display saldos"""
 
         # Calculate saldos
-        saldo_bruno = self.calculator.calcular_saldo_bruno()
-        saldo_rafael = self.calculator.calcular_saldo_rafael()
+        saldos = self.calculator.calcular_saldos_socios()
+        saldo_bruno = saldos[Socio.BA]
+        saldo_rafael = saldos[Socio.RR]
 
         # Update BA
         # Saldo atual
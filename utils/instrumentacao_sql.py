@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentação SQL opcional (diagnóstico de performance)
+
+Regista, por ecrã e por método de manager, o número de queries e o tempo
+total de SQL, além das queries mais lentas. Ativa-se com
+SQL_INSTRUMENTACAO=True no .env; o painel de diagnóstico abre-se na janela
+principal com Ctrl+Shift+D e os dados podem ser exportados em JSON.
+
+Uso:
+    instrumentacao = ativar_se_configurado(engine)
+    ...
+    instrumentacao.resumo()
+    instrumentacao.exportar_json("diagnostico_sql.json")
+"""
+import heapq
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SEM_ECRA = "(sem ecrã)"
+SEM_METODO = "(fora dos managers)"
+
+_instrumentacao: Optional['InstrumentacaoSQL'] = None
+
+
+def _origem() -> Tuple[str, str]:
+    """
+    Identifica o ecrã e o método de manager que originaram a query atual
+
+    Percorre a stack: o método é o frame mais interior de logic/ e o ecrã é
+    o frame mais interior cujo self é um ecrã (ui.screens), incluindo os
+    métodos herdados do BaseScreen.
+
+    Returns:
+        Tuple (ecra, metodo)
+    """
+    ecra = metodo = None
+    frame = sys._getframe(2)
+    while frame is not None and (ecra is None or metodo is None):
+        modulo = frame.f_globals.get('__name__', '')
+        if metodo is None and modulo.startswith('logic.'):
+            codigo = frame.f_code
+            metodo = getattr(codigo, 'co_qualname', None)
+            if metodo is None:
+                obj = frame.f_locals.get('self')
+                metodo = f"{type(obj).__name__}.{codigo.co_name}" if obj is not None else codigo.co_name
+        elif ecra is None and modulo.startswith('ui.'):
+            obj = frame.f_locals.get('self')
+            if obj is not None and type(obj).__module__.startswith('ui.screens.'):
+                ecra = type(obj).__name__
+        frame = frame.f_back
+    return ecra or SEM_ECRA, metodo or SEM_METODO
+
+
+class InstrumentacaoSQL:
+    """
+    Contadores de queries / tempo de SQL ligados aos eventos de um Engine
+    """
+
+    MAX_LENTAS = 20
+
+    def __init__(self):
+        """Initialize instrumentação (desligada até ligar(engine))"""
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._sequencia = itertools.count()
+        self.limpar()
+
+    def ligar(self, engine: Engine):
+        """
+        Começa a registar as queries executadas no engine
+
+        Args:
+            engine: SQLAlchemy Engine
+        """
+        if self._engine is not None:
+            return
+        event.listen(engine, "before_cursor_execute", self._antes_execute)
+        event.listen(engine, "after_cursor_execute", self._depois_execute)
+        self._engine = engine
+
+    def desligar(self):
+        """Deixa de registar queries"""
+        if self._engine is None:
+            return
+        event.remove(self._engine, "before_cursor_execute", self._antes_execute)
+        event.remove(self._engine, "after_cursor_execute", self._depois_execute)
+        self._engine = None
+
+    @property
+    def ligada(self) -> bool:
+        """True se está a registar queries"""
+        return self._engine is not None
+
+    def limpar(self):
+        """Apaga os contadores"""
+        with self._lock:
+            self.inicio = datetime.now()
+            self.total_queries = 0
+            self.tempo_total = 0.0
+            self.por_ecra: Dict[str, Dict[str, float]] = {}
+            self.por_metodo: Dict[str, Dict[str, float]] = {}
+            self._lentas = []
+
+    def _antes_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('instrumentacao_sql', []).append((time.perf_counter(), _origem()))
+
+    def _depois_execute(self, conn, cursor, statement, parameters, context, executemany):
+        pilha = conn.info.get('instrumentacao_sql')
+        if not pilha:
+            return
+        inicio, (ecra, metodo) = pilha.pop()
+        duracao = time.perf_counter() - inicio
+
+        with self._lock:
+            self.total_queries += 1
+            self.tempo_total += duracao
+            for contadores, chave in ((self.por_ecra, ecra), (self.por_metodo, metodo)):
+                entrada = contadores.setdefault(chave, {'queries': 0, 'tempo': 0.0})
+                entrada['queries'] += 1
+                entrada['tempo'] += duracao
+
+            # Min-heap com as MAX_LENTAS queries mais lentas
+            registo = (duracao, next(self._sequencia), {
+                'sql': statement,
+                'parametros': repr(parameters)[:200],
+                'ecra': ecra,
+                'metodo': metodo,
+            })
+            if len(self._lentas) < self.MAX_LENTAS:
+                heapq.heappush(self._lentas, registo)
+            elif duracao > self._lentas[0][0]:
+                heapq.heapreplace(self._lentas, registo)
+
+    @staticmethod
+    def _ordenar(contadores: Dict[str, Dict[str, float]]) -> list:
+        return [
+            {'nome': nome, 'queries': int(dados['queries']), 'tempo_ms': round(dados['tempo'] * 1000, 2)}
+            for nome, dados in sorted(contadores.items(), key=lambda item: item[1]['tempo'], reverse=True)
+        ]
+
+    def resumo(self) -> Dict[str, Any]:
+        """
+        Devolve os contadores atuais
+
+        Returns:
+            Dict com totais, por_ecra, por_metodo (ordenados por tempo) e queries_lentas
+        """
+        with self._lock:
+            lentas = sorted(self._lentas, reverse=True)
+            return {
+                'inicio': self.inicio.isoformat(timespec='seconds'),
+                'total_queries': self.total_queries,
+                'tempo_total_ms': round(self.tempo_total * 1000, 2),
+                'por_ecra': self._ordenar(self.por_ecra),
+                'por_metodo': self._ordenar(self.por_metodo),
+                'queries_lentas': [
+                    dict(registo, tempo_ms=round(duracao * 1000, 2))
+                    for duracao, _, registo in lentas
+                ],
+            }
+
+    def exportar_json(self, caminho) -> Path:
+        """
+        Grava o resumo num ficheiro JSON
+
+        Args:
+            caminho: Caminho do ficheiro
+
+        Returns:
+            Path do ficheiro gravado
+        """
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(self.resumo(), f, indent=2, ensure_ascii=False)
+        return caminho
+
+
+def ativar_se_configurado(engine: Engine) -> Optional[InstrumentacaoSQL]:
+    """
+    Liga a instrumentação ao engine se SQL_INSTRUMENTACAO=True
+
+    Args:
+        engine: SQLAlchemy Engine da aplicação
+
+    Returns:
+        InstrumentacaoSQL ativa ou None
+    """
+    global _instrumentacao
+    if os.getenv('SQL_INSTRUMENTACAO', 'False').lower() not in ('1', 'true', 'yes'):
+        return None
+    if _instrumentacao is None:
+        _instrumentacao = InstrumentacaoSQL()
+    _instrumentacao.ligar(engine)
+    logger.info("Instrumentação SQL ativa (Ctrl+Shift+D abre o painel de diagnóstico)")
+    return _instrumentacao
+
+
+def obter_instrumentacao() -> Optional[InstrumentacaoSQL]:
+    """Devolve a instrumentação ativa (None se desligada)"""
+    if _instrumentacao is not None and _instrumentacao.ligada:
+        return _instrumentacao
+    return None
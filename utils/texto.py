@@ -0,0 +1,21 @@
+"""
+Helpers de texto partilhados pela UI e pela lógica
+"""
+import unicodedata
+from typing import Any
+
+
+def normalizar_pesquisa(texto: Any) -> str:
+    """
+    Normaliza texto para pesquisa: minúsculas e sem acentos ("Produção" -> "producao").
+
+    Args:
+        texto: Texto (ou valor convertível para str)
+
+    Returns:
+        Texto normalizado
+    """
+    if texto is None:
+        return ''
+    decomposto = unicodedata.normalize('NFKD', str(texto).lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))